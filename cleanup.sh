@@ -172,6 +172,7 @@ soft_cleanup() {
     --profile client-data-bots
     --profile modules
     --profile tools
+    --profile monitoring
     --profile db
   )
   execute_command "Stopping runtime profiles" $COMPOSE_BASE "${profiles[@]}" down
@@ -189,6 +190,7 @@ hard_cleanup() {
     --profile client-data-bots
     --profile modules
     --profile tools
+    --profile monitoring
     --profile db
   )
   execute_command "Removing containers and networks" $COMPOSE_BASE "${profiles[@]}" down --remove-orphans
@@ -216,6 +218,7 @@ nuclear_cleanup() {
     --profile client-data-bots
     --profile modules
     --profile tools
+    --profile monitoring
     --profile db
   )
   execute_command "Removing containers, networks and volumes" $COMPOSE_BASE "${profiles[@]}" down --volumes --remove-orphans
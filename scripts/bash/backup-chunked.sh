@@ -0,0 +1,142 @@
+#!/bin/bash
+# Chunked parallel dump/load of ACore databases via MySQL Shell.
+set -euo pipefail
+
+log(){ echo "[$(date '+%F %T')] $*"; }
+fatal(){ echo "❌ $*" >&2; exit 1; }
+
+usage(){
+  cat <<'EOF'
+Usage: ./backup-chunked.sh dump --output DIR --schemas LIST [options]
+       ./backup-chunked.sh load --input DIR [--schemas LIST] [options]
+
+Dumps databases as per-table, primary-key-range chunks from one consistent
+snapshot (util.dumpSchemas) and loads them back in parallel with secondary
+indexes and key checks deferred (util.loadDump). Requires mysqlsh, which ships
+in the mysql:8.0 image used by ac-mysql and ac-backup.
+
+Options:
+  --schemas LIST        Comma-separated schemas (load: default all in the dump)
+  --threads N           Worker threads (default: $BACKUP_CHUNKED_THREADS or nproc)
+  --chunk-size SIZE     Target bytes per chunk, e.g. 64M (dump; default: 64M)
+  --compression CODEC   zstd, gzip or none (dump; default: zstd)
+  --keep-existing       Load into existing schemas instead of dropping them first
+  --host HOST           MySQL host (default: $MYSQL_HOST or localhost)
+  --port PORT           MySQL port (default: $MYSQL_PORT or 3306)
+  --user USER           MySQL user (default: $MYSQL_USER or root)
+  --password PASS       MySQL password (default: $MYSQL_PASSWORD)
+  -h, --help            Show this help
+
+A completed dump contains @.done.json; dumps are written to DIR.partial and
+renamed on success.
+EOF
+}
+
+ACTION="${1:-}"
+case "$ACTION" in
+  dump|load) shift ;;
+  -h|--help) usage; exit 0 ;;
+  *) usage; exit 1 ;;
+esac
+
+DIR=""
+SCHEMAS=""
+THREADS="${BACKUP_CHUNKED_THREADS:-}"
+CHUNK_SIZE="${BACKUP_CHUNKED_CHUNK_SIZE:-64M}"
+COMPRESSION="${BACKUP_CHUNKED_COMPRESSION:-zstd}"
+KEEP_EXISTING=0
+HOST="${MYSQL_HOST:-localhost}"
+PORT="${MYSQL_PORT:-3306}"
+USER_NAME="${MYSQL_USER:-root}"
+PASSWORD="${MYSQL_PASSWORD:-}"
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --output|--input) DIR="$2"; shift 2 ;;
+    --schemas) SCHEMAS="$2"; shift 2 ;;
+    --threads) THREADS="$2"; shift 2 ;;
+    --chunk-size) CHUNK_SIZE="$2"; shift 2 ;;
+    --compression) COMPRESSION="$2"; shift 2 ;;
+    --keep-existing) KEEP_EXISTING=1; shift ;;
+    --host) HOST="$2"; shift 2 ;;
+    --port) PORT="$2"; shift 2 ;;
+    --user) USER_NAME="$2"; shift 2 ;;
+    --password) PASSWORD="$2"; shift 2 ;;
+    -h|--help) usage; exit 0 ;;
+    *) fatal "Unknown option: $1" ;;
+  esac
+done
+
+[ -n "$DIR" ] || fatal "--output/--input is required"
+command -v mysqlsh >/dev/null 2>&1 || fatal "mysqlsh not found (run inside the ac-mysql or ac-backup container)"
+[[ "$THREADS" =~ ^[1-9][0-9]*$ ]] || THREADS="$(nproc 2>/dev/null || echo 4)"
+case "$COMPRESSION" in zstd|gzip|none) ;; *) fatal "Unsupported compression: $COMPRESSION" ;; esac
+
+# "a, b" -> ["a","b"] for the JS option objects below
+js_list(){
+  local out="" item
+  IFS=',' read -ra items <<<"${1// /}"
+  for item in "${items[@]}"; do
+    [ -n "$item" ] || continue
+    out+="${out:+,}\"${item//\"/}\""
+  done
+  echo "[$out]"
+}
+
+shell(){
+  mysqlsh --no-wizard --log-level=1 --host="$HOST" --port="$PORT" --user="$USER_NAME" \
+    --password="$PASSWORD" "$@"
+}
+
+if [ "$ACTION" = "dump" ]; then
+  [ -n "$SCHEMAS" ] || fatal "--schemas is required for dump"
+  [ ! -e "$DIR" ] || fatal "Output directory already exists: $DIR"
+  rm -rf "${DIR}.partial"
+  log "Dumping $(js_list "$SCHEMAS") to $DIR (${THREADS} threads, ${CHUNK_SIZE} chunks, ${COMPRESSION})"
+  shell --js -e "util.dumpSchemas($(js_list "$SCHEMAS"), '${DIR}.partial', {
+    threads: ${THREADS},
+    bytesPerChunk: '${CHUNK_SIZE}',
+    compression: '${COMPRESSION}',
+    consistent: true,
+    events: true,
+    routines: true,
+    triggers: true,
+    showProgress: false
+  })"
+  [ -f "${DIR}.partial/@.done.json" ] || fatal "Dump did not complete: ${DIR}.partial"
+  mv "${DIR}.partial" "$DIR"
+  log "✅ Chunked dump complete: $DIR"
+  exit 0
+fi
+
+[ -f "$DIR/@.done.json" ] || fatal "Not a completed chunked dump (missing @.done.json): $DIR"
+if [ -z "$SCHEMAS" ]; then
+  SCHEMAS="$(find "$DIR" -maxdepth 1 -name '*.json' ! -name '@*' ! -name '*@*' -printf '%f\n' \
+    | sed 's/\.json$//' | paste -sd, -)"
+fi
+[ -n "$SCHEMAS" ] || fatal "No schemas found in $DIR"
+
+if [ "$KEEP_EXISTING" != "1" ]; then
+  # Match the logical dumps, which restore with DROP DATABASE first.
+  IFS=',' read -ra drop_list <<<"${SCHEMAS// /}"
+  for schema in "${drop_list[@]}"; do
+    [ -n "$schema" ] || continue
+    shell --sql -e "DROP DATABASE IF EXISTS \`${schema//\`/}\`;" >/dev/null
+  done
+fi
+
+local_infile="$(shell --sql -e "SELECT @@GLOBAL.local_infile;" 2>/dev/null | tail -n 1 || echo 0)"
+shell --sql -e "SET GLOBAL local_infile = ON;" >/dev/null
+trap '[ "$local_infile" = "1" ] || shell --sql -e "SET GLOBAL local_infile = OFF;" >/dev/null 2>&1 || true' EXIT
+
+log "Loading $(js_list "$SCHEMAS") from $DIR (${THREADS} threads)"
+shell --js -e "util.loadDump('${DIR}', {
+  threads: ${THREADS},
+  includeSchemas: $(js_list "$SCHEMAS"),
+  deferTableIndexes: 'all',
+  resetProgress: true,
+  ignoreVersion: true,
+  loadUsers: false,
+  showProgress: false
+})"
+log "✅ Chunked load complete: $DIR"
@@ -31,6 +31,7 @@ DEST_PROVIDED=false
 EXPLICIT_SELECTION=false
 MYSQL_CONTAINER="${CONTAINER_MYSQL:-ac-mysql}"
 DEFAULT_BACKUP_DIR="${BACKUP_PATH:-${STORAGE_PATH:-./storage}/backups}"
+REPOSITORY_DIR=""
 
 usage(){
   cat <<'EOF'
@@ -46,6 +47,8 @@ Options:
       --world-db NAME       World database schema name
       --db LIST             Comma-separated list of databases to export
       --skip LIST           Comma-separated list of databases to skip
+      --repository [DIR]    Store dumps in the deduplicating chunk repository (default DIR: <output>/repository)
+                            and write acore_<db>.sql.idx indexes instead of .sql.gz files
   -h, --help                Show this help and exit
 
 Supported database identifiers: auth, characters, world.
@@ -60,6 +63,9 @@ Examples:
 
   # Export only world database
   ./backup-export.sh --password azerothcore123 --db world --world-db acore_world
+
+  # Export into the shared chunk repository (restores with backup-import.sh as usual)
+  ./backup-export.sh --password azerothcore123 --db world --world-db acore_world --repository
 EOF
 }
 
@@ -172,6 +178,15 @@ while [[ $# -gt 0 ]]; do
       parse_db_list SKIP_DBS "$2"
       shift 2
       ;;
+    --repository)
+      if [[ $# -ge 2 && "$2" != -* ]]; then
+        REPOSITORY_DIR="$2"
+        shift 2
+      else
+        REPOSITORY_DIR="default"
+        shift
+      fi
+      ;;
     -h|--help)
       usage
       exit 0
@@ -240,6 +255,13 @@ else
   mkdir -p "$DEST_PARENT"
 fi
 
+REPOSITORY_TOOL="$SCRIPT_DIR/../python/backup_repo.py"
+if [[ "$REPOSITORY_DIR" == "default" ]]; then
+  REPOSITORY_DIR="$DEST_PARENT/repository"
+elif [[ -n "$REPOSITORY_DIR" ]]; then
+  REPOSITORY_DIR="$(resolve_relative "$INVOCATION_DIR" "$REPOSITORY_DIR")"
+fi
+
 TIMESTAMP="$(date +%Y%m%d_%H%M%S)"
 DEST_DIR="$(printf '%s/ExportBackup_%s' "$DEST_PARENT" "$TIMESTAMP")"
 mkdir -p "$DEST_DIR"
@@ -248,11 +270,19 @@ generated_at="$(date --iso-8601=seconds)"
 dump_db(){
   local schema="$1" outfile="$2"
   echo "Dumping ${schema} -> ${outfile}"
-  docker exec "$MYSQL_CONTAINER" mysqldump -uroot -p"$MYSQL_PW" "$schema" | gzip > "$outfile"
+  if [[ -n "$REPOSITORY_DIR" ]]; then
+    # Streams straight into the repository; only chunks not already stored are written.
+    docker exec "$MYSQL_CONTAINER" mysqldump -uroot -p"$MYSQL_PW" "$schema" \
+      | python3 "$REPOSITORY_TOOL" put --repo "$REPOSITORY_DIR" --index "$outfile"
+  else
+    docker exec "$MYSQL_CONTAINER" mysqldump -uroot -p"$MYSQL_PW" "$schema" | gzip > "$outfile"
+  fi
 }
 
+dump_ext="sql.gz"
+[[ -n "$REPOSITORY_DIR" ]] && dump_ext="sql.idx"
 for db in "${ACTIVE_DBS[@]}"; do
-  outfile="$DEST_DIR/acore_${db}.sql.gz"
+  outfile="$DEST_DIR/acore_${db}.${dump_ext}"
   dump_db "${DB_NAMES[$db]}" "$outfile"
 done
 
@@ -31,6 +31,10 @@ MYSQL_PW=""
 BACKUP_DIR=""
 BACKUP_PROVIDED=false
 EXPLICIT_SELECTION=false
+RESTORE_JOBS="${RESTORE_JOBS:-}"
+DEFER_INDEXES=false
+MAX_ALLOWED_PACKET="${RESTORE_MAX_ALLOWED_PACKET:-1073741824}"
+PROGRESS_INTERVAL="${RESTORE_PROGRESS_INTERVAL:-15}"
 
 usage(){
   cat <<'EOF'
@@ -47,6 +51,9 @@ Options:
       --db LIST             Comma-separated list of databases to import
       --skip LIST           Comma-separated list of databases to skip
       --all                 Import all supported databases
+  -j, --jobs N              Databases restored concurrently (default: all selected)
+      --defer-indexes       Build secondary indexes after each table's data instead of inline (not for
+                            dumps whose foreign keys reference another table's secondary key)
   -h, --help                Show this help and exit
 
 Supported database identifiers: auth, characters, world.
@@ -185,6 +192,14 @@ find_dump(){
   if ! command -v python3 >/dev/null 2>&1; then
     fatal "python3 is required to locate backup dumps"
   fi
+  # Indexed lookup when the backup root carries a catalog; scan otherwise.
+  local catalog_tool="$SCRIPT_DIR/../python/backup_catalog.py" found
+  if [[ -f "$BACKUP_DIR/catalog.sqlite" && -f "$catalog_tool" ]]; then
+    if found="$(python3 "$catalog_tool" --root "$BACKUP_DIR" find ${hint:+--db "$hint"} --db "acore_${db}" --db "$db" 2>/dev/null)"; then
+      echo "$found"
+      return 0
+    fi
+  fi
   python3 - "$BACKUP_DIR" "$db" "$hint" <<'PY'
 import glob, os, sys
 backup_dir, db, hint = sys.argv[1:4]
@@ -192,12 +207,16 @@ backup_dir, db, hint = sys.argv[1:4]
 # Search patterns for database dumps
 patterns = [
     f"acore_{db}.sql.gz",
+    f"acore_{db}.sql.zst",
+    f"acore_{db}.sql.idx",
     f"acore_{db}.sql",
     f"{db}.sql.gz",
+    f"{db}.sql.zst",
+    f"{db}.sql.idx",
     f"{db}.sql",
 ]
 if hint:
-    patterns = [f"{hint}.sql.gz", f"{hint}.sql"] + patterns
+    patterns = [f"{hint}.sql.gz", f"{hint}.sql.zst", f"{hint}.sql.idx", f"{hint}.sql"] + patterns
 
 # Search locations (in order of preference)
 search_dirs = []
@@ -242,6 +261,14 @@ seen = {}
 matches = []
 
 for search_dir in search_dirs:
+    # Chunked (mysqlsh) sets: one <schema>.json per database under chunked/
+    chunked_dir = os.path.join(search_dir, "chunked")
+    if os.path.isfile(os.path.join(chunked_dir, "@.done.json")):
+        for name in ([hint] if hint else []) + [f"acore_{db}", db]:
+            path = os.path.join(chunked_dir, f"{name}.json")
+            if path not in seen and os.path.isfile(path):
+                seen[path] = True
+                matches.append(path)
     for pattern in patterns:
         for path in glob.glob(os.path.join(search_dir, pattern)):
             if path not in seen and os.path.isfile(path):
@@ -262,11 +289,11 @@ guess_schema_from_dump(){
   local base
   base="$(basename "$dump")"
   case "$base" in
-    acore_auth.sql|acore_auth.sql.gz) echo "acore_auth" ;;
-    acore_characters.sql|acore_characters.sql.gz) echo "acore_characters" ;;
-    acore_world.sql|acore_world.sql.gz) echo "acore_world" ;;
+    acore_auth.sql|acore_auth.sql.gz|acore_auth.sql.zst|acore_auth.sql.idx) echo "acore_auth" ;;
+    acore_characters.sql|acore_characters.sql.gz|acore_characters.sql.zst|acore_characters.sql.idx) echo "acore_characters" ;;
+    acore_world.sql|acore_world.sql.gz|acore_world.sql.zst|acore_world.sql.idx) echo "acore_world" ;;
     *)
-      if [[ "$base" =~ ^([A-Za-z0-9_-]+)\.sql(\.gz)?$ ]]; then
+      if [[ "$base" =~ ^([A-Za-z0-9_-]+)\.(sql(\.gz|\.zst|\.idx)?|json)$ ]]; then
         echo "${BASH_REMATCH[1]}"
       fi
       ;;
@@ -283,14 +310,188 @@ backup_db(){
   docker exec ac-mysql mysqldump -uroot -p"$MYSQL_PW" "$schema" > "$out"
 }
 
-restore(){
+# Map a host path to the same directory inside ac-mysql when it is bind-mounted
+# there (normally BACKUP_PATH -> /backups); prints nothing otherwise.
+container_path(){
+  local host_path="$1" source dest
+  while IFS='|' read -r source dest; do
+    [[ -n "$source" && "$host_path/" == "$source/"* ]] || continue
+    echo "${dest}${host_path#"$source"}"
+    return 0
+  done < <(docker inspect -f '{{range .Mounts}}{{.Source}}|{{.Destination}}{{"\n"}}{{end}}' ac-mysql 2>/dev/null)
+}
+
+restore_chunked(){
   local schema="$1" dump="$2"
+  local dir dumped target
+  dir="$(cd "$(dirname "$dump")" && pwd)"
+  dumped="$(basename "$dump" .json)"
+  [[ "$dumped" == "$schema" ]] || fatal "Chunked dump holds '${dumped}'; it can only be restored into a schema of the same name (not '${schema}')."
+  target="$(container_path "$dir")"
+  if [[ -z "$target" ]]; then
+    target="/tmp/acore-chunked-restore"
+    log "Copying chunked dump into ac-mysql"
+    docker exec ac-mysql rm -rf "$target"
+    docker cp "$dir" "ac-mysql:$target" >/dev/null
+  fi
+  log "Importing ${schema} from chunked dump ${dir}"
+  docker exec -i ac-mysql bash -s -- load --input "$target" --schemas "$schema" \
+    --host localhost --user root --password "$MYSQL_PW" < "$SCRIPT_DIR/backup-chunked.sh"
+  if [[ "$target" == "/tmp/acore-chunked-restore" ]]; then
+    docker exec ac-mysql rm -rf "$target" || true
+  fi
+}
+
+# Bulk-load session settings sent ahead of every dump (mysqldump output sets
+# both as well; other .sql files may not). The restore stays in the binary log
+# so incremental chains and the binlog stream see it.
+RESTORE_SESSION_SQL="SET SESSION unique_checks = 0; SET SESSION foreign_key_checks = 0;"
+
+# --defer-indexes: move secondary KEY/UNIQUE KEY definitions out of each
+# CREATE TABLE and add them with one ALTER TABLE once the table's rows are
+# loaded, so InnoDB builds them by sorting instead of maintaining them row by
+# row. Tables with foreign keys keep their indexes inline (the constraints
+# depend on them), and so does a key leading with the AUTO_INCREMENT column
+# when the primary key does not (MySQL requires one).
+DEFER_INDEX_AWK='
+function flush_deferred() {
+  if (pending_table != "" && pending_keys != "")
+    print "ALTER TABLE `" pending_table "` " pending_keys ";"
+  pending_table = ""; pending_keys = ""
+}
+function first_column(line) {
+  if (!match(line, /\(`[^`]+`/)) return ""
+  return substr(line, RSTART + 2, RLENGTH - 3)
+}
+function emit_create(   i, has_fk, auto_col, keys, kept, last, line) {
+  has_fk = 0; auto_col = ""
+  for (i = 1; i <= n; i++) {
+    if (buf[i] ~ /^  CONSTRAINT /) has_fk = 1
+    if (buf[i] ~ /^  `[^`]+` .* AUTO_INCREMENT/) { match(buf[i], /`[^`]+`/); auto_col = substr(buf[i], RSTART + 1, RLENGTH - 2) }
+  }
+  for (i = 1; i <= n; i++)
+    if (buf[i] ~ /^  PRIMARY KEY / && first_column(buf[i]) == auto_col) auto_col = ""
+  keys = ""; kept = 0
+  for (i = 1; i <= n; i++) {
+    line = buf[i]
+    if (!has_fk && i > 1 && i < n && line ~ /^  (UNIQUE )?KEY `/ && (auto_col == "" || first_column(line) != auto_col)) {
+      sub(/,$/, "", line)
+      keys = keys (keys == "" ? "" : ", ") "ADD " substr(line, 3)
+      continue
+    }
+    out[++kept] = line
+  }
+  if (keys != "" && kept >= 2) sub(/,$/, "", out[kept - 1])
+  for (i = 1; i <= kept; i++) print out[i]
+  pending_table = table; pending_keys = keys
+}
+in_create {
+  buf[++n] = $0
+  if ($0 ~ /^\)/) { emit_create(); in_create = 0 }
+  next
+}
+/^CREATE TABLE `/ {
+  flush_deferred()
+  in_create = 1; n = 0; buf[++n] = $0
+  match($0, /`[^`]+`/); table = substr($0, RSTART + 1, RLENGTH - 2)
+  if ($0 ~ /;[[:space:]]*$/) { emit_create(); in_create = 0 }
+  next
+}
+/^UNLOCK TABLES;/ { print; flush_deferred(); next }
+/^-- (Table structure|Dump completed|Temporary view|Final view)/ { flush_deferred() }
+{ print }
+END { flush_deferred() }'
+
+index_filter(){
+  if $DEFER_INDEXES; then
+    awk "$DEFER_INDEX_AWK"
+  else
+    cat
+  fi
+}
+
+# Dumps taken with --databases carry their own USE/CREATE DATABASE; when the
+# target schema differs from the one in the dump, rename it on the way through
+# instead of letting the dump load into its original schema.
+schema_filter(){
+  local source="$1" target="$2"
+  if [[ -n "$source" && "$source" != "$target" ]]; then
+    python3 "$SCRIPT_DIR/../python/sql_rename.py" --map "$source=$target" -
+  else
+    cat
+  fi
+}
+
+# Decompress $1 into the client. Reads through fd $2 (opened on the dump by
+# the caller) so the read offset can be watched for progress.
+restore(){
+  local schema="$1" dump="$2" fd="${3:-}"
+  if [[ "$dump" == */chunked/*.json ]]; then
+    restore_chunked "$schema" "$dump"
+    return
+  fi
+  if [[ -z "$fd" ]]; then
+    exec {fd}<"$dump"
+  fi
   log "Importing ${dump##*/} into ${schema}"
-  case "$dump" in
-    *.gz) gzip -dc "$dump" ;;
-    *.sql) cat "$dump" ;;
-    *) fatal "Unsupported dump format: $dump" ;;
-  esac | docker exec -i ac-mysql mysql -uroot -p"$MYSQL_PW" "$schema"
+  {
+    printf '%s\n' "$RESTORE_SESSION_SQL"
+    case "$dump" in
+      *.gz) gzip -dc <&"$fd" ;;
+      *.zst) zstd -dc <&"$fd" ;;
+      *.idx) python3 "$SCRIPT_DIR/../python/backup_repo.py" cat "$dump" ;;
+      *.sql) cat <&"$fd" ;;
+      *) fatal "Unsupported dump format: $dump" ;;
+    esac
+  } | schema_filter "$(guess_schema_from_dump "$dump")" "$schema" \
+    | index_filter \
+    | docker exec -i ac-mysql mysql --max-allowed-packet="$MAX_ALLOWED_PACKET" -uroot -p"$MYSQL_PW" "$schema"
+}
+
+human_mb(){ awk -v b="$1" 'BEGIN { printf "%.1f", b / 1048576 }'; }
+
+# Report how far the restore of $1 has read through its dump (fd $3 of pid $2).
+watch_progress(){
+  local label="$1" pid="$2" fd="$3" total="$4" start pos elapsed rate eta
+  start=$(date +%s)
+  while sleep "$PROGRESS_INTERVAL"; do
+    pos=$(awk '/^pos:/ {print $2}' "/proc/$pid/fdinfo/$fd" 2>/dev/null) || break
+    [[ -n "$pos" && "$total" -gt 0 ]] || break
+    elapsed=$(( $(date +%s) - start ))
+    [[ "$elapsed" -gt 0 && "$pos" -gt 0 ]] || continue
+    rate=$(( pos / elapsed ))
+    eta=$(( rate > 0 ? (total - pos) / rate : 0 ))
+    log "  ${label}: $(( pos * 100 / total ))% ($(human_mb "$pos")/$(human_mb "$total") MB read, $(human_mb "$rate") MB/s, ETA ${eta}s)"
+  done
+}
+
+# Worker: safety backup, then restore one database with progress and throughput.
+restore_worker(){
+  local db="$1" schema="${DB_NAMES[$1]}" dump="${DUMP_PATHS[$1]}"
+  local start fd="" monitor="" total=0 elapsed
+  backup_db "$schema" "$db"
+  start=$(date +%s)
+  if [[ "$dump" != */chunked/*.json ]]; then
+    exec {fd}<"$dump"
+    total=$(stat -c %s "$dump" 2>/dev/null || echo 0)
+    if [[ "$dump" != *.idx && -r "/proc/$BASHPID/fdinfo/$fd" ]]; then
+      watch_progress "$db" "$BASHPID" "$fd" "$total" &
+      monitor=$!
+    fi
+  fi
+  local rc=0
+  restore "$schema" "$dump" "$fd" || rc=$?
+  [[ -n "$monitor" ]] && kill "$monitor" 2>/dev/null || true
+  elapsed=$(( $(date +%s) - start ))
+  if [[ "$rc" -ne 0 ]]; then
+    err "  ${db}: restore failed after ${elapsed}s"
+    return "$rc"
+  fi
+  if [[ "$total" -gt 0 ]]; then
+    log "  ${db}: restored $(human_mb "$total") MB of ${dump##*.} in ${elapsed}s ($(human_mb $(( total / (elapsed > 0 ? elapsed : 1) ))) MB/s)"
+  else
+    log "  ${db}: restored in ${elapsed}s"
+  fi
 }
 
 db_selected(){
@@ -349,6 +550,15 @@ while [[ $# -gt 0 ]]; do
       parse_db_list SKIP_DBS "$2"
       shift 2
       ;;
+    -j|--jobs)
+      [[ $# -ge 2 ]] || fatal "--jobs requires a value"
+      RESTORE_JOBS="$2"
+      shift 2
+      ;;
+    --defer-indexes)
+      DEFER_INDEXES=true
+      shift
+      ;;
     --all)
       EXPLICIT_SELECTION=true
       for db in "${SUPPORTED_DBS[@]}"; do
@@ -429,11 +639,39 @@ done
 log "Stopping world/auth services"
 docker stop ac-worldserver ac-authserver >/dev/null || warn "Services already stopped"
 
+[[ "$RESTORE_JOBS" =~ ^[1-9][0-9]*$ ]] || RESTORE_JOBS="${#ACTIVE_DBS[@]}"
+# Large rows in extended INSERTs need the server-side limit raised too; it
+# applies to connections opened after this, i.e. the restore sessions below.
+OLD_MAX_PACKET="$(count_rows "SELECT @@GLOBAL.max_allowed_packet;" 2>/dev/null || true)"
+if [[ "$OLD_MAX_PACKET" =~ ^[0-9]+$ && "$OLD_MAX_PACKET" -lt "$MAX_ALLOWED_PACKET" ]]; then
+  count_rows "SET GLOBAL max_allowed_packet = ${MAX_ALLOWED_PACKET};" >/dev/null 2>&1 \
+    || warn "Could not raise max_allowed_packet; continuing with ${OLD_MAX_PACKET}"
+else
+  OLD_MAX_PACKET=""
+fi
+
+log "Restoring ${#ACTIVE_DBS[@]} database(s), ${RESTORE_JOBS} at a time"
+declare -A WORKER_PIDS=()
+running=0
+for db in "${ACTIVE_DBS[@]}"; do
+  if [[ "$running" -ge "$RESTORE_JOBS" ]]; then
+    wait -n || true
+    running=$((running - 1))
+  fi
+  restore_worker "$db" &
+  WORKER_PIDS["$db"]=$!
+  running=$((running + 1))
+done
+declare -a FAILED_DBS=()
 for db in "${ACTIVE_DBS[@]}"; do
-  backup_db "${DB_NAMES[$db]}" "$db"
-  restore "${DB_NAMES[$db]}" "${DUMP_PATHS[$db]}"
+  wait "${WORKER_PIDS[$db]}" || FAILED_DBS+=("$db")
 done
 
+if [[ -n "$OLD_MAX_PACKET" ]]; then
+  count_rows "SET GLOBAL max_allowed_packet = ${OLD_MAX_PACKET};" >/dev/null 2>&1 || true
+fi
+((${#FAILED_DBS[@]} == 0)) || fatal "Restore failed for: ${FAILED_DBS[*]} (pre-import copies are in manual-backups/)"
+
 log "Module SQL patches will be applied when services restart"
 
 log "Restarting services to reinitialize GUID generators"
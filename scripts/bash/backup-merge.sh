@@ -167,14 +167,19 @@ mysql_query(){
   docker exec ac-mysql mysql -uroot -p"$MYSQL_PW" -N -B "$db" -e "$query" 2>/dev/null
 }
 
+# Quote stdin lines as a SQL VALUES list: ('a'),('b')
+sql_values(){
+  sed -e "s/[\\\\']/\\\\&/g" -e "s/.*/('&')/" | paste -sd, -
+}
+
 # Extract SQL dumps
-log "Extracting backup files..."
+log "Locating backup files..."
 
 AUTH_DUMP=""
 CHARACTERS_DUMP=""
 
 # Find auth dump
-for pattern in "acore_auth.sql.gz" "auth.sql.gz" "acore_auth.sql" "auth.sql"; do
+for pattern in "acore_auth.sql.gz" "acore_auth.sql.zst" "acore_auth.sql.idx" "auth.sql.gz" "acore_auth.sql" "auth.sql"; do
   if [[ -f "$BACKUP_DIR/$pattern" ]]; then
     AUTH_DUMP="$BACKUP_DIR/$pattern"
     break
@@ -182,7 +187,7 @@ for pattern in "acore_auth.sql.gz" "auth.sql.gz" "acore_auth.sql" "auth.sql"; do
 done
 
 # Find characters dump
-for pattern in "acore_characters.sql.gz" "characters.sql.gz" "acore_characters.sql" "characters.sql"; do
+for pattern in "acore_characters.sql.gz" "acore_characters.sql.zst" "acore_characters.sql.idx" "characters.sql.gz" "acore_characters.sql" "characters.sql"; do
   if [[ -f "$BACKUP_DIR/$pattern" ]]; then
     CHARACTERS_DUMP="$BACKUP_DIR/$pattern"
     break
@@ -195,20 +200,6 @@ done
 log "Found auth dump: ${AUTH_DUMP##*/}"
 log "Found characters dump: ${CHARACTERS_DUMP##*/}"
 
-# Extract dumps to temp files
-info "Decompressing backup files..."
-if [[ "$AUTH_DUMP" == *.gz ]]; then
-  zcat "$AUTH_DUMP" > "$TEMP_DIR/auth.sql"
-else
-  cp "$AUTH_DUMP" "$TEMP_DIR/auth.sql"
-fi
-
-if [[ "$CHARACTERS_DUMP" == *.gz ]]; then
-  zcat "$CHARACTERS_DUMP" > "$TEMP_DIR/characters.sql"
-else
-  cp "$CHARACTERS_DUMP" "$TEMP_DIR/characters.sql"
-fi
-
 # Load backup data into temp database
 log "Creating temporary staging database..."
 
@@ -236,12 +227,21 @@ trap 'cleanup_staging; rm -rf "$TEMP_DIR"' EXIT
 
 info "Loading backup into staging database..."
 
-# Modify SQL to use staging database names
-sed "s/\`acore_auth\`/\`$STAGE_AUTH_DB\`/g; s/USE \`acore_auth\`;/USE \`$STAGE_AUTH_DB\`;/g" "$TEMP_DIR/auth.sql" | \
-  docker exec -i ac-mysql mysql -uroot -p"$MYSQL_PW" 2>/dev/null
+# Stream each dump straight into its staging database, renaming the schemas
+# the dump itself selects or creates (USE, CREATE DATABASE) and their
+# qualified references. A dump without them loads into the stage as is.
+load_staging(){
+  local dump="$1" stage="$2" name
+  local -a maps=()
+  while IFS= read -r name; do
+    [[ -n "$name" ]] && maps+=(--map "$name=$stage")
+  done < <(python3 "$SCRIPT_DIR/../python/sql_rename.py" --schemas "$dump")
+  python3 "$SCRIPT_DIR/../python/sql_rename.py" ${maps[@]+"${maps[@]}"} "$dump" | \
+    docker exec -i ac-mysql mysql -uroot -p"$MYSQL_PW" "$stage" 2>/dev/null
+}
 
-sed "s/\`acore_characters\`/\`$STAGE_CHARS_DB\`/g; s/USE \`acore_characters\`;/USE \`$STAGE_CHARS_DB\`;/g" "$TEMP_DIR/characters.sql" | \
-  docker exec -i ac-mysql mysql -uroot -p"$MYSQL_PW" 2>/dev/null
+load_staging "$AUTH_DUMP" "$STAGE_AUTH_DB"
+load_staging "$CHARACTERS_DUMP" "$STAGE_CHARS_DB"
 
 log "Backup loaded into staging databases"
 
@@ -270,97 +270,110 @@ info "Backup contains:"
 info "  Accounts: $BACKUP_ACCOUNT_COUNT"
 info "  Characters: $BACKUP_CHAR_COUNT"
 
-# Build list of accounts to import
+# Build the import selection. Everything below works on sets inside MySQL:
+# selected rows live in merge_accounts / merge_characters in the staging
+# databases and every later step joins against them, so the number of
+# round trips does not grow with the number of accounts or characters.
 info ""
 info "Building import list..."
 
+BOT_ACCOUNT_FILTER="a.username NOT LIKE 'RNDBOT%' AND a.username NOT LIKE 'bot%' AND a.username NOT LIKE 'BOT%'"
+
+mysql_exec "$STAGE_AUTH_DB" <<EOF
+CREATE TABLE merge_accounts (id INT UNSIGNED PRIMARY KEY);
+CREATE TABLE merge_account_names AS SELECT username FROM account WHERE 1 = 0;
+EOF
+mysql_exec "$STAGE_CHARS_DB" <<EOF
+CREATE TABLE merge_characters (guid INT UNSIGNED PRIMARY KEY);
+CREATE TABLE merge_character_names AS SELECT name FROM characters WHERE 1 = 0;
+EOF
+
 if $IMPORT_ALL_ACCOUNTS; then
   if $EXCLUDE_BOTS; then
     # Exclude bot accounts (RNDBOT%, bot%, etc.)
-    mysql_query "$STAGE_AUTH_DB" "
-      SELECT username FROM account
-      WHERE username NOT LIKE 'RNDBOT%'
-        AND username NOT LIKE 'bot%'
-        AND username NOT LIKE 'BOT%'
-    " > "$TEMP_DIR/accounts_to_import.txt"
+    mysql_query "$STAGE_AUTH_DB" "INSERT INTO merge_accounts SELECT a.id FROM account a WHERE $BOT_ACCOUNT_FILTER;"
   else
-    mysql_query "$STAGE_AUTH_DB" "SELECT username FROM account;" > "$TEMP_DIR/accounts_to_import.txt"
+    mysql_query "$STAGE_AUTH_DB" "INSERT INTO merge_accounts SELECT id FROM account;"
   fi
-else
-  > "$TEMP_DIR/accounts_to_import.txt"
-  for username in "${IMPORT_ACCOUNTS[@]}"; do
-    echo "$username" >> "$TEMP_DIR/accounts_to_import.txt"
-  done
+elif [[ ${#IMPORT_ACCOUNTS[@]} -gt 0 ]]; then
+  mysql_exec "$STAGE_AUTH_DB" <<EOF
+INSERT INTO merge_account_names (username) VALUES $(printf '%s\n' "${IMPORT_ACCOUNTS[@]}" | sql_values);
+INSERT IGNORE INTO merge_accounts SELECT a.id FROM account a INNER JOIN merge_account_names n ON n.username = a.username;
+EOF
 fi
 
-# Build list of characters to import
 if $IMPORT_ALL_CHARACTERS; then
   if $EXCLUDE_BOTS; then
     # Check if playerbots DB exists in backup
-    PLAYERBOTS_DB_EXISTS=$(docker exec ac-mysql mysql -uroot -p"$MYSQL_PW" -e "SHOW DATABASES LIKE 'merge_stage_playerbots_%';" 2>/dev/null | wc -l)
+    STAGE_PLAYERBOTS_DB=$(docker exec ac-mysql mysql -uroot -p"$MYSQL_PW" -N -B -e "SHOW DATABASES LIKE 'merge_stage_playerbots_%';" 2>/dev/null | tail -1)
 
-    if [[ $PLAYERBOTS_DB_EXISTS -gt 1 ]]; then
+    if [[ -n "$STAGE_PLAYERBOTS_DB" ]]; then
       # Exclude characters linked to playerbots_random_bots table
-      STAGE_PLAYERBOTS_DB=$(docker exec ac-mysql mysql -uroot -p"$MYSQL_PW" -e "SHOW DATABASES LIKE 'merge_stage_playerbots_%';" 2>/dev/null | tail -1)
       mysql_query "$STAGE_CHARS_DB" "
-        SELECT c.name
+        INSERT INTO merge_characters
+        SELECT c.guid
         FROM characters c
-        INNER JOIN account a ON c.account = a.id
+        INNER JOIN $STAGE_AUTH_DB.account a ON c.account = a.id
         LEFT JOIN $STAGE_PLAYERBOTS_DB.playerbots_random_bots pb ON c.guid = pb.bot
-        WHERE pb.bot IS NULL
-          AND a.username NOT LIKE 'RNDBOT%'
-          AND a.username NOT LIKE 'bot%'
-          AND a.username NOT LIKE 'BOT%'
-      " > "$TEMP_DIR/characters_to_import.txt" 2>/dev/null || {
+        WHERE pb.bot IS NULL AND $BOT_ACCOUNT_FILTER
+      " || {
         # Fallback if playerbots DB structure is different
         mysql_query "$STAGE_CHARS_DB" "
-          SELECT c.name
+          INSERT IGNORE INTO merge_characters
+          SELECT c.guid
           FROM characters c
           INNER JOIN $STAGE_AUTH_DB.account a ON c.account = a.id
-          WHERE a.username NOT LIKE 'RNDBOT%'
-            AND a.username NOT LIKE 'bot%'
-            AND a.username NOT LIKE 'BOT%'
-        " > "$TEMP_DIR/characters_to_import.txt"
+          WHERE $BOT_ACCOUNT_FILTER
+        "
       }
     else
       # No playerbots DB, just exclude characters from bot accounts
       mysql_query "$STAGE_CHARS_DB" "
-        SELECT c.name
+        INSERT INTO merge_characters
+        SELECT c.guid
         FROM characters c
         INNER JOIN $STAGE_AUTH_DB.account a ON c.account = a.id
-        WHERE a.username NOT LIKE 'RNDBOT%'
-          AND a.username NOT LIKE 'bot%'
-          AND a.username NOT LIKE 'BOT%'
-      " > "$TEMP_DIR/characters_to_import.txt"
+        WHERE $BOT_ACCOUNT_FILTER
+      "
     fi
   else
-    mysql_query "$STAGE_CHARS_DB" "SELECT name FROM characters;" > "$TEMP_DIR/characters_to_import.txt"
+    mysql_query "$STAGE_CHARS_DB" "INSERT INTO merge_characters SELECT guid FROM characters;"
   fi
-else
-  > "$TEMP_DIR/characters_to_import.txt"
-  for charname in "${IMPORT_CHARACTERS[@]}"; do
-    echo "$charname" >> "$TEMP_DIR/characters_to_import.txt"
-  done
+elif [[ ${#IMPORT_CHARACTERS[@]} -gt 0 ]]; then
+  mysql_exec "$STAGE_CHARS_DB" <<EOF
+INSERT INTO merge_character_names (name) VALUES $(printf '%s\n' "${IMPORT_CHARACTERS[@]}" | sql_values);
+INSERT IGNORE INTO merge_characters SELECT c.guid FROM characters c INNER JOIN merge_character_names n ON n.name = c.name;
+EOF
 fi
 
 # If importing specific characters, also import their accounts
-if [[ -s "$TEMP_DIR/characters_to_import.txt" ]] && ! $IMPORT_ALL_ACCOUNTS; then
-  while IFS= read -r charname; do
-    account_id=$(mysql_query "$STAGE_CHARS_DB" "SELECT account FROM characters WHERE name='$charname';" || echo "")
-    if [[ -n "$account_id" ]]; then
-      username=$(mysql_query "$STAGE_AUTH_DB" "SELECT username FROM account WHERE id=$account_id;" || echo "")
-      if [[ -n "$username" ]]; then
-        echo "$username" >> "$TEMP_DIR/accounts_to_import.txt"
-      fi
-    fi
-  done < "$TEMP_DIR/characters_to_import.txt"
+if ! $IMPORT_ALL_ACCOUNTS; then
+  mysql_query "$STAGE_AUTH_DB" "
+    INSERT IGNORE INTO merge_accounts
+    SELECT a.id
+    FROM $STAGE_CHARS_DB.merge_characters s
+    INNER JOIN $STAGE_CHARS_DB.characters c ON c.guid = s.guid
+    INNER JOIN account a ON a.id = c.account
+  "
+fi
 
-  # Remove duplicates
-  sort -u "$TEMP_DIR/accounts_to_import.txt" -o "$TEMP_DIR/accounts_to_import.txt"
+# Names given on the command line that the backup does not contain
+MISSING_NAMES=$(mysql_query "$STAGE_AUTH_DB" "
+  SELECT CONCAT('account ', n.username) FROM merge_account_names n
+  LEFT JOIN account a ON a.username = n.username WHERE a.id IS NULL
+  UNION ALL
+  SELECT CONCAT('character ', n.name) FROM $STAGE_CHARS_DB.merge_character_names n
+  LEFT JOIN $STAGE_CHARS_DB.characters c ON c.name = n.name WHERE c.guid IS NULL
+" || true)
+if [[ -n "$MISSING_NAMES" ]]; then
+  warn "Not found in backup:"
+  while IFS= read -r line; do
+    warn "  - $line"
+  done <<< "$MISSING_NAMES"
 fi
 
-ACCOUNTS_TO_IMPORT=$(wc -l < "$TEMP_DIR/accounts_to_import.txt" | tr -d ' ')
-CHARACTERS_TO_IMPORT=$(wc -l < "$TEMP_DIR/characters_to_import.txt" | tr -d ' ')
+ACCOUNTS_TO_IMPORT=$(mysql_query "$STAGE_AUTH_DB" "SELECT COUNT(*) FROM merge_accounts;")
+CHARACTERS_TO_IMPORT=$(mysql_query "$STAGE_CHARS_DB" "SELECT COUNT(*) FROM merge_characters;")
 
 if $EXCLUDE_BOTS; then
   BOT_ACCOUNTS_EXCLUDED=$((BACKUP_ACCOUNT_COUNT - ACCOUNTS_TO_IMPORT))
@@ -379,32 +392,28 @@ if [[ $ACCOUNTS_TO_IMPORT -eq 0 ]] && [[ $CHARACTERS_TO_IMPORT -eq 0 ]]; then
   fatal "No accounts or characters selected for import"
 fi
 
-# Conflict detection
+# Conflict detection: one join per table against the live databases
 info ""
 info "Checking for conflicts..."
 
-ACCOUNT_CONFLICTS=0
-CHARACTER_CONFLICTS=0
-
-# Check account username conflicts
-> "$TEMP_DIR/account_conflicts.txt"
-while IFS= read -r username; do
-  existing=$(mysql_query "$AUTH_DB" "SELECT COUNT(*) FROM account WHERE username='$username';" || echo "0")
-  if [[ "$existing" != "0" ]]; then
-    echo "$username" >> "$TEMP_DIR/account_conflicts.txt"
-    ((ACCOUNT_CONFLICTS++)) || true
-  fi
-done < "$TEMP_DIR/accounts_to_import.txt"
-
-# Check character name conflicts
-> "$TEMP_DIR/character_conflicts.txt"
-while IFS= read -r charname; do
-  existing=$(mysql_query "$CHARACTERS_DB" "SELECT COUNT(*) FROM characters WHERE name='$charname';" || echo "0")
-  if [[ "$existing" != "0" ]]; then
-    echo "$charname" >> "$TEMP_DIR/character_conflicts.txt"
-    ((CHARACTER_CONFLICTS++)) || true
-  fi
-done < "$TEMP_DIR/characters_to_import.txt"
+mysql_query "$STAGE_AUTH_DB" "
+  SELECT a.username
+  FROM merge_accounts s
+  INNER JOIN account a ON a.id = s.id
+  INNER JOIN $AUTH_DB.account live ON live.username = a.username
+  ORDER BY a.username
+" > "$TEMP_DIR/account_conflicts.txt"
+
+mysql_query "$STAGE_CHARS_DB" "
+  SELECT c.name
+  FROM merge_characters s
+  INNER JOIN characters c ON c.guid = s.guid
+  INNER JOIN $CHARACTERS_DB.characters live ON live.name = c.name
+  ORDER BY c.name
+" > "$TEMP_DIR/character_conflicts.txt"
+
+ACCOUNT_CONFLICTS=$(wc -l < "$TEMP_DIR/account_conflicts.txt" | tr -d ' ')
+CHARACTER_CONFLICTS=$(wc -l < "$TEMP_DIR/character_conflicts.txt" | tr -d ' ')
 
 if [[ $ACCOUNT_CONFLICTS -gt 0 ]] || [[ $CHARACTER_CONFLICTS -gt 0 ]]; then
   warn "Found conflicts:"
@@ -423,18 +432,19 @@ if [[ $ACCOUNT_CONFLICTS -gt 0 ]] || [[ $CHARACTER_CONFLICTS -gt 0 ]]; then
 
   if $SKIP_CONFLICTS; then
     warn "Skipping conflicting entries (--skip-conflicts enabled)"
-    # Remove conflicts from import lists
-    if [[ -s "$TEMP_DIR/account_conflicts.txt" ]]; then
-      grep -vxF -f "$TEMP_DIR/account_conflicts.txt" "$TEMP_DIR/accounts_to_import.txt" > "$TEMP_DIR/accounts_to_import_filtered.txt" || true
-      mv "$TEMP_DIR/accounts_to_import_filtered.txt" "$TEMP_DIR/accounts_to_import.txt"
-    fi
-    if [[ -s "$TEMP_DIR/character_conflicts.txt" ]]; then
-      grep -vxF -f "$TEMP_DIR/character_conflicts.txt" "$TEMP_DIR/characters_to_import.txt" > "$TEMP_DIR/characters_to_import_filtered.txt" || true
-      mv "$TEMP_DIR/characters_to_import_filtered.txt" "$TEMP_DIR/characters_to_import.txt"
-    fi
+    # Remove conflicts from the selection
+    mysql_exec "$STAGE_AUTH_DB" <<EOF
+DELETE s FROM merge_accounts s
+INNER JOIN account a ON a.id = s.id
+INNER JOIN $AUTH_DB.account live ON live.username = a.username;
+
+DELETE s FROM $STAGE_CHARS_DB.merge_characters s
+INNER JOIN $STAGE_CHARS_DB.characters c ON c.guid = s.guid
+INNER JOIN $CHARACTERS_DB.characters live ON live.name = c.name;
+EOF
 
-    ACCOUNTS_TO_IMPORT=$(wc -l < "$TEMP_DIR/accounts_to_import.txt" | tr -d ' ')
-    CHARACTERS_TO_IMPORT=$(wc -l < "$TEMP_DIR/characters_to_import.txt" | tr -d ' ')
+    ACCOUNTS_TO_IMPORT=$(mysql_query "$STAGE_AUTH_DB" "SELECT COUNT(*) FROM merge_accounts;")
+    CHARACTERS_TO_IMPORT=$(mysql_query "$STAGE_CHARS_DB" "SELECT COUNT(*) FROM merge_characters;")
 
     if [[ $ACCOUNTS_TO_IMPORT -eq 0 ]] && [[ $CHARACTERS_TO_IMPORT -eq 0 ]]; then
       warn "All entries had conflicts. Nothing to import."
@@ -463,29 +473,22 @@ info "  Account ID offset: +$ACCOUNT_OFFSET"
 info "  Character GUID offset: +$CHAR_OFFSET"
 info "  Item GUID offset: +$ITEM_OFFSET"
 
-# Generate mapping tables
+# Generate all three mapping tables in one session
 info ""
 info "Generating ID mapping tables..."
 
-# Account ID mapping
-mysql_exec "$STAGE_AUTH_DB" <<EOF
-CREATE TABLE IF NOT EXISTS account_id_map (
+mysql_exec "$STAGE_CHARS_DB" <<EOF
+CREATE TABLE IF NOT EXISTS $STAGE_AUTH_DB.account_id_map (
   old_id INT UNSIGNED PRIMARY KEY,
   new_id INT UNSIGNED,
   username VARCHAR(32)
 );
 
-INSERT INTO account_id_map (old_id, new_id, username)
-SELECT
-  id,
-  id + $ACCOUNT_OFFSET,
-  username
-FROM account
-WHERE username IN ($(printf "'%s'," $(cat "$TEMP_DIR/accounts_to_import.txt") | sed 's/,$//'));
-EOF
+INSERT INTO $STAGE_AUTH_DB.account_id_map (old_id, new_id, username)
+SELECT a.id, a.id + $ACCOUNT_OFFSET, a.username
+FROM $STAGE_AUTH_DB.account a
+INNER JOIN $STAGE_AUTH_DB.merge_accounts s ON s.id = a.id;
 
-# Character GUID mapping
-mysql_exec "$STAGE_CHARS_DB" <<EOF
 CREATE TABLE IF NOT EXISTS character_guid_map (
   old_guid INT UNSIGNED PRIMARY KEY,
   new_guid INT UNSIGNED,
@@ -494,17 +497,10 @@ CREATE TABLE IF NOT EXISTS character_guid_map (
 );
 
 INSERT INTO character_guid_map (old_guid, new_guid, name, account)
-SELECT
-  guid,
-  guid + $CHAR_OFFSET,
-  name,
-  account
-FROM characters
-WHERE name IN ($(printf "'%s'," $(cat "$TEMP_DIR/characters_to_import.txt") | sed 's/,$//'));
-EOF
+SELECT c.guid, c.guid + $CHAR_OFFSET, c.name, c.account
+FROM characters c
+INNER JOIN merge_characters s ON s.guid = c.guid;
 
-# Item GUID mapping
-mysql_exec "$STAGE_CHARS_DB" <<EOF
 CREATE TABLE IF NOT EXISTS item_guid_map (
   old_guid INT UNSIGNED PRIMARY KEY,
   new_guid INT UNSIGNED,
@@ -512,10 +508,7 @@ CREATE TABLE IF NOT EXISTS item_guid_map (
 );
 
 INSERT INTO item_guid_map (old_guid, new_guid, owner_guid)
-SELECT
-  i.guid,
-  i.guid + $ITEM_OFFSET,
-  i.owner_guid
+SELECT i.guid, i.guid + $ITEM_OFFSET, i.owner_guid
 FROM item_instance i
 INNER JOIN character_guid_map cm ON i.owner_guid = cm.old_guid;
 EOF
@@ -528,63 +521,39 @@ ITEM_MAP_COUNT=$(mysql_query "$STAGE_CHARS_DB" "SELECT COUNT(*) FROM item_guid_m
 info "  Character mappings created: $CHAR_MAP_COUNT"
 info "  Item mappings created: $ITEM_MAP_COUNT"
 
-# Summary
-info ""
-info "═══════════════════════════════════════════════════════════"
-info "  IMPORT SUMMARY"
-info "═══════════════════════════════════════════════════════════"
-
-mysql_query "$STAGE_AUTH_DB" "SELECT CONCAT('  ', username, ' (account id: ', old_id, ' → ', new_id, ')') FROM account_id_map;" | while read -r line; do
-  info "$line"
-done
-
-if [[ $CHARACTERS_TO_IMPORT -gt 0 ]]; then
-  info ""
-  info "Characters to import:"
-  mysql_query "$STAGE_CHARS_DB" "SELECT CONCAT('  ', name, ' (guid: ', old_guid, ' → ', new_guid, ', account: ', account, ')') FROM character_guid_map;" | while read -r line; do
-    info "$line"
-  done
-fi
-
-if $DRY_RUN; then
-  warn ""
-  warn "═══════════════════════════════════════════════════════════"
-  warn "  DRY RUN MODE - No changes will be made"
-  warn "═══════════════════════════════════════════════════════════"
-  log ""
-  log "Review complete. Remove --dry-run to perform the actual import."
-  exit 0
-fi
-
-# Confirmation prompt
-if ! $AUTO_CONFIRM; then
-  info ""
-  read -p "Proceed with import? [y/N]: " -n 1 -r
-  echo
-  if [[ ! $REPLY =~ ^[Yy]$ ]]; then
-    warn "Import cancelled"
-    exit 0
+# Import plan: every step is a single INSERT ... SELECT joined to the mapping
+# tables. The FROM/JOIN clause is kept separately so the same step can be
+# counted for the dry-run report.
+declare -A HAVE_TABLE=()
+while IFS=$'\t' read -r schema table; do
+  HAVE_TABLE["$schema.$table"]=1
+done < <(mysql_query information_schema "
+  SELECT TABLE_SCHEMA, TABLE_NAME FROM TABLES
+  WHERE TABLE_SCHEMA IN ('$AUTH_DB', '$CHARACTERS_DB', '$STAGE_AUTH_DB', '$STAGE_CHARS_DB')
+")
+
+PLAN_DB=()
+PLAN_TABLE=()
+PLAN_FROM=()
+PLAN_SQL=()
+
+# plan_step TARGET_DB STAGE_DB TABLE "INSERT ... SELECT ..." "FROM ..." [suffix]
+plan_step(){
+  local target="$1" stage="$2" table="$3" insert="$4" from="$5" suffix="${6:-}"
+  if [[ -z "${HAVE_TABLE[$stage.$table]:-}" ]] || [[ -z "${HAVE_TABLE[$target.$table]:-}" ]]; then
+    return 0
   fi
-fi
-
-# Import phase
-log ""
-log "═══════════════════════════════════════════════════════════"
-log "  IMPORT PHASE"
-log "═══════════════════════════════════════════════════════════"
-
-log "Stopping world/auth services..."
-docker stop ac-worldserver ac-authserver >/dev/null 2>&1 || warn "Services already stopped"
+  PLAN_DB+=("$target")
+  PLAN_TABLE+=("$table")
+  PLAN_FROM+=("$from")
+  PLAN_SQL+=("$insert $from $suffix")
+}
 
-log "Starting import..."
+ACCOUNT_MAP="$STAGE_AUTH_DB.account_id_map"
+CHAR_MAP="$STAGE_CHARS_DB.character_guid_map"
+ITEM_MAP="$STAGE_CHARS_DB.item_guid_map"
 
-# Import accounts
-if [[ $ACCOUNTS_TO_IMPORT -gt 0 ]]; then
-  log "Importing $ACCOUNTS_TO_IMPORT account(s)..."
-
-  # Import main account table
-  info "  Importing main account table..."
-  ACCOUNT_SQL=$(cat <<EOSQL
+plan_step "$AUTH_DB" "$STAGE_AUTH_DB" account "$(cat <<EOSQL
 INSERT INTO account (id, username, salt, verifier, session_key, totp_secret, email, reg_mail,
                      joindate, last_ip, last_attempt_ip, failed_logins, locked, lock_country,
                      last_login, online, expansion, Flags, mutetime, mutereason, muteby, locale,
@@ -615,129 +584,40 @@ SELECT
   a.os,
   a.recruiter,
   a.totaltime
-FROM $STAGE_AUTH_DB.account a
-INNER JOIN $STAGE_AUTH_DB.account_id_map m ON a.id = m.old_id;
-EOSQL
-)
-  ACCOUNT_SQL_EXPANDED=$(echo "$ACCOUNT_SQL" | sed "s/STAGE_AUTH_DB/$STAGE_AUTH_DB/g")
-  ACCOUNT_RESULT=$(echo "$ACCOUNT_SQL_EXPANDED" | docker exec -i ac-mysql mysql -uroot -p"$MYSQL_PW" "$AUTH_DB" 2>&1 || true)
-  if echo "$ACCOUNT_RESULT" | grep -q "ERROR"; then
-    err "  ✗ Account import failed:"
-    echo "$ACCOUNT_RESULT" | grep "ERROR" >&2
-    fatal "Account import failed. Check errors above."
-  fi
-  info "  ✓ Main account table imported"
-
-  # Import account_access
-  info "  Importing account_access..."
-  ACCESS_SQL=$(cat <<EOSQL
-INSERT INTO account_access (id, gmlevel, RealmID, comment)
-SELECT
-  m.new_id,
-  aa.gmlevel,
-  aa.RealmID,
-  aa.comment
-FROM STAGE_AUTH_DB.account_access aa
-INNER JOIN STAGE_AUTH_DB.account_id_map m ON aa.id = m.old_id;
 EOSQL
-)
-  ACCESS_SQL_EXPANDED=$(echo "$ACCESS_SQL" | sed "s/STAGE_AUTH_DB/$STAGE_AUTH_DB/g")
-  ACCESS_RESULT=$(echo "$ACCESS_SQL_EXPANDED" | docker exec -i ac-mysql mysql -uroot -p"$MYSQL_PW" "$AUTH_DB" 2>&1 || true)
-  if echo "$ACCESS_RESULT" | grep -q "ERROR"; then
-    err "  ✗ account_access import failed:"
-    echo "$ACCESS_RESULT" | grep "ERROR" >&2
-  fi
-  info "  ✓ account_access imported"
-
-  # Import account_banned
-  info "  Importing account_banned..."
-  BANNED_SQL=$(cat <<EOSQL
-INSERT INTO account_banned (id, bandate, unbandate, bannedby, banreason, active)
-SELECT
-  m.new_id,
-  ab.bandate,
-  ab.unbandate,
-  ab.bannedby,
-  ab.banreason,
-  ab.active
-FROM STAGE_AUTH_DB.account_banned ab
-INNER JOIN STAGE_AUTH_DB.account_id_map m ON ab.id = m.old_id;
-EOSQL
-)
-  BANNED_SQL_EXPANDED=$(echo "$BANNED_SQL" | sed "s/STAGE_AUTH_DB/$STAGE_AUTH_DB/g")
-  BANNED_RESULT=$(echo "$BANNED_SQL_EXPANDED" | docker exec -i ac-mysql mysql -uroot -p"$MYSQL_PW" "$AUTH_DB" 2>&1 || true)
-  if echo "$BANNED_RESULT" | grep -q "ERROR"; then
-    err "  ✗ account_banned import failed:"
-    echo "$BANNED_RESULT" | grep "ERROR" >&2
-  fi
-  info "  ✓ account_banned imported"
-
-  # Import account_muted
-  info "  Importing account_muted..."
-  MUTED_SQL=$(cat <<EOSQL
-INSERT INTO account_muted (guid, mutedate, mutetime, mutedby, mutereason)
-SELECT
-  m.new_id,
-  am.mutedate,
-  am.mutetime,
-  am.mutedby,
-  am.mutereason
-FROM STAGE_AUTH_DB.account_muted am
-INNER JOIN STAGE_AUTH_DB.account_id_map m ON am.guid = m.old_id;
-EOSQL
-)
-  MUTED_SQL_EXPANDED=$(echo "$MUTED_SQL" | sed "s/STAGE_AUTH_DB/$STAGE_AUTH_DB/g")
-  MUTED_RESULT=$(echo "$MUTED_SQL_EXPANDED" | docker exec -i ac-mysql mysql -uroot -p"$MYSQL_PW" "$AUTH_DB" 2>&1 || true)
-  if echo "$MUTED_RESULT" | grep -q "ERROR"; then
-    err "  ✗ account_muted import failed:"
-    echo "$MUTED_RESULT" | grep "ERROR" >&2
-  fi
-  info "  ✓ account_muted imported"
-
-  log "✓ Accounts imported successfully"
-fi
-
-# Import characters
-if [[ $CHARACTERS_TO_IMPORT -gt 0 ]]; then
-  log "Importing $CHARACTERS_TO_IMPORT character(s) and their data..."
-
-  # Import account_data (from characters DB, linked to account)
-  cat <<EOSQL | sed "s/STAGE_AUTH_DB/$STAGE_AUTH_DB/g; s/STAGE_CHARS_DB/$STAGE_CHARS_DB/g" | mysql_exec "$CHARACTERS_DB"
-INSERT INTO account_data (accountId, type, time, data)
-SELECT
-  m.new_id,
-  ad.type,
-  ad.time,
-  ad.data
-FROM $STAGE_CHARS_DB.account_data ad
-INNER JOIN $STAGE_CHARS_DB.character_guid_map cm ON ad.accountId = cm.account
-INNER JOIN $STAGE_AUTH_DB.account_id_map m ON ad.accountId = m.old_id
-ON DUPLICATE KEY UPDATE time=VALUES(time), data=VALUES(data);
-EOSQL
-
-  # Import account_tutorial
-  cat <<EOSQL | sed "s/STAGE_AUTH_DB/$STAGE_AUTH_DB/g; s/STAGE_CHARS_DB/$STAGE_CHARS_DB/g" | mysql_exec "$CHARACTERS_DB"
-INSERT INTO account_tutorial (accountId, tut0, tut1, tut2, tut3, tut4, tut5, tut6, tut7)
-SELECT
-  m.new_id,
-  at.tut0,
-  at.tut1,
-  at.tut2,
-  at.tut3,
-  at.tut4,
-  at.tut5,
-  at.tut6,
-  at.tut7
-FROM $STAGE_CHARS_DB.account_tutorial at
-INNER JOIN $STAGE_CHARS_DB.character_guid_map cm ON at.accountId = cm.account
-INNER JOIN $STAGE_AUTH_DB.account_id_map m ON at.accountId = m.old_id
-ON DUPLICATE KEY UPDATE tut0=VALUES(tut0), tut1=VALUES(tut1), tut2=VALUES(tut2),
-                         tut3=VALUES(tut3), tut4=VALUES(tut4), tut5=VALUES(tut5),
-                         tut6=VALUES(tut6), tut7=VALUES(tut7);
-EOSQL
-
-  # Import main characters table
-  CHAR_SQL=$(cat <<EOSQL
+)" "FROM $STAGE_AUTH_DB.account a INNER JOIN $ACCOUNT_MAP m ON a.id = m.old_id"
+
+plan_step "$AUTH_DB" "$STAGE_AUTH_DB" account_access \
+  "INSERT INTO account_access (id, gmlevel, RealmID, comment) SELECT m.new_id, aa.gmlevel, aa.RealmID, aa.comment" \
+  "FROM $STAGE_AUTH_DB.account_access aa INNER JOIN $ACCOUNT_MAP m ON aa.id = m.old_id"
+
+plan_step "$AUTH_DB" "$STAGE_AUTH_DB" account_banned \
+  "INSERT INTO account_banned (id, bandate, unbandate, bannedby, banreason, active) SELECT m.new_id, ab.bandate, ab.unbandate, ab.bannedby, ab.banreason, ab.active" \
+  "FROM $STAGE_AUTH_DB.account_banned ab INNER JOIN $ACCOUNT_MAP m ON ab.id = m.old_id"
+
+plan_step "$AUTH_DB" "$STAGE_AUTH_DB" account_muted \
+  "INSERT INTO account_muted (guid, mutedate, mutetime, mutedby, mutereason) SELECT m.new_id, am.mutedate, am.mutetime, am.mutedby, am.mutereason" \
+  "FROM $STAGE_AUTH_DB.account_muted am INNER JOIN $ACCOUNT_MAP m ON am.guid = m.old_id"
+
+# Account-wide data in the characters DB, for accounts of imported characters
+plan_step "$CHARACTERS_DB" "$STAGE_CHARS_DB" account_data \
+  "INSERT INTO account_data (accountId, type, time, data) SELECT m.new_id, ad.type, ad.time, ad.data" \
+  "FROM $STAGE_CHARS_DB.account_data ad
+   INNER JOIN (SELECT DISTINCT account FROM $CHAR_MAP) cm ON ad.accountId = cm.account
+   INNER JOIN $ACCOUNT_MAP m ON ad.accountId = m.old_id" \
+  "ON DUPLICATE KEY UPDATE time=VALUES(time), data=VALUES(data)"
+
+plan_step "$CHARACTERS_DB" "$STAGE_CHARS_DB" account_tutorial \
+  "INSERT INTO account_tutorial (accountId, tut0, tut1, tut2, tut3, tut4, tut5, tut6, tut7)
+   SELECT m.new_id, at.tut0, at.tut1, at.tut2, at.tut3, at.tut4, at.tut5, at.tut6, at.tut7" \
+  "FROM $STAGE_CHARS_DB.account_tutorial at
+   INNER JOIN (SELECT DISTINCT account FROM $CHAR_MAP) cm ON at.accountId = cm.account
+   INNER JOIN $ACCOUNT_MAP m ON at.accountId = m.old_id" \
+  "ON DUPLICATE KEY UPDATE tut0=VALUES(tut0), tut1=VALUES(tut1), tut2=VALUES(tut2),
+                           tut3=VALUES(tut3), tut4=VALUES(tut4), tut5=VALUES(tut5),
+                           tut6=VALUES(tut6), tut7=VALUES(tut7)"
+
+plan_step "$CHARACTERS_DB" "$STAGE_CHARS_DB" characters "$(cat <<EOSQL
 INSERT INTO characters (guid, account, name, race, class, gender, level, xp, money, skin, face,
                         hairStyle, hairColor, facialStyle, bankSlots, restState, playerFlags,
                         position_x, position_y, position_z, map, instance_id, instance_mode_mask,
@@ -832,165 +712,195 @@ SELECT
   c.deleteDate,
   c.innTriggerId,
   c.extraBonusTalentCount
-FROM $STAGE_CHARS_DB.characters c
-INNER JOIN $STAGE_CHARS_DB.character_guid_map cm ON c.guid = cm.old_guid
-INNER JOIN $STAGE_AUTH_DB.account_id_map am ON c.account = am.old_id;
 EOSQL
+)" "FROM $STAGE_CHARS_DB.characters c
+   INNER JOIN $CHAR_MAP cm ON c.guid = cm.old_guid
+   INNER JOIN $ACCOUNT_MAP am ON c.account = am.old_id"
+
+plan_step "$CHARACTERS_DB" "$STAGE_CHARS_DB" item_instance \
+  "INSERT INTO item_instance (guid, itemEntry, owner_guid, creatorGuid, giftCreatorGuid, count,
+                              duration, charges, flags, enchantments, randomPropertyId, durability,
+                              playedTime, text)
+   SELECT im.new_guid, ii.itemEntry, cm.new_guid, ii.creatorGuid, ii.giftCreatorGuid, ii.count,
+          ii.duration, ii.charges, ii.flags, ii.enchantments, ii.randomPropertyId, ii.durability,
+          ii.playedTime, ii.text" \
+  "FROM $STAGE_CHARS_DB.item_instance ii
+   INNER JOIN $ITEM_MAP im ON ii.guid = im.old_guid
+   INNER JOIN $CHAR_MAP cm ON ii.owner_guid = cm.old_guid"
+
+# bag is the item guid of the container (0 for the backpack/equipment slots),
+# so it is remapped through the item map as well.
+plan_step "$CHARACTERS_DB" "$STAGE_CHARS_DB" character_inventory \
+  "INSERT INTO character_inventory (guid, bag, slot, item)
+   SELECT cm.new_guid, IF(ci.bag = 0, 0, bm.new_guid), ci.slot, im.new_guid" \
+  "FROM $STAGE_CHARS_DB.character_inventory ci
+   INNER JOIN $CHAR_MAP cm ON ci.guid = cm.old_guid
+   INNER JOIN $ITEM_MAP im ON ci.item = im.old_guid
+   LEFT JOIN $ITEM_MAP bm ON ci.bag = bm.old_guid
+   WHERE ci.bag = 0 OR bm.new_guid IS NOT NULL"
+
+# Character sub-tables keyed on guid; columns are the ones present in both
+# the backup and the live schema, read in one information_schema query.
+CHAR_TABLES=(
+  "character_account_data"
+  "character_achievement"
+  "character_achievement_progress"
+  "character_action"
+  "character_arena_stats"
+  "character_aura"
+  "character_banned"
+  "character_battleground_random"
+  "character_brew_of_the_month"
+  "character_declinedname"
+  "character_entry_point"
+  "character_equipmentsets"
+  "character_gifts"
+  "character_glyphs"
+  "character_homebind"
+  "character_instance"
+  "character_pet"
+  "character_pet_declinedname"
+  "character_queststatus"
+  "character_queststatus_daily"
+  "character_queststatus_monthly"
+  "character_queststatus_rewarded"
+  "character_queststatus_seasonal"
+  "character_queststatus_weekly"
+  "character_reputation"
+  "character_settings"
+  "character_skills"
+  "character_social"
+  "character_spell"
+  "character_spell_cooldown"
+  "character_stats"
+  "character_talent"
+  "character_void_storage"
 )
-  CHAR_SQL_EXPANDED=$(echo "$CHAR_SQL" | sed "s/STAGE_AUTH_DB/$STAGE_AUTH_DB/g; s/STAGE_CHARS_DB/$STAGE_CHARS_DB/g")
-  CHAR_RESULT=$(echo "$CHAR_SQL_EXPANDED" | docker exec -i ac-mysql mysql -uroot -p"$MYSQL_PW" "$CHARACTERS_DB" 2>&1 | tee /tmp/char-import-result.log)
-  if echo "$CHAR_RESULT" | grep -q "ERROR"; then
-    err "✗ Character import failed with errors:"
-    echo "$CHAR_RESULT" >&2
-    fatal "Character import SQL failed. See /tmp/char-import-result.log for details."
+
+while IFS=$'\t' read -r table columns select_list; do
+  [[ -n "$table" ]] || continue
+  plan_step "$CHARACTERS_DB" "$STAGE_CHARS_DB" "$table" \
+    "INSERT IGNORE INTO $table ($columns) SELECT $select_list" \
+    "FROM $STAGE_CHARS_DB.$table t INNER JOIN $CHAR_MAP cm ON t.guid = cm.old_guid"
+done < <(mysql_query information_schema "
+  SET SESSION group_concat_max_len = 65535;
+  SELECT s.TABLE_NAME,
+         GROUP_CONCAT(CONCAT('\`', s.COLUMN_NAME, '\`') ORDER BY s.ORDINAL_POSITION SEPARATOR ', '),
+         GROUP_CONCAT(IF(s.COLUMN_NAME = 'guid', 'cm.new_guid', CONCAT('t.\`', s.COLUMN_NAME, '\`'))
+                      ORDER BY s.ORDINAL_POSITION SEPARATOR ', ')
+  FROM COLUMNS s
+  INNER JOIN COLUMNS l
+    ON l.TABLE_SCHEMA = '$CHARACTERS_DB' AND l.TABLE_NAME = s.TABLE_NAME AND l.COLUMN_NAME = s.COLUMN_NAME
+  WHERE s.TABLE_SCHEMA = '$STAGE_CHARS_DB'
+    AND s.TABLE_NAME IN ($(printf '%s\n' "${CHAR_TABLES[@]}" | sql_values | tr -d '()'))
+  GROUP BY s.TABLE_NAME
+  HAVING SUM(s.COLUMN_NAME = 'guid') > 0
+  ORDER BY s.TABLE_NAME
+")
+
+# Print "db<TAB>table<TAB>rows" for every planned step, in one query
+plan_row_counts(){
+  local idx query=""
+  for idx in "${!PLAN_TABLE[@]}"; do
+    query+="${query:+ UNION ALL }SELECT '${PLAN_DB[$idx]}', '${PLAN_TABLE[$idx]}', COUNT(*) ${PLAN_FROM[$idx]}"
+  done
+  [[ -n "$query" ]] || return 0
+  mysql_query "$STAGE_CHARS_DB" "$query"
+}
+
+# Run every planned step for DB in one session and one transaction. The mysql
+# client stops at the first error and the open transaction is rolled back.
+run_transaction(){
+  local db="$1" idx sql="START TRANSACTION;"$'\n' output rc=0
+  for idx in "${!PLAN_TABLE[@]}"; do
+    [[ "${PLAN_DB[$idx]}" == "$db" ]] || continue
+    sql+="${PLAN_SQL[$idx]};"$'\n'"SELECT '${PLAN_TABLE[$idx]}', ROW_COUNT();"$'\n'
+  done
+  sql+="COMMIT;"
+  output=$(printf '%s\n' "$sql" | docker exec -i ac-mysql mysql -uroot -p"$MYSQL_PW" -N -B "$db" 2>"$TEMP_DIR/$db.err") || rc=$?
+  if [[ $rc -ne 0 ]]; then
+    err "  ✗ $db import failed; the transaction was rolled back:"
+    grep "ERROR" "$TEMP_DIR/$db.err" >&2 || true
+    return 1
   fi
-  CHARS_IMPORTED=$(mysql_query "$CHARACTERS_DB" "SELECT COUNT(*) FROM characters WHERE account IN (101, 102);")
-  info "  Characters imported: $CHARS_IMPORTED"
+  while IFS=$'\t' read -r table rows; do
+    [[ -n "$table" ]] && info "    $table: $rows rows"
+  done <<< "$output"
+}
 
-  log "✓ Main character data imported"
+# Summary
+info ""
+info "═══════════════════════════════════════════════════════════"
+info "  IMPORT SUMMARY"
+info "═══════════════════════════════════════════════════════════"
 
-  # Import items
-  log "Importing character items..."
+mysql_query "$STAGE_AUTH_DB" "SELECT CONCAT('  ', username, ' (account id: ', old_id, ' → ', new_id, ')') FROM account_id_map;" | while read -r line; do
+  info "$line"
+done
 
-  ITEM_SQL=$(cat <<EOSQL
-INSERT INTO item_instance (guid, itemEntry, owner_guid, creatorGuid, giftCreatorGuid, count,
-                            duration, charges, flags, enchantments, randomPropertyId, durability,
-                            playedTime, text)
-SELECT
-  im.new_guid,
-  ii.itemEntry,
-  cm.new_guid,
-  ii.creatorGuid,
-  ii.giftCreatorGuid,
-  ii.count,
-  ii.duration,
-  ii.charges,
-  ii.flags,
-  ii.enchantments,
-  ii.randomPropertyId,
-  ii.durability,
-  ii.playedTime,
-  ii.text
-FROM $STAGE_CHARS_DB.item_instance ii
-INNER JOIN $STAGE_CHARS_DB.item_guid_map im ON ii.guid = im.old_guid
-INNER JOIN $STAGE_CHARS_DB.character_guid_map cm ON ii.owner_guid = cm.old_guid;
-EOSQL
-)
-  ITEM_SQL_EXPANDED=$(echo "$ITEM_SQL" | sed "s/STAGE_CHARS_DB/$STAGE_CHARS_DB/g")
-  ITEM_COUNT=$(echo "$ITEM_SQL_EXPANDED" | docker exec -i ac-mysql mysql -uroot -p"$MYSQL_PW" "$CHARACTERS_DB" 2>&1 | tee /dev/stderr | grep -c "ERROR" || echo "0")
-  if [[ "$ITEM_COUNT" != "0" ]]; then
-    warn "  Warning: Errors occurred during item_instance import"
-  fi
+if [[ $CHARACTERS_TO_IMPORT -gt 0 ]]; then
+  info ""
+  info "Characters to import:"
+  mysql_query "$STAGE_CHARS_DB" "SELECT CONCAT('  ', name, ' (guid: ', old_guid, ' → ', new_guid, ', account: ', account, ')') FROM character_guid_map;" | while read -r line; do
+    info "$line"
+  done
+fi
 
-  INV_SQL=$(cat <<EOSQL
-INSERT INTO character_inventory (guid, bag, slot, item)
-SELECT
-  cm.new_guid,
-  ci.bag,
-  ci.slot,
-  im.new_guid
-FROM $STAGE_CHARS_DB.character_inventory ci
-INNER JOIN $STAGE_CHARS_DB.character_guid_map cm ON ci.guid = cm.old_guid
-INNER JOIN $STAGE_CHARS_DB.item_guid_map im ON ci.item = im.old_guid;
-EOSQL
-)
-  INV_SQL_EXPANDED=$(echo "$INV_SQL" | sed "s/STAGE_CHARS_DB/$STAGE_CHARS_DB/g")
-  INV_COUNT=$(echo "$INV_SQL_EXPANDED" | docker exec -i ac-mysql mysql -uroot -p"$MYSQL_PW" "$CHARACTERS_DB" 2>&1 | tee /dev/stderr | grep -c "ERROR" || echo "0")
-  if [[ "$INV_COUNT" != "0" ]]; then
-    warn "  Warning: Errors occurred during character_inventory import"
-  fi
+info ""
+info "Rows to import per table:"
+plan_row_counts | while IFS=$'\t' read -r db table rows; do
+  [[ "$rows" == "0" ]] || info "  $db.$table: $rows"
+done
 
-  # Report counts
-  ITEMS_IMPORTED=$(mysql_query "$CHARACTERS_DB" "SELECT COUNT(*) FROM item_instance WHERE owner_guid IN (SELECT new_guid FROM $STAGE_CHARS_DB.character_guid_map);")
-  INV_IMPORTED=$(mysql_query "$CHARACTERS_DB" "SELECT COUNT(*) FROM character_inventory WHERE guid IN (SELECT new_guid FROM $STAGE_CHARS_DB.character_guid_map);")
-  info "  Items imported: $ITEMS_IMPORTED"
-  info "  Inventory slots imported: $INV_IMPORTED"
-
-  log "✓ Items imported"
-
-  # Import character sub-tables
-  log "Importing character progression data..."
-
-  # List of character tables to import (guid-based)
-  CHAR_TABLES=(
-    "character_account_data"
-    "character_achievement"
-    "character_achievement_progress"
-    "character_action"
-    "character_arena_stats"
-    "character_aura"
-    "character_banned"
-    "character_battleground_random"
-    "character_brew_of_the_month"
-    "character_declinedname"
-    "character_entry_point"
-    "character_equipmentsets"
-    "character_gifts"
-    "character_glyphs"
-    "character_homebind"
-    "character_instance"
-    "character_pet"
-    "character_pet_declinedname"
-    "character_queststatus"
-    "character_queststatus_daily"
-    "character_queststatus_monthly"
-    "character_queststatus_rewarded"
-    "character_queststatus_seasonal"
-    "character_queststatus_weekly"
-    "character_reputation"
-    "character_settings"
-    "character_skills"
-    "character_social"
-    "character_spell"
-    "character_spell_cooldown"
-    "character_stats"
-    "character_talent"
-    "character_void_storage"
-  )
-
-  for table in "${CHAR_TABLES[@]}"; do
-    # Check if table exists in staging DB
-    table_exists=$(mysql_query "$STAGE_CHARS_DB" "SHOW TABLES LIKE '$table';" || echo "")
-    if [[ -z "$table_exists" ]]; then
-      continue
-    fi
+if $DRY_RUN; then
+  warn ""
+  warn "═══════════════════════════════════════════════════════════"
+  warn "  DRY RUN MODE - No changes will be made"
+  warn "═══════════════════════════════════════════════════════════"
+  log ""
+  log "Review complete. Remove --dry-run to perform the actual import."
+  exit 0
+fi
 
-    # Count rows for this character in the table
-    row_count=$(mysql_query "$STAGE_CHARS_DB" "
-      SELECT COUNT(*)
-      FROM $table t
-      INNER JOIN character_guid_map cm ON t.guid = cm.old_guid
-    " 2>/dev/null || echo "0")
+# Confirmation prompt
+if ! $AUTO_CONFIRM; then
+  info ""
+  read -p "Proceed with import? [y/N]: " -n 1 -r
+  echo
+  if [[ ! $REPLY =~ ^[Yy]$ ]]; then
+    warn "Import cancelled"
+    exit 0
+  fi
+fi
 
-    if [[ "$row_count" == "0" ]]; then
-      continue
-    fi
+# Import phase
+log ""
+log "═══════════════════════════════════════════════════════════"
+log "  IMPORT PHASE"
+log "═══════════════════════════════════════════════════════════"
 
-    # Get all columns except guid
-    columns=$(mysql_query "$STAGE_CHARS_DB" "
-      SELECT GROUP_CONCAT(COLUMN_NAME ORDER BY ORDINAL_POSITION SEPARATOR ', ')
-      FROM INFORMATION_SCHEMA.COLUMNS
-      WHERE TABLE_SCHEMA = '$STAGE_CHARS_DB' AND TABLE_NAME = '$table'
-    ")
-
-    # Build select list with guid remapping
-    select_list=$(echo "$columns" | sed 's/\bguid\b/cm.new_guid/g')
-
-    # Import with guid remapping
-    PROG_SQL="INSERT IGNORE INTO $table ($columns) SELECT $select_list FROM $STAGE_CHARS_DB.$table t INNER JOIN $STAGE_CHARS_DB.character_guid_map cm ON t.guid = cm.old_guid;"
-    PROG_SQL_EXPANDED=$(echo "$PROG_SQL" | sed "s/STAGE_CHARS_DB/$STAGE_CHARS_DB/g")
-    PROG_RESULT=$(echo "$PROG_SQL_EXPANDED" | docker exec -i ac-mysql mysql -uroot -p"$MYSQL_PW" "$CHARACTERS_DB" 2>&1)
-    if echo "$PROG_RESULT" | grep -q "ERROR"; then
-      warn "  Warning: Errors importing $table:"
-      echo "$PROG_RESULT" | grep "ERROR" >&2
-    else
-      ROWS_IMPORTED=$(mysql_query "$CHARACTERS_DB" "SELECT COUNT(*) FROM $table WHERE guid IN (SELECT new_guid FROM $STAGE_CHARS_DB.character_guid_map);")
-      info "    $table: $ROWS_IMPORTED rows"
-    fi
+log "Stopping world/auth services..."
+docker stop ac-worldserver ac-authserver >/dev/null 2>&1 || warn "Services already stopped"
 
-  done
+log "Starting import..."
 
-  log "✓ Character progression data imported"
+# Import accounts
+if [[ $ACCOUNTS_TO_IMPORT -gt 0 ]]; then
+  log "Importing $ACCOUNTS_TO_IMPORT account(s)..."
+  run_transaction "$AUTH_DB" || fatal "Account import failed. Check errors above."
+  log "✓ Accounts imported successfully"
+fi
+
+# Import characters, items and progression data
+if [[ $CHARACTERS_TO_IMPORT -gt 0 ]]; then
+  log "Importing $CHARACTERS_TO_IMPORT character(s) and their data..."
+  if ! run_transaction "$CHARACTERS_DB"; then
+    if [[ $ACCOUNTS_TO_IMPORT -gt 0 ]]; then
+      warn "Accounts were already committed to $AUTH_DB; only the character data was rolled back."
+    fi
+    fatal "Character import failed. Check errors above."
+  fi
+  log "✓ Characters imported successfully"
 fi
 
 # Restart services
@@ -1021,19 +931,17 @@ log "═════════════════════════
 if [[ $ACCOUNTS_TO_IMPORT -gt 0 ]]; then
   log ""
   log "Imported accounts:"
-  while IFS= read -r username; do
-    new_id=$(mysql_query "$AUTH_DB" "SELECT id FROM account WHERE username='$username';" || echo "?")
-    log "  ✓ $username (account id: $new_id)"
-  done < "$TEMP_DIR/accounts_to_import.txt"
+  mysql_query "$STAGE_AUTH_DB" "SELECT CONCAT('  ✓ ', username, ' (account id: ', new_id, ')') FROM account_id_map ORDER BY new_id;" | while IFS= read -r line; do
+    log "$line"
+  done
 fi
 
 if [[ $CHARACTERS_TO_IMPORT -gt 0 ]]; then
   log ""
   log "Imported characters:"
-  while IFS= read -r charname; do
-    new_guid=$(mysql_query "$CHARACTERS_DB" "SELECT guid FROM characters WHERE name='$charname';" || echo "?")
-    log "  ✓ $charname (guid: $new_guid)"
-  done < "$TEMP_DIR/characters_to_import.txt"
+  mysql_query "$STAGE_CHARS_DB" "SELECT CONCAT('  ✓ ', name, ' (guid: ', new_guid, ')') FROM character_guid_map ORDER BY new_guid;" | while IFS= read -r line; do
+    log "$line"
+  done
 fi
 
 log ""
@@ -0,0 +1,168 @@
+#!/bin/bash
+# Point-in-time restore: replay a full backup plus archived binary logs.
+set -euo pipefail
+
+log(){ echo "[$(date '+%F %T')] $*"; }
+warn(){ echo "⚠️  $*" >&2; }
+fatal(){ echo "❌ $*" >&2; exit 1; }
+
+usage(){
+  cat <<'EOF'
+Usage: ./backup-pitr.sh --until "YYYY-MM-DD HH:MM:SS" [options]
+
+Restores the newest full backup taken before the target time, then replays the
+binary log segments archived by incremental interval backups
+(BACKUP_INCREMENTAL=1) up to, but not including, the first event at or after
+the target time. Run it where mysql and mysqlbinlog are available and the
+backup root is mounted, e.g. inside ac-backup. Stop the world and auth servers
+first.
+
+Options:
+  --until TIME          Target time (server local time, anything `date -d` accepts)
+  --backup-root DIR     Backup root with daily/ and hourly/ (default: $BACKUP_DIR_BASE or /backups)
+  --db LIST             Comma-separated schemas to restore (default: all in the base backup)
+  --dry-run             Print the restore plan without touching the database
+  --host HOST           MySQL host (default: $MYSQL_HOST or localhost)
+  --port PORT           MySQL port (default: $MYSQL_PORT or 3306)
+  --user USER           MySQL user (default: $MYSQL_USER or root)
+  --password PASS       MySQL password (default: $MYSQL_PASSWORD)
+  -h, --help            Show this help
+
+Example:
+  docker exec ac-backup /tmp/scripts/bash/backup-pitr.sh --until "2025-01-01 14:35:00" --dry-run
+EOF
+}
+
+UNTIL=""
+BACKUP_ROOT="${BACKUP_DIR_BASE:-/backups}"
+DB_FILTER=""
+DRY_RUN=0
+HOST="${MYSQL_HOST:-localhost}"
+PORT="${MYSQL_PORT:-3306}"
+USER_NAME="${MYSQL_USER:-root}"
+PASSWORD="${MYSQL_PASSWORD:-}"
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    --until) UNTIL="$2"; shift 2 ;;
+    --backup-root) BACKUP_ROOT="$2"; shift 2 ;;
+    --db) DB_FILTER="$2"; shift 2 ;;
+    --dry-run) DRY_RUN=1; shift ;;
+    --host) HOST="$2"; shift 2 ;;
+    --port) PORT="$2"; shift 2 ;;
+    --user) USER_NAME="$2"; shift 2 ;;
+    --password) PASSWORD="$2"; shift 2 ;;
+    -h|--help) usage; exit 0 ;;
+    *) fatal "Unknown option: $1" ;;
+  esac
+done
+
+[ -n "$UNTIL" ] || { usage; exit 1; }
+UNTIL_EPOCH="$(date -d "$UNTIL" +%s 2>/dev/null)" || fatal "Unrecognised time: $UNTIL"
+UNTIL="$(date -d "@$UNTIL_EPOCH" '+%Y-%m-%d %H:%M:%S')"
+BACKUP_ROOT="${BACKUP_ROOT%/}"
+[ -d "$BACKUP_ROOT" ] || fatal "Backup root not found: $BACKUP_ROOT"
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+# 20250101_143000 -> epoch seconds
+ts_epoch(){
+  local ts="$1"
+  date -d "${ts:0:8} ${ts:9:2}:${ts:11:2}:${ts:13:2}" +%s 2>/dev/null || echo 0
+}
+
+mysql_cmd(){
+  mysql -h"$HOST" -P"$PORT" -u"$USER_NAME" -p"$PASSWORD" "$@"
+}
+
+# Pick the newest full backup (with binlog coordinates) taken before UNTIL.
+BASE="" BASE_TS=""
+for dir in "$BACKUP_ROOT"/daily/*/ "$BACKUP_ROOT"/hourly/*/; do
+  dir="${dir%/}"
+  [ -f "$dir/.backup_complete" ] && [ -s "$dir/binlog-position.txt" ] || continue
+  ts="$(basename "$dir")"
+  [ "$(ts_epoch "$ts")" -le "$UNTIL_EPOCH" ] || continue
+  if [ -z "$BASE_TS" ] || [[ "$ts" > "$BASE_TS" ]]; then
+    BASE_TS="$ts"
+    BASE="${dir#"$BACKUP_ROOT"/}"
+  fi
+done
+[ -n "$BASE" ] || fatal "No full backup with binlog coordinates before ${UNTIL} (enable BACKUP_INCREMENTAL=1)"
+
+# Archived segments for this chain, oldest first, as full paths.
+declare -a SEGMENTS=()
+for dir in "$BACKUP_ROOT"/hourly/*/; do
+  dir="${dir%/}"
+  [ -f "$dir/.backup_complete" ] && [ -s "$dir/binlog-files.txt" ] || continue
+  [ "$(cat "$dir/binlog-base.txt" 2>/dev/null)" = "$BASE" ] || continue
+  while IFS= read -r name; do
+    [ -n "$name" ] && SEGMENTS+=("$dir/binlog/$name")
+  done < "$dir/binlog-files.txt"
+done
+
+declare -a DBS=() DB_FILES=() DB_POSITIONS=()
+while read -r db file pos; do
+  [ -n "$db" ] || continue
+  if [ -n "$DB_FILTER" ] && ! [[ ",${DB_FILTER// /}," == *",${db},"* ]]; then
+    continue
+  fi
+  DBS+=("$db"); DB_FILES+=("$file"); DB_POSITIONS+=("$pos")
+done < "$BACKUP_ROOT/$BASE/binlog-position.txt"
+[ "${#DBS[@]}" -gt 0 ] || fatal "None of the requested databases are in ${BASE}"
+
+dump_for(){
+  local db="$1" candidate
+  for candidate in "$BACKUP_ROOT/$BASE/${db}.sql.gz" "$BACKUP_ROOT/$BASE/${db}.sql.zst" "$BACKUP_ROOT/$BASE/${db}.sql.idx" "$BACKUP_ROOT/$BASE/${db}.sql"; do
+    [ -f "$candidate" ] && { echo "$candidate"; return 0; }
+  done
+  [ -f "$BACKUP_ROOT/$BASE/chunked/${db}.json" ] && { echo "$BACKUP_ROOT/$BASE/chunked"; return 0; }
+  return 1
+}
+
+# Segments from the database's own starting file onwards.
+segments_for(){
+  local start_file="$1" path started=0
+  for path in "${SEGMENTS[@]}"; do
+    [ "$(basename "$path")" = "$start_file" ] && started=1
+    [ "$started" = "1" ] && echo "$path"
+  done
+}
+
+log "Point-in-time restore to ${UNTIL}"
+log "Base backup: ${BASE} (${#SEGMENTS[@]} archived binlog segments in chain)"
+for idx in "${!DBS[@]}"; do
+  db="${DBS[$idx]}"
+  dump="$(dump_for "$db")" || fatal "No dump for ${db} in ${BASE}"
+  mapfile -t replay < <(segments_for "${DB_FILES[$idx]}")
+  log "  ${db}: restore ${dump#"$BACKUP_ROOT"/}, replay ${#replay[@]} segment(s) from ${DB_FILES[$idx]}:${DB_POSITIONS[$idx]}"
+  if [ "${#replay[@]}" -eq 0 ] && [ "$(ts_epoch "$BASE_TS")" -lt "$UNTIL_EPOCH" ]; then
+    warn "No archived binlogs for ${db} after ${BASE}; restoring to the base backup time only"
+  fi
+done
+[ "$DRY_RUN" = "1" ] && exit 0
+
+command -v mysqlbinlog >/dev/null 2>&1 || fatal "mysqlbinlog not found"
+
+for idx in "${!DBS[@]}"; do
+  db="${DBS[$idx]}"
+  dump="$(dump_for "$db")"
+  log "Restoring ${db} from ${BASE}"
+  case "$dump" in
+    */chunked)
+      bash "$SCRIPT_DIR/backup-chunked.sh" load --input "$dump" --schemas "$db" \
+        --host "$HOST" --port "$PORT" --user "$USER_NAME" --password "$PASSWORD" ;;
+    *.gz) gzip -dc "$dump" | mysql_cmd ;;
+    *.zst) zstd -q -dc "$dump" | mysql_cmd ;;
+    *.idx) python3 "$SCRIPT_DIR/../python/backup_repo.py" cat "$dump" | mysql_cmd ;;
+    *) mysql_cmd < "$dump" ;;
+  esac
+
+  mapfile -t replay < <(segments_for "${DB_FILES[$idx]}")
+  [ "${#replay[@]}" -gt 0 ] || continue
+  log "Replaying ${#replay[@]} binlog segment(s) into ${db} until ${UNTIL}"
+  mysqlbinlog --disable-log-bin --database="$db" \
+    --start-position="${DB_POSITIONS[$idx]}" --stop-datetime="$UNTIL" "${replay[@]}" \
+    | mysql_cmd "$db"
+done
+
+log "✅ Point-in-time restore complete (${UNTIL})"
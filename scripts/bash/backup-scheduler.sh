@@ -10,6 +10,7 @@ RETENTION_DAYS=${BACKUP_RETENTION_DAYS:-3}
 DAILY_TIME=${BACKUP_DAILY_TIME:-09}
 BACKUP_INTERVAL_MINUTES=${BACKUP_INTERVAL_MINUTES:-60}
 MYSQL_PORT=${MYSQL_PORT:-3306}
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
 mkdir -p "$HOURLY_DIR" "$DAILY_DIR"
 
@@ -65,13 +66,411 @@ if [ "${BACKUP_SCHEDULER_LIST_ONLY:-0}" = "1" ]; then
   exit 0
 fi
 
+# Pick the compressor once: pigz keeps the .sql.gz format every restore path
+# understands; zstd is opt-in and writes .sql.zst.
+select_codec() {
+  local requested="${BACKUP_COMPRESSION:-auto}"
+  case "$requested" in
+    auto|pigz)
+      if command -v pigz >/dev/null 2>&1; then echo "pigz"; return; fi
+      [ "$requested" = "pigz" ] && log "⚠️  pigz not installed; falling back to gzip" >&2
+      echo "gzip" ;;
+    zstd)
+      if command -v zstd >/dev/null 2>&1; then echo "zstd"; return; fi
+      log "⚠️  zstd not installed; falling back to gzip" >&2
+      echo "gzip" ;;
+    gzip) echo "gzip" ;;
+    *)
+      log "⚠️  Unknown BACKUP_COMPRESSION '${requested}'; using gzip" >&2
+      echo "gzip" ;;
+  esac
+}
+
+codec_extension() {
+  case "$1" in
+    zstd) echo "sql.zst" ;;
+    repository) echo "sql.idx" ;;
+    *) echo "sql.gz" ;;
+  esac
+}
+
+REPOSITORY_DIR="${BACKUP_DIR_BASE}/repository"
+REPOSITORY_TOOL="$SCRIPT_DIR/../python/backup_repo.py"
+CATALOG_TOOL="$SCRIPT_DIR/../python/backup_catalog.py"
+
+# Record created/pruned backup sets in the SQLite catalog (BACKUP_DIR_BASE/catalog.sqlite).
+# Runs in the background so hashing dumps never delays the schedule.
+catalog_record() {
+  [ "${BACKUP_CATALOG:-1}" = "1" ] && [ -f "$CATALOG_TOOL" ] && command -v python3 >/dev/null 2>&1 || return 0
+  ( python3 "$CATALOG_TOOL" --root "$BACKUP_DIR_BASE" "$@" >/dev/null 2>&1 \
+      || log "⚠️  Backup catalog update failed ($1)" ) &
+  disown
+}
+
+VERIFY_TOOL="$SCRIPT_DIR/backup-verify.sh"
+
+# Stream-verify a finished set in the background at low CPU/IO priority so the
+# next backup is not held up, then catalog it with the verification result.
+post_backup() {
+  local target_dir="$1"
+  (
+    if [ "${BACKUP_VERIFY:-1}" = "1" ] && [ -f "$VERIFY_TOOL" ]; then
+      local jobs="${BACKUP_VERIFY_JOBS:-}"
+      if ! [[ "$jobs" =~ ^[1-9][0-9]*$ ]]; then
+        jobs=$(( $(nproc 2>/dev/null || echo 2) / 2 ))
+        [ "$jobs" -lt 1 ] && jobs=1
+      fi
+      local -a low=(nice -n 10)
+      ionice -c 3 true >/dev/null 2>&1 && low+=(ionice -c 3)
+      local report
+      if report=$("${low[@]}" bash "$VERIFY_TOOL" --quiet --jobs "$jobs" "$target_dir" 2>&1); then
+        log "🔎 Verified $target_dir"
+      else
+        log "❌ Verification failed for $target_dir"
+        printf '%s\n' "$report" | while IFS= read -r line; do log "   $line"; done
+      fi
+    fi
+    catalog_record add "$target_dir"
+  ) &
+  # Detached from the job table so run_backup's worker pool never waits on it.
+  disown
+}
+
+# Write a dump stream to $3: compressed, or chunked into the deduplicating
+# repository with $3 as its index.
+write_dump() {
+  local codec="$1" threads="$2" outfile="$3"
+  if [ "$codec" = "repository" ]; then
+    python3 "$REPOSITORY_TOOL" put --repo "$REPOSITORY_DIR" --index "$outfile" 2>/dev/null
+  else
+    compress_stream "$codec" "$threads" > "$outfile"
+  fi
+}
+
+compress_stream() {
+  local codec="$1" threads="$2"
+  case "$codec" in
+    pigz) pigz -c -p "$threads" ;;
+    zstd) zstd -q -c -T"$threads" -"${BACKUP_ZSTD_LEVEL:-3}" ;;
+    *) gzip -c ;;
+  esac
+}
+
+decompress_stream() {
+  case "$1" in
+    *.zst) zstd -q -dc "$1" ;;
+    *.idx) python3 "$REPOSITORY_TOOL" cat "$1" ;;
+    *) gzip -dc "$1" ;;
+  esac
+}
+
+mysql_cmd() {
+  mysql -h"${MYSQL_HOST}" -P"${MYSQL_PORT}" -u"${MYSQL_USER}" -p"${MYSQL_PASSWORD}" "$@"
+}
+
+# --source-data and binlog archiving need log_bin (MYSQL_DISABLE_BINLOG=0).
+binlog_enabled() {
+  [ "$(mysql_cmd -s -N -e "SELECT @@log_bin;" 2>/dev/null)" = "1" ]
+}
+
+# Cheap change signature for a database. "metadata" hashes table create/update
+# times, auto-increment counters and routine/trigger/event definitions times;
+# "checksum" adds CHECKSUM TABLE over every base table (exact, but reads all rows).
+database_fingerprint() {
+  local db="$1"
+  local safe="${db//\'/}"
+  {
+    mysql_cmd -s -N -e "SET SESSION information_schema_stats_expiry = 0;
+      SELECT table_name, table_type, engine, IFNULL(create_time, ''), IFNULL(update_time, ''), IFNULL(auto_increment, '')
+        FROM information_schema.tables WHERE table_schema = '${safe}' ORDER BY table_name;
+      SELECT routine_type, routine_name, last_altered FROM information_schema.routines WHERE routine_schema = '${safe}' ORDER BY 1, 2;
+      SELECT trigger_name, created FROM information_schema.triggers WHERE trigger_schema = '${safe}' ORDER BY 1;
+      SELECT event_name, last_altered FROM information_schema.events WHERE event_schema = '${safe}' ORDER BY 1;" || return 1
+    if [ "${BACKUP_FINGERPRINT:-metadata}" = "checksum" ]; then
+      local tables
+      tables=$(mysql_cmd -s -N -e "SELECT GROUP_CONCAT(CONCAT('\`', table_schema, '\`.\`', table_name, '\`') ORDER BY table_name)
+        FROM information_schema.tables WHERE table_schema = '${safe}' AND table_type = 'BASE TABLE';") || return 1
+      if [ -n "$tables" ] && [ "$tables" != "NULL" ]; then
+        mysql_cmd -s -N -e "CHECKSUM TABLE ${tables};" || return 1
+      fi
+    fi
+  } | md5sum | awk '{print $1}'
+}
+
+# Print "<path> <dumped_at> <source>" for the previous backup's dump of $db when
+# its fingerprint matches and the original dump is recent enough to reuse.
+find_reusable_dump() {
+  local db="$1" ext="$2" fingerprint="$3" target_dir="$4"
+  local max_age=$(( ${BACKUP_REUSE_MAX_AGE_HOURS:-24} * 3600 ))
+  local dir previous=""
+  while IFS= read -r dir; do
+    [ "$dir" = "$target_dir" ] && continue
+    [ -f "$dir/.backup_complete" ] && [ -f "$dir/${db}.fingerprint" ] || continue
+    previous="$dir"
+    break
+  done < <(for dir in "$DAILY_DIR"/*/ "$HOURLY_DIR"/*/; do
+      dir="${dir%/}"; [ -d "$dir" ] && printf '%s %s\n' "$(basename "$dir")" "$dir"
+    done | sort -r | cut -d' ' -f2-)
+  [ -n "$previous" ] && [ -f "$previous/${db}.${ext}" ] || return 1
+  local old_fingerprint dumped_at
+  read -r old_fingerprint dumped_at _ < "$previous/${db}.fingerprint"
+  [ "$old_fingerprint" = "$fingerprint" ] || return 1
+  [[ "$dumped_at" =~ ^[0-9]+$ ]] && [ $(( $(date +%s) - dumped_at )) -lt "$max_age" ] || return 1
+  echo "$previous/${db}.${ext} $dumped_at ${previous#"$BACKUP_DIR_BASE"/}"
+}
+
+# Worker: dump one database straight into the compressor and onto disk, then
+# record "<db> <status> <size_mb> <compressed_bytes> <duration> <binlog_file>
+# <binlog_pos> <dumped|reused> <source>" for run_backup.
+dump_database() {
+  local db="$1" target_dir="$2" codec="$3" threads="$4" result_file="$5"
+  local ext; ext="$(codec_extension "$codec")"
+  local outfile="$target_dir/${db}.${ext}"
+  local db_start_time=$(date +%s)
+  log "Backing up database: $db"
+
+  # Get database size before backup
+  local db_size_mb=$(mysql -h"${MYSQL_HOST}" -P"${MYSQL_PORT}" -u"${MYSQL_USER}" -p"${MYSQL_PASSWORD}" \
+    -e "SELECT ROUND(SUM(data_length + index_length) / 1024 / 1024, 2) as size_mb FROM information_schema.tables WHERE table_schema = '$db';" \
+    -s -N 2>/dev/null || echo "0")
+  [[ "$db_size_mb" =~ ^[0-9.]+$ ]] || db_size_mb=0
+
+  # Incremental chains need the binlog coordinates of each dump's snapshot.
+  local -a source_data=()
+  [ "${INCREMENTAL_ACTIVE:-0}" = "1" ] && source_data=(--source-data=2)
+
+  # Unchanged since the previous backup: hardlink its dump instead of dumping.
+  local fingerprint=""
+  if [ "${BACKUP_SKIP_UNCHANGED:-1}" = "1" ]; then
+    # Read the binlog position before fingerprinting so replay from it can
+    # only repeat, never miss, changes made after the check.
+    local coords_now="- -"
+    if [ "${#source_data[@]}" -gt 0 ]; then
+      coords_now=$(mysql_cmd -s -N -e "SHOW MASTER STATUS;" 2>/dev/null | awk 'NR==1 && NF>=2 {print $1" "$2}')
+      [ -n "$coords_now" ] || coords_now="- -"
+    fi
+    fingerprint="$(database_fingerprint "$db" 2>/dev/null || true)"
+    local reuse previous dumped_at source
+    if [ -n "$fingerprint" ] && reuse="$(find_reusable_dump "$db" "$ext" "$fingerprint" "$target_dir")"; then
+      read -r previous dumped_at source <<< "$reuse"
+      if ln "$previous" "$outfile" 2>/dev/null; then
+        echo "$fingerprint $dumped_at" > "$target_dir/${db}.fingerprint"
+        local compressed_size=$(ls -l "$outfile" 2>/dev/null | awk '{print $5}' || echo "0")
+        log "♻️  $db unchanged since ${source}; linked previous dump"
+        echo "$db ok $db_size_mb ${compressed_size:-0} 0 $coords_now reused $source" > "$result_file"
+        return 0
+      fi
+    fi
+  fi
+
+  # Write under a .partial name so a half-written dump never looks complete.
+  if ( set -o pipefail
+       mysqldump \
+         -h"${MYSQL_HOST}" -P"${MYSQL_PORT}" -u"${MYSQL_USER}" -p"${MYSQL_PASSWORD}" \
+         --single-transaction --routines --triggers --events \
+         --hex-blob --quick --lock-tables=false "${source_data[@]}" \
+         --add-drop-database --databases "$db" \
+         | write_dump "$codec" "$threads" "${outfile}.partial" ) \
+     && mv -f "${outfile}.partial" "$outfile"; then
+    local db_duration=$(( $(date +%s) - db_start_time ))
+    # Get compressed file size using ls (more portable than stat)
+    local compressed_size=$(ls -l "$outfile" 2>/dev/null | awk '{print $5}' || echo "0")
+    local coords="- -"
+    if [ "${#source_data[@]}" -gt 0 ]; then
+      coords=$(decompress_stream "$outfile" 2>/dev/null | head -n 60 \
+        | sed -n "s/.*SOURCE_LOG_FILE='\([^']*\)', SOURCE_LOG_POS=\([0-9]*\).*/\1 \2/p" | head -n 1)
+      [ -n "$coords" ] || coords="- -"
+    fi
+    [ -n "$fingerprint" ] && echo "$fingerprint $db_start_time" > "$target_dir/${db}.fingerprint"
+    echo "$db ok $db_size_mb ${compressed_size:-0} $db_duration $coords dumped -" > "$result_file"
+  else
+    rm -f "${outfile}.partial"
+    echo "$db failed $db_size_mb 0 $(( $(date +%s) - db_start_time )) - - failed -" > "$result_file"
+  fi
+}
+
+# Chunked mode: one consistent mysqlsh dump of every database, split into
+# per-table primary-key chunks, with the same per-database result files.
+dump_chunked() {
+  local target_dir="$1" results_dir="$2"
+  shift 2
+  local -a dbs=("$@")
+  local chunk_dir="$target_dir/chunked"
+  local start_time=$(date +%s) idx db
+  declare -A sizes=()
+  for db in "${dbs[@]}"; do
+    sizes["$db"]=$(mysql -h"${MYSQL_HOST}" -P"${MYSQL_PORT}" -u"${MYSQL_USER}" -p"${MYSQL_PASSWORD}" \
+      -e "SELECT ROUND(SUM(data_length + index_length) / 1024 / 1024, 2) as size_mb FROM information_schema.tables WHERE table_schema = '$db';" \
+      -s -N 2>/dev/null || echo "0")
+    [[ "${sizes[$db]}" =~ ^[0-9.]+$ ]] || sizes["$db"]=0
+  done
+
+  local status="ok"
+  if ! bash "$SCRIPT_DIR/backup-chunked.sh" dump --output "$chunk_dir" \
+       --schemas "$(IFS=,; echo "${dbs[*]}")"; then
+    status="failed"
+  fi
+  local duration=$(( $(date +%s) - start_time ))
+  # mysqlsh records the snapshot's binlog position once for the whole dump.
+  local coords="- -"
+  if [ "$status" = "ok" ] && [ -f "$chunk_dir/@.json" ]; then
+    local binlog_file binlog_pos
+    binlog_file=$(sed -n 's/.*"binlogFile": *"\([^"]*\)".*/\1/p' "$chunk_dir/@.json" | head -n 1)
+    binlog_pos=$(sed -n 's/.*"binlogPosition": *\([0-9]*\).*/\1/p' "$chunk_dir/@.json" | head -n 1)
+    [ -n "$binlog_file" ] && [ -n "$binlog_pos" ] && coords="$binlog_file $binlog_pos"
+  fi
+  for idx in "${!dbs[@]}"; do
+    db="${dbs[$idx]}"
+    local bytes=0
+    if [ "$status" = "ok" ]; then
+      bytes=$(find "$chunk_dir" -maxdepth 1 -type f \( -name "${db}@*" -o -name "${db}.*" \) -printf '%s\n' \
+        | awk '{s+=$1} END {print s+0}')
+    fi
+    echo "$db $status ${sizes[$db]} $bytes $duration $coords dumped -" > "$results_dir/$idx"
+  done
+}
+
+# Newest complete full backup that recorded binlog coordinates, as a path
+# relative to BACKUP_DIR_BASE (e.g. daily/20250101_090000).
+latest_full_backup() {
+  local dir best="" best_ts=""
+  for dir in "$DAILY_DIR"/*/ "$HOURLY_DIR"/*/; do
+    dir="${dir%/}"
+    [ -f "$dir/.backup_complete" ] && [ -s "$dir/binlog-position.txt" ] || continue
+    if [ -z "$best_ts" ] || [[ "$(basename "$dir")" > "$best_ts" ]]; then
+      best_ts="$(basename "$dir")"
+      best="${dir#"$BACKUP_DIR_BASE"/}"
+    fi
+  done
+  echo "$best"
+}
+
+# Incremental interval backup: rotate the binary log and archive every closed
+# segment written since the previous link in the chain (or since the base full
+# backup). Returns non-zero when no usable chain exists so the caller can take
+# a full backup instead.
+run_incremental() {
+  local tier_dir="$1" tier_type="$2"
+  local base; base="$(latest_full_backup)"
+  if [ -z "$base" ]; then
+    log "ℹ️  No full backup with binlog coordinates yet"
+    return 1
+  fi
+
+  # Continue after the last archived segment, or from the base's oldest file.
+  local last_file="" dir
+  for dir in "$HOURLY_DIR"/*/; do
+    dir="${dir%/}"
+    [ -f "$dir/.backup_complete" ] && [ -s "$dir/binlog-files.txt" ] || continue
+    [ "$(cat "$dir/binlog-base.txt" 2>/dev/null)" = "$base" ] || continue
+    last_file="$(tail -n 1 "$dir/binlog-files.txt")"
+  done
+  local start_file
+  start_file="$(awk '{print $2}' "$BACKUP_DIR_BASE/$base/binlog-position.txt" | sort | head -n 1)"
+
+  local backup_start_time=$(date +%s)
+  if ! mysql_cmd -e "FLUSH BINARY LOGS;" >/dev/null 2>&1; then
+    log "⚠️  Unable to rotate binary logs"
+    return 1
+  fi
+  local -a server_logs=()
+  mapfile -t server_logs < <(mysql_cmd -s -N -e "SHOW BINARY LOGS;" 2>/dev/null | awk '{print $1}')
+  if [ "${#server_logs[@]}" -lt 2 ]; then
+    log "⚠️  No closed binary logs available"
+    return 1
+  fi
+  # The last entry is the fresh log FLUSH just opened; everything before it is closed.
+  local -a closed=("${server_logs[@]:0:${#server_logs[@]}-1}") files=()
+  local name found_start=0 found_last=0
+  for name in "${closed[@]}"; do
+    [ "$name" = "$start_file" ] && found_start=1
+    if [ -n "$last_file" ]; then
+      [ "$name" = "$last_file" ] && found_last=1
+      [[ "$name" > "$last_file" ]] && files+=("$name")
+    elif [ "$found_start" = "1" ]; then
+      files+=("$name")
+    fi
+  done
+  # Missing files mean events were purged or the tmpfs datadir was reset.
+  if [ -n "$last_file" ] && [ "$found_last" != "1" ]; then
+    log "⚠️  Binary log chain broken after ${last_file}"
+    return 1
+  fi
+  if [ -z "$last_file" ] && [ "$found_start" != "1" ]; then
+    log "⚠️  Binary log ${start_file} from ${base} is no longer on the server"
+    return 1
+  fi
+
+  local ts=$(date '+%Y%m%d_%H%M%S')
+  local target_dir="$tier_dir/$ts"
+  mkdir -p "$target_dir/binlog"
+  log "Starting ${tier_type} incremental backup to $target_dir (${#files[@]} binlog segments since ${base})"
+  if ! mysqlbinlog --read-from-remote-server --raw \
+       --host="${MYSQL_HOST}" --port="${MYSQL_PORT}" --user="${MYSQL_USER}" --password="${MYSQL_PASSWORD}" \
+       --result-file="$target_dir/binlog/" "${files[@]}" 2>/dev/null; then
+    log "❌ Failed to fetch binary logs"
+    rm -rf "$target_dir"
+    return 1
+  fi
+  printf '%s\n' "${files[@]}" > "$target_dir/binlog-files.txt"
+  echo "$base" > "$target_dir/binlog-base.txt"
+
+  local -a dbs
+  mapfile -t dbs < <(awk '{print $1}' "$BACKUP_DIR_BASE/$base/binlog-position.txt")
+  local total_duration=$(( $(date +%s) - backup_start_time ))
+  local bytes; bytes=$(du -sb "$target_dir/binlog" | cut -f1)
+  local size_mb; size_mb=$(awk "BEGIN {printf \"%.2f\", $bytes / 1024 / 1024}")
+  local backup_rate=$(awk "BEGIN {if($total_duration > 0) printf \"%.2f\", $size_mb / $total_duration; else print \"0\"}")
+  local size; size=$(du -sh "$target_dir" | cut -f1)
+  local mysql_ver; mysql_ver=$(mysql_cmd -e 'SELECT VERSION();' -s -N 2>/dev/null || echo "unknown")
+
+  cat > "$target_dir/manifest.json" <<EOF
+{
+  "timestamp": "${ts}",
+  "type": "incremental",
+  "databases": [$(printf '"%s",' "${dbs[@]}" | sed 's/,$//')],
+  "backup_size": "${size}",
+  "retention_hours": ${RETENTION_HOURS},
+  "mysql_version": "${mysql_ver}",
+  "format": "binlog",
+  "base": "${base}",
+  "binlog_files": [$(printf '"%s",' "${files[@]}" | sed 's/,$//')],
+  "performance": {
+    "duration_seconds": ${total_duration},
+    "uncompressed_size_mb": ${size_mb},
+    "compressed_size_mb": ${size_mb},
+    "compression_ratio_percent": 0,
+    "throughput_mb_per_second": ${backup_rate}
+  }
+}
+EOF
+  touch "$target_dir/.backup_complete"
+  post_backup "$target_dir"
+  log "Incremental backup complete: $target_dir (${#files[@]} segments, size ${size})"
+  return 0
+}
+
 run_backup() {
   local tier_dir="$1"    # hourly or daily dir
   local tier_type="$2"   # "hourly" or "daily"
+
+  INCREMENTAL_ACTIVE="${BACKUP_INCREMENTAL:-0}"
+  if [ "$INCREMENTAL_ACTIVE" = "1" ] && ! binlog_enabled; then
+    log "⚠️  BACKUP_INCREMENTAL=1 but binary logging is off (MYSQL_DISABLE_BINLOG=1?); taking a plain full backup"
+    INCREMENTAL_ACTIVE=0
+  fi
+
+  # Interval backups only ship binary logs once a full backup anchors the chain.
+  if [ "$INCREMENTAL_ACTIVE" = "1" ] && [ "$tier_type" != "daily" ]; then
+    if run_incremental "$tier_dir" "$tier_type"; then
+      return 0
+    fi
+    log "ℹ️  Taking a full backup to start a new binlog chain"
+  fi
+
   local ts=$(date '+%Y%m%d_%H%M%S')
   local target_dir="$tier_dir/$ts"
   mkdir -p "$target_dir"
-  log "Starting ${tier_type} backup to $target_dir"
 
   local -a dbs
   mapfile -t dbs < <(database_list)
@@ -79,42 +478,109 @@ run_backup() {
   local total_uncompressed_size=0
   local total_compressed_size=0
 
-  for db in "${dbs[@]}"; do
-    local db_start_time=$(date +%s)
-    log "Backing up database: $db"
-
-    # Get database size before backup
-    local db_size_mb=$(mysql -h"${MYSQL_HOST}" -P"${MYSQL_PORT}" -u"${MYSQL_USER}" -p"${MYSQL_PASSWORD}" \
-      -e "SELECT ROUND(SUM(data_length + index_length) / 1024 / 1024, 2) as size_mb FROM information_schema.tables WHERE table_schema = '$db';" \
-      -s -N 2>/dev/null || echo "0")
+  local codec; codec="$(select_codec)"
+  local jobs="${BACKUP_PARALLEL_JOBS:-2}"
+  [[ "$jobs" =~ ^[1-9][0-9]*$ ]] || jobs=1
+  [ "$jobs" -gt "${#dbs[@]}" ] && jobs="${#dbs[@]}"
+  [ "$jobs" -lt 1 ] && jobs=1
+  # Split the cores between concurrent dumps unless told otherwise.
+  local threads="${BACKUP_COMPRESSION_THREADS:-}"
+  if ! [[ "$threads" =~ ^[1-9][0-9]*$ ]]; then
+    threads=$(( $(nproc 2>/dev/null || echo 1) / jobs ))
+    [ "$threads" -lt 1 ] && threads=1
+  fi
+  # Daily backups stay as plain mysqldump files so every restore path,
+  # including the automatic one in ac-db-import, can always read one.
+  local format="sql"
+  if [ "${BACKUP_FORMAT:-sql}" = "chunked" ] && [ "$tier_type" != "daily" ]; then
+    if command -v mysqlsh >/dev/null 2>&1; then
+      format="chunked"
+      codec="mysqlsh-${BACKUP_CHUNKED_COMPRESSION:-zstd}"
+    else
+      log "⚠️  mysqlsh not installed; falling back to per-database mysqldump"
+    fi
+  fi
+  if [ "$format" = "sql" ] && [ "${BACKUP_REPOSITORY:-0}" = "1" ] && [ "$tier_type" != "daily" ]; then
+    if command -v python3 >/dev/null 2>&1 && [ -f "$REPOSITORY_TOOL" ]; then
+      codec="repository"
+    else
+      log "⚠️  python3 not available; writing compressed dump files instead of repository indexes"
+    fi
+  fi
 
-    if mysqldump \
-      -h"${MYSQL_HOST}" -P"${MYSQL_PORT}" -u"${MYSQL_USER}" -p"${MYSQL_PASSWORD}" \
-      --single-transaction --routines --triggers --events \
-      --hex-blob --quick --lock-tables=false \
-      --add-drop-database --databases "$db" \
-      | gzip -c > "$target_dir/${db}.sql.gz"; then
+  local results_dir; results_dir="$(mktemp -d)"
+  local idx
+  if [ "$format" = "chunked" ]; then
+    log "Starting ${tier_type} chunked backup to $target_dir (${#dbs[@]} databases)"
+    dump_chunked "$target_dir" "$results_dir" "${dbs[@]}"
+  else
+    log "Starting ${tier_type} backup to $target_dir (${#dbs[@]} databases, ${jobs} parallel, ${codec} x${threads})"
+    local running=0
+    for idx in "${!dbs[@]}"; do
+      if [ "$running" -ge "$jobs" ]; then
+        wait -n || true
+        running=$((running - 1))
+      fi
+      dump_database "${dbs[$idx]}" "$target_dir" "$codec" "$threads" "$results_dir/$idx" &
+      running=$((running + 1))
+    done
+    wait || true
+  fi
 
-      local db_end_time=$(date +%s)
-      local db_duration=$((db_end_time - db_start_time))
-      # Get compressed file size using ls (more portable than stat)
-      local compressed_size=$(ls -l "$target_dir/${db}.sql.gz" 2>/dev/null | awk '{print $5}' || echo "0")
-      local compressed_size_mb=$((compressed_size / 1024 / 1024))
+  local -a binlog_lines=() dump_lines=()
+  local binlog_complete=1
+  for idx in "${!dbs[@]}"; do
+    local db="${dbs[$idx]}" status="failed" db_size_mb=0 compressed_size=0 db_duration=0
+    local binlog_file="-" binlog_pos="-" action="failed" source="-"
+    if [ -s "$results_dir/$idx" ]; then
+      read -r _ status db_size_mb compressed_size db_duration binlog_file binlog_pos action source < "$results_dir/$idx"
+    fi
+    if [ "$action" = "reused" ]; then
+      dump_lines+=("    \"${db}\": {\"action\": \"reused\", \"source\": \"${source}\", \"duration_seconds\": ${db_duration:-0}}")
+    else
+      dump_lines+=("    \"${db}\": {\"action\": \"${action:-failed}\", \"duration_seconds\": ${db_duration:-0}}")
+    fi
+    if [ "$status" != "ok" ]; then
+      log "❌ Failed to back up $db"
+      binlog_complete=0
+      continue
+    fi
+    if [ "${binlog_file:--}" = "-" ]; then
+      binlog_complete=0
+    else
+      binlog_lines+=("$db $binlog_file $binlog_pos")
+    fi
+    local compressed_size_mb=$((compressed_size / 1024 / 1024))
 
-      # Use awk for floating point arithmetic (more portable than bc)
-      total_uncompressed_size=$(awk "BEGIN {printf \"%.2f\", $total_uncompressed_size + $db_size_mb}")
-      total_compressed_size=$(awk "BEGIN {printf \"%.2f\", $total_compressed_size + $compressed_size_mb}")
+    # Use awk for floating point arithmetic (more portable than bc)
+    total_uncompressed_size=$(awk "BEGIN {printf \"%.2f\", $total_uncompressed_size + $db_size_mb}")
+    total_compressed_size=$(awk "BEGIN {printf \"%.2f\", $total_compressed_size + $compressed_size_mb}")
 
-      log "✅ Successfully backed up $db (${db_size_mb}MB → ${compressed_size_mb}MB, ${db_duration}s)"
+    if [ "$action" = "reused" ]; then
+      continue
+    fi
+    log "✅ Successfully backed up $db (${db_size_mb}MB → ${compressed_size_mb}MB, ${db_duration}s)"
 
-      # Warn about slow backups
-      if [[ $db_duration -gt 300 ]]; then
-        log "⚠️  Slow backup detected for $db: ${db_duration}s (>5min)"
-      fi
-    else
-      log "❌ Failed to back up $db"
+    # Warn about slow backups
+    if [[ $db_duration -gt 300 ]]; then
+      log "⚠️  Slow backup detected for $db: ${db_duration}s (>5min)"
     fi
   done
+  rm -rf "$results_dir"
+
+  # A full backup with binlog coordinates for every database can anchor an
+  # incremental chain (see run_incremental).
+  local binlog_block=""
+  if [ "$INCREMENTAL_ACTIVE" = "1" ] && [ "$binlog_complete" = "1" ] && [ "${#binlog_lines[@]}" -gt 0 ]; then
+    printf '%s\n' "${binlog_lines[@]}" > "$target_dir/binlog-position.txt"
+    binlog_block=$(printf '%s\n' "${binlog_lines[@]}" \
+      | awk 'BEGIN {printf "  \"binlog\": {"} {printf "%s\n    \"%s\": {\"file\": \"%s\", \"position\": %s}", (NR>1?",":""), $1, $2, $3} END {print "\n  },"}')
+    binlog_block+=$'\n'
+  fi
+  local dumps_block=""
+  if [ "${#dump_lines[@]}" -gt 0 ]; then
+    dumps_block="  \"dumps\": {"$'\n'"$(IFS=$'\n'; printf '%s' "${dump_lines[*]}" | sed '$!s/$/,/')"$'\n'"  },"$'\n'
+  fi
 
   # Calculate overall backup statistics
   local backup_end_time=$(date +%s)
@@ -136,7 +602,9 @@ run_backup() {
   "backup_size": "${size}",
   "retention_hours": ${RETENTION_HOURS},
   "mysql_version": "${mysql_ver}",
-  "performance": {
+  "format": "${format}",
+  "compression": "${codec}",
+${binlog_block}${dumps_block}  "performance": {
     "duration_seconds": ${total_duration},
     "uncompressed_size_mb": ${total_uncompressed_size},
     "compressed_size_mb": ${total_compressed_size},
@@ -154,7 +622,9 @@ EOF
   "backup_size": "${size}",
   "retention_days": ${RETENTION_DAYS},
   "mysql_version": "${mysql_ver}",
-  "performance": {
+  "format": "${format}",
+  "compression": "${codec}",
+${binlog_block}${dumps_block}  "performance": {
     "duration_seconds": ${total_duration},
     "uncompressed_size_mb": ${total_uncompressed_size},
     "compressed_size_mb": ${total_compressed_size},
@@ -167,6 +637,7 @@ EOF
 
   # Create completion marker to indicate backup is finished
   touch "$target_dir/.backup_complete"
+  post_backup "$target_dir"
 
   log "Backup complete: $target_dir (size ${size})"
   log "📊 Backup Statistics:"
@@ -194,8 +665,40 @@ EOF
 }
 
 cleanup_old() {
-  find "$HOURLY_DIR" -mindepth 1 -maxdepth 1 -type d -mmin +$((RETENTION_HOURS*60)) -print -exec rm -rf {} + 2>/dev/null || true
-  find "$DAILY_DIR" -mindepth 1 -maxdepth 1 -type d -mtime +$RETENTION_DAYS -print -exec rm -rf {} + 2>/dev/null || true
+  # Full backups that surviving incrementals replay from are kept until the
+  # incrementals themselves expire.
+  declare -A keep=()
+  local dir
+  for dir in "$HOURLY_DIR"/*/; do
+    dir="${dir%/}"
+    [ -s "$dir/binlog-base.txt" ] || continue
+    if [ -z "$(find "$dir" -maxdepth 0 -mmin +$((RETENTION_HOURS*60)) 2>/dev/null)" ]; then
+      keep["$BACKUP_DIR_BASE/$(cat "$dir/binlog-base.txt")"]=1
+    fi
+  done
+  local -a removed_dirs=()
+  while IFS= read -r dir; do
+    [ -n "$dir" ] && [ -z "${keep[$dir]:-}" ] || continue
+    echo "$dir"
+    rm -rf "$dir"
+    removed_dirs+=("$dir")
+  done < <(
+    find "$HOURLY_DIR" -mindepth 1 -maxdepth 1 -type d -mmin +$((RETENTION_HOURS*60)) 2>/dev/null
+    find "$DAILY_DIR" -mindepth 1 -maxdepth 1 -type d -mtime +$RETENTION_DAYS 2>/dev/null
+  )
+  # Repository chunks live as long as any surviving index (backup sets and
+  # exports under the backup root) references them.
+  local removed=${#removed_dirs[@]}
+  [ "$removed" -gt 0 ] && catalog_record remove "${removed_dirs[@]}"
+  if [ "$removed" -gt 0 ] && [ -d "$REPOSITORY_DIR/chunks" ] && command -v python3 >/dev/null 2>&1; then
+    local gc_result
+    if gc_result=$(python3 "$REPOSITORY_TOOL" gc --repo "$REPOSITORY_DIR" --root "$BACKUP_DIR_BASE" \
+         --grace "${BACKUP_REPOSITORY_GC_GRACE_SECONDS:-3600}" 2>/dev/null); then
+      log "🧹 Repository gc: ${gc_result}"
+    else
+      log "⚠️  Repository gc failed"
+    fi
+  fi
 }
 
 log "Backup scheduler starting: interval(${BACKUP_INTERVAL_MINUTES}m), daily($RETENTION_DAYS d at ${DAILY_TIME}:00)"
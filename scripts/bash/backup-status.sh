@@ -70,6 +70,30 @@ BACKUP_INTERVAL_MINUTES="${BACKUP_INTERVAL_MINUTES:-60}"
 BACKUP_RETENTION_HOURS="${BACKUP_RETENTION_HOURS:-6}"
 BACKUP_RETENTION_DAYS="${BACKUP_RETENTION_DAYS:-3}"
 BACKUP_DAILY_TIME="${BACKUP_DAILY_TIME:-09}"
+STATUS_CACHE_PATH="${STATUS_CACHE_PATH:-${STORAGE_PATH_LOCAL:-./local-storage}/status-cache}"
+case "$STATUS_CACHE_PATH" in
+  /*) ;;
+  *) STATUS_CACHE_PATH="$PROJECT_ROOT/${STATUS_CACHE_PATH#./}" ;;
+esac
+DIR_SIZES_SCRIPT="$PROJECT_ROOT/scripts/python/dir_sizes.py"
+CATALOG_SCRIPT="$PROJECT_ROOT/scripts/python/backup_catalog.py"
+USE_CATALOG=0
+
+# Query the backup catalog (tab-separated rows); fails when it is unavailable
+catalog_query() {
+  [ "$USE_CATALOG" = "1" ] || return 1
+  python3 "$CATALOG_SCRIPT" --root "$BACKUP_PATH" "$@" --format tsv --no-sync 2>/dev/null
+}
+
+# Reconcile the catalog once per run; later queries skip the directory listing
+init_catalog() {
+  if command -v python3 >/dev/null 2>&1 && [ -f "$CATALOG_SCRIPT" ] && [ -f "$BACKUP_PATH/catalog.sqlite" ]; then
+    python3 "$CATALOG_SCRIPT" --root "$BACKUP_PATH" sync --no-checksums >/dev/null 2>&1 || true
+    if python3 "$CATALOG_SCRIPT" --root "$BACKUP_PATH" summary --no-sync >/dev/null 2>&1; then
+      USE_CATALOG=1
+    fi
+  fi
+}
 
 # Format bytes to human readable
 format_bytes() {
@@ -85,10 +109,15 @@ format_bytes() {
   fi
 }
 
-# Get directory size
+# Get directory size (cached per-directory totals, falls back to du)
 get_dir_size() {
   local dir="$1"
   if [ -d "$dir" ]; then
+    if command -v python3 >/dev/null 2>&1 && [ -f "$DIR_SIZES_SCRIPT" ]; then
+      if python3 "$DIR_SIZES_SCRIPT" --cache "$STATUS_CACHE_PATH/backup-sizes.json" --format bytes "$dir" 2>/dev/null; then
+        return
+      fi
+    fi
     du -sb "$dir" 2>/dev/null | cut -f1
   else
     echo "0"
@@ -222,10 +251,15 @@ show_backup_tier() {
     return
   fi
 
-  local count size latest
-  count=$(count_backups "$tier_dir")
-  size=$(get_dir_size "$tier_dir")
-  latest=$(get_latest_backup "$tier_dir")
+  local count size latest catalog_row
+  if catalog_row=$(catalog_query summary --tier "$(basename "$tier_dir")"); then
+    IFS=$'\t' read -r _ count size latest _ <<< "${catalog_row:-x 0 0 }"
+    count="${count:-0}"; size="${size:-0}"
+  else
+    count=$(count_backups "$tier_dir")
+    size=$(get_dir_size "$tier_dir")
+    latest=$(get_latest_backup "$tier_dir")
+  fi
 
   if [ "$count" = "0" ]; then
     printf "  ${ICON_WARNING} ${YELLOW}%s:${NC} No backups found\n" "$tier_name"
@@ -243,7 +277,15 @@ show_backup_tier() {
 
   if [ "$SHOW_DETAILS" = "1" ]; then
     printf "     ${ICON_BACKUP} Available backups:\n"
-    local backup_list
+    local backup_list catalog_rows
+    if catalog_rows=$(catalog_query list --tier "$(basename "$tier_dir")"); then
+      # id path tier timestamp created_at type format compression complete size_bytes ...
+      while IFS=$'\t' read -r _ _ _ backup _ _ _ _ _ backup_size _; do
+        [ -n "$backup" ] || continue
+        printf "        - %s: %s (%s)\n" "$backup" "$(format_bytes "$backup_size")" "$(time_ago "$(parse_timestamp "$backup")")"
+      done <<< "$catalog_rows"
+      return
+    fi
     backup_list=$(ls -1t "$tier_dir" 2>/dev/null || true)
     while IFS= read -r backup; do
       if [ -n "$backup" ]; then
@@ -260,6 +302,33 @@ show_backup_tier() {
 }
 
 # Show size trends
+# Write-behind binlog stream (binlog-stream.sh) state and lag
+show_binlog_stream() {
+  local status_file="$BACKUP_PATH/binlog-stream/status.json"
+  [ -f "$status_file" ] || return 0
+  field() { sed -n "s/.*\"$1\": *\"\{0,1\}\([^\",}]*\)\"\{0,1\}.*/\1/p" "$status_file" | head -n 1; }
+  local state lag_bytes lag_seconds max_lag local_file age
+  state="$(field state)"
+  lag_bytes="$(field lag_bytes)"
+  lag_seconds="$(field lag_seconds)"
+  max_lag="$(field max_lag_seconds)"
+  local_file="$(field local_file)"
+  age=$(( $(date +%s) - $(stat -c %Y "$status_file") ))
+
+  printf "${BOLD}📼 Binlog Stream${NC}\n"
+  echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
+  if [ "$age" -gt 300 ]; then
+    printf "  ${YELLOW}${ICON_WARNING} No update for %s seconds (state: %s)${NC}\n" "$age" "${state:-unknown}"
+  elif [ "$state" = "streaming" ] && [ "${lag_seconds:-0}" -le "${max_lag:-60}" ]; then
+    printf "  ${GREEN}${ICON_SUCCESS} Streaming:${NC} %s, lag %s (%ss)\n" "${local_file:--}" "$(format_bytes "${lag_bytes:-0}")" "${lag_seconds:-0}"
+  elif [ "$state" = "streaming" ]; then
+    printf "  ${RED}${ICON_WARNING} Behind:${NC} lag %s (%ss, limit %ss)\n" "$(format_bytes "${lag_bytes:-0}")" "${lag_seconds:-0}" "${max_lag:-60}"
+  else
+    printf "  ${YELLOW}${ICON_WARNING} State:${NC} %s\n" "${state:-unknown}"
+  fi
+  echo
+}
+
 show_trends() {
   printf "${BOLD}${ICON_CHART} Backup Size Trends${NC}\n"
   echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
@@ -270,9 +339,19 @@ show_trends() {
     return
   fi
 
-  # Get last 7 daily backups
-  local backup_list
-  backup_list=$(ls -1t "$daily_dir" 2>/dev/null | head -7 | tac)
+  # Get last 7 daily backups (sizes from the catalog when available)
+  local backup_list catalog_rows
+  declare -A catalog_sizes=()
+  if catalog_rows=$(catalog_query trends --tier daily --limit 7); then
+    backup_list=""
+    while IFS=$'\t' read -r _ _ _ backup _ _ _ _ _ backup_size _; do
+      [ -n "$backup" ] || continue
+      catalog_sizes["$backup"]="$backup_size"
+      backup_list+="${backup}"$'\n'
+    done <<< "$catalog_rows"
+  else
+    backup_list=$(ls -1t "$daily_dir" 2>/dev/null | head -7 | tac)
+  fi
 
   if [ -z "$backup_list" ]; then
     printf "  ${ICON_WARNING} Not enough backups for trend analysis\n\n"
@@ -284,7 +363,7 @@ show_trends() {
   while IFS= read -r backup; do
     if [ -n "$backup" ]; then
       local size
-      size=$(get_dir_size "$daily_dir/$backup")
+      size="${catalog_sizes[$backup]:-$(get_dir_size "$daily_dir/$backup")}"
       if [ "$size" -gt "$max_size" ]; then
         max_size=$size
       fi
@@ -295,7 +374,7 @@ show_trends() {
   while IFS= read -r backup; do
     if [ -n "$backup" ]; then
       local size
-      size=$(get_dir_size "$daily_dir/$backup")
+      size="${catalog_sizes[$backup]:-$(get_dir_size "$daily_dir/$backup")}"
       local timestamp
       timestamp=$(parse_timestamp "$backup")
       local date_str="${timestamp:0:4}-${timestamp:4:2}-${timestamp:6:2}"
@@ -335,6 +414,8 @@ main() {
     exit 1
   fi
 
+  init_catalog
+
   # Show current backup tiers
   printf "${BOLD}${ICON_BACKUP} Backup Tiers${NC}\n"
   echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
@@ -374,6 +455,8 @@ main() {
 
   echo
 
+  show_binlog_stream
+
   # Show next scheduled backups
   printf "${BOLD}${ICON_SCHEDULE} Backup Schedule${NC}\n"
   echo "━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━"
@@ -387,8 +470,13 @@ main() {
   local total_size=0
   for tier_dir in "$BACKUP_PATH/hourly" "$BACKUP_PATH/daily"; do
     if [ -d "$tier_dir" ]; then
-      local size
-      size=$(get_dir_size "$tier_dir")
+      local size catalog_row
+      if catalog_row=$(catalog_query summary --tier "$(basename "$tier_dir")"); then
+        IFS=$'\t' read -r _ _ size _ <<< "${catalog_row:-x 0 0}"
+        size="${size:-0}"
+      else
+        size=$(get_dir_size "$tier_dir")
+      fi
       total_size=$((total_size + size))
     fi
   done
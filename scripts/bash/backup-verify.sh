@@ -0,0 +1,224 @@
+#!/bin/bash
+# Stream every dump in a backup set and check it can actually be restored.
+set -euo pipefail
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+
+usage() {
+  cat <<'EOF'
+Usage: ./backup-verify.sh [options] BACKUP_DIR
+
+Decompresses every dump in a backup set in parallel and checks:
+  - compression framing (gzip/zstd CRCs, repository chunk hashes)
+  - the mysqldump "-- Dump completed" trailer at the end of the stream
+  - CREATE TABLE and INSERT statement counts per table
+Results are added to the set's manifest.json under "verification".
+
+Options:
+  -j, --jobs N          Dumps verified concurrently (default: $BACKUP_VERIFY_JOBS or nproc)
+      --no-manifest     Only print results; leave manifest.json untouched
+  -q, --quiet           Print failures only
+  -h, --help            Show this help
+
+Exit codes:
+  0 - Every dump verified
+  1 - At least one dump is truncated, corrupt or incomplete
+EOF
+}
+
+JOBS="${BACKUP_VERIFY_JOBS:-}"
+WRITE_MANIFEST=true
+QUIET=false
+BACKUP_DIR=""
+
+while [[ $# -gt 0 ]]; do
+  case "$1" in
+    -j|--jobs)
+      [[ $# -ge 2 ]] || { echo "Error: --jobs requires a value" >&2; exit 1; }
+      JOBS="$2"
+      shift 2
+      ;;
+    --no-manifest) WRITE_MANIFEST=false; shift ;;
+    -q|--quiet) QUIET=true; shift ;;
+    -h|--help) usage; exit 0 ;;
+    -*) echo "Error: Unknown option $1" >&2; exit 1 ;;
+    *)
+      [[ -z "$BACKUP_DIR" ]] || { echo "Error: Multiple backup directories specified" >&2; exit 1; }
+      BACKUP_DIR="$1"
+      shift
+      ;;
+  esac
+done
+
+[[ -n "$BACKUP_DIR" ]] || { echo "Error: Backup directory required" >&2; usage; exit 1; }
+[[ -d "$BACKUP_DIR" ]] || { echo "Error: Backup directory not found: $BACKUP_DIR" >&2; exit 1; }
+BACKUP_DIR="${BACKUP_DIR%/}"
+[[ "$JOBS" =~ ^[1-9][0-9]*$ ]] || JOBS="$(nproc 2>/dev/null || echo 2)"
+
+say() { $QUIET || echo "$*"; }
+
+stream_dump() {
+  case "$1" in
+    *.gz) gzip -dc "$1" ;;
+    *.zst) zstd -q -dc "$1" ;;
+    *.idx) python3 "$SCRIPT_DIR/../python/backup_repo.py" cat "$1" ;;
+    *) cat "$1" ;;
+  esac
+}
+
+# Count statements per table and note whether the last non-blank line is the
+# completion trailer. Emits the JSON fragment for one database.
+COUNT_AWK='
+  substr($0, 1, 13) == "CREATE TABLE " {
+    if (match($0, /`[^`]+`/)) { t = substr($0, RSTART + 1, RLENGTH - 2); create[t]++; seen[t] = 1 }
+    creates++
+  }
+  substr($0, 1, 12) == "INSERT INTO " {
+    if (match($0, /`[^`]+`/)) { t = substr($0, RSTART + 1, RLENGTH - 2); insert[t]++; seen[t] = 1 }
+    inserts++
+  }
+  NF { last = $0 }
+  END {
+    trailer = (substr(last, 1, 17) == "-- Dump completed") ? "true" : "false"
+    printf "\"trailer\": %s, \"create_tables\": %d, \"inserts\": %d, \"tables\": {", trailer, creates, inserts
+    sep = ""
+    for (t in seen) {
+      name = t
+      gsub(/["\\]/, "", name)
+      printf "%s\"%s\": {\"create\": %d, \"inserts\": %d}", sep, name, create[t], insert[t]
+      sep = ", "
+    }
+    printf "}"
+    exit (trailer == "true") ? 0 : 3
+  }'
+
+# Worker: verify one dump and write "<status>\t<json>" to $3.
+verify_dump() {
+  local db="$1" file="$2" out="$3"
+  local start=$(date +%s) body="" status framing="ok" rc=0
+  body=$( stream_dump "$file" 2>/dev/null | awk "$COUNT_AWK"
+          codes=("${PIPESTATUS[@]}")
+          [ "${codes[0]}" -eq 0 ] || exit 2
+          exit "${codes[1]}" ) || rc=$?
+  case "$rc" in
+    0) status="ok" ;;
+    3) status="failed" ;;
+    *) status="failed"; framing="corrupt" ;;
+  esac
+  [ -n "$body" ] || body="\"trailer\": false, \"create_tables\": 0, \"inserts\": 0, \"tables\": {}"
+  printf '%s\t"%s": {"status": "%s", "file": "%s", "framing": "%s", %s, "seconds": %d}\n' \
+    "$status" "$db" "$status" "$(basename "$file")" "$framing" "$body" $(( $(date +%s) - start )) > "$out"
+}
+
+# mysqlsh sets: every data chunk of the schema must pass the codec's own test.
+verify_chunked() {
+  local db="$1" dir="$2" out="$3"
+  local start=$(date +%s) status="ok" framing="ok" chunks=0 tables=0 file
+  [ -f "$dir/@.done.json" ] || { status="failed"; framing="incomplete"; }
+  tables=$(find "$dir" -maxdepth 1 -name "${db}@*.json" ! -name '*@@*' | wc -l)
+  while IFS= read -r file; do
+    chunks=$((chunks + 1))
+    case "$file" in
+      *.zst) zstd -q -t "$file" >/dev/null 2>&1 ;;
+      *.gz) gzip -t "$file" >/dev/null 2>&1 ;;
+      *) true ;;
+    esac || { status="failed"; framing="corrupt"; }
+  done < <(find "$dir" -maxdepth 1 -name "${db}@*" ! -name '*.json' ! -name '*.idx' ! -name '*@@*' | sort)
+  printf '%s\t"%s": {"status": "%s", "file": "chunked/", "framing": "%s", "chunks": %d, "tables": %d, "seconds": %d}\n' \
+    "$status" "$db" "$status" "$framing" "$chunks" "$tables" $(( $(date +%s) - start )) > "$out"
+}
+
+declare -a DBS=() FILES=()
+for file in "$BACKUP_DIR"/*.sql.gz "$BACKUP_DIR"/*.sql.zst "$BACKUP_DIR"/*.sql.idx "$BACKUP_DIR"/*.sql; do
+  [ -f "$file" ] || continue
+  name="$(basename "$file")"
+  DBS+=("${name%%.sql*}")
+  FILES+=("$file")
+done
+if [ -f "$BACKUP_DIR/chunked/@.json" ] || [ -f "$BACKUP_DIR/chunked/@.done.json" ]; then
+  for file in "$BACKUP_DIR"/chunked/*.json; do
+    name="$(basename "$file" .json)"
+    [[ "$name" == *@* ]] && continue
+    DBS+=("$name")
+    FILES+=("chunked")
+  done
+fi
+# Binlog increments carry no dumps; make sure the archived segments are there.
+if [ "${#DBS[@]}" -eq 0 ] && [ -s "$BACKUP_DIR/binlog-files.txt" ]; then
+  missing=0
+  while IFS= read -r segment; do
+    [ -n "$segment" ] && [ ! -s "$BACKUP_DIR/binlog/$segment" ] && missing=$((missing + 1))
+  done < "$BACKUP_DIR/binlog-files.txt"
+  [ "$missing" -eq 0 ] || { echo "❌ ${missing} archived binlog segment(s) missing in $BACKUP_DIR"; exit 1; }
+  say "✅ Binlog segments present: $BACKUP_DIR"
+  exit 0
+fi
+[ "${#DBS[@]}" -gt 0 ] || { echo "❌ No dumps found in $BACKUP_DIR"; exit 1; }
+
+results_dir="$(mktemp -d)"
+trap 'rm -rf "$results_dir"' EXIT
+verify_start=$(date +%s)
+running=0
+for idx in "${!DBS[@]}"; do
+  if [ "$running" -ge "$JOBS" ]; then
+    wait -n || true
+    running=$((running - 1))
+  fi
+  if [ "${FILES[$idx]}" = "chunked" ]; then
+    verify_chunked "${DBS[$idx]}" "$BACKUP_DIR/chunked" "$results_dir/$idx" &
+  else
+    verify_dump "${DBS[$idx]}" "${FILES[$idx]}" "$results_dir/$idx" &
+  fi
+  running=$((running + 1))
+done
+wait || true
+
+failed=0
+declare -a entries=()
+for idx in "${!DBS[@]}"; do
+  status="failed" entry="\"${DBS[$idx]}\": {\"status\": \"failed\", \"framing\": \"unknown\"}"
+  if [ -s "$results_dir/$idx" ]; then
+    IFS=$'\t' read -r status entry < "$results_dir/$idx"
+  fi
+  if [ "$status" = "ok" ]; then
+    say "✅ ${DBS[$idx]}: $(sed -n 's/.*"create_tables": \([0-9]*\), "inserts": \([0-9]*\).*/\1 tables, \2 INSERT statements/p; s/.*"chunks": \([0-9]*\), "tables": \([0-9]*\).*/\2 tables in \1 chunks/p' <<< "$entry")"
+  else
+    failed=$((failed + 1))
+    echo "❌ ${DBS[$idx]}: $(sed -n 's/.*"framing": "\([a-z]*\)".*/framing \1/p' <<< "$entry")$(grep -q '"trailer": false' <<< "$entry" && echo ", missing '-- Dump completed' trailer")"
+  fi
+  entries+=("      ${entry}")
+done
+
+overall="ok"
+[ "$failed" -eq 0 ] || overall="failed"
+block="  \"verification\": {"$'\n'
+block+="    \"status\": \"${overall}\","$'\n'
+block+="    \"verified_at\": \"$(date -u '+%Y-%m-%dT%H:%M:%SZ')\","$'\n'
+block+="    \"seconds\": $(( $(date +%s) - verify_start )),"$'\n'
+block+="    \"databases\": {"$'\n'
+block+="$(IFS=$'\n'; printf '%s' "${entries[*]}" | sed '$!s/$/,/')"$'\n'
+block+="    }"$'\n'
+block+="  }"
+
+# The manifest is written by the scheduler with "verification" (if any) as the
+# last key, so replace from that key to the end, or append before the final brace.
+if $WRITE_MANIFEST && [ -f "$BACKUP_DIR/manifest.json" ]; then
+  manifest="$BACKUP_DIR/manifest.json"
+  awk -v block="$block" '
+    /^  "verification": \{/ { skipping = 1 }
+    !skipping { lines[++n] = $0 }
+    END {
+      while (n > 0 && lines[n] !~ /[^[:space:]]/) n--
+      if (n > 0 && lines[n] ~ /^}[[:space:]]*$/) n--
+      if (n > 0 && lines[n] !~ /[{,][[:space:]]*$/) lines[n] = lines[n] ","
+      for (i = 1; i <= n; i++) print lines[i]
+      print block
+      print "}"
+    }' "$manifest" > "${manifest}.tmp" && mv -f "${manifest}.tmp" "$manifest"
+fi
+
+if [ "$failed" -gt 0 ]; then
+  echo "❌ ${failed} of ${#DBS[@]} dump(s) failed verification: $BACKUP_DIR"
+  exit 1
+fi
+say "✅ All ${#DBS[@]} dump(s) verified: $BACKUP_DIR"
@@ -0,0 +1,352 @@
+#!/bin/bash
+# Write-behind persistence for the tmpfs MySQL datadir.
+# Streams binary log events to durable storage as the server writes them, and
+# after ac-mysql hydrates from a physical snapshot, replays the stream from the
+# snapshot's binlog position so only the last few seconds can be lost.
+set -euo pipefail
+
+usage() {
+  cat <<'EOF'
+Usage: binlog-stream.sh [replay|status]
+
+Without arguments runs the streaming daemon (the ac-binlog-stream service).
+"replay" brings a server hydrated from a snapshot forward with the stream and
+exits (the one-shot ac-binlog-replay service that database writers wait for).
+"status" prints the last status.json written by the daemon.
+
+The stream lives in BINLOG_STREAM_DIR with one directory per server run
+("epoch", named after @@server_uuid). epochs.tsv lists them in order with how
+each run started: "chain" (snapshot plus a completed replay) or "reset".
+
+Environment variables:
+  BINLOG_STREAM_ENABLED            Set to 0 to idle without streaming (default: 1)
+  BINLOG_STREAM_DIR                Durable stream directory (default: /backups/binlog-stream)
+  BINLOG_STREAM_STATUS_SECONDS     Status/fsync interval (default: 10)
+  BINLOG_STREAM_MAX_LAG_SECONDS    Lag after which the service reports unhealthy (default: 60)
+  BINLOG_STREAM_RETENTION_HOURS    Keep segments no snapshot needs for this long (default: 48)
+  BINLOG_STREAM_SERVER_ID          Replica server id used for the dump connection (default: 4242)
+  MYSQL_SNAPSHOT_DIR, MYSQL_SNAPSHOT_MARKER   Snapshots written by mysql-snapshot.sh
+  MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD
+EOF
+}
+
+log(){ echo "📼 [binlog-stream] $*"; }
+warn(){ echo "⚠️ [binlog-stream] $*" >&2; }
+
+STREAM_DIR="${BINLOG_STREAM_DIR:-/backups/binlog-stream}"
+SNAPSHOT_DIR="${MYSQL_SNAPSHOT_DIR:-/var/lib/mysql-persistent/snapshots}"
+SNAPSHOT_MARKER="${MYSQL_SNAPSHOT_MARKER:-/var/lib/mysql-persistent/.snapshot-restored}"
+STATUS_SECONDS="${BINLOG_STREAM_STATUS_SECONDS:-10}"
+MAX_LAG_SECONDS="${BINLOG_STREAM_MAX_LAG_SECONDS:-60}"
+RETENTION_HOURS="${BINLOG_STREAM_RETENTION_HOURS:-48}"
+SERVER_ID="${BINLOG_STREAM_SERVER_ID:-4242}"
+HEALTH_FILE="${BINLOG_STREAM_HEALTH_FILE:-/tmp/binlog-stream.ready}"
+EPOCHS="$STREAM_DIR/epochs.tsv"
+STATUS_FILE="$STREAM_DIR/status.json"
+
+MODE="stream"
+case "${1:-}" in
+  -h|--help) usage; exit 0 ;;
+  status)
+    [ -f "$STATUS_FILE" ] || { echo "No stream status at $STATUS_FILE" >&2; exit 1; }
+    cat "$STATUS_FILE"
+    exit 0
+    ;;
+  replay) MODE="replay" ;;
+  "") ;;
+  *) usage >&2; exit 1 ;;
+esac
+
+mysql_cmd(){
+  MYSQL_PWD="${MYSQL_PASSWORD:-}" mysql -h "${MYSQL_HOST:-ac-mysql}" -P "${MYSQL_PORT:-3306}" -u "${MYSQL_USER:-root}" -N -B "$@"
+}
+
+# Same low-priority treatment the scheduler gives its background verifier.
+declare -a THROTTLE=(nice -n 10)
+if command -v ionice >/dev/null 2>&1 && ionice -c 3 true 2>/dev/null; then
+  THROTTLE+=(ionice -c 3)
+fi
+
+json_field(){
+  sed -n "s/.*\"$2\": *\"\\{0,1\\}\\([^\",}]*\\)\"\\{0,1\\}.*/\\1/p" "$1" | head -n 1
+}
+
+epoch_files(){
+  find "$STREAM_DIR/$1" -maxdepth 1 -type f -name '*.[0-9]*' ! -name '.*' -printf '%f\n' 2>/dev/null | sort
+}
+
+epoch_base(){
+  awk -F'\t' -v id="$1" '$1 == id {print $3}' "$EPOCHS"
+}
+
+mark_ready(){ printf '%s\n' "$*" > "$HEALTH_FILE"; }
+mark_unhealthy(){ rm -f "$HEALTH_FILE" 2>/dev/null || true; }
+
+STATE="starting" EPOCH="" STREAMER_PID="" CAUGHT_UP_AT="$(date +%s)" LAST_REPLAY="null"
+
+write_status(){
+  local server_file="${1:-}" server_pos="${2:-0}" local_file="${3:-}" local_bytes="${4:-0}" lag_bytes="${5:-0}" lag_seconds="${6:-0}"
+  cat > "${STATUS_FILE}.tmp" <<EOF
+{
+  "updated_at": "$(date -u '+%Y-%m-%dT%H:%M:%SZ')",
+  "state": "${STATE}",
+  "epoch": "${EPOCH}",
+  "server_file": "${server_file}",
+  "server_position": ${server_pos:-0},
+  "local_file": "${local_file}",
+  "local_bytes": ${local_bytes:-0},
+  "lag_bytes": ${lag_bytes:-0},
+  "lag_seconds": ${lag_seconds:-0},
+  "max_lag_seconds": ${MAX_LAG_SECONDS},
+  "last_replay": ${LAST_REPLAY}
+}
+EOF
+  mv -f "${STATUS_FILE}.tmp" "$STATUS_FILE"
+}
+
+# Replay one epoch's segments into the server without binlogging them again.
+# $2/$3 give the starting file and position (empty = from the first segment).
+replay_epoch(){
+  local epoch="$1" start_file="${2:-}" start_pos="${3:-}"
+  local -a files=() args=()
+  local file
+  while IFS= read -r file; do
+    [ -n "$start_file" ] && [[ "$file" < "$start_file" ]] && continue
+    files+=("$STREAM_DIR/$epoch/$file")
+    # A gap means events were lost while the stream was down; stop before it.
+    [ -e "$STREAM_DIR/$epoch/.gap-after-$file" ] && { warn "Stream gap after ${file} in ${epoch}; replay stops there"; break; }
+  done < <(epoch_files "$epoch")
+  [ "${#files[@]}" -gt 0 ] || return 0
+  [ -n "$start_pos" ] && args+=(--start-position="$start_pos")
+  log "Replaying ${#files[@]} segment(s) from epoch ${epoch}${start_file:+ starting at ${start_file}:${start_pos}}"
+  mysqlbinlog --disable-log-bin "${args[@]}" "${files[@]}" | mysql_cmd
+  local codes=("${PIPESTATUS[@]}")
+  if [ "${codes[0]}" -ne 0 ] || [ "${codes[1]}" -ne 0 ]; then
+    return 1
+  fi
+  if [ -e "$STREAM_DIR/$epoch/.gap-after-${files[-1]##*/}" ]; then
+    return 2
+  fi
+}
+
+# ac-mysql unpacked a snapshot into a fresh server: bring it forward by
+# replaying the stream from the snapshot's clone position through every run
+# that chained onto it. Returns 0 only when the data is now current.
+replay_after_snapshot(){
+  [ -f "$SNAPSHOT_MARKER" ] || return 1
+  local marker snapshot meta
+  marker="$(cat "$SNAPSHOT_MARKER")"
+  [ "$marker" != "$(cat "$STREAM_DIR/.replayed" 2>/dev/null)" ] || return 1
+  snapshot="$(cut -f2 <<< "$marker")"
+  meta="$SNAPSHOT_DIR/${snapshot%.tar.*}.json"
+  local snap_epoch snap_file snap_pos
+  snap_epoch="$(json_field "$meta" server_uuid 2>/dev/null || true)"
+  snap_file="$(json_field "$meta" binlog_file 2>/dev/null || true)"
+  snap_pos="$(json_field "$meta" binlog_position 2>/dev/null || true)"
+  if [ -z "$snap_epoch" ] || [ -z "$snap_file" ] || [ ! -d "$STREAM_DIR/$snap_epoch" ]; then
+    warn "Snapshot ${snapshot} has no streamed binlog to replay"
+    LAST_REPLAY="{\"snapshot\": \"${snapshot}\", \"status\": \"nothing-to-replay\"}"
+    printf '%s\n' "$marker" > "$STREAM_DIR/.replayed"
+    return 1
+  fi
+
+  local start replayed=0 rc=0 id base following=0
+  start="$(date +%s)"
+  STATE="replaying"; write_status
+  while IFS=$'\t' read -r id _ base; do
+    if [ "$id" = "$snap_epoch" ]; then
+      following=1
+      replay_epoch "$id" "$snap_file" "$snap_pos" || rc=$?
+    elif [ "$following" = "1" ]; then
+      [ "$base" = "chain" ] || break
+      replay_epoch "$id" || rc=$?
+    else
+      continue
+    fi
+    [ "$rc" -eq 0 ] || break
+    replayed=$((replayed + 1))
+  done < "$EPOCHS"
+  printf '%s\n' "$marker" > "$STREAM_DIR/.replayed"
+
+  local status="ok"
+  [ "$rc" -eq 0 ] || status="failed"
+  [ "$rc" -eq 2 ] && status="partial"
+  LAST_REPLAY="{\"snapshot\": \"${snapshot}\", \"status\": \"${status}\", \"epochs\": ${replayed}, \"seconds\": $(( $(date +%s) - start )), \"at\": \"$(date -u '+%Y-%m-%dT%H:%M:%SZ')\"}"
+  if [ "$rc" -ne 0 ]; then
+    warn "Replay on top of ${snapshot} ${status}; the new run starts a fresh chain"
+    return 1
+  fi
+  log "Replayed ${replayed} epoch(s) on top of ${snapshot} in $(( $(date +%s) - start ))s"
+}
+
+# Record a server run in epochs.tsv, replaying onto a hydrated snapshot first.
+register_run(){
+  local uuid="$1" base="reset"
+  if replay_after_snapshot; then
+    base="chain"
+  fi
+  printf '%s\t%s\t%s\n' "$uuid" "$(date -u '+%Y-%m-%dT%H:%M:%SZ')" "$base" >> "$EPOCHS"
+  log "New server run ${uuid} (${base})"
+}
+
+stop_streamer(){
+  if [ -n "$STREAMER_PID" ]; then
+    kill "$STREAMER_PID" 2>/dev/null || true
+    wait "$STREAMER_PID" 2>/dev/null || true
+    STREAMER_PID=""
+  fi
+}
+
+start_streamer(){
+  local epoch="$1" dir="$STREAM_DIR/$1" start_file=""
+  mkdir -p "$dir"
+  local -a server=()
+  mapfile -t server < <(mysql_cmd -e "SHOW BINARY LOGS;" | awk '{print $1}')
+  [ "${#server[@]}" -gt 0 ] || return 1
+  start_file="$(epoch_files "$epoch" | tail -n 1)"
+  if [ -n "$start_file" ] && ! printf '%s\n' "${server[@]}" | grep -qx "$start_file"; then
+    warn "${start_file} is no longer on the server; recording a gap in the stream"
+    touch "$dir/.gap-after-$start_file"
+    start_file=""
+  fi
+  [ -n "$start_file" ] || start_file="${server[0]}"
+  log "Streaming ${epoch} from ${start_file}"
+  # The last local segment is fetched again from its start, overwriting it.
+  MYSQL_PWD="${MYSQL_PASSWORD:-}" "${THROTTLE[@]}" mysqlbinlog --read-from-remote-server --raw --stop-never \
+    --connection-server-id="$SERVER_ID" --host="${MYSQL_HOST:-ac-mysql}" --port="${MYSQL_PORT:-3306}" \
+    --user="${MYSQL_USER:-root}" --result-file="$dir/" "$start_file" &
+  STREAMER_PID=$!
+}
+
+# Compare the server's write position with what is on disk, fsync the open
+# segment, and refresh status/health.
+check_lag(){
+  local dir="$STREAM_DIR/$EPOCH"
+  local local_file local_bytes=0
+  local_file="$(epoch_files "$EPOCH" | tail -n 1)"
+  if [ -n "$local_file" ]; then
+    sync "$dir/$local_file" 2>/dev/null || true
+    local_bytes="$(stat -c %s "$dir/$local_file" 2>/dev/null || echo 0)"
+  fi
+  local logs lag_bytes server_file server_pos
+  logs="$(mysql_cmd -e "SHOW BINARY LOGS;" 2>/dev/null)" || return 1
+  server_file="$(tail -n 1 <<< "$logs" | awk '{print $1}')"
+  server_pos="$(tail -n 1 <<< "$logs" | awk '{print $2}')"
+  lag_bytes="$(awk -v f="$local_file" -v b="$local_bytes" '
+    f == "" || $1 > f { lag += $2 }
+    $1 == f && $2 > b { lag += $2 - b }
+    END { print lag + 0 }' <<< "$logs")"
+  local now lag_seconds=0
+  now="$(date +%s)"
+  if [ "$lag_bytes" -eq 0 ]; then
+    CAUGHT_UP_AT="$now"
+  else
+    lag_seconds=$((now - CAUGHT_UP_AT))
+  fi
+  write_status "$server_file" "$server_pos" "$local_file" "$local_bytes" "$lag_bytes" "$lag_seconds"
+  if [ "$lag_seconds" -le "$MAX_LAG_SECONDS" ]; then
+    mark_ready "streaming ${EPOCH} lag=${lag_bytes}B/${lag_seconds}s"
+  else
+    warn "Stream is ${lag_seconds}s (${lag_bytes} bytes) behind the server"
+    mark_unhealthy
+  fi
+}
+
+# Segments stay while any snapshot can still be brought forward with them;
+# older ones are kept for BINLOG_STREAM_RETENTION_HOURS (handy for PITR).
+prune_stream(){
+  local oldest_epoch="" oldest_file="" meta id file
+  while IFS= read -r meta; do
+    id="$(json_field "$meta" server_uuid)"; file="$(json_field "$meta" binlog_file)"
+    [ -n "$id" ] && [ -n "$file" ] || continue
+    local idx; idx="$(awk -F'\t' -v id="$id" '$1 == id {print NR}' "$EPOCHS")"
+    [ -n "$idx" ] || continue
+    if [ -z "$oldest_epoch" ] || [ "$idx" -lt "$oldest_epoch" ] || { [ "$idx" -eq "$oldest_epoch" ] && [[ "$file" < "$oldest_file" ]]; }; then
+      oldest_epoch="$idx"; oldest_file="$file"
+    fi
+  done < <(find "$SNAPSHOT_DIR" -maxdepth 1 -name 'datadir-*.json' 2>/dev/null)
+
+  local n=0 cutoff
+  cutoff=$(( $(date +%s) - RETENTION_HOURS * 3600 ))
+  while IFS=$'\t' read -r id _ _; do
+    n=$((n + 1))
+    [ "$id" = "$EPOCH" ] && continue
+    while IFS= read -r file; do
+      if [ -n "$oldest_epoch" ]; then
+        [ "$n" -gt "$oldest_epoch" ] && continue
+        [ "$n" -eq "$oldest_epoch" ] && ! [[ "$file" < "$oldest_file" ]] && continue
+      fi
+      [ "$(stat -c %Y "$STREAM_DIR/$id/$file")" -lt "$cutoff" ] || continue
+      rm -f "$STREAM_DIR/$id/$file" "$STREAM_DIR/$id/.gap-after-$file"
+    done < <(epoch_files "$id")
+  done < "$EPOCHS"
+}
+
+mkdir -p "$STREAM_DIR"
+touch "$EPOCHS"
+
+# One-shot startup step: finish the replay before anything else writes, then
+# exit. A failed replay only starts a fresh chain, so it does not block startup.
+if [ "$MODE" = "replay" ]; then
+  if [ "${BINLOG_STREAM_ENABLED:-1}" != "1" ]; then
+    log "Stream disabled; nothing to replay"
+    exit 0
+  fi
+  uuid="$(mysql_cmd -e "SELECT @@server_uuid;")" || { warn "Cannot reach ${MYSQL_HOST:-ac-mysql}"; exit 1; }
+  if [ -z "$(epoch_base "$uuid")" ]; then
+    register_run "$uuid"
+  else
+    log "Server run ${uuid} already recorded"
+  fi
+  exit 0
+fi
+
+trap 'stop_streamer; mark_unhealthy; exit 0' TERM INT
+mark_unhealthy
+log "Persisting binary logs from ${MYSQL_HOST:-ac-mysql}:${MYSQL_PORT:-3306} to ${STREAM_DIR}"
+
+ticks=0
+while true; do
+  if [ "${BINLOG_STREAM_ENABLED:-1}" != "1" ]; then
+    STATE="disabled"; write_status; mark_ready "disabled"
+    sleep 300
+    continue
+  fi
+  if ! mysql_cmd -e "SELECT 1" >/dev/null 2>&1; then
+    stop_streamer
+    STATE="waiting"; write_status; mark_unhealthy
+    sleep "$STATUS_SECONDS"
+    continue
+  fi
+  if [ "$(mysql_cmd -e "SELECT @@log_bin;" 2>/dev/null)" != "1" ]; then
+    # Nothing to persist; stay healthy so dependants are not blocked.
+    STATE="binlog-off"; write_status; mark_ready "binary logging disabled"
+    sleep 60
+    continue
+  fi
+
+  uuid="$(mysql_cmd -e "SELECT @@server_uuid;")"
+  if [ "$uuid" != "$EPOCH" ] || [ -z "$STREAMER_PID" ] || ! kill -0 "$STREAMER_PID" 2>/dev/null; then
+    stop_streamer
+    if [ -z "$(epoch_base "$uuid")" ]; then
+      # ac-mysql restarted on its own after stack startup, so ac-binlog-replay
+      # did not run for this server run: replay here before streaming it.
+      mark_unhealthy
+      register_run "$uuid"
+    fi
+    EPOCH="$uuid"
+    STATE="streaming"
+    if ! start_streamer "$EPOCH"; then
+      STATE="error"; write_status; mark_unhealthy
+      sleep "$STATUS_SECONDS"
+      continue
+    fi
+  fi
+
+  check_lag || true
+  ticks=$((ticks + 1))
+  if [ $((ticks % 360)) -eq 0 ]; then
+    prune_stream
+  fi
+  sleep "$STATUS_SECONDS"
+done
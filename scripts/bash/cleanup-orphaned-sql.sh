@@ -67,6 +67,8 @@ NOTES:
     - It does NOT reverse any SQL that was applied
     - This is safe to run and only cleans up tracking metadata
     - Orphaned entries occur when modules are removed/updated
+    - Files under data/sql/updates, custom and archive count as present
+    - Deletes run in chunks inside one transaction per database
 
 EOF
     exit 0
@@ -142,116 +144,25 @@ if [[ "$DRY_RUN" == true ]]; then
     echo
 fi
 
-# Function to get SQL files from worldserver container
-get_sql_files() {
-    local db_type=$1
-    docker exec "$WORLDSERVER_CONTAINER" find "/azerothcore/data/sql/updates/${db_type}/" -name "*.sql" -type f 2>/dev/null | \
-        xargs -I {} basename {} 2>/dev/null || true
-}
-
-# Function to clean orphaned entries
-clean_orphaned_entries() {
-    local database=$1
-    local db_type=$2
-
-    echo -e "${BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
-    echo -e "${GREEN}Processing: $database${NC}"
-    echo -e "${BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
-
-    # Get list of SQL files on disk
-    local sql_files
-    sql_files=$(get_sql_files "$db_type")
-
-    if [[ -z "$sql_files" ]]; then
-        echo -e "${YELLOW}⚠ No SQL files found in /azerothcore/data/sql/updates/${db_type}/${NC}"
-        echo
-        return
-    fi
-
-    local file_count
-    file_count=$(echo "$sql_files" | wc -l)
-    echo -e "📁 Found ${file_count} SQL files on disk"
-
-    # Get entries from updates table
-    local total_updates
-    total_updates=$(docker exec "$MYSQL_CONTAINER" mysql -u"$MYSQL_USER" -p"$MYSQL_PASSWORD" "$database" -sN \
-        -e "SELECT COUNT(*) FROM updates" 2>/dev/null || echo "0")
-
-    echo -e "📊 Total updates in database: ${total_updates}"
-
-    if [[ "$total_updates" == "0" ]]; then
-        echo -e "${YELLOW}⚠ No updates found in database${NC}"
-        echo
-        return
-    fi
-
-    # Find orphaned entries (in DB but not on disk)
-    # We'll create a temp table with file names and do a LEFT JOIN
-    local orphaned_count=0
-    local orphaned_list=""
-
-    # Get all update names from DB
-    local db_updates
-    db_updates=$(docker exec "$MYSQL_CONTAINER" mysql -u"$MYSQL_USER" -p"$MYSQL_PASSWORD" "$database" -sN \
-        -e "SELECT name FROM updates ORDER BY name" 2>/dev/null || true)
-
-    if [[ -n "$db_updates" ]]; then
-        # Check each DB entry against disk files
-        while IFS= read -r update_name; do
-            if ! echo "$sql_files" | grep -qF "$update_name"; then
-                ((orphaned_count++))
-                if [[ "$VERBOSE" == true ]] || [[ "$DRY_RUN" == true ]]; then
-                    orphaned_list="${orphaned_list}${update_name}\n"
-                fi
-
-                # Delete if not dry run
-                if [[ "$DRY_RUN" == false ]]; then
-                    docker exec "$MYSQL_CONTAINER" mysql -u"$MYSQL_USER" -p"$MYSQL_PASSWORD" "$database" -e \
-                        "DELETE FROM updates WHERE name='${update_name}'" 2>/dev/null
-                fi
-            fi
-        done <<< "$db_updates"
-    fi
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
-    # Report results
-    if [[ $orphaned_count -gt 0 ]]; then
-        echo -e "${YELLOW}🗑️  Orphaned entries: ${orphaned_count}${NC}"
-
-        if [[ "$VERBOSE" == true ]] || [[ "$DRY_RUN" == true ]]; then
-            echo
-            echo -e "${YELLOW}Orphaned files:${NC}"
-            echo -e "$orphaned_list" | head -20
-            if [[ $orphaned_count -gt 20 ]]; then
-                echo -e "${YELLOW}... and $((orphaned_count - 20)) more${NC}"
-            fi
-        fi
-
-        if [[ "$DRY_RUN" == false ]]; then
-            echo -e "${GREEN}✅ Cleaned ${orphaned_count} orphaned entries${NC}"
-        else
-            echo -e "${YELLOW}Would clean ${orphaned_count} orphaned entries${NC}"
-        fi
-    else
-        echo -e "${GREEN}✅ No orphaned entries found${NC}"
-    fi
-
-    echo
-}
-
-# Process each database
+# Orphans are computed as a set difference between one file listing and one
+# updates query per database, then deleted in chunked batches inside a single
+# transaction per database.
+cleanup_args=(--password "$MYSQL_PASSWORD" --user "$MYSQL_USER" --container "$MYSQL_CONTAINER" --worldserver "$WORLDSERVER_CONTAINER")
 for db in "${DATABASES[@]}"; do
     case $db in
-        acore_world)
-            clean_orphaned_entries "$db" "db_world"
-            ;;
-        acore_characters)
-            clean_orphaned_entries "$db" "db_characters"
-            ;;
-        acore_auth)
-            clean_orphaned_entries "$db" "db_auth"
-            ;;
+        acore_world) cleanup_args+=(--database "$db=db_world") ;;
+        acore_characters) cleanup_args+=(--database "$db=db_characters") ;;
+        acore_auth) cleanup_args+=(--database "$db=db_auth") ;;
     esac
 done
+[[ "$DRY_RUN" == true ]] && cleanup_args+=(--dry-run)
+[[ "$VERBOSE" == true ]] && cleanup_args+=(--verbose)
+
+CLEANUP_STATUS=0
+python3 "$SCRIPT_DIR/../python/updates_cleanup.py" "${cleanup_args[@]}" || CLEANUP_STATUS=$?
+echo
 
 # Summary
 echo -e "${BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
@@ -263,3 +174,5 @@ if [[ "$DRY_RUN" == true ]]; then
     echo -e "${YELLOW}This was a dry run. To actually clean orphaned entries, run:${NC}"
     echo -e "${YELLOW}  $0 --password yourpassword${NC}"
 fi
+
+exit "$CLEANUP_STATUS"
@@ -11,6 +11,27 @@ cd "$CONFIG_DIR" || {
     exit 1
 }
 
+# Seed through the asset manifest when python3 is available: .conf files are
+# created when missing and refreshed from a changed .dist while unedited, and
+# unedited ones are removed once their .dist template disappears.
+ASSET_SYNC="$(cd "$(dirname "${BASH_SOURCE[0]}")/../python" 2>/dev/null && pwd)/asset_sync.py"
+if command -v python3 >/dev/null 2>&1 && [ -f "$ASSET_SYNC" ]; then
+    for file in *.dist; do
+        [ -e "$file" ] || continue
+        conffile="${file%.dist}"
+        case "$conffile" in
+            authserver.conf|worldserver.conf|dbimport.conf) continue ;;
+        esac
+        printf '%s\t%s\t%s\tseed\n' "$file" "$CONFIG_DIR/$file" "$conffile"
+    done | python3 "$ASSET_SYNC" --dest "$CONFIG_DIR" --spec - --label "module configuration"
+    sync_status=$?
+    echo "Module configuration files are now ready for customization"
+    echo ""
+    echo "Available configuration files:"
+    ls -1 *.conf | sort
+    exit "$sync_status"
+fi
+
 # Counter for created files
 created_count=0
 
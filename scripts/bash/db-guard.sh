@@ -23,6 +23,11 @@ HEALTH_FILE="${DB_GUARD_HEALTH_FILE:-/tmp/db-guard.ready}"
 STATUS_FILE="${DB_GUARD_STATUS_FILE:-/tmp/db-guard.status}"
 ERROR_FILE="${DB_GUARD_ERROR_FILE:-/tmp/db-guard.error}"
 MODULE_SQL_HOST_PATH="${MODULE_SQL_HOST_PATH:-/modules-sql}"
+SNAPSHOT_SCRIPT="${DB_GUARD_SNAPSHOT_SCRIPT:-/tmp/mysql-snapshot.sh}"
+SNAPSHOT_INTERVAL="${DB_GUARD_SNAPSHOT_INTERVAL_SECONDS:-0}"
+SNAPSHOT_MARKER="${MYSQL_SNAPSHOT_MARKER:-/var/lib/mysql-persistent/.snapshot-restored}"
+SNAPSHOT_PID=""
+LAST_SNAPSHOT_ATTEMPT=0
 
 SEED_CONF_SCRIPT="${SEED_DBIMPORT_CONF_SCRIPT:-/tmp/seed-dbimport-conf.sh}"
 if [ -f "$SEED_CONF_SCRIPT" ]; then
@@ -166,7 +171,38 @@ maybe_run_verification(){
   fi
 }
 
+# Physical snapshots let ac-mysql refill its tmpfs by unpacking files after a
+# reboot instead of replaying dumps. Runs in the background so the health
+# file keeps being refreshed while the clone is packed.
+maybe_take_snapshot(){
+  if [ "${SNAPSHOT_INTERVAL}" -le 0 ] || [ ! -f "$SNAPSHOT_SCRIPT" ]; then
+    return 0
+  fi
+  if [ -n "$SNAPSHOT_PID" ] && kill -0 "$SNAPSHOT_PID" 2>/dev/null; then
+    return 0
+  fi
+  local now last latest
+  now="$(date +%s)"
+  last="$LAST_SNAPSHOT_ATTEMPT"
+  if latest="$(bash "$SNAPSHOT_SCRIPT" latest 2>/dev/null)"; then
+    local taken
+    taken="$(stat -c %Y "$latest" 2>/dev/null || echo 0)"
+    [ "$taken" -gt "$last" ] && last="$taken"
+  fi
+  if [ $((now - last)) -lt "${SNAPSHOT_INTERVAL}" ]; then
+    return 0
+  fi
+  LAST_SNAPSHOT_ATTEMPT="$now"
+  log "Taking physical snapshot of the runtime datadir..."
+  ( nice -n 10 bash "$SNAPSHOT_SCRIPT" create \
+      || warn "Physical snapshot failed; logical import remains the rehydrate path" ) &
+  SNAPSHOT_PID=$!
+}
+
 log "Watching MySQL (${MYSQL_HOST}:${MYSQL_PORT}) for ${#DB_SCHEMAS[@]} schemas: ${DB_SCHEMAS[*]}"
+if [ -f "$SNAPSHOT_MARKER" ]; then
+  log "Runtime datadir was hydrated from snapshot $(cut -f2 "$SNAPSHOT_MARKER" 2>/dev/null)"
+fi
 
 while true; do
   if ! wait_for_mysql; then
@@ -180,6 +216,7 @@ while true; do
     if [ "$count" -gt 0 ] 2>/dev/null; then
       mark_ready "Detected ${count} tables across tracked schemas"
       maybe_run_verification
+      maybe_take_snapshot
       sleep "$RECHECK_SECONDS"
       continue
     fi
@@ -149,6 +149,15 @@ fi
 
 echo "🔍 Checking restoration status..."
 
+# ac-mysql unpacked a physical snapshot into the runtime datadir at startup.
+SNAPSHOT_MARKER="${MYSQL_SNAPSHOT_MARKER:-$RESTORE_STATUS_DIR/.snapshot-restored}"
+if [ -f "$SNAPSHOT_MARKER" ] && verify_databases_populated; then
+  echo "📸 Runtime datadir was hydrated from a physical snapshot"
+  cat "$SNAPSHOT_MARKER" || true
+  echo "🚫 Skipping database import - snapshot data is already loaded"
+  exit 0
+fi
+
 if [ -f "$RESTORE_SUCCESS_MARKER" ]; then
   if verify_databases_populated; then
     echo "✅ Backup restoration completed successfully"
@@ -202,6 +211,29 @@ else
   echo "🔍 No legacy backup found"
 fi
 
+# The backup catalog keeps the newest complete daily/hourly set in
+# catalog-latest.tsv, which avoids listing every tier after a reboot.
+if [ -z "$backup_path" ]; then
+  for BACKUP_DIRS in "${BACKUP_SEARCH_PATHS[@]}"; do
+    [ -s "$BACKUP_DIRS/catalog-latest.tsv" ] || continue
+    while IFS=$'\t' read -r catalog_tier catalog_rel; do
+      candidate="$BACKUP_DIRS/$catalog_rel"
+      [ -n "$catalog_rel" ] && [ -f "$candidate/.backup_complete" ] || continue
+      first_dump=$(ls "$candidate"/*.sql.gz 2>/dev/null | head -n 1)
+      if [ -n "$first_dump" ] && timeout 10 gzip -t "$first_dump" >/dev/null 2>&1; then
+        echo "📇 Catalog: latest ${catalog_tier} backup ${catalog_rel}"
+        backup_path="$candidate"
+        break 2
+      fi
+      if [ -f "$candidate/chunked/@.done.json" ] && command -v mysqlsh >/dev/null 2>&1; then
+        echo "📇 Catalog: latest ${catalog_tier} chunked backup ${catalog_rel}"
+        backup_path="$candidate"
+        break 2
+      fi
+    done < "$BACKUP_DIRS/catalog-latest.tsv"
+  done
+fi
+
 # Search through backup directories
 if [ -z "$backup_path" ]; then
   for BACKUP_DIRS in "${BACKUP_SEARCH_PATHS[@]}"; do
@@ -248,6 +280,14 @@ if [ -z "$backup_path" ]; then
               fi
             fi
           done
+          if [ -f "$BACKUP_DIRS/hourly/$latest_hourly/chunked/@.done.json" ]; then
+            if command -v mysqlsh >/dev/null 2>&1; then
+              echo "✅ Valid chunked hourly backup: $latest_hourly"
+              backup_path="$BACKUP_DIRS/hourly/$latest_hourly"
+              break
+            fi
+            echo "⚠️  Chunked hourly backup needs mysqlsh, which this image lacks; skipping"
+          fi
         fi
       fi
 
@@ -320,6 +360,18 @@ if [ -n "$backup_path" ]; then
         cat "$backup_path/manifest.json"
       fi
 
+      # Chunked (mysqlsh) dump: parallel load with deferred indexes
+      if [ -f "$backup_path/chunked/@.done.json" ] && command -v mysqlsh >/dev/null 2>&1; then
+        echo "🔄 Loading chunked dump from $backup_path/chunked..."
+        if bash "$SCRIPT_DIR/backup-chunked.sh" load --input "$backup_path/chunked" \
+             --host "${CONTAINER_MYSQL}" --user "${MYSQL_USER}" --password "${MYSQL_ROOT_PASSWORD}"; then
+          echo "✅ Restored chunked dump"
+        else
+          echo "❌ Failed to restore chunked dump"
+          restore_success=false
+        fi
+      fi
+
       # Restore compressed SQL files
       if ls "$backup_path"/*.sql.gz >/dev/null 2>&1; then
         for backup_file in "$backup_path"/*.sql.gz; do
@@ -179,10 +179,10 @@ if [[ "$CURRENT_ITEM_COUNT" != "0" ]]; then
   exit 0
 fi
 
-# Extract backup files
-log "Extracting backup files..."
+# Locate backup files
+log "Locating backup files..."
 CHARACTERS_DUMP=""
-for pattern in "acore_characters.sql.gz" "characters.sql.gz" "acore_characters.sql" "characters.sql"; do
+for pattern in "acore_characters.sql.gz" "acore_characters.sql.zst" "acore_characters.sql.idx" "characters.sql.gz" "acore_characters.sql" "characters.sql"; do
   if [[ -f "$BACKUP_DIR/$pattern" ]]; then
     CHARACTERS_DUMP="$BACKUP_DIR/$pattern"
     break
@@ -193,13 +193,6 @@ done
 
 info "Found characters dump: ${CHARACTERS_DUMP##*/}"
 
-# Extract dump to temp file
-if [[ "$CHARACTERS_DUMP" == *.gz ]]; then
-  zcat "$CHARACTERS_DUMP" > "$TEMP_DIR/characters.sql"
-else
-  cp "$CHARACTERS_DUMP" "$TEMP_DIR/characters.sql"
-fi
-
 # Create staging database
 log "Creating staging database..."
 STAGE_CHARS_DB="fix_stage_chars_$$"
@@ -220,8 +213,8 @@ trap 'cleanup_staging; rm -rf "$TEMP_DIR"' EXIT
 
 # Load backup into staging database
 info "Loading backup into staging database..."
-sed "s/\`$CHARACTERS_DB\`/\`$STAGE_CHARS_DB\`/g; s/USE \`$CHARACTERS_DB\`;/USE \`$STAGE_CHARS_DB\`;/g" "$TEMP_DIR/characters.sql" | \
-  docker exec -i "$MYSQL_CONTAINER" mysql -uroot -p"$MYSQL_PW" 2>/dev/null
+python3 "$SCRIPT_DIR/../python/sql_rename.py" --map "$CHARACTERS_DB=$STAGE_CHARS_DB" "$CHARACTERS_DUMP" | \
+  docker exec -i "$MYSQL_CONTAINER" mysql -uroot -p"$MYSQL_PW" "$STAGE_CHARS_DB" 2>/dev/null
 
 # Get current database state
 CURRENT_MAX_ITEM_GUID=$(mysql_query_local "$CHARACTERS_DB" "SELECT COALESCE(MAX(guid), 0) FROM item_instance;")
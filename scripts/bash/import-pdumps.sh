@@ -31,6 +31,7 @@ AUTH_DB="${ACORE_DB_AUTH_NAME:-acore_auth}"
 CHARACTERS_DB="${ACORE_DB_CHARACTERS_NAME:-acore_characters}"
 DEFAULT_ACCOUNT="${DEFAULT_IMPORT_ACCOUNT:-}"
 INTERACTIVE=${INTERACTIVE:-true}
+JOBS=""
 
 usage(){
   cat <<'EOF'
@@ -44,6 +45,7 @@ Options:
   --auth-db NAME           Auth database name (overrides env)
   --characters-db NAME     Characters database name (overrides env)
   --non-interactive        Don't prompt for missing information
+  --jobs N                 Characters imported concurrently (default: nproc, at most 8)
   -h, --help               Show this help and exit
 
 Directory Structure:
@@ -140,13 +142,14 @@ prompt_for_account(){
   done
 }
 
-process_pdump_file(){
+# Add one file to the import plan (file, account, name, guid per line)
+plan_pdump_file(){
   local pdump_file="$1"
   local filename
   filename=$(basename "$pdump_file")
   local config_file="$IMPORT_DIR/configs/${filename%.*}.conf"
 
-  info "Processing: $filename"
+  info "Queueing: $filename"
 
   # Parse configuration file if it exists
   parse_config_file "$config_file"
@@ -160,37 +163,10 @@ process_pdump_file(){
     fi
   fi
 
-  # Build command arguments
-  local cmd_args=(
-    --file "$pdump_file"
-    --account "$target_account"
-    --password "$MYSQL_PW"
-    --auth-db "$AUTH_DB"
-    --characters-db "$CHARACTERS_DB"
-  )
-
-  # Add optional parameters if specified in config
-  [[ -n "$CONFIG_NAME" ]] && cmd_args+=(--name "$CONFIG_NAME")
-  [[ -n "$CONFIG_GUID" ]] && cmd_args+=(--guid "$CONFIG_GUID")
-
-  log "Importing $filename to account $target_account"
+  printf '%s\t%s\t%s\t%s\n' "$pdump_file" "$target_account" "$CONFIG_NAME" "$CONFIG_GUID" >> "$PLAN_FILE"
   [[ -n "$CONFIG_NAME" ]] && log "  Character name: $CONFIG_NAME"
   [[ -n "$CONFIG_GUID" ]] && log "  Forced GUID: $CONFIG_GUID"
-
-  # Execute the import
-  if "./scripts/bash/pdump-import.sh" "${cmd_args[@]}"; then
-    log "✅ Successfully imported: $filename"
-
-    # Move processed file to processed/ subdirectory
-    local processed_dir="$IMPORT_DIR/processed"
-    mkdir -p "$processed_dir"
-    mv "$pdump_file" "$processed_dir/"
-    [[ -f "$config_file" ]] && mv "$config_file" "$processed_dir/"
-
-  else
-    err "❌ Failed to import: $filename"
-    return 1
-  fi
+  return 0
 }
 
 # Parse command line arguments
@@ -220,6 +196,11 @@ while [[ $# -gt 0 ]]; do
       INTERACTIVE=false
       shift
       ;;
+    --jobs)
+      [[ $# -ge 2 ]] || fatal "--jobs requires a value"
+      JOBS="$2"
+      shift 2
+      ;;
     -h|--help)
       usage
       exit 0
@@ -259,25 +240,71 @@ log "Found ${#pdump_files[@]} pdump file(s) to process"
 # Create configs directory if it doesn't exist
 mkdir -p "$IMPORT_DIR/configs"
 
-# Process each file
-processed=0
-failed=0
+PLAN_FILE="$(mktemp)"
+REPORT_FILE="$(mktemp)"
+trap 'rm -f "$PLAN_FILE" "$REPORT_FILE"' EXIT
 
 for pdump_file in "${pdump_files[@]}"; do
-  if process_pdump_file "$pdump_file"; then
-    ((processed++))
+  plan_pdump_file "$pdump_file"
+done
+
+if [[ ! -s "$PLAN_FILE" ]]; then
+  warn "Nothing to import"
+  exit 0
+fi
+
+# One backup and one worldserver restart for the whole batch; the importer
+# allocates GUID ranges up front and imports the characters concurrently.
+backup_file="scripts/bash/manual-backups/characters-pre-pdump-import-$(date +%Y%m%d_%H%M%S).sql"
+mkdir -p "$(dirname "$backup_file")"
+log "Creating backup: $backup_file"
+docker exec ac-mysql mysqldump -uroot -p"$MYSQL_PW" "$CHARACTERS_DB" > "$backup_file"
+
+log "Stopping world server for safe import..."
+docker stop ac-worldserver >/dev/null 2>&1 || warn "World server was not running"
+
+importer_args=(--plan "$PLAN_FILE" --report "$REPORT_FILE" --password "$MYSQL_PW"
+  --auth-db "$AUTH_DB" --characters-db "$CHARACTERS_DB")
+[[ -n "$JOBS" ]] && importer_args+=(--jobs "$JOBS")
+importer_status=0
+python3 "$SCRIPT_DIR/../python/pdump_import.py" "${importer_args[@]}" || importer_status=$?
+
+log "Restarting world server..."
+docker start ac-worldserver >/dev/null 2>&1 || warn "World server failed to start"
+
+if [[ ! -s "$REPORT_FILE" ]]; then
+  fatal "Importer failed (exit $importer_status) without a report; restore from $backup_file if needed"
+fi
+
+# Move imported files (and their configs) to processed/
+processed=0
+failed=0
+processed_dir="$IMPORT_DIR/processed"
+while IFS=$'\t' read -r status pdump_file _; do
+  if [[ "$status" == "imported" ]]; then
+    mkdir -p "$processed_dir"
+    filename=$(basename "$pdump_file")
+    mv "$pdump_file" "$processed_dir/"
+    config_file="$IMPORT_DIR/configs/${filename%.*}.conf"
+    [[ -f "$config_file" ]] && mv "$config_file" "$processed_dir/"
+    processed=$((processed + 1))
   else
-    ((failed++))
+    failed=$((failed + 1))
   fi
-done
+done < "$REPORT_FILE"
 
 echo ""
 log "Import summary:"
 log "  ✅ Processed: $processed"
+log "  Backup created: $backup_file"
 [[ $failed -gt 0 ]] && err "  ❌ Failed: $failed"
 
 if [[ $processed -gt 0 ]]; then
   log ""
   log "Character imports completed! Processed files moved to $IMPORT_DIR/processed/"
   log "You can now log in and access your imported characters."
+fi
+
+if [[ $importer_status -ne 0 ]]; then
+  fatal "Importer exited with status $importer_status; failed files were left in $IMPORT_DIR"
 fi
\ No newline at end of file
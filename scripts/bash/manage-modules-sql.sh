@@ -8,6 +8,7 @@ ALT_CUSTOM_SQL_ROOT="/scripts/sql/custom"
 HELPER_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}" )" && pwd)"
 PROJECT_ROOT="$(cd "$HELPER_DIR/../.." && pwd)"
 MODULE_HELPER="${MODULE_HELPER:-$PROJECT_ROOT/scripts/python/modules.py}"
+MODULE_SQL_EXECUTOR="${MODULE_SQL_EXECUTOR:-$PROJECT_ROOT/scripts/python/module_sql.py}"
 
 SQL_SUCCESS_LOG=()
 SQL_FAILURE_LOG=()
@@ -290,6 +291,41 @@ module_sql_run_module(){
   return 0
 }
 
+# Render and apply every file in .sql-manifest.json with module_sql.py: one
+# python process and one client session per database instead of one of each
+# per file. Returns 1 when the manifest or python3 is unavailable.
+# Nothing in the startup path calls execute_module_sql_scripts any more (module
+# SQL goes through the DB updater via stage-modules.sh); module_sql.py records
+# the updates rows for what it applies, so running both does not apply twice.
+execute_module_sql_batched(){
+  local modules_root="$1"
+  local manifest="${modules_root}/.sql-manifest.json"
+  [ -f "$manifest" ] && [ -f "$MODULE_SQL_EXECUTOR" ] || return 1
+  command -v python3 >/dev/null 2>&1 || return 1
+
+  local custom_root="$CUSTOM_SQL_ROOT"
+  if [ ! -d "$custom_root" ] && [ -d "$ALT_CUSTOM_SQL_ROOT" ]; then
+    custom_root="$ALT_CUSTOM_SQL_ROOT"
+  fi
+  local -a args=(--manifest "$manifest" --host "${CONTAINER_MYSQL}" --port "${MYSQL_PORT:-3306}")
+  [ -d "$custom_root" ] && args+=(--custom-root "$custom_root")
+
+  local report
+  report="$(mktemp)"
+  echo "Applying module SQL from ${manifest}"
+  python3 "$MODULE_SQL_EXECUTOR" "${args[@]}" --skip-applied --report "$report" || true
+
+  local status db file
+  while IFS=$'\t' read -r status db file; do
+    case "$status" in
+      success) log_sql_success "$db" "$file" ;;
+      failure) log_sql_failure "$db" "$file" ;;
+    esac
+  done < "$report"
+  rm -f "$report"
+  return 0
+}
+
 # Main function to execute SQL for all enabled modules
 execute_module_sql_scripts() {
   # Install MariaDB client if not available
@@ -301,6 +337,13 @@ execute_module_sql_scripts() {
   SQL_SUCCESS_LOG=()
   SQL_FAILURE_LOG=()
 
+  local modules_root="${MODULES_ROOT:-/modules}"
+  modules_root="${modules_root%/}"
+  if execute_module_sql_batched "$modules_root"; then
+    print_sql_summary
+    return 0
+  fi
+
   local metadata_available=1
   if ! ensure_module_metadata; then
     metadata_available=0
@@ -312,8 +355,6 @@ execute_module_sql_scripts() {
   local world_db="${DB_WORLD_NAME:-acore_world}"
   local auth_db="${DB_AUTH_NAME:-acore_auth}"
   local characters_db="${DB_CHARACTERS_NAME:-acore_characters}"
-  local modules_root="${MODULES_ROOT:-/modules}"
-  modules_root="${modules_root%/}"
   if [ "$metadata_available" = "1" ]; then
     echo "Discovered ${#MODULE_KEYS[@]} module definitions (MODULES_ROOT=${modules_root})"
     for key in "${MODULE_KEYS[@]}"; do
@@ -352,6 +393,11 @@ execute_module_sql_scripts() {
   run_custom_sql_group auth "${auth_db}" "custom auth SQL"
   run_custom_sql_group characters "${characters_db}" "custom characters SQL"
 
+  print_sql_summary
+  return 0
+}
+
+print_sql_summary(){
   echo "SQL execution summary:"
   if [ ${#SQL_SUCCESS_LOG[@]} -gt 0 ]; then
     echo "  ✅ Applied:"
@@ -21,6 +21,8 @@ source "$PROJECT_ROOT/scripts/bash/project_name.sh"
 
 # Module-specific configuration
 MODULE_HELPER="$PROJECT_ROOT/scripts/python/modules.py"
+LUA_SCRIPTS_DIR="/azerothcore/lua_scripts"
+ASSET_SYNC="$PROJECT_ROOT/scripts/python/asset_sync.py"
 DEFAULT_ENV_PATH="$PROJECT_ROOT/.env"
 ENV_PATH="${MODULES_ENV_PATH:-$DEFAULT_ENV_PATH}"
 TEMPLATE_FILE="$PROJECT_ROOT/.env.template"
@@ -139,7 +141,7 @@ run_post_install_hooks(){
       export MODULE_DIR="$dir"
       export MODULE_NAME="${MODULE_NAME[$key]:-$(basename "$dir")}"
       export MODULES_ROOT="${MODULES_ROOT:-/modules}"
-      export LUA_SCRIPTS_TARGET="/azerothcore/lua_scripts"
+      export LUA_SCRIPTS_TARGET="$LUA_SCRIPTS_DIR"
 
       # Execute the hook script
       if "$hook_script"; then
@@ -161,6 +163,9 @@ run_post_install_hooks(){
 }
 
 install_enabled_modules(){
+  # Lua hooks queue their files here; they are synced in one pass afterwards.
+  export LUA_SYNC_SPEC
+  LUA_SYNC_SPEC="$(mktemp)"
   for key in "${MODULE_KEYS[@]}"; do
     if [ "${MODULE_ENABLED[$key]:-0}" != "1" ]; then
       continue
@@ -188,6 +193,13 @@ install_enabled_modules(){
     fi
     run_post_install_hooks "$key" "$dir"
   done
+  if mkdir -p "$LUA_SCRIPTS_DIR" 2>/dev/null; then
+    if ! python3 "$ASSET_SYNC" --dest "$LUA_SCRIPTS_DIR" --spec "$LUA_SYNC_SPEC" --label "Lua script"; then
+      warn "Some Lua scripts could not be synced to $LUA_SCRIPTS_DIR"
+    fi
+  fi
+  rm -f "$LUA_SYNC_SPEC"
+  unset LUA_SYNC_SPEC
 }
 
 
@@ -389,9 +401,15 @@ manage_configuration_files(){
   local modules_conf_dir="${env_target%/}/modules"
   mkdir -p "$modules_conf_dir"
   rm -rf "${modules_conf_dir}.backup"
-  rm -f "$modules_conf_dir"/*.conf "$modules_conf_dir"/*.conf.dist 2>/dev/null || true
+  # Without a sync manifest the directory's owners are unknown; start clean once.
+  if [ ! -f "$modules_conf_dir/.asset-manifest" ]; then
+    rm -f "$modules_conf_dir"/*.conf "$modules_conf_dir"/*.conf.dist 2>/dev/null || true
+  fi
 
-  local module_dir
+  # .conf files seeded from .conf.dist go first so a module's own .conf wins.
+  local module_dir conf_spec seeded_spec
+  conf_spec="$(mktemp)"
+  seeded_spec="$(mktemp)"
   for key in "${MODULE_KEYS[@]}"; do
     module_dir="${MODULE_NAME[$key]:-}"
     [ -n "$module_dir" ] || continue
@@ -411,16 +429,18 @@ manage_configuration_files(){
         fi
       fi
 
-      dest_path="${modules_conf_dir}/${base_name}"
-      cp "$conf_file" "$dest_path"
+      printf '%s\t%s\t%s\n' "$module_dir" "$conf_file" "$base_name" >> "$conf_spec"
       if [[ "$base_name" == *.conf.dist ]]; then
-        dest_conf="${modules_conf_dir}/${base_name%.dist}"
-        if [ ! -f "$dest_conf" ]; then
-          cp "$conf_file" "$dest_conf"
-        fi
+        printf '%s\t%s\t%s\n' "$module_dir" "$conf_file" "${base_name%.dist}" >> "$seeded_spec"
       fi
-    done < <(find "$module_dir" -path "*/conf/*" -type f \( -name "*.conf" -o -name "*.conf.dist" \) 2>/dev/null)
+    done < <(find "$module_dir" -path "*/conf/*" -type f \( -name "*.conf" -o -name "*.conf.dist" \) 2>/dev/null | sort)
   done
+  # Modules without a directory are disabled; their configs drop out of the spec and are removed.
+  if ! cat "$seeded_spec" "$conf_spec" | python3 "$ASSET_SYNC" --dest "$modules_conf_dir" --spec - \
+      --label "module config" --quiet; then
+    warn "Some module configuration files could not be synced"
+  fi
+  rm -f "$conf_spec" "$seeded_spec"
 
   local playerbots_enabled="${MODULE_PLAYERBOTS:-0}"
   if [ "${MODULE_ENABLED[MODULE_PLAYERBOTS]:-0}" = "1" ]; then
@@ -10,6 +10,13 @@ if ! command -v "$ORIGINAL_ENTRYPOINT" >/dev/null 2>&1; then
   fi
 fi
 
+# Hydrate an empty tmpfs datadir from the newest physical snapshot before
+# mysqld starts; without one, mysqld initializes and db-import restores dumps.
+SNAPSHOT_SCRIPT="${MYSQL_SNAPSHOT_SCRIPT:-/usr/local/bin/mysql-snapshot.sh}"
+if [ -f "$SNAPSHOT_SCRIPT" ]; then
+  bash "$SNAPSHOT_SCRIPT" restore "${MYSQL_DATADIR:-/var/lib/mysql-runtime}" || true
+fi
+
 TARGET_SPEC="${MYSQL_RUNTIME_USER:-${CONTAINER_USER:-}}"
 if [ -z "${TARGET_SPEC:-}" ] || [ "${TARGET_SPEC}" = "0:0" ]; then
   exec "$ORIGINAL_ENTRYPOINT" "$@"
@@ -0,0 +1,222 @@
+#!/bin/bash
+# Physical snapshots of the tmpfs MySQL datadir.
+# "create" (run by db-guard) clones the running server into the persistent
+# volume and packs it; "restore" (run by the ac-mysql entrypoint before mysqld
+# starts) unpacks the newest snapshot into an empty runtime datadir.
+set -euo pipefail
+
+usage() {
+  cat <<'EOF'
+Usage: mysql-snapshot.sh <command> [args]
+
+Commands:
+  create            Clone the running server (CLONE LOCAL) and pack it into SNAPSHOT_DIR
+  restore DATADIR   Unpack the newest snapshot into DATADIR if it is empty
+  latest            Print the newest snapshot archive
+
+Environment variables:
+  MYSQL_SNAPSHOT_DIR            Snapshot directory (default: /var/lib/mysql-persistent/snapshots)
+  MYSQL_SNAPSHOT_KEEP           Snapshots kept after create (default: 2)
+  MYSQL_SNAPSHOT_COMPRESSION    auto, pigz, zstd or gzip (default: auto = pigz, else gzip)
+  MYSQL_SNAPSHOT_THREADS        Compression threads (default: nproc)
+  MYSQL_SNAPSHOT_RESTORE        Set to 0 to always fall back to logical import (default: 1)
+  MYSQL_SNAPSHOT_BACKUP_DIR     Backups checked for newer sets before restore (default: /backups)
+  MYSQL_SNAPSHOT_MARKER         Written after a restore (default: /var/lib/mysql-persistent/.snapshot-restored)
+  BINLOG_STREAM_DIR             Binlog stream that can bring a snapshot forward (default: /backups/binlog-stream)
+  CONTAINER_MYSQL, MYSQL_PORT, MYSQL_USER, MYSQL_ROOT_PASSWORD   Connection used by create
+EOF
+}
+
+log(){ echo "📸 [snapshot] $*"; }
+warn(){ echo "⚠️ [snapshot] $*" >&2; }
+
+SNAPSHOT_DIR="${MYSQL_SNAPSHOT_DIR:-/var/lib/mysql-persistent/snapshots}"
+KEEP="${MYSQL_SNAPSHOT_KEEP:-2}"
+COMPRESSION="${MYSQL_SNAPSHOT_COMPRESSION:-auto}"
+THREADS="${MYSQL_SNAPSHOT_THREADS:-}"
+BACKUP_DIR="${MYSQL_SNAPSHOT_BACKUP_DIR:-/backups}"
+MARKER="${MYSQL_SNAPSHOT_MARKER:-/var/lib/mysql-persistent/.snapshot-restored}"
+STREAM_DIR="${BINLOG_STREAM_DIR:-/backups/binlog-stream}"
+[[ "$THREADS" =~ ^[1-9][0-9]*$ ]] || THREADS="$(nproc 2>/dev/null || echo 2)"
+[[ "$KEEP" =~ ^[1-9][0-9]*$ ]] || KEEP=2
+
+mysql_exec(){
+  MYSQL_PWD="${MYSQL_ROOT_PASSWORD:-root}" mysql -h "${CONTAINER_MYSQL:-ac-mysql}" -P "${MYSQL_PORT:-3306}" \
+    -u "${MYSQL_USER:-root}" -N -B -e "$1"
+}
+
+list_snapshots(){
+  find "$SNAPSHOT_DIR" -maxdepth 1 \( -name 'datadir-*.tar.gz' -o -name 'datadir-*.tar.zst' \) 2>/dev/null | sort
+}
+
+latest_snapshot(){
+  list_snapshots | tail -n 1
+}
+
+compressor(){
+  case "$COMPRESSION" in
+    auto) if command -v pigz >/dev/null 2>&1; then echo pigz; else echo gzip; fi ;;
+    pigz|zstd|gzip) command -v "$COMPRESSION" >/dev/null 2>&1 && echo "$COMPRESSION" || echo gzip ;;
+    *) echo gzip ;;
+  esac
+}
+
+create_snapshot(){
+  mkdir -p "$SNAPSHOT_DIR"
+  local plugin
+  plugin="$(mysql_exec "SELECT PLUGIN_STATUS FROM information_schema.plugins WHERE PLUGIN_NAME = 'clone';")"
+  if [ "$plugin" != "ACTIVE" ]; then
+    mysql_exec "INSTALL PLUGIN clone SONAME 'mysql_clone.so';" >/dev/null
+  fi
+
+  # CLONE copies InnoDB only; anything else would come back empty.
+  local other_engines
+  other_engines="$(mysql_exec "SELECT COUNT(*) FROM information_schema.tables
+    WHERE table_type = 'BASE TABLE' AND engine <> 'InnoDB'
+      AND table_schema NOT IN ('mysql', 'information_schema', 'performance_schema', 'sys');")"
+  if [ "${other_engines:-0}" -gt 0 ]; then
+    warn "${other_engines} non-InnoDB table(s) would be empty in a clone; not taking a snapshot"
+    return 1
+  fi
+
+  local ts start staging codec ext archive
+  ts="$(date +%Y%m%d_%H%M%S)"
+  start="$(date +%s)"
+  staging="$SNAPSHOT_DIR/.clone-$ts"
+  codec="$(compressor)"
+  ext="gz"; [ "$codec" = "zstd" ] && ext="zst"
+  archive="$SNAPSHOT_DIR/datadir-$ts.tar.$ext"
+
+  log "Cloning runtime datadir into $staging"
+  if ! mysql_exec "CLONE LOCAL DATA DIRECTORY = '${staging}';"; then
+    rm -rf "${staging:?}"
+    return 1
+  fi
+  local raw_bytes server_uuid binlog_file="" binlog_pos=0
+  raw_bytes="$(du -sb "$staging" 2>/dev/null | awk '{print $1}')"
+  # Where the clone sits in the binary log, so binlog-stream.sh can replay
+  # everything written after it.
+  server_uuid="$(mysql_exec "SELECT @@server_uuid;" 2>/dev/null || true)"
+  read -r binlog_file binlog_pos < <(mysql_exec "SELECT IFNULL(BINLOG_FILE, ''), IFNULL(BINLOG_POSITION, 0)
+    FROM performance_schema.clone_status;" 2>/dev/null | head -n 1) || true
+
+  log "Packing snapshot with ${codec} (${THREADS} threads)"
+  local -a compress=(gzip -c)
+  case "$codec" in
+    pigz) compress=(pigz -c -p "$THREADS") ;;
+    zstd) compress=(zstd -q -c -T"$THREADS") ;;
+  esac
+  local rc=0
+  tar -C "$staging" -cf - . | "${compress[@]}" > "${archive}.partial" || rc=$?
+  rm -rf "${staging:?}"
+  if [ "$rc" -ne 0 ]; then
+    rm -f "${archive}.partial"
+    warn "Packing failed (exit ${rc})"
+    return 1
+  fi
+  mv -f "${archive}.partial" "$archive"
+  # Date the archive at the clone point so restore can compare it with backups.
+  touch -d "@${start}" "$archive"
+
+  local archive_bytes seconds
+  archive_bytes="$(stat -c %s "$archive")"
+  seconds=$(( $(date +%s) - start ))
+  cat > "${archive%.tar.*}.json" <<EOF
+{
+  "created_at": "$(date -u -d "@${start}" '+%Y-%m-%dT%H:%M:%SZ')",
+  "archive": "$(basename "$archive")",
+  "compression": "${codec}",
+  "server_uuid": "${server_uuid}",
+  "binlog_file": "${binlog_file}",
+  "binlog_position": ${binlog_pos:-0},
+  "datadir_bytes": ${raw_bytes:-0},
+  "archive_bytes": ${archive_bytes},
+  "seconds": ${seconds}
+}
+EOF
+  log "Snapshot $(basename "$archive") ready ($(( ${raw_bytes:-0} / 1048576 ))MB → $(( archive_bytes / 1048576 ))MB, ${seconds}s)"
+
+  local old
+  while IFS= read -r old; do
+    [ -n "$old" ] || continue
+    rm -f "$old" "${old%.tar.*}.json"
+  done < <(list_snapshots | sort -r | tail -n +$((KEEP + 1)))
+}
+
+# Returns 0 only when DATADIR was hydrated; any other outcome leaves it empty
+# so mysqld initializes a fresh datadir and db-import restores logically.
+restore_snapshot(){
+  local datadir="$1"
+  mkdir -p "$SNAPSHOT_DIR" "$datadir"
+  chown mysql:mysql "$SNAPSHOT_DIR" 2>/dev/null || true
+
+  if [ -n "$(ls -A "$datadir" 2>/dev/null)" ]; then
+    return 1
+  fi
+  rm -f "$MARKER" 2>/dev/null || true
+  if [ "${MYSQL_SNAPSHOT_RESTORE:-1}" != "1" ]; then
+    log "Snapshot restore disabled; falling back to logical import"
+    return 1
+  fi
+
+  local archive
+  archive="$(latest_snapshot)"
+  if [ -z "$archive" ]; then
+    log "No snapshot in ${SNAPSHOT_DIR}; falling back to logical import"
+    return 1
+  fi
+  # A streamed binlog for the snapshot's server run brings it past any backup.
+  local newer="" server_uuid
+  server_uuid="$(sed -n 's/.*"server_uuid": *"\([^"]*\)".*/\1/p' "${archive%.tar.*}.json" 2>/dev/null | head -n 1)"
+  if [ -z "$server_uuid" ] || [ -z "$(ls -A "$STREAM_DIR/$server_uuid" 2>/dev/null)" ]; then
+    newer="$(find "$BACKUP_DIR" -mindepth 3 -maxdepth 3 -name .backup_complete -newer "$archive" 2>/dev/null | head -n 1)"
+  fi
+  if [ -n "$newer" ]; then
+    log "Backup $(dirname "${newer#"$BACKUP_DIR"/}") is newer than $(basename "$archive"); falling back to logical import"
+    return 1
+  fi
+
+  local -a decompress=(gzip -dc)
+  case "$archive" in
+    *.zst) decompress=(zstd -q -dc) ;;
+    *.gz) command -v pigz >/dev/null 2>&1 && decompress=(pigz -dc) ;;
+  esac
+  if ! command -v tar >/dev/null 2>&1; then
+    microdnf install -y tar >/dev/null 2>&1 || true
+  fi
+  if ! command -v tar >/dev/null 2>&1 || ! command -v "${decompress[0]}" >/dev/null 2>&1; then
+    warn "tar/${decompress[0]} unavailable; cannot unpack $(basename "$archive")"
+    return 1
+  fi
+
+  log "Restoring $(basename "$archive") into ${datadir}"
+  local start rc=0
+  start="$(date +%s)"
+  "${decompress[@]}" "$archive" | tar -C "$datadir" -xf - || rc=$?
+  if [ "$rc" -ne 0 ]; then
+    warn "Unpacking $(basename "$archive") failed (exit ${rc}); falling back to logical import"
+    find "$datadir" -mindepth 1 -delete 2>/dev/null || true
+    return 1
+  fi
+  chown -R mysql:mysql "$datadir" 2>/dev/null || true
+  local seconds bytes
+  seconds=$(( $(date +%s) - start ))
+  bytes="$(du -sb "$datadir" 2>/dev/null | awk '{print $1}')"
+  log "Restored $(( ${bytes:-0} / 1048576 ))MB in ${seconds}s"
+  printf '%s\t%s\n' "$(date -Iseconds)" "$(basename "$archive")" > "$MARKER" 2>/dev/null || true
+}
+
+case "${1:-}" in
+  create) create_snapshot ;;
+  restore)
+    [ -n "${2:-}" ] || { usage >&2; exit 1; }
+    restore_snapshot "$2"
+    ;;
+  latest)
+    archive="$(latest_snapshot)"
+    [ -n "$archive" ] || exit 1
+    echo "$archive"
+    ;;
+  -h|--help) usage ;;
+  *) usage >&2; exit 1 ;;
+esac
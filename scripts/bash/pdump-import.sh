@@ -66,52 +66,6 @@ Notes:
 EOF
 }
 
-validate_account(){
-  local account="$1"
-  if [[ "$account" =~ ^[0-9]+$ ]]; then
-    # Account ID provided
-    local count
-    count=$(docker exec ac-mysql mysql -uroot -p"$MYSQL_PW" -N -B -e \
-      "SELECT COUNT(*) FROM ${AUTH_DB}.account WHERE id = $account;")
-    [[ "$count" -eq 1 ]] || fatal "Account ID $account not found in auth database"
-  else
-    # Account name provided
-    local count
-    count=$(docker exec ac-mysql mysql -uroot -p"$MYSQL_PW" -N -B -e \
-      "SELECT COUNT(*) FROM ${AUTH_DB}.account WHERE username = '$account';")
-    [[ "$count" -eq 1 ]] || fatal "Account '$account' not found in auth database"
-  fi
-}
-
-get_account_id(){
-  local account="$1"
-  if [[ "$account" =~ ^[0-9]+$ ]]; then
-    echo "$account"
-  else
-    docker exec ac-mysql mysql -uroot -p"$MYSQL_PW" -N -B -e \
-      "SELECT id FROM ${AUTH_DB}.account WHERE username = '$account';"
-  fi
-}
-
-validate_character_name(){
-  local name="$1"
-  # Check character name format (WoW naming rules)
-  if [[ ! "$name" =~ ^[A-Za-z]{2,12}$ ]]; then
-    fatal "Invalid character name: '$name'. Must be 2-12 letters, no numbers or special characters."
-  fi
-
-  # Check if character name already exists
-  local count
-  count=$(docker exec ac-mysql mysql -uroot -p"$MYSQL_PW" -N -B -e \
-    "SELECT COUNT(*) FROM ${CHARACTERS_DB}.characters WHERE name = '$name';")
-  [[ "$count" -eq 0 ]] || fatal "Character name '$name' already exists in database"
-}
-
-get_next_guid(){
-  docker exec ac-mysql mysql -uroot -p"$MYSQL_PW" -N -B -e \
-    "SELECT COALESCE(MAX(guid), 0) + 1 FROM ${CHARACTERS_DB}.characters;"
-}
-
 validate_pdump_format(){
   local file="$1"
   if [[ ! -f "$file" ]]; then
@@ -137,48 +91,17 @@ backup_characters(){
   echo "$backup_file"
 }
 
-process_pdump_sql(){
-  local file="$1"
-  local account_id="$2"
-  local new_guid="${3:-}"
-  local new_name="${4:-}"
-
-  # Create temporary processed file
-  local temp_file
-  temp_file=$(mktemp)
-
-  # Process the pdump SQL file
-  # Replace account references and optionally GUID/name
-  if [[ -n "$new_guid" && -n "$new_name" ]]; then
-    sed -e "s/\([^0-9]\)[0-9]\+\([^0-9].*account.*=\)/\1${account_id}\2/g" \
-        -e "s/\([^0-9]\)[0-9]\+\([^0-9].*guid.*=\)/\1${new_guid}\2/g" \
-        -e "s/'[^']*'\([^']*name.*=\)/'${new_name}'\1/g" \
-        "$file" > "$temp_file"
-  elif [[ -n "$new_guid" ]]; then
-    sed -e "s/\([^0-9]\)[0-9]\+\([^0-9].*account.*=\)/\1${account_id}\2/g" \
-        -e "s/\([^0-9]\)[0-9]\+\([^0-9].*guid.*=\)/\1${new_guid}\2/g" \
-        "$file" > "$temp_file"
-  elif [[ -n "$new_name" ]]; then
-    sed -e "s/\([^0-9]\)[0-9]\+\([^0-9].*account.*=\)/\1${account_id}\2/g" \
-        -e "s/'[^']*'\([^']*name.*=\)/'${new_name}'\1/g" \
-        "$file" > "$temp_file"
-  else
-    sed -e "s/\([^0-9]\)[0-9]\+\([^0-9].*account.*=\)/\1${account_id}\2/g" \
-        "$file" > "$temp_file"
-  fi
-
-  echo "$temp_file"
-}
-
-import_pdump(){
-  local processed_file="$1"
-
-  log "Importing character data into $CHARACTERS_DB database"
-  if docker exec -i ac-mysql mysql -uroot -p"$MYSQL_PW" "$CHARACTERS_DB" < "$processed_file"; then
-    log "Character import completed successfully"
-  else
-    fatal "Character import failed. Check MySQL logs for details."
-  fi
+# Parse, remap and import through the batch importer (one transaction per file)
+run_importer(){
+  local -a args=(
+    --password "$MYSQL_PW"
+    --account "$TARGET_ACCOUNT"
+    --auth-db "$AUTH_DB"
+    --characters-db "$CHARACTERS_DB"
+  )
+  [[ -n "$NEW_CHARACTER_NAME" ]] && args+=(--name "$NEW_CHARACTER_NAME")
+  [[ -n "$FORCE_GUID" ]] && args+=(--guid "$FORCE_GUID")
+  python3 "$SCRIPT_DIR/../python/pdump_import.py" "${args[@]}" "$@" "$PDUMP_FILE"
 }
 
 case "${1:-}" in
@@ -268,37 +191,15 @@ fi
 log "Validating pdump file..."
 validate_pdump_format "$PDUMP_FILE"
 
-log "Validating target account..."
-validate_account "$TARGET_ACCOUNT"
-ACCOUNT_ID=$(get_account_id "$TARGET_ACCOUNT")
-log "Target account ID: $ACCOUNT_ID"
-
-if [[ -n "$NEW_CHARACTER_NAME" ]]; then
-  log "Validating new character name..."
-  validate_character_name "$NEW_CHARACTER_NAME"
+# Validate account, name and GUIDs and rehearse the rewrite without writing
+log "Checking account, character name and GUID allocation..."
+if ! run_importer --dry-run; then
+  fatal "Pdump cannot be imported. See the report above."
 fi
 
-# Determine GUID
-if [[ -n "$FORCE_GUID" ]]; then
-  CHARACTER_GUID="$FORCE_GUID"
-  log "Using forced GUID: $CHARACTER_GUID"
-else
-  CHARACTER_GUID=$(get_next_guid)
-  log "Using next available GUID: $CHARACTER_GUID"
-fi
-
-# Process pdump file
-log "Processing pdump file..."
-PROCESSED_FILE=$(process_pdump_sql "$PDUMP_FILE" "$ACCOUNT_ID" "$CHARACTER_GUID" "$NEW_CHARACTER_NAME")
-
 if $DRY_RUN; then
   info "DRY RUN: Pdump processing completed successfully"
-  info "Processed file saved to: $PROCESSED_FILE"
-  info "Account ID: $ACCOUNT_ID"
-  info "Character GUID: $CHARACTER_GUID"
-  [[ -n "$NEW_CHARACTER_NAME" ]] && info "Character name: $NEW_CHARACTER_NAME"
   info "Run without --dry-run to perform actual import"
-  rm -f "$PROCESSED_FILE"
   exit 0
 fi
 
@@ -313,8 +214,9 @@ log "Stopping world server for safe import..."
 docker stop ac-worldserver >/dev/null 2>&1 || warn "World server was not running"
 
 # Perform import
-trap 'rm -f "$PROCESSED_FILE"' EXIT
-import_pdump "$PROCESSED_FILE"
+log "Importing character data into $CHARACTERS_DB database"
+IMPORT_OK=true
+run_importer || IMPORT_OK=false
 
 # Restart world server
 log "Restarting world server..."
@@ -333,12 +235,9 @@ for i in {1..30}; do
   sleep 2
 done
 
-# Verify import
-CHARACTER_COUNT=$(docker exec ac-mysql mysql -uroot -p"$MYSQL_PW" -N -B -e \
-  "SELECT COUNT(*) FROM ${CHARACTERS_DB}.characters WHERE account = $ACCOUNT_ID;")
+$IMPORT_OK || fatal "Character import failed; the transaction was rolled back. See the report above."
 
 log "Import completed successfully!"
-log "Characters on account $TARGET_ACCOUNT: $CHARACTER_COUNT"
 [[ -n "$BACKUP_FILE" ]] && log "Backup created: $BACKUP_FILE"
 
 info "Character import from pdump completed. You can now log in and play!"
\ No newline at end of file
@@ -441,7 +441,7 @@ host_stage_clear(){
   docker run --rm \
     -v "$STAGE_PATH_MODULE_SQL":/host-stage \
     "$HOST_STAGE_HELPER_IMAGE" \
-    sh -c 'find /host-stage -type f -name "MODULE_*.sql" -delete' >/dev/null 2>&1 || true
+    sh -c 'rm -f /host-stage/.module-sql-manifest; find /host-stage -type f -name "MODULE_*.sql" -delete' >/dev/null 2>&1 || true
 }
 
 host_stage_reset_dir(){
@@ -467,6 +467,26 @@ copy_to_host_stage(){
     sh -c "mkdir -p /host-stage/$core_dir && cp \"/src/$base_name\" \"/host-stage/$core_dir/$target_name\"" >/dev/null 2>&1
 }
 
+# Stage module SQL incrementally. The stager hashes module SQL locally and
+# diffs it against the manifest left by the last staging; changed files and
+# removals go into the worldserver as one tar stream through one docker exec.
+# An unchanged tree costs a single read of the container's manifest. Applied
+# files stay staged because the updater drops rows whose file has disappeared.
+# Returns 1 when python3 is unavailable so the caller can stage everything.
+stage_module_sql_planned(){
+  local stager="$PROJECT_DIR/scripts/python/module_sql_stage.py"
+  command -v python3 >/dev/null 2>&1 && [ -f "$stager" ] || return 1
+
+  MYSQL_ROOT_PASSWORD="$(read_env MYSQL_ROOT_PASSWORD "")" python3 "$stager" \
+    --modules-dir "$MODULES_DIR" --enabled "$MODULES_ENABLED_FILE" \
+    --host-stage "$STAGE_PATH_MODULE_SQL" \
+    --mysql-container "$(read_env CONTAINER_MYSQL "ac-mysql")" \
+    --world-db "$(read_env DB_WORLD_NAME "acore_world")" \
+    --auth-db "$(read_env DB_AUTH_NAME "acore_auth")" \
+    --characters-db "$(read_env DB_CHARACTERS_NAME "acore_characters")" \
+    --playerbots-db "$(read_env DB_PLAYERBOTS_NAME "acore_playerbots")"
+}
+
 stage_module_sql_to_core() {
   show_staging_step "Module SQL Staging" "Preparing module database updates"
 
@@ -495,6 +515,9 @@ stage_module_sql_to_core() {
   fi
 
   echo "📦 Staging module SQL files to core updates directory..."
+  if stage_module_sql_planned; then
+    return 0
+  fi
   host_stage_clear
 
   # Create core updates directories inside container
@@ -508,7 +531,7 @@ stage_module_sql_to_core() {
   local staged_count=0
   local total_skipped=0
   local total_failed=0
-  docker exec ac-worldserver bash -c "find /azerothcore/data/sql/updates -name '*_MODULE_*.sql' -delete" >/dev/null 2>&1 || true
+  docker exec ac-worldserver bash -c "rm -f /azerothcore/data/sql/updates/.module-sql-manifest; find /azerothcore/data/sql/updates -name '*_MODULE_*.sql' -delete" >/dev/null 2>&1 || true
 
   shopt -s nullglob
   for db_type in db-world db-characters db-auth db-playerbots; do
@@ -641,6 +664,17 @@ stage_module_dbc_files(){
   echo "📦 Staging module DBC files to server data directory..."
   echo "   (Using manifest 'server_dbc_path' field to locate server-side DBC files)"
 
+  # With the data directory's host path known, sync through the asset manifest:
+  # only changed files are copied, conflicts between modules are reported, DBCs
+  # of disabled modules are removed and the client originals they replaced restored.
+  local data_dir dbc_spec=""
+  data_dir="$(docker inspect -f '{{range .Mounts}}{{if eq .Destination "/azerothcore/data"}}{{.Source}}{{end}}{{end}}' \
+    ac-worldserver 2>/dev/null || true)"
+  if [ -n "$data_dir" ] && [ -d "$data_dir/dbc" ] && [ -w "$data_dir/dbc" ] && command -v python3 >/dev/null 2>&1 \
+      && [ -f "$PROJECT_DIR/scripts/python/asset_sync.py" ]; then
+    dbc_spec="$(mktemp)"
+  fi
+
   local staged_count=0
   local skipped=0
   local failed=0
@@ -680,6 +714,11 @@ stage_module_dbc_files(){
 
       local dbc_filename="$(basename "$dbc_file")"
 
+      if [ -n "$dbc_spec" ]; then
+        printf '%s\t%s\t%s\n' "$module_name" "$dbc_file" "$dbc_filename" >> "$dbc_spec"
+        continue
+      fi
+
       # Copy to worldserver DBC directory
       if docker cp "$dbc_file" "ac-worldserver:/azerothcore/data/dbc/$dbc_filename" >/dev/null 2>&1; then
         echo "  ✓ Staged $module_name → $dbc_filename"
@@ -692,6 +731,19 @@ stage_module_dbc_files(){
   done
   shopt -u nullglob
 
+  if [ -n "$dbc_spec" ]; then
+    local sync_output
+    sync_output="$(python3 "$PROJECT_DIR/scripts/python/asset_sync.py" --dest "$data_dir/dbc" --spec "$dbc_spec" \
+      --preserve --label "module DBC")" || true
+    rm -f "$dbc_spec"
+    echo "$sync_output"
+    [ "$skipped" -gt 0 ] && echo "⚠️  Skipped $skipped module(s) with a missing DBC directory"
+    if printf '%s\n' "$sync_output" | grep -qE '(Staged|Removed|Restored original) '; then
+      echo "🔄 Restart worldserver to load new DBC data: docker restart ac-worldserver"
+    fi
+    return 0
+  fi
+
   echo ""
   if [ "$staged_count" -gt 0 ]; then
     echo "✅ Staged $staged_count module DBC files to server data directory"
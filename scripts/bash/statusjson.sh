@@ -4,10 +4,17 @@ import os
 import re
 import socket
 import subprocess
+import sys
 import time
 from pathlib import Path
 
 PROJECT_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_DIR / "scripts" / "python"))
+
+from build_metadata import BuildMetadataProvider  # noqa: E402
+from dir_sizes import SizeAccountant, format_size  # noqa: E402
+from status_history import HistoryStore, snapshot_metrics  # noqa: E402
+
 ENV_FILE = PROJECT_DIR / ".env"
 DEFAULT_ACORE_STANDARD_REPO = "https://github.com/azerothcore/azerothcore-wotlk.git"
 DEFAULT_ACORE_PLAYERBOTS_REPO = "https://github.com/mod-playerbots/azerothcore-wotlk.git"
@@ -30,34 +37,43 @@ def load_env():
 def read_env(env, key, default=""):
     return env.get(key, default)
 
-def docker_exists(name):
-    result = subprocess.run([
-        "docker", "ps", "-a", "--format", "{{.Names}}"
-    ], capture_output=True, text=True)
-    names = set(result.stdout.split())
-    return name in names
+SNAPSHOT_TEMPLATE = "\t".join([
+    "{{.State.Status}}",
+    "{{if .State.Health}}{{.State.Health.Status}}{{else}}none{{end}}",
+    "{{.State.StartedAt}}",
+    "{{.Config.Image}}",
+    "{{.State.ExitCode}}",
+    "{{.Image}}",
+    "{{.RestartCount}}",
+])
 
 def docker_inspect(name, template):
     try:
         result = subprocess.run([
-            "docker", "inspect", f"--format={template}", name
+            "docker", "container", "inspect", f"--format={template}", name
         ], capture_output=True, text=True, check=True)
         return result.stdout.strip()
     except subprocess.CalledProcessError:
         return ""
 
-def service_snapshot(name, label):
+def service_snapshot(name, label, image_ids=None):
     status = "missing"
     health = "none"
     started = ""
     image = ""
     exit_code = ""
-    if docker_exists(name):
-        status = docker_inspect(name, "{{.State.Status}}") or status
-        health = docker_inspect(name, "{{if .State.Health}}{{.State.Health.Status}}{{else}}none{{end}}") or health
-        started = docker_inspect(name, "{{.State.StartedAt}}") or ""
-        image = docker_inspect(name, "{{.Config.Image}}") or ""
-        exit_code = docker_inspect(name, "{{.State.ExitCode}}") or "0"
+    restart_count = 0
+    raw = docker_inspect(name, SNAPSHOT_TEMPLATE)
+    if raw:
+        fields = (raw.split("\t") + [""] * 7)[:7]
+        status = fields[0] or status
+        health = fields[1] or health
+        started = fields[2]
+        image = fields[3]
+        exit_code = fields[4] or "0"
+        if image_ids is not None and image and fields[5]:
+            image_ids[image] = fields[5]
+        restart_count = int(fields[6]) if fields[6].isdigit() else 0
     return {
         "name": name,
         "label": label,
@@ -66,6 +82,7 @@ def service_snapshot(name, label):
         "started_at": started,
         "image": image,
         "exit_code": exit_code,
+        "restart_count": restart_count,
     }
 
 def port_reachable(port):
@@ -117,24 +134,50 @@ def module_list(env):
                 })
     return modules
 
-def dir_info(path):
+def status_cache_dir(env):
+    local_storage = read_env(env, "STORAGE_PATH_LOCAL", "./local-storage")
+    return Path(expand_path(read_env(env, "STATUS_CACHE_PATH", f"{local_storage}/status-cache"), env))
+
+def world_latency(env):
+    """Latest summary written by world_latency.py; the collector owns SOAP access."""
+    state_path = status_cache_dir(env) / "world-latency.json"
+    try:
+        summary = json.loads(state_path.read_text(encoding="utf-8")).get("summary") or {}
+    except (OSError, ValueError):
+        return {"available": False}
+    max_age = int(read_env(env, "WORLD_LATENCY_MAX_AGE", "300") or 300)
+    age = time.time() - state_path.stat().st_mtime
+    summary["available"] = True
+    summary["stale"] = age > max_age
+    return summary
+
+def binlog_stream(env):
+    """Last status.json written by binlog-stream.sh into the backup directory."""
+    storage_path = read_env(env, "STORAGE_PATH", "./storage")
+    backup_path = expand_path(read_env(env, "BACKUP_PATH", f"{storage_path}/backups"), env)
+    state_path = Path(backup_path) / "binlog-stream" / "status.json"
+    try:
+        status = json.loads(state_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"available": False}
+    status["available"] = True
+    status["stale"] = time.time() - state_path.stat().st_mtime > 300
+    return status
+
+def dir_info(path, accountant):
     p = Path(path)
     exists = p.exists()
     size = "--"
+    size_bytes = 0
     if exists:
         try:
-            result = subprocess.run(
-                ["du", "-sh", str(p)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.DEVNULL,
-                text=True,
-                check=False,
-            )
-            if result.stdout:
-                size = result.stdout.split()[0]
+            measured = accountant.measure(p)
+            if measured is not None:
+                size_bytes = measured
+                size = format_size(measured)
         except Exception:
             size = "--"
-    return {"path": str(p), "exists": exists, "size": size}
+    return {"path": str(p), "exists": exists, "size": size, "bytes": size_bytes}
 
 def volume_info(name, fallback=None):
     candidates = [name]
@@ -175,22 +218,6 @@ def repo_config_for_variant(env, variant):
         branch = read_env(env, "ACORE_BRANCH_STANDARD", DEFAULT_ACORE_STANDARD_BRANCH)
     return repo, branch
 
-def image_labels(image):
-    try:
-        result = subprocess.run(
-            ["docker", "image", "inspect", "--format", "{{json .Config.Labels}}", image],
-            capture_output=True,
-            text=True,
-            check=True,
-            timeout=3,
-        )
-        labels = json.loads(result.stdout or "{}")
-        if isinstance(labels, dict):
-            return {k: (v or "").strip() for k, v in labels.items()}
-    except Exception:
-        pass
-    return {}
-
 def first_label(labels, keys):
     for key in keys:
         value = labels.get(key, "")
@@ -204,37 +231,6 @@ def short_commit(commit):
         return commit[:12]
     return commit
 
-def git_info_from_path(path):
-    repo_path = Path(path)
-    if not (repo_path / ".git").exists():
-        return None
-
-    def run_git(args):
-        try:
-            result = subprocess.run(
-                ["git"] + args,
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                check=True,
-            )
-            return result.stdout.strip()
-        except Exception:
-            return ""
-
-    commit = run_git(["rev-parse", "HEAD"])
-    if not commit:
-        return None
-
-    return {
-        "commit": commit,
-        "commit_short": run_git(["rev-parse", "--short", "HEAD"]) or short_commit(commit),
-        "date": run_git(["log", "-1", "--format=%cd", "--date=iso-strict"]),
-        "repo": run_git(["remote", "get-url", "origin"]),
-        "branch": run_git(["rev-parse", "--abbrev-ref", "HEAD"]),
-        "path": str(repo_path),
-    }
-
 def candidate_source_paths(env, variant):
     paths = []
     for key in ("MODULES_REBUILD_SOURCE_PATH", "SOURCE_DIR"):
@@ -264,7 +260,7 @@ def candidate_source_paths(env, variant):
             unique_paths.append(p)
     return unique_paths
 
-def build_info(service_data, env):
+def build_info(service_data, env, provider, image_ids=None):
     variant = detect_source_variant(env)
     repo, branch = repo_config_for_variant(env, variant)
     info = {
@@ -316,7 +312,7 @@ def build_info(service_data, env):
     ]
 
     for image in deduped_images:
-        labels = image_labels(image)
+        labels = provider.image_labels(image, (image_ids or {}).get(image, ""))
         if not info["image"]:
             info["image"] = image
         if not labels:
@@ -331,7 +327,7 @@ def build_info(service_data, env):
             return info
 
     for path in candidate_source_paths(env, variant):
-        git_meta = git_info_from_path(path)
+        git_meta = provider.git_info(path)
         if git_meta:
             info["commit"] = git_meta.get("commit_short") or short_commit(git_meta.get("commit", ""))
             info["commit_date"] = git_meta.get("date", "")
@@ -474,6 +470,8 @@ def main():
     services = [
         ("ac-mysql", "MySQL"),
         ("ac-backup", "Backup"),
+        ("ac-binlog-stream", "Binlog Stream"),
+        ("ac-binlog-replay", "Binlog Replay"),
         ("ac-volume-init", "Volume Init"),
         ("ac-storage-init", "Storage Init"),
         ("ac-db-init", "DB Init"),
@@ -487,7 +485,8 @@ def main():
         ("ac-keira3", "Keira3"),
     ]
 
-    service_data = [service_snapshot(name, label) for name, label in services]
+    image_ids = {}
+    service_data = [service_snapshot(name, label, image_ids) for name, label in services]
 
     port_entries = [
         {"name": "Auth", "port": read_env(env, "AUTH_EXTERNAL_PORT"), "reachable": port_reachable(read_env(env, "AUTH_EXTERNAL_PORT"))},
@@ -502,20 +501,24 @@ def main():
     local_storage_path = expand_path(read_env(env, "STORAGE_PATH_LOCAL", "./local-storage"), env)
     client_data_path = expand_path(read_env(env, "CLIENT_DATA_PATH", f"{storage_path}/client-data"), env)
 
+    accountant = SizeAccountant(status_cache_dir(env) / "dir-sizes.json")
     storage_info = {
-        "storage": dir_info(storage_path),
-        "local_storage": dir_info(local_storage_path),
-        "client_data": dir_info(client_data_path),
-        "modules": dir_info(os.path.join(storage_path, "modules")),
-        "local_modules": dir_info(os.path.join(local_storage_path, "modules")),
+        "storage": dir_info(storage_path, accountant),
+        "local_storage": dir_info(local_storage_path, accountant),
+        "client_data": dir_info(client_data_path, accountant),
+        "modules": dir_info(os.path.join(storage_path, "modules"), accountant),
+        "local_modules": dir_info(os.path.join(local_storage_path, "modules"), accountant),
     }
+    accountant.save()
 
     volumes = {
         "client_cache": volume_info(f"{project}_client-data-cache"),
         "mysql_data": volume_info(f"{project}_mysql-data", "mysql-data"),
     }
 
-    build = build_info(service_data, env)
+    provider = BuildMetadataProvider(status_cache_dir(env) / "build-metadata.json")
+    build = build_info(service_data, env, provider, image_ids)
+    provider.save()
 
     data = {
         "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
@@ -529,8 +532,16 @@ def main():
         "users": user_stats(env),
         "stats": docker_stats(),
         "build": build,
+        "world_latency": world_latency(env),
+        "binlog_stream": binlog_stream(env),
     }
 
+    if read_env(env, "STATUS_HISTORY_ENABLED", "1") == "1":
+        try:
+            HistoryStore(status_cache_dir(env) / "status-history.bin").append(snapshot_metrics(data))
+        except Exception as exc:
+            print(f"Warning: unable to record status history: {exc}", file=sys.stderr)
+
     print(json.dumps(data))
 
 if __name__ == "__main__":
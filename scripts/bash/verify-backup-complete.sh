@@ -11,6 +11,7 @@ Verifies that a backup directory is complete and safe to copy.
 Options:
   -w, --wait SECONDS    Wait for completion (default: 0, no wait)
   -t, --timeout SECONDS Maximum wait time (default: 3600)
+  -i, --integrity       Also stream-verify every dump (backup-verify.sh)
   -v, --verbose         Show detailed output
   -h, --help           Show this help
 
@@ -26,13 +27,18 @@ Examples:
   # Wait up to 30 minutes for backup to complete
   ./verify-backup-complete.sh --wait 60 --timeout 1800 /path/to/backup
 
+  # Check the dumps can actually be decompressed and are not truncated
+  ./verify-backup-complete.sh --integrity /path/to/backup
+
 EOF
 }
 
 WAIT_SECONDS=0
 TIMEOUT=3600
 VERBOSE=false
+INTEGRITY=false
 BACKUP_DIR=""
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
 while [[ $# -gt 0 ]]; do
   case "$1" in
@@ -46,6 +52,10 @@ while [[ $# -gt 0 ]]; do
       TIMEOUT="$2"
       shift 2
       ;;
+    -i|--integrity)
+      INTEGRITY=true
+      shift
+      ;;
     -v|--verbose)
       VERBOSE=true
       shift
@@ -104,7 +114,10 @@ check_backup_complete() {
       local missing=false
       while IFS= read -r db; do
         [[ -z "$db" ]] && continue
-        if [[ ! -f "$dir/${db}.sql.gz" && ! -f "$dir/${db}.sql" ]]; then
+        if [[ -f "$dir/chunked/@.done.json" && -f "$dir/chunked/${db}.json" ]]; then
+          continue
+        fi
+        if [[ ! -f "$dir/${db}.sql.gz" && ! -f "$dir/${db}.sql.zst" && ! -f "$dir/${db}.sql.idx" && ! -f "$dir/${db}.sql" ]]; then
           log "Expected database file missing: ${db}.sql.gz"
           missing=true
         fi
@@ -127,6 +140,11 @@ waited=0
 while true; do
   if check_backup_complete "$BACKUP_DIR"; then
     $VERBOSE && echo "✅ Backup is complete: $BACKUP_DIR"
+    if $INTEGRITY; then
+      verify_args=(--no-manifest)
+      $VERBOSE || verify_args+=(--quiet)
+      bash "$SCRIPT_DIR/backup-verify.sh" "${verify_args[@]}" "$BACKUP_DIR" || exit 1
+    fi
     exit 0
   fi
 
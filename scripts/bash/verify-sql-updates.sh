@@ -26,6 +26,7 @@ MODULE_NAME=""
 DATABASE_NAME=""
 SHOW_ALL=0
 CHECK_HASH=0
+SHOW_PENDING=0
 CONTAINER_NAME="ac-mysql"
 
 usage() {
@@ -39,6 +40,8 @@ Options:
   --database NAME           Check specific database (auth/world/characters)
   --all                     Show all module updates
   --check-hash              Verify file hashes match database
+  --pending                 Compare staged module SQL with the updates tables
+                            (new / changed / applied per module)
   --container NAME          MySQL container name (default: ac-mysql)
   -h, --help                Show this help
 
@@ -46,6 +49,7 @@ Examples:
   ./verify-sql-updates.sh --all
   ./verify-sql-updates.sh --module mod-aoe-loot
   ./verify-sql-updates.sh --database acore_world --all
+  ./verify-sql-updates.sh --pending
 
 EOF
 }
@@ -57,6 +61,7 @@ while [[ $# -gt 0 ]]; do
     --database) DATABASE_NAME="$2"; shift 2;;
     --all) SHOW_ALL=1; shift;;
     --check-hash) CHECK_HASH=1; shift;;
+    --pending) SHOW_PENDING=1; shift;;
     --container) CONTAINER_NAME="$2"; shift 2;;
     -h|--help) usage; exit 0;;
     *) echo "Unknown option: $1"; usage; exit 1;;
@@ -208,6 +213,21 @@ list_module_updates() {
   return 0
 }
 
+# updates rows keyed by "<database>/<name>", loaded once per database
+declare -A UPDATES_ROWS=()
+declare -A UPDATES_LOADED=()
+
+load_updates_table() {
+  local database_name="$1"
+  [ -n "${UPDATES_LOADED[$database_name]:-}" ] && return 0
+  local name hash state timestamp
+  while IFS=$'\t' read -r name hash state timestamp; do
+    [ -n "$name" ] || continue
+    UPDATES_ROWS["$database_name/$name"]="$hash"$'\t'"$state"$'\t'"$timestamp"
+  done < <(mysql_query "$database_name" "SELECT name, hash, state, timestamp FROM updates" 2>/dev/null || true)
+  UPDATES_LOADED[$database_name]=1
+}
+
 # Check update applied
 check_update_applied() {
   local filename="$1"
@@ -219,10 +239,8 @@ check_update_applied() {
     return 2
   fi
 
-  # Query for specific file
-  local query="SELECT hash, state, timestamp FROM updates WHERE name='$filename' LIMIT 1"
-  local result
-  result=$(mysql_query "$database_name" "$query" 2>/dev/null || echo "")
+  load_updates_table "$database_name"
+  local result="${UPDATES_ROWS[$database_name/$filename]:-}"
 
   if [ -z "$result" ]; then
     warn "Update not found: $filename"
@@ -300,6 +318,27 @@ generate_verification_report() {
   echo
 }
 
+# Staged module SQL against the updates tables: one query per database plus
+# local hashing, instead of one lookup per file.
+show_pending_updates() {
+  local modules_dir="${STORAGE_MODULES_PATH:-${STORAGE_PATH:-$PROJECT_ROOT/storage}/modules}"
+  case "$modules_dir" in
+    /*) ;;
+    *) modules_dir="$PROJECT_ROOT/${modules_dir#./}" ;;
+  esac
+  if [ ! -d "$modules_dir" ]; then
+    err "Modules directory not found: $modules_dir"
+    return 1
+  fi
+
+  info "Comparing module SQL in $modules_dir with updates tables"
+  echo
+  MYSQL_ROOT_PASSWORD="$MYSQL_ROOT_PASSWORD" python3 "$PROJECT_ROOT/scripts/python/sql_update_plan.py" \
+    --modules-dir "$modules_dir" --enabled "$modules_dir/.modules-meta/modules-enabled.txt" \
+    --container "$CONTAINER_NAME" --world-db "$DB_WORLD_NAME" --auth-db "$DB_AUTH_NAME" \
+    --characters-db "$DB_CHARACTERS_NAME" --playerbots-db "$DB_PLAYERBOTS_NAME" --summary
+}
+
 # Main execution
 main() {
   echo
@@ -317,7 +356,9 @@ main() {
   fi
 
   # Execute based on options
-  if [ -n "$MODULE_NAME" ]; then
+  if [ "$SHOW_PENDING" = "1" ]; then
+    show_pending_updates
+  elif [ -n "$MODULE_NAME" ]; then
     # Check specific module
     if [ -n "$DATABASE_NAME" ]; then
       verify_module_sql "$MODULE_NAME" "$DATABASE_NAME"
@@ -40,6 +40,7 @@ type DirInfo struct {
 	Path   string `json:"path"`
 	Exists bool   `json:"exists"`
 	Size   string `json:"size"`
+	Bytes  int64  `json:"bytes"`
 }
 
 type VolumeInfo struct {
@@ -86,6 +87,22 @@ type Snapshot struct {
 	Users     UserStats                 `json:"users"`
 	Stats     map[string]ContainerStats `json:"stats"`
 	Build     BuildInfo                 `json:"build"`
+	Trends    map[string][]float64      `json:"-"`
+}
+
+type historyQuery struct {
+	Points [][2]float64 `json:"points"`
+}
+
+// Metrics read back from the status history ring buffer for the trends panel.
+var trendMetrics = []struct {
+	Metric string
+	Label  string
+	MaxVal float64
+}{
+	{"online", "Online", 0},
+	{"worldserver_cpu", "World CPU %", 100},
+	{"mysql_cpu", "MySQL CPU %", 100},
 }
 
 var persistentServiceOrder = []string{
@@ -183,9 +200,34 @@ func runSnapshot() (*Snapshot, error) {
 	if err := json.Unmarshal(output, snap); err != nil {
 		return nil, err
 	}
+	snap.Trends = loadTrends()
 	return snap, nil
 }
 
+// loadTrends reads the last hour of 1-minute buckets that statusjson.sh
+// appended to the history store. Missing history just leaves a metric empty.
+func loadTrends() map[string][]float64 {
+	trends := make(map[string][]float64)
+	for _, t := range trendMetrics {
+		cmd := exec.Command("python3", "./scripts/python/status_history.py",
+			"query", "--metric", t.Metric, "--since", "1h", "--tier", "1m")
+		output, err := cmd.Output()
+		if err != nil {
+			continue
+		}
+		var result historyQuery
+		if err := json.Unmarshal(output, &result); err != nil {
+			continue
+		}
+		values := make([]float64, len(result.Points))
+		for i, p := range result.Points {
+			values[i] = p[1]
+		}
+		trends[t.Metric] = values
+	}
+	return trends
+}
+
 func partitionServices(all []Service) ([]Service, []Service) {
 	byName := make(map[string]Service)
 	for _, svc := range all {
@@ -276,6 +318,38 @@ func buildPortsTable(s *Snapshot) *TableNoCol {
 	return table
 }
 
+func buildTrendsGroup(s *Snapshot, width int) *widgets.SparklineGroup {
+	lines := make([]*widgets.Sparkline, 0, len(trendMetrics))
+	for _, t := range trendMetrics {
+		values := s.Trends[t.Metric]
+		if width > 0 && len(values) > width {
+			values = values[len(values)-width:]
+		}
+		line := widgets.NewSparkline()
+		line.Data = values
+		line.LineColor = ui.ColorGreen
+		line.MaxVal = t.MaxVal
+		if line.MaxVal == 0 {
+			line.MaxVal = 1
+			for _, v := range values {
+				if v > line.MaxVal {
+					line.MaxVal = v
+				}
+			}
+		}
+		if len(values) > 0 {
+			line.Title = fmt.Sprintf("%s %.0f", t.Label, values[len(values)-1])
+		} else {
+			line.Title = fmt.Sprintf("%s -", t.Label)
+		}
+		lines = append(lines, line)
+	}
+	group := widgets.NewSparklineGroup(lines...)
+	group.Title = "Trends (1h)"
+	group.Border = true
+	return group
+}
+
 func buildModulesList(s *Snapshot) *widgets.List {
 	list := widgets.NewList()
 	list.Title = fmt.Sprintf("Modules (%d)", len(s.Modules))
@@ -462,6 +536,7 @@ func renderSnapshot(s *Snapshot, selectedModule int) (*widgets.List, *ui.Grid) {
 	// as top-level rows.
 	grid := ui.NewGrid()
 	termWidth, termHeight := ui.TerminalDimensions()
+	trendsGroup := buildTrendsGroup(s, int(float64(termWidth)*0.4)-2)
 
 	headerHeight := int(float64(termHeight) * headerRowFrac)
 	middleHeight := int(float64(termHeight) * middleRowFrac)
@@ -502,7 +577,10 @@ func renderSnapshot(s *Snapshot, selectedModule int) (*widgets.List, *ui.Grid) {
 		),
 		ui.NewRow(middleRowFrac,
 			ui.NewCol(0.6, servicesTable),
-			ui.NewCol(0.4, portsTable),
+			ui.NewCol(0.4,
+				ui.NewRow(0.5, portsTable),
+				ui.NewRow(0.5, trendsGroup),
+			),
 		),
 		ui.NewRow(bottomRowFrac,
 			ui.NewCol(0.25, modulesList),
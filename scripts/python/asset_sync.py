@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Sync module assets (configs, DBC files, Lua scripts) into a destination directory.
+
+The wanted files come from a spec with one tab-separated line per file:
+module, source path, destination path relative to the target, and an optional
+``seed`` flag. Each destination keeps a ``.asset-manifest`` recording, for each
+file it wrote, the content SHA1, the owning module, and the size and mtime left
+on disk. A file is copied only when its source hash differs from the manifest
+or the destination was changed or deleted since. Copies run on a worker pool.
+
+When two modules ship the same destination file with different content, the
+later spec line wins and the overwrite is reported as a conflict. Files the
+manifest owns that no longer appear in the spec, for example because their module
+was disabled, are removed. Seed files are created when missing and refreshed
+when their source changes, but only while the file on disk is still the copy
+the sync wrote. A seed edited locally, or one that was there before the sync
+and differs from the source, is left alone and never removed, so a user's
+edits survive.
+
+With ``--preserve``, a file that existed before the sync first took it over
+(for example a client DBC that a module replaces) is moved to
+``.asset-originals`` and restored when the module's copy is removed.
+
+Usage:
+    asset_sync.py --dest storage/config/modules --spec /tmp/conf.spec
+    printf 'mod-a\\t/modules/mod-a/dbc/Spell.dbc\\tSpell.dbc\\n' | asset_sync.py --dest data/dbc --spec -
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+MANIFEST = ".asset-manifest"
+ORIGINALS = ".asset-originals"
+
+
+class SyncError(Exception):
+    """Raised when the spec is malformed."""
+
+
+@dataclass
+class Asset:
+    module: str
+    source: Path
+    dest: str
+    seed: bool = False
+    sha1: str = ""
+
+
+@dataclass
+class Record:
+    sha1: str
+    module: str
+    size: int
+    mtime_ns: int
+    seed: bool = False
+
+    def matches(self, path: Path) -> bool:
+        try:
+            st = path.stat()
+        except OSError:
+            return False
+        return st.st_size == self.size and st.st_mtime_ns == self.mtime_ns
+
+
+def sha1_file(path: Path) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_spec(lines: Iterable[str]) -> List[Asset]:
+    assets: List[Asset] = []
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip("\n")
+        if not line.strip() or line.startswith("#"):
+            continue
+        fields = line.split("\t")
+        if len(fields) < 3 or not all(fields[:3]):
+            raise SyncError(f"spec line {number}: expected module, source and destination")
+        dest = os.path.normpath(fields[2])
+        if dest.startswith("..") or os.path.isabs(dest):
+            raise SyncError(f"spec line {number}: destination {fields[2]!r} leaves the target directory")
+        assets.append(Asset(fields[0], Path(fields[1]), dest, len(fields) > 3 and fields[3] == "seed"))
+    return assets
+
+
+def read_manifest(path: Path) -> Dict[str, Record]:
+    records: Dict[str, Record] = {}
+    if not path.is_file():
+        return records
+    for line in path.read_text(encoding="utf-8").splitlines():
+        fields = line.split("\t")
+        if len(fields) >= 5 and fields[3].isdigit() and fields[4].isdigit():
+            records[fields[0]] = Record(fields[1], fields[2], int(fields[3]), int(fields[4]),
+                                        len(fields) > 5 and fields[5] == "seed")
+    return records
+
+
+def write_manifest(path: Path, records: Dict[str, Record]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as handle:
+        for dest, rec in sorted(records.items()):
+            fields = [dest, rec.sha1, rec.module, str(rec.size), str(rec.mtime_ns)]
+            if rec.seed:
+                fields.append("seed")
+            handle.write("\t".join(fields) + "\n")
+    tmp.replace(path)
+
+
+def resolve(assets: List[Asset]) -> Tuple[Dict[str, Asset], List[Tuple[str, Asset, Asset]]]:
+    """Last spec line wins per destination; differing content from another module is a conflict."""
+    wanted: Dict[str, Asset] = {}
+    conflicts: List[Tuple[str, Asset, Asset]] = []
+    for asset in assets:
+        previous = wanted.get(asset.dest)
+        if previous and previous.module != asset.module and previous.sha1 != asset.sha1:
+            conflicts.append((asset.dest, previous, asset))
+        wanted[asset.dest] = asset
+    return wanted, conflicts
+
+
+def copy(asset: Asset, target: Path) -> Record:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.sync")
+    shutil.copyfile(asset.source, tmp)
+    os.replace(tmp, target)
+    st = target.stat()
+    return Record(asset.sha1, asset.module, st.st_size, st.st_mtime_ns, asset.seed)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Sync module assets into a directory using a hash manifest")
+    parser.add_argument("--dest", type=Path, required=True, help="Destination directory")
+    parser.add_argument("--spec", required=True, help="Spec file (module, source, dest[, seed]); - for stdin")
+    parser.add_argument("--label", default="asset", help="Noun used in output (default: asset)")
+    parser.add_argument("-j", "--jobs", type=int, default=min(8, os.cpu_count() or 2),
+                        help="Concurrent copies (default: nproc, at most 8)")
+    parser.add_argument("--preserve", action="store_true",
+                        help=f"Keep files overwritten for the first time in {ORIGINALS} and restore them on removal")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="Report what would change")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Only print conflicts, errors and the summary")
+    args = parser.parse_args(argv)
+
+    try:
+        with (sys.stdin if args.spec == "-" else open(args.spec, encoding="utf-8")) as handle:
+            assets = read_spec(handle)
+    except (OSError, SyncError) as exc:
+        print(f"❌ {exc}", file=sys.stderr)
+        return 1
+
+    usable: List[Asset] = []
+    for asset in assets:
+        try:
+            if asset.source.stat().st_size == 0:
+                print(f"  ⚠️  Skipped empty file: {asset.module}/{asset.source.name}")
+                continue
+            asset.sha1 = sha1_file(asset.source)
+        except OSError as exc:
+            print(f"  ❌ Cannot read {asset.module}/{asset.source.name}: {exc.strerror}")
+            continue
+        usable.append(asset)
+
+    wanted, conflicts = resolve(usable)
+    for dest, loser, winner in conflicts:
+        print(f"  ⚠️  Conflict: {dest} is shipped by {loser.module} and {winner.module}; using {winner.module}")
+
+    manifest_path = args.dest / MANIFEST
+    records = read_manifest(manifest_path)
+    pending: List[Asset] = []
+    unchanged = 0
+    dirty = not manifest_path.exists()
+    for dest, asset in wanted.items():
+        target = args.dest / dest
+        rec = records.get(dest)
+        if asset.seed and target.exists():
+            if rec is not None and rec.matches(target):
+                # Still the copy we wrote: follow the source, keep the owner current.
+                if rec.sha1 != asset.sha1:
+                    pending.append(asset)
+                    continue
+                if rec.module != asset.module or not rec.seed:
+                    records[dest] = Record(rec.sha1, asset.module, rec.size, rec.mtime_ns, True)
+                    dirty = True
+            elif rec is None and sha1_file(target) == asset.sha1:
+                st = target.stat()
+                records[dest] = Record(asset.sha1, asset.module, st.st_size, st.st_mtime_ns, True)
+                dirty = True
+            unchanged += 1
+        elif rec is not None and rec.sha1 == asset.sha1 and rec.module == asset.module and rec.matches(target):
+            unchanged += 1
+        else:
+            pending.append(asset)
+
+    stale = sorted(dest for dest in records if dest not in wanted)
+    removed = kept = failed = 0
+    for dest in stale:
+        rec = records[dest]
+        target = args.dest / dest
+        original = args.dest / ORIGINALS / dest
+        if rec.seed and target.exists() and not rec.matches(target):
+            print(f"  ℹ️  Kept {dest} from {rec.module} (modified locally)")
+            kept += 1
+        elif not args.dry_run:
+            try:
+                if original.exists():
+                    os.replace(original, target)
+                else:
+                    target.unlink(missing_ok=True)
+            except OSError as exc:
+                print(f"  ❌ Cannot remove {dest}: {exc.strerror}")
+                failed += 1
+                continue
+            if not args.quiet:
+                action = "Restored original" if target.exists() else "Removed"
+                print(f"  🗑️  {action} {dest} ({rec.module})")
+            removed += 1
+        else:
+            print(f"  🗑️  Would remove {dest} ({rec.module})")
+            removed += 1
+        if not args.dry_run:
+            del records[dest]
+
+    if args.dry_run:
+        for asset in pending:
+            print(f"  ✓ Would copy {asset.module} → {asset.dest}")
+        print(f"{len(pending)} {args.label} file(s) to copy, {removed} to remove, {unchanged} unchanged, "
+              f"{len(conflicts)} conflict(s)")
+        return 0
+
+    copied = 0
+    if args.preserve:
+        # Never overwrite a file we do not own without keeping it first.
+        preserved: List[Asset] = []
+        for asset in pending:
+            target = args.dest / asset.dest
+            original = args.dest / ORIGINALS / asset.dest
+            if asset.dest not in records and target.exists() and not original.exists():
+                try:
+                    original.parent.mkdir(parents=True, exist_ok=True)
+                    shutil.copy2(target, original)
+                except OSError as exc:
+                    print(f"  ❌ Cannot preserve original {asset.dest}: {exc.strerror}")
+                    failed += 1
+                    continue
+            preserved.append(asset)
+        pending = preserved
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            futures = [(asset, pool.submit(copy, asset, args.dest / asset.dest)) for asset in pending]
+            for asset, future in futures:
+                try:
+                    records[asset.dest] = future.result()
+                except OSError as exc:
+                    print(f"  ❌ Failed to copy {asset.module}/{asset.source.name}: {exc.strerror}")
+                    failed += 1
+                    continue
+                if not args.quiet:
+                    print(f"  ✓ Staged {asset.module} → {asset.dest}")
+                copied += 1
+    if dirty or pending or stale:
+        try:
+            args.dest.mkdir(parents=True, exist_ok=True)
+            write_manifest(manifest_path, records)
+        except OSError as exc:
+            print(f"❌ Cannot write {manifest_path}: {exc.strerror}", file=sys.stderr)
+            return 1
+
+    summary = f"✅ {args.label}: {copied} copied, {unchanged} unchanged, {removed} removed"
+    if kept:
+        summary += f", {kept} kept"
+    if conflicts:
+        summary += f", {len(conflicts)} conflict(s)"
+    print(summary)
+    if failed:
+        print(f"❌ {failed} {args.label} file(s) failed")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
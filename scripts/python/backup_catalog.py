@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+SQLite catalog of backup sets.
+
+One row per backup set (tier, timestamp, type, format, size, duration) and one
+row per database dump (size, SHA-256, dump time), recorded by the backup
+scheduler when a set is completed and marked removed when retention prunes
+it. Latest-backup lookups, the status dashboard and size trends become indexed
+queries instead of walking and ``du``-ing every tier directory.
+
+``sync`` reconciles the catalog with the tiers on disk by listing directory
+names only, so sets written by older schedulers or copied in by hand are
+picked up without rescanning sets already catalogued.
+
+Usage:
+    backup_catalog.py add /backups/hourly/20250101_120000
+    backup_catalog.py remove /backups/hourly/20250101_060000
+    backup_catalog.py sync --root /backups
+    backup_catalog.py find --root ./storage/backups --db acore_world --db world
+    backup_catalog.py summary --root ./storage/backups
+    backup_catalog.py trends --root ./storage/backups --tier daily --limit 7
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+CATALOG_NAME = "catalog.sqlite"
+# Plain-text copy of the latest-per-tier query for shell-only consumers
+# (db-import-conditional.sh runs in images without python3 or sqlite3).
+LATEST_NAME = "catalog-latest.tsv"
+TIMESTAMP_RE = re.compile(r"(\d{8})_(\d{6})$")
+DUMP_RE = re.compile(r"^(?P<db>[A-Za-z0-9_-]+)\.sql(?:\.gz|\.zst|\.idx)?$")
+TIERS = ("daily", "hourly")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS backups (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    tier TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    type TEXT,
+    format TEXT,
+    compression TEXT,
+    complete INTEGER NOT NULL DEFAULT 0,
+    size_bytes INTEGER NOT NULL DEFAULT 0,
+    duration_seconds REAL,
+    uncompressed_mb REAL,
+    manifest TEXT,
+    cataloged_at INTEGER NOT NULL,
+    removed_at INTEGER
+);
+CREATE INDEX IF NOT EXISTS backups_live ON backups (removed_at, tier, created_at);
+CREATE TABLE IF NOT EXISTS dumps (
+    backup_id INTEGER NOT NULL REFERENCES backups (id) ON DELETE CASCADE,
+    database TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    sha256 TEXT,
+    inode INTEGER,
+    mtime INTEGER,
+    action TEXT,
+    duration_seconds REAL,
+    PRIMARY KEY (backup_id, name)
+);
+CREATE INDEX IF NOT EXISTS dumps_database ON dumps (database);
+CREATE INDEX IF NOT EXISTS dumps_inode ON dumps (inode, size_bytes, mtime);
+"""
+
+
+def default_root() -> Path:
+    return Path(os.environ.get("BACKUP_DIR_BASE") or os.environ.get("BACKUP_PATH") or "/backups")
+
+
+def connect(catalog: Path) -> sqlite3.Connection:
+    conn = sqlite3.connect(str(catalog), timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def tier_of(root: Path, backup_dir: Path) -> str:
+    try:
+        parent = backup_dir.resolve().parent.relative_to(root.resolve())
+    except ValueError:
+        return "external"
+    name = str(parent)
+    if name in TIERS:
+        return name
+    if name == "." and backup_dir.name.startswith("ExportBackup_"):
+        return "export"
+    return name if name != "." else "root"
+
+
+def timestamp_epoch(timestamp: str, fallback: float) -> int:
+    match = TIMESTAMP_RE.search(timestamp)
+    if not match:
+        return int(fallback)
+    try:
+        return int(time.mktime(time.strptime("".join(match.groups()), "%Y%m%d%H%M%S")))
+    except ValueError:
+        return int(fallback)
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def iter_dumps(backup_dir: Path) -> Iterator[Tuple[str, str, Path]]:
+    """Yield (database, name relative to the set, path) for each dump."""
+    for path in sorted(backup_dir.iterdir()):
+        match = DUMP_RE.match(path.name)
+        if match and path.is_file():
+            yield match.group("db"), path.name, path
+    chunked = backup_dir / "chunked"
+    if (chunked / "@.done.json").is_file():
+        for path in sorted(chunked.glob("*.json")):
+            if "@" not in path.name:
+                yield path.stem, f"chunked/{path.name}", path
+
+
+def dir_size(path: Path) -> int:
+    total = 0
+    for base, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(base, name)).st_size
+            except OSError:
+                continue
+    return total
+
+
+def known_checksum(conn: sqlite3.Connection, stat: os.stat_result) -> Optional[str]:
+    # Reused (hardlinked) dumps share an inode with an already hashed file.
+    row = conn.execute(
+        "SELECT sha256 FROM dumps WHERE inode = ? AND size_bytes = ? AND mtime = ? AND sha256 IS NOT NULL LIMIT 1",
+        (stat.st_ino, stat.st_size, int(stat.st_mtime)),
+    ).fetchone()
+    return row["sha256"] if row else None
+
+
+def add(conn: sqlite3.Connection, root: Path, backup_dir: Path, checksums: bool = True) -> Optional[int]:
+    backup_dir = Path(backup_dir)
+    if not backup_dir.is_dir():
+        return None
+    manifest: Dict = {}
+    try:
+        manifest = json.loads((backup_dir / "manifest.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        pass
+    performance = manifest.get("performance") or {}
+    dump_info = manifest.get("dumps") or {}
+    path = os.path.relpath(backup_dir.resolve(), root.resolve())
+    stat = backup_dir.stat()
+    timestamp = str(manifest.get("timestamp") or backup_dir.name)
+    tier = tier_of(root, backup_dir)
+    now = int(time.time())
+    with conn:
+        conn.execute(
+            """
+            INSERT INTO backups (path, tier, timestamp, created_at, type, format, compression, complete,
+                                 size_bytes, duration_seconds, uncompressed_mb, manifest, cataloged_at, removed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)
+            ON CONFLICT (path) DO UPDATE SET
+                tier = excluded.tier, timestamp = excluded.timestamp, created_at = excluded.created_at,
+                type = excluded.type, format = excluded.format, compression = excluded.compression,
+                complete = excluded.complete, size_bytes = excluded.size_bytes,
+                duration_seconds = excluded.duration_seconds, uncompressed_mb = excluded.uncompressed_mb,
+                manifest = excluded.manifest, cataloged_at = excluded.cataloged_at, removed_at = NULL
+            """,
+            (
+                path,
+                tier,
+                timestamp,
+                timestamp_epoch(timestamp, stat.st_mtime),
+                manifest.get("type"),
+                manifest.get("format") or "sql",
+                manifest.get("compression"),
+                1 if (backup_dir / ".backup_complete").exists() or tier not in TIERS else 0,
+                dir_size(backup_dir),
+                performance.get("duration_seconds"),
+                performance.get("uncompressed_size_mb"),
+                json.dumps(manifest) if manifest else None,
+                now,
+            ),
+        )
+        backup_id = conn.execute("SELECT id FROM backups WHERE path = ?", (path,)).fetchone()["id"]
+        conn.execute("DELETE FROM dumps WHERE backup_id = ?", (backup_id,))
+        for database, name, dump_path in iter_dumps(backup_dir):
+            dump_stat = dump_path.stat()
+            checksum = None
+            if checksums:
+                checksum = known_checksum(conn, dump_stat) or file_sha256(dump_path)
+            info = dump_info.get(database) or {}
+            conn.execute(
+                "INSERT INTO dumps (backup_id, database, name, size_bytes, sha256, inode, mtime, action, duration_seconds)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    backup_id,
+                    database,
+                    name,
+                    dump_stat.st_size,
+                    checksum,
+                    dump_stat.st_ino,
+                    int(dump_stat.st_mtime),
+                    info.get("action"),
+                    info.get("duration_seconds"),
+                ),
+            )
+    return backup_id
+
+
+def remove(conn: sqlite3.Connection, root: Path, backup_dir: Path) -> bool:
+    path = os.path.relpath(Path(backup_dir).resolve(), root.resolve())
+    with conn:
+        cursor = conn.execute(
+            "UPDATE backups SET removed_at = ? WHERE path = ? AND removed_at IS NULL", (int(time.time()), path)
+        )
+    return cursor.rowcount > 0
+
+
+def candidate_dirs(root: Path) -> Iterator[Path]:
+    for tier in TIERS:
+        tier_dir = root / tier
+        if tier_dir.is_dir():
+            for entry in tier_dir.iterdir():
+                if entry.is_dir() and TIMESTAMP_RE.search(entry.name):
+                    yield entry
+    if root.is_dir():
+        for entry in root.iterdir():
+            if entry.is_dir() and (entry.name.startswith("ExportBackup_") or TIMESTAMP_RE.fullmatch(entry.name)):
+                yield entry
+
+
+def sync(conn: sqlite3.Connection, root: Path, checksums: bool = True) -> Dict[str, int]:
+    live = {row["path"]: row["complete"] for row in conn.execute("SELECT path, complete FROM backups WHERE removed_at IS NULL")}
+    seen = set()
+    added = 0
+    for entry in candidate_dirs(root):
+        path = os.path.relpath(entry.resolve(), root.resolve())
+        seen.add(path)
+        # Re-read sets that were still being written when last catalogued.
+        if path in live and (live[path] or not (entry / ".backup_complete").exists()):
+            continue
+        add(conn, root, entry, checksums)
+        added += 1
+    removed = 0
+    for path in set(live) - seen:
+        if not (root / path).is_dir():
+            removed += int(remove(conn, root, root / path))
+    return {"added": added, "removed": removed}
+
+
+def find(conn: sqlite3.Connection, root: Path, databases: Sequence[str], tier: Optional[str] = None) -> Optional[Path]:
+    """Newest live, complete dump of any of ``databases`` that still exists."""
+    placeholders = ",".join("?" for _ in databases)
+    query = (
+        "SELECT b.path AS backup, d.name AS name FROM dumps d JOIN backups b ON b.id = d.backup_id"
+        f" WHERE b.removed_at IS NULL AND b.complete = 1 AND d.database IN ({placeholders})"
+    )
+    params: List = list(databases)
+    if tier:
+        query += " AND b.tier = ?"
+        params.append(tier)
+    query += " ORDER BY b.created_at DESC, b.id DESC"
+    for row in conn.execute(query, params):
+        path = root / row["backup"] / row["name"]
+        if path.is_file():
+            return path
+    return None
+
+
+def write_latest(conn: sqlite3.Connection, root: Path) -> None:
+    lines = []
+    for tier in TIERS:
+        row = conn.execute(
+            "SELECT path FROM backups WHERE removed_at IS NULL AND complete = 1 AND tier = ?"
+            " ORDER BY created_at DESC, id DESC LIMIT 1",
+            (tier,),
+        ).fetchone()
+        if row:
+            lines.append(f"{tier}\t{row['path']}\n")
+    target = root / LATEST_NAME
+    tmp_path = target.with_name(f".{LATEST_NAME}.{os.getpid()}.tmp")
+    tmp_path.write_text("".join(lines), encoding="utf-8")
+    os.replace(tmp_path, target)
+
+
+def summary(conn: sqlite3.Connection) -> List[Dict]:
+    rows = conn.execute(
+        """
+        SELECT tier, COUNT(*) AS count, SUM(size_bytes) AS size_bytes, MAX(timestamp) AS latest,
+               AVG(duration_seconds) AS avg_duration_seconds
+        FROM backups WHERE removed_at IS NULL GROUP BY tier ORDER BY tier
+        """
+    )
+    return [dict(row) for row in rows]
+
+
+def list_backups(conn: sqlite3.Connection, tier: Optional[str], limit: int, include_removed: bool = False) -> List[Dict]:
+    query = "SELECT id, path, tier, timestamp, created_at, type, format, compression, complete, size_bytes, duration_seconds, removed_at FROM backups"
+    clauses, params = [], []
+    if not include_removed:
+        clauses.append("removed_at IS NULL")
+    if tier:
+        clauses.append("tier = ?")
+        params.append(tier)
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY created_at DESC LIMIT ?"
+    params.append(limit)
+    return [dict(row) for row in conn.execute(query, params)]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="SQLite catalog of backup sets")
+    parser.add_argument("--root", type=Path, default=None, help="Backup root (default: $BACKUP_DIR_BASE, $BACKUP_PATH or /backups)")
+    parser.add_argument("--catalog", type=Path, default=None, help=f"Catalog file (default: <root>/{CATALOG_NAME})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add_parser = sub.add_parser("add", help="Catalog (or refresh) one backup set")
+    add_parser.add_argument("dirs", nargs="+", type=Path)
+    add_parser.add_argument("--no-checksums", action="store_true", help="Skip SHA-256 of dump files")
+
+    remove_parser = sub.add_parser("remove", help="Mark backup sets as pruned")
+    remove_parser.add_argument("dirs", nargs="+", type=Path)
+
+    sync_parser = sub.add_parser("sync", help="Reconcile the catalog with the tier directories")
+    sync_parser.add_argument("--no-checksums", action="store_true")
+
+    find_parser = sub.add_parser("find", help="Print the newest dump for a database")
+    find_parser.add_argument("--db", action="append", required=True, help="Schema/name to match (repeatable)")
+    find_parser.add_argument("--tier")
+    find_parser.add_argument("--no-sync", action="store_true", help="Query without reconciling first")
+
+    for name, help_text in (("summary", "Per-tier counts, sizes and latest backup"),
+                            ("list", "List backup sets, newest first"),
+                            ("trends", "Sizes and durations over time, oldest first")):
+        query = sub.add_parser(name, help=help_text)
+        query.add_argument("--tier")
+        query.add_argument("--limit", type=int, default=50)
+        query.add_argument("--format", choices=("json", "tsv"), default="json")
+        query.add_argument("--no-sync", action="store_true")
+        if name == "list":
+            query.add_argument("--all", action="store_true", help="Include pruned sets")
+
+    args = parser.parse_args(argv)
+    root = (args.root or default_root())
+    catalog = args.catalog or root / CATALOG_NAME
+    if not root.is_dir():
+        print(f"Backup root not found: {root}", file=sys.stderr)
+        return 1
+    try:
+        conn = connect(catalog)
+    except sqlite3.Error as exc:
+        print(f"Cannot open catalog {catalog}: {exc}", file=sys.stderr)
+        return 1
+
+    if args.command == "add":
+        for directory in args.dirs:
+            if add(conn, root, directory, not args.no_checksums) is None:
+                print(f"Not a directory: {directory}", file=sys.stderr)
+        write_latest(conn, root)
+        return 0
+    if args.command == "remove":
+        for directory in args.dirs:
+            remove(conn, root, directory)
+        write_latest(conn, root)
+        return 0
+    if args.command == "sync":
+        print(json.dumps(sync(conn, root, not args.no_checksums)))
+        write_latest(conn, root)
+        return 0
+
+    if not args.no_sync:
+        try:
+            sync(conn, root, checksums=False)
+        except (OSError, sqlite3.Error) as exc:
+            # Read-only catalogs (e.g. owned by the backup container) are still queryable.
+            print(f"Catalog sync skipped: {exc}", file=sys.stderr)
+    if args.command == "find":
+        path = find(conn, root, args.db, args.tier)
+        if path is None:
+            return 1
+        print(path)
+        return 0
+
+    if args.command == "summary":
+        rows = summary(conn)
+        if args.tier:
+            rows = [row for row in rows if row["tier"] == args.tier]
+    else:
+        rows = list_backups(conn, args.tier, args.limit, getattr(args, "all", False))
+        if args.command == "trends":
+            rows.reverse()
+    if args.format == "tsv":
+        for row in rows:
+            print("\t".join("-" if value is None else str(value) for value in row.values()))
+    else:
+        print(json.dumps(rows, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Content-addressed, deduplicated store for SQL dumps.
+
+Dumps are split into content-defined chunks and each chunk is stored once,
+zlib-compressed, under ``<repo>/chunks/<hh>/<sha256>``. A backup keeps only a
+small index (``<db>.sql.idx``) listing its chunks, so hourly and daily copies
+of a mostly unchanged database share almost all of their storage.
+
+Chunk boundaries are chosen at SQL row separators (``),(``) and newlines whose
+preceding bytes hash to a fixed pattern. An edit therefore only changes the
+chunks around it instead of shifting every later boundary. Both directions
+stream: ``put`` reads a dump from stdin and ``cat`` writes it to stdout, so a
+restore never materialises the whole file.
+
+Usage:
+    mysqldump ... | backup_repo.py put --repo /backups/repository --index hourly/TS/acore_world.sql.idx
+    backup_repo.py cat hourly/TS/acore_world.sql.idx | mysql acore_world
+    backup_repo.py gc --repo /backups/repository --root /backups
+    backup_repo.py stats --repo /backups/repository
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Optional, Sequence, Set, Tuple
+
+INDEX_FORMAT = "acore-chunk-index"
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".idx"
+
+MIN_CHUNK = 256 * 1024
+MAX_CHUNK = 8 * 1024 * 1024
+AVG_BITS = 13
+WINDOW = 48
+READ_SIZE = 4 * 1024 * 1024
+
+CANDIDATE = re.compile(rb"\n|\),\(")
+
+
+class RepositoryError(Exception):
+    """Raised for missing or corrupt chunks and unreadable indexes."""
+
+
+def chunk_stream(
+    stream: BinaryIO,
+    min_size: int = MIN_CHUNK,
+    max_size: int = MAX_CHUNK,
+    avg_bits: int = AVG_BITS,
+) -> Iterator[bytes]:
+    """Yield content-defined chunks read from ``stream``."""
+    mask = (1 << avg_bits) - 1
+    buf = bytearray()
+    eof = False
+    while True:
+        while not eof and len(buf) < max_size:
+            data = stream.read(READ_SIZE)
+            if not data:
+                eof = True
+            else:
+                buf += data
+        if not buf:
+            return
+        cut = 0
+        with memoryview(buf) as view:
+            for match in CANDIDATE.finditer(buf, min_size, min(len(buf), max_size)):
+                end = match.end()
+                if zlib.crc32(view[end - WINDOW:end]) & mask == mask:
+                    cut = end
+                    break
+        if not cut:
+            if len(buf) >= max_size:
+                cut = max_size
+            elif eof:
+                cut = len(buf)
+            else:
+                continue
+        yield bytes(buf[:cut])
+        del buf[:cut]
+
+
+class Repository:
+    def __init__(self, path: Path, level: int = 6):
+        self.path = Path(path)
+        self.chunks = self.path / "chunks"
+        self.level = level
+
+    def chunk_path(self, digest: str) -> Path:
+        return self.chunks / digest[:2] / digest
+
+    def put_chunk(self, data: bytes) -> Tuple[str, int]:
+        """Store ``data`` unless present; returns (digest, bytes written)."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.chunk_path(digest)
+        if path.exists():
+            return digest, 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = zlib.compress(data, self.level)
+        tmp_path = path.with_name(f".{digest}.{os.getpid()}.tmp")
+        with tmp_path.open("wb") as fh:
+            fh.write(payload)
+        os.replace(tmp_path, path)
+        return digest, len(payload)
+
+    def get_chunk(self, digest: str, verify: bool = True) -> bytes:
+        path = self.chunk_path(digest)
+        try:
+            data = zlib.decompress(path.read_bytes())
+        except FileNotFoundError as exc:
+            raise RepositoryError(f"Missing chunk {digest}") from exc
+        except zlib.error as exc:
+            raise RepositoryError(f"Corrupt chunk {digest}: {exc}") from exc
+        if verify and hashlib.sha256(data).hexdigest() != digest:
+            raise RepositoryError(f"Chunk {digest} failed its hash check")
+        return data
+
+    def touch(self, digest: str) -> None:
+        # Refresh reused chunks so gc's grace period protects in-flight backups.
+        try:
+            os.utime(self.chunk_path(digest))
+        except OSError:
+            pass
+
+
+def write_index(index_path: Path, repo: Repository, chunks: List[Tuple[str, int]], size: int, sha256: str) -> None:
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "format": INDEX_FORMAT,
+        "version": INDEX_VERSION,
+        "repository": os.path.relpath(repo.path.resolve(), index_path.parent.resolve()),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "size": size,
+        "sha256": sha256,
+        "chunks": [[digest, length] for digest, length in chunks],
+    }
+    tmp_path = index_path.with_name(f".{index_path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, index_path)
+
+
+def read_index(index_path: Path) -> dict:
+    try:
+        data = json.loads(Path(index_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        raise RepositoryError(f"Unreadable index {index_path}: {exc}") from exc
+    if data.get("format") != INDEX_FORMAT:
+        raise RepositoryError(f"{index_path} is not a chunk index")
+    return data
+
+
+def index_repository(index_path: Path, data: dict, override: Optional[Path] = None) -> Repository:
+    if override is not None:
+        return Repository(override)
+    return Repository((Path(index_path).parent / data.get("repository", "")).resolve())
+
+
+def store(stream: BinaryIO, repo: Repository, index_path: Path, **chunk_args) -> dict:
+    digest_all = hashlib.sha256()
+    chunks: List[Tuple[str, int]] = []
+    size = new_chunks = written = 0
+    for data in chunk_stream(stream, **chunk_args):
+        digest_all.update(data)
+        digest, stored = repo.put_chunk(data)
+        if stored:
+            new_chunks += 1
+            written += stored
+        else:
+            repo.touch(digest)
+        chunks.append((digest, len(data)))
+        size += len(data)
+    write_index(index_path, repo, chunks, size, digest_all.hexdigest())
+    return {
+        "size": size,
+        "chunks": len(chunks),
+        "new_chunks": new_chunks,
+        "written_bytes": written,
+    }
+
+
+def restore(index_path: Path, out: BinaryIO, repo_override: Optional[Path] = None) -> int:
+    data = read_index(index_path)
+    repo = index_repository(index_path, data, repo_override)
+    digest_all = hashlib.sha256()
+    total = 0
+    for digest, _length in data.get("chunks", []):
+        chunk = repo.get_chunk(digest)
+        digest_all.update(chunk)
+        out.write(chunk)
+        total += len(chunk)
+    out.flush()
+    if data.get("sha256") and digest_all.hexdigest() != data["sha256"]:
+        raise RepositoryError(f"{index_path}: restored stream does not match its checksum")
+    return total
+
+
+def find_indexes(roots: Sequence[Path]) -> Iterator[Path]:
+    for root in roots:
+        if Path(root).is_file():
+            yield Path(root)
+            continue
+        for path in Path(root).rglob(f"*{INDEX_SUFFIX}"):
+            if path.is_file():
+                yield path
+
+
+def collect_references(roots: Sequence[Path]) -> Tuple[Set[str], int]:
+    referenced: Set[str] = set()
+    indexes = 0
+    for path in find_indexes(roots):
+        try:
+            data = read_index(path)
+        except RepositoryError as exc:
+            print(f"Warning: {exc}", file=sys.stderr)
+            continue
+        indexes += 1
+        referenced.update(digest for digest, _ in data.get("chunks", []))
+    return referenced, indexes
+
+
+def gc(repo: Repository, roots: Sequence[Path], grace: int = 3600, dry_run: bool = False) -> dict:
+    """Delete chunks no surviving index references (mark and sweep).
+
+    Retention itself is applied by removing backup directories; whatever
+    indexes remain under ``roots`` keep their chunks alive. Chunks younger
+    than ``grace`` seconds are kept for backups still being written.
+    """
+    referenced, indexes = collect_references(roots)
+    cutoff = time.time() - grace
+    removed = freed = kept = 0
+    if repo.chunks.is_dir():
+        for path in repo.chunks.glob("*/*"):
+            if path.name.startswith("."):
+                continue
+            if path.name in referenced:
+                kept += 1
+                continue
+            stat = path.stat()
+            if stat.st_mtime > cutoff:
+                kept += 1
+                continue
+            removed += 1
+            freed += stat.st_size
+            if not dry_run:
+                path.unlink()
+    return {"indexes": indexes, "kept": kept, "removed": removed, "freed_bytes": freed, "dry_run": dry_run}
+
+
+def stats(repo: Repository, roots: Sequence[Path]) -> dict:
+    stored = chunks = 0
+    if repo.chunks.is_dir():
+        for path in repo.chunks.glob("*/*"):
+            if not path.name.startswith("."):
+                chunks += 1
+                stored += path.stat().st_size
+    logical = indexes = 0
+    for path in find_indexes(roots):
+        try:
+            logical += int(read_index(path).get("size", 0))
+            indexes += 1
+        except RepositoryError:
+            continue
+    return {
+        "chunks": chunks,
+        "stored_bytes": stored,
+        "indexes": indexes,
+        "logical_bytes": logical,
+        "dedup_ratio": round(logical / stored, 2) if stored else None,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Deduplicated chunk repository for SQL dumps")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    put = sub.add_parser("put", help="Chunk a dump from stdin into the repository and write its index")
+    put.add_argument("--repo", required=True, help="Repository directory")
+    put.add_argument("--index", required=True, help="Index file to write (e.g. <backup>/acore_world.sql.idx)")
+    put.add_argument("--level", type=int, default=6, help="zlib level for new chunks (default: 6)")
+    put.add_argument("--min-chunk", type=int, default=MIN_CHUNK)
+    put.add_argument("--max-chunk", type=int, default=MAX_CHUNK)
+    put.add_argument("--avg-bits", type=int, default=AVG_BITS,
+                     help="Boundary probability 1/2^N per row/line candidate (default: 13)")
+
+    cat = sub.add_parser("cat", help="Stream a stored dump to stdout")
+    cat.add_argument("index", help="Index file")
+    cat.add_argument("--repo", help="Override the repository recorded in the index")
+
+    verify = sub.add_parser("verify", help="Check that every chunk of an index is present and intact")
+    verify.add_argument("index", nargs="+")
+    verify.add_argument("--repo", help="Override the repository recorded in the index")
+
+    gc_parser = sub.add_parser("gc", help="Remove chunks no longer referenced by any index")
+    gc_parser.add_argument("--repo", required=True)
+    gc_parser.add_argument("--root", action="append", required=True,
+                           help="Directory searched for *.idx files (repeatable)")
+    gc_parser.add_argument("--grace", type=int, default=3600,
+                           help="Keep unreferenced chunks newer than this many seconds (default: 3600)")
+    gc_parser.add_argument("--dry-run", action="store_true")
+
+    stats_parser = sub.add_parser("stats", help="Report repository size and deduplication")
+    stats_parser.add_argument("--repo", required=True)
+    stats_parser.add_argument("--root", action="append", default=[], help="Directory searched for *.idx files")
+
+    args = parser.parse_args(argv)
+    try:
+        if args.command == "put":
+            result = store(
+                sys.stdin.buffer,
+                Repository(Path(args.repo), args.level),
+                Path(args.index),
+                min_size=args.min_chunk,
+                max_size=args.max_chunk,
+                avg_bits=args.avg_bits,
+            )
+            print(json.dumps(result), file=sys.stderr)
+        elif args.command == "cat":
+            restore(Path(args.index), sys.stdout.buffer, Path(args.repo) if args.repo else None)
+        elif args.command == "verify":
+            failed = False
+            for name in args.index:
+                try:
+                    restore(Path(name), open(os.devnull, "wb"), Path(args.repo) if args.repo else None)
+                    print(f"✅ {name}")
+                except RepositoryError as exc:
+                    failed = True
+                    print(f"❌ {exc}")
+            return 1 if failed else 0
+        elif args.command == "gc":
+            result = gc(Repository(Path(args.repo)), [Path(r) for r in args.root], args.grace, args.dry_run)
+            print(json.dumps(result))
+        else:
+            print(json.dumps(stats(Repository(Path(args.repo)), [Path(r) for r in args.root])))
+    except RepositoryError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
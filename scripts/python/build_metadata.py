@@ -0,0 +1,613 @@
+#!/usr/bin/env python3
+"""
+Subprocess-free build metadata for the status tooling.
+
+Reads commit, branch, remote and commit date straight from a repository's
+``.git`` directory (HEAD, loose refs, packed-refs, config and the object
+store) and fetches image labels through the Docker Engine socket. Results are
+cached on disk: git metadata by the mtimes of HEAD and the files it resolves
+through, image labels by image ID. A steady-state status poll therefore spawns
+no ``git`` or ``docker image inspect`` processes at all.
+
+Anything the reader does not understand (reftable, SHA-256 repositories,
+unreachable docker socket) falls back to the equivalent CLI call so output
+stays identical to the previous implementation.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import http.client
+import json
+import os
+import re
+import socket
+import struct
+import subprocess
+import sys
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+CACHE_VERSION = 1
+HEX_SHA_LEN = 40
+FALLBACK_DEFAULT_ABBREV = 7
+
+OBJ_COMMIT = 1
+OBJ_OFS_DELTA = 6
+OBJ_REF_DELTA = 7
+
+
+class GitReadError(Exception):
+    """Raised when a repository cannot be read without the git CLI."""
+
+
+# ---------------------------------------------------------------------------
+# Git repository reader
+# ---------------------------------------------------------------------------
+
+
+def parse_git_config(path: Path) -> Dict[str, List[str]]:
+    """Parse a git config file into ``section.subsection.key -> [values]``."""
+    values: Dict[str, List[str]] = {}
+    if not path.exists():
+        return values
+    section = ""
+    for raw_line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+        line = raw_line.strip()
+        if not line or line[0] in "#;":
+            continue
+        header = re.match(r'^\[\s*([^\s\]"]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]', line)
+        if header:
+            name = header.group(1).lower()
+            sub = header.group(2)
+            if sub is None and "." in name:
+                # Legacy [section.subsection] syntax
+                name, _, sub = name.partition(".")
+            section = f"{name}.{sub}" if sub is not None else name
+            line = line[header.end():].strip()
+            if not line:
+                continue
+        if "=" in line:
+            key, value = line.split("=", 1)
+            value = value.strip()
+        else:
+            key, value = line, "true"
+        value = _strip_config_value(value)
+        values.setdefault(f"{section}.{key.strip().lower()}", []).append(value)
+    return values
+
+
+def _strip_config_value(value: str) -> str:
+    out: List[str] = []
+    in_quotes = False
+    i = 0
+    while i < len(value):
+        ch = value[i]
+        if ch == '"':
+            in_quotes = not in_quotes
+        elif ch == "\\" and i + 1 < len(value):
+            i += 1
+            out.append({"n": "\n", "t": "\t", "b": "\b"}.get(value[i], value[i]))
+        elif ch in "#;" and not in_quotes:
+            break
+        else:
+            out.append(ch)
+        i += 1
+    return "".join(out).strip()
+
+
+class PackIndex:
+    """Minimal reader for version 2 pack index files."""
+
+    def __init__(self, idx_path: Path):
+        self.idx_path = idx_path
+        self.pack_path = idx_path.with_suffix(".pack")
+        data = idx_path.read_bytes()
+        if data[:4] != b"\377tOc" or struct.unpack(">I", data[4:8])[0] != 2:
+            raise GitReadError(f"Unsupported pack index format: {idx_path}")
+        fanout = struct.unpack(">256I", data[8:8 + 1024])
+        self.count = fanout[255]
+        names_start = 8 + 1024
+        offsets_start = names_start + self.count * 20 + self.count * 4
+        large_start = offsets_start + self.count * 4
+        self.names = [
+            data[names_start + i * 20: names_start + (i + 1) * 20] for i in range(self.count)
+        ]
+        self._offsets = data[offsets_start:large_start]
+        self._large = data[large_start:]
+
+    def find(self, sha: bytes) -> Tuple[int, bool]:
+        pos = bisect.bisect_left(self.names, sha)
+        return pos, pos < self.count and self.names[pos] == sha
+
+    def offset(self, pos: int) -> int:
+        value = struct.unpack(">I", self._offsets[pos * 4:pos * 4 + 4])[0]
+        if value & 0x80000000:
+            idx = value & 0x7FFFFFFF
+            value = struct.unpack(">Q", self._large[idx * 8:idx * 8 + 8])[0]
+        return value
+
+
+def _apply_delta(base: bytes, delta: bytes) -> bytes:
+    def varint(pos: int) -> Tuple[int, int]:
+        result = shift = 0
+        while True:
+            byte = delta[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            shift += 7
+            if not byte & 0x80:
+                return result, pos
+
+    _, pos = varint(0)
+    _, pos = varint(pos)
+    out = bytearray()
+    while pos < len(delta):
+        op = delta[pos]
+        pos += 1
+        if op & 0x80:
+            offset = size = 0
+            for i in range(4):
+                if op & (1 << i):
+                    offset |= delta[pos] << (8 * i)
+                    pos += 1
+            for i in range(3):
+                if op & (0x10 << i):
+                    size |= delta[pos] << (8 * i)
+                    pos += 1
+            out += base[offset:offset + (size or 0x10000)]
+        elif op:
+            out += delta[pos:pos + op]
+            pos += op
+        else:
+            raise GitReadError("Invalid delta opcode")
+    return bytes(out)
+
+
+class GitRepository:
+    """Read refs, config and commit objects from a repository on disk."""
+
+    def __init__(self, work_tree: Path):
+        self.work_tree = Path(work_tree)
+        self.git_dir = self._resolve_git_dir()
+        commondir = self.git_dir / "commondir"
+        if commondir.exists():
+            common = Path(commondir.read_text(encoding="utf-8").strip())
+            self.common_dir = common if common.is_absolute() else (self.git_dir / common).resolve()
+        else:
+            self.common_dir = self.git_dir
+        self._packs: Optional[List[PackIndex]] = None
+        self._config: Optional[Dict[str, List[str]]] = None
+
+    def _resolve_git_dir(self) -> Path:
+        dot_git = self.work_tree / ".git"
+        if dot_git.is_file():
+            content = dot_git.read_text(encoding="utf-8").strip()
+            if not content.startswith("gitdir:"):
+                raise GitReadError(f"Unrecognised .git file in {self.work_tree}")
+            target = Path(content[len("gitdir:"):].strip())
+            return target if target.is_absolute() else (self.work_tree / target).resolve()
+        if dot_git.is_dir():
+            return dot_git
+        raise GitReadError(f"No .git entry in {self.work_tree}")
+
+    # -- cache signature -------------------------------------------------
+
+    def signature(self) -> List[int]:
+        """mtimes that change whenever HEAD, its ref, or the remote config moves."""
+        paths = [self.git_dir / "HEAD", self.common_dir / "packed-refs", self.common_dir / "config"]
+        target = self.head_target()
+        if target:
+            paths.append(self.common_dir / target)
+        mtimes = []
+        for path in paths:
+            try:
+                mtimes.append(path.stat().st_mtime_ns)
+            except OSError:
+                mtimes.append(0)
+        return mtimes
+
+    # -- refs ------------------------------------------------------------
+
+    def head_target(self) -> Optional[str]:
+        head = (self.git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        if head.startswith("ref:"):
+            return head[4:].strip()
+        return None
+
+    def _packed_refs(self) -> Dict[str, str]:
+        refs: Dict[str, str] = {}
+        path = self.common_dir / "packed-refs"
+        if not path.exists():
+            return refs
+        for line in path.read_text(encoding="utf-8").splitlines():
+            if not line or line[0] in "#^":
+                continue
+            sha, _, name = line.partition(" ")
+            refs[name.strip()] = sha
+        return refs
+
+    def resolve_ref(self, name: str, depth: int = 0) -> Optional[str]:
+        if depth > 5:
+            raise GitReadError(f"Symbolic ref loop at {name}")
+        for base in (self.git_dir, self.common_dir):
+            ref_path = base / name
+            if ref_path.is_file():
+                value = ref_path.read_text(encoding="utf-8").strip()
+                if value.startswith("ref:"):
+                    return self.resolve_ref(value[4:].strip(), depth + 1)
+                return value or None
+        return self._packed_refs().get(name)
+
+    def head_commit(self) -> Optional[str]:
+        target = self.head_target()
+        if target is None:
+            commit = (self.git_dir / "HEAD").read_text(encoding="utf-8").strip()
+        else:
+            commit = self.resolve_ref(target)
+        if commit and not re.fullmatch(r"[0-9a-f]{40}", commit):
+            raise GitReadError(f"Unsupported object id format: {commit}")
+        return commit
+
+    def branch(self) -> str:
+        target = self.head_target()
+        if target is None:
+            return "HEAD"
+        for prefix in ("refs/heads/", "refs/remotes/", "refs/tags/", "refs/"):
+            if target.startswith(prefix):
+                return target[len(prefix):]
+        return target
+
+    # -- config ----------------------------------------------------------
+
+    def config(self) -> Dict[str, List[str]]:
+        if self._config is None:
+            if (self.common_dir / "reftable").exists():
+                raise GitReadError("reftable repositories are not supported")
+            self._config = parse_git_config(self.common_dir / "config")
+            fmt = self._config.get("extensions.objectformat", ["sha1"])[-1].lower()
+            if fmt != "sha1":
+                raise GitReadError(f"Unsupported object format: {fmt}")
+        return self._config
+
+    def remote_url(self, remote: str = "origin") -> str:
+        config = self.config()
+        urls = config.get(f"remote.{remote}.url")
+        if not urls:
+            return ""
+        url = urls[0]
+        # Apply url.<base>.insteadOf rewrites like `git remote get-url` does.
+        best_base, best_len = None, -1
+        for key, values in config.items():
+            if not key.startswith("url.") or not key.endswith(".insteadof"):
+                continue
+            base = key[len("url."):-len(".insteadof")]
+            for prefix in values:
+                if url.startswith(prefix) and len(prefix) > best_len:
+                    best_base, best_len = base, len(prefix)
+        if best_base is not None:
+            url = best_base + url[best_len:]
+        return url
+
+    # -- objects ---------------------------------------------------------
+
+    def packs(self) -> List[PackIndex]:
+        if self._packs is None:
+            pack_dir = self.common_dir / "objects" / "pack"
+            self._packs = [PackIndex(p) for p in sorted(pack_dir.glob("*.idx"))] if pack_dir.is_dir() else []
+        return self._packs
+
+    def _read_pack_object(self, pack: PackIndex, offset: int) -> Tuple[int, bytes]:
+        with pack.pack_path.open("rb") as fh:
+            fh.seek(offset)
+            byte = fh.read(1)[0]
+            obj_type = (byte >> 4) & 0x7
+            while byte & 0x80:
+                byte = fh.read(1)[0]
+            base_sha = None
+            base_offset = None
+            if obj_type == OBJ_OFS_DELTA:
+                byte = fh.read(1)[0]
+                rel = byte & 0x7F
+                while byte & 0x80:
+                    byte = fh.read(1)[0]
+                    rel = ((rel + 1) << 7) | (byte & 0x7F)
+                base_offset = offset - rel
+            elif obj_type == OBJ_REF_DELTA:
+                base_sha = fh.read(20)
+            decomp = zlib.decompressobj()
+            chunks = []
+            while not decomp.eof:
+                chunk = fh.read(65536)
+                if not chunk:
+                    break
+                chunks.append(decomp.decompress(chunk))
+            data = b"".join(chunks)
+        if base_offset is not None:
+            base_type, base = self._read_pack_object(pack, base_offset)
+            return base_type, _apply_delta(base, data)
+        if base_sha is not None:
+            base_type, base = self.read_object(base_sha.hex())
+            return base_type, _apply_delta(base, data)
+        return obj_type, data
+
+    def read_object(self, sha: str) -> Tuple[int, bytes]:
+        loose = self.common_dir / "objects" / sha[:2] / sha[2:]
+        if loose.exists():
+            raw = zlib.decompress(loose.read_bytes())
+            header, _, body = raw.partition(b"\0")
+            kind = header.split(b" ", 1)[0]
+            return {b"commit": OBJ_COMMIT}.get(kind, 0), body
+        binary = bytes.fromhex(sha)
+        for pack in self.packs():
+            pos, found = pack.find(binary)
+            if found:
+                return self._read_pack_object(pack, pack.offset(pos))
+        raise GitReadError(f"Object {sha} not found")
+
+    def commit_date(self, sha: str) -> str:
+        """Committer date formatted like ``git log --date=iso-strict``."""
+        obj_type, body = self.read_object(sha)
+        if obj_type != OBJ_COMMIT:
+            raise GitReadError(f"{sha} is not a commit")
+        for line in body.split(b"\n"):
+            if not line:
+                break
+            if line.startswith(b"committer "):
+                match = re.search(rb"(\d+) ([+-])(\d\d)(\d\d)$", line)
+                if not match:
+                    break
+                sign = 1 if match.group(2) == b"+" else -1
+                offset = timedelta(hours=int(match.group(3)), minutes=int(match.group(4))) * sign
+                stamp = datetime.fromtimestamp(int(match.group(1)), timezone(offset))
+                return stamp.isoformat()
+        return ""
+
+    # -- abbreviation ----------------------------------------------------
+
+    def abbrev_len(self, sha: str) -> int:
+        """Shortest unique prefix length, mirroring ``git rev-parse --short``."""
+        configured = self.config().get("core.abbrev", ["auto"])[-1].strip().lower()
+        if configured in ("auto", ""):
+            count = sum(pack.count for pack in self.packs())
+            length = (count.bit_length() + 1) // 2 if count else 0
+            length = max(length, FALLBACK_DEFAULT_ABBREV)
+        elif configured in ("no", "false", "off"):
+            return HEX_SHA_LEN
+        else:
+            length = max(4, min(int(configured), HEX_SHA_LEN))
+
+        def common_hex(a: str, b: str) -> int:
+            n = 0
+            while n < HEX_SHA_LEN and a[n] == b[n]:
+                n += 1
+            return n
+
+        binary = bytes.fromhex(sha)
+        for pack in self.packs():
+            pos, found = pack.find(binary)
+            neighbours = [pos - 1, pos + 1] if found else [pos - 1, pos]
+            for idx in neighbours:
+                if 0 <= idx < pack.count:
+                    length = max(length, common_hex(sha, pack.names[idx].hex()) + 1)
+        loose_dir = self.common_dir / "objects" / sha[:2]
+        if loose_dir.is_dir():
+            for entry in loose_dir.iterdir():
+                other = sha[:2] + entry.name
+                if other != sha and len(other) == HEX_SHA_LEN:
+                    length = max(length, common_hex(sha, other) + 1)
+        return min(length, HEX_SHA_LEN)
+
+    def info(self) -> Optional[Dict[str, str]]:
+        commit = self.head_commit()
+        if not commit:
+            return None
+        return {
+            "commit": commit,
+            "commit_short": commit[: self.abbrev_len(commit)],
+            "date": self.commit_date(commit),
+            "repo": self.remote_url("origin"),
+            "branch": self.branch(),
+            "path": str(self.work_tree),
+        }
+
+
+def git_info_via_cli(repo_path: Path) -> Optional[Dict[str, str]]:
+    """Original subprocess implementation, used when the reader gives up."""
+
+    def run_git(args):
+        try:
+            result = subprocess.run(
+                ["git"] + args,
+                cwd=repo_path,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            return result.stdout.strip()
+        except Exception:
+            return ""
+
+    commit = run_git(["rev-parse", "HEAD"])
+    if not commit:
+        return None
+
+    return {
+        "commit": commit,
+        "commit_short": run_git(["rev-parse", "--short", "HEAD"]) or commit[:12],
+        "date": run_git(["log", "-1", "--format=%cd", "--date=iso-strict"]),
+        "repo": run_git(["remote", "get-url", "origin"]),
+        "branch": run_git(["rev-parse", "--abbrev-ref", "HEAD"]),
+        "path": str(repo_path),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Docker image labels
+# ---------------------------------------------------------------------------
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float = 3.0):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+def docker_socket_path() -> Optional[str]:
+    host = os.environ.get("DOCKER_HOST", "")
+    if host.startswith("unix://"):
+        path = host[len("unix://"):]
+    elif host:
+        return None
+    else:
+        path = "/var/run/docker.sock"
+    return path if os.path.exists(path) else None
+
+
+def docker_api_get(path: str) -> Optional[dict]:
+    socket_path = docker_socket_path()
+    if not socket_path:
+        return None
+    try:
+        conn = _UnixHTTPConnection(socket_path)
+        conn.request("GET", path)
+        response = conn.getresponse()
+        body = response.read()
+        conn.close()
+    except OSError:
+        return None
+    if response.status != 200:
+        return {}
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+def _clean_labels(labels) -> Dict[str, str]:
+    if isinstance(labels, dict):
+        return {k: (v or "").strip() for k, v in labels.items()}
+    return {}
+
+
+def inspect_image(image: str) -> Tuple[str, Dict[str, str]]:
+    """Return ``(image_id, labels)`` for an image reference."""
+    from urllib.parse import quote
+
+    data = docker_api_get(f"/images/{quote(image, safe='')}/json")
+    if data is not None:
+        if not data:
+            return "", {}
+        return data.get("Id", ""), _clean_labels((data.get("Config") or {}).get("Labels"))
+    try:
+        result = subprocess.run(
+            ["docker", "image", "inspect", "--format", "{{.Id}}\t{{json .Config.Labels}}", image],
+            capture_output=True,
+            text=True,
+            check=True,
+            timeout=3,
+        )
+        image_id, _, labels = result.stdout.strip().partition("\t")
+        return image_id, _clean_labels(json.loads(labels or "{}"))
+    except Exception:
+        return "", {}
+
+
+# ---------------------------------------------------------------------------
+# Cached provider
+# ---------------------------------------------------------------------------
+
+
+class BuildMetadataProvider:
+    """Cache git metadata by ref mtimes and image labels by image ID."""
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.git: Dict[str, dict] = {}
+        self.images: Dict[str, Dict[str, str]] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.cache_path or not self.cache_path.exists():
+            return
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == CACHE_VERSION:
+            self.git = data.get("git") or {}
+            self.images = data.get("images") or {}
+
+    def save(self) -> None:
+        if not self.cache_path or not self._dirty:
+            return
+        payload = {"version": CACHE_VERSION, "git": self.git, "images": self.images}
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, self.cache_path)
+        except OSError as exc:
+            print(f"Warning: unable to write build metadata cache {self.cache_path}: {exc}", file=sys.stderr)
+
+    def git_info(self, path) -> Optional[Dict[str, str]]:
+        repo_path = Path(path)
+        if not (repo_path / ".git").exists():
+            return None
+        key = str(repo_path)
+        try:
+            repo = GitRepository(repo_path)
+            signature = repo.signature()
+            cached = self.git.get(key)
+            if cached and cached.get("signature") == signature:
+                return cached.get("info")
+            info = repo.info()
+        except (GitReadError, OSError, ValueError, IndexError, zlib.error):
+            return git_info_via_cli(repo_path)
+        self.git[key] = {"signature": signature, "info": info}
+        self._dirty = True
+        return info
+
+    def image_labels(self, image: str, image_id: str = "") -> Dict[str, str]:
+        if image_id and image_id in self.images:
+            return self.images[image_id]
+        resolved_id, labels = inspect_image(image)
+        if resolved_id:
+            self.images[resolved_id] = labels
+            self._dirty = True
+        return labels
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Read build metadata without spawning git/docker")
+    parser.add_argument("--cache", help="Cache file path (default: no persistent cache)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    git_parser = sub.add_parser("git", help="Print git metadata for a source tree")
+    git_parser.add_argument("path")
+    image_parser = sub.add_parser("image", help="Print labels for an image reference")
+    image_parser.add_argument("image")
+    args = parser.parse_args(argv)
+
+    provider = BuildMetadataProvider(Path(args.cache) if args.cache else None)
+    if args.command == "git":
+        result = provider.git_info(Path(args.path).expanduser().resolve())
+    else:
+        result = provider.image_labels(args.image)
+    provider.save()
+    json.dump(result, sys.stdout, indent=2, sort_keys=True)
+    sys.stdout.write("\n")
+    return 0 if result is not None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Incremental directory size accounting.
+
+Replaces repeated ``du`` walks in the status tooling. Per-directory totals are
+cached on disk keyed by the directory mtime, so a snapshot only rescans the
+subtrees whose entries changed since the previous run. Unchanged directories
+cost a single ``stat`` call each.
+
+A directory's mtime only moves when entries are created, removed or renamed,
+not when an existing file grows in place (log files, for example). Cached
+entries are therefore also rescanned once they are older than ``max_age``
+seconds, which bounds how stale a reported total can get.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+CACHE_VERSION = 1
+DEFAULT_MAX_AGE = 600.0
+
+
+def format_size(num_bytes: int) -> str:
+    """Format a byte count the way ``du -h`` does (1024 based, rounded up)."""
+    if num_bytes < 1024:
+        return str(num_bytes)
+    value = float(num_bytes)
+    for unit in ("K", "M", "G", "T", "P", "E"):
+        value /= 1024.0
+        if value < 1024.0:
+            break
+    if value < 10:
+        rounded = math.ceil(value * 10) / 10
+        if rounded < 10:
+            return f"{rounded:.1f}{unit}"
+    return f"{math.ceil(value)}{unit}"
+
+
+@dataclass
+class DirEntry:
+    """Cached accounting for the direct (non-directory) children of one directory."""
+
+    mtime_ns: int
+    scanned_at: float
+    files_bytes: int
+    subdirs: List[str]
+    # Files with more than one hard link, keyed by "dev:ino" so totals can
+    # count each inode once (matching du behaviour for hardlinked backups).
+    links: Dict[str, int]
+
+    def to_json(self) -> list:
+        return [self.mtime_ns, self.scanned_at, self.files_bytes, self.subdirs, self.links]
+
+    @classmethod
+    def from_json(cls, raw: list) -> "DirEntry":
+        mtime_ns, scanned_at, files_bytes, subdirs, links = raw
+        return cls(int(mtime_ns), float(scanned_at), int(files_bytes), list(subdirs), dict(links))
+
+
+class SizeAccountant:
+    """Measure directory trees, reusing cached totals for unchanged subtrees."""
+
+    def __init__(self, cache_path: Optional[Path] = None, max_age: float = DEFAULT_MAX_AGE):
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.max_age = max_age
+        self.entries: Dict[str, DirEntry] = {}
+        self.visited: Set[str] = set()
+        self.roots: List[str] = []
+        self.rescanned = 0
+        self.reused = 0
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not self.cache_path or not self.cache_path.exists():
+            return
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return
+        for path, raw in (data.get("dirs") or {}).items():
+            try:
+                self.entries[path] = DirEntry.from_json(raw)
+            except (TypeError, ValueError):
+                continue
+
+    def _scan(self, path: str, dir_stat: os.stat_result) -> DirEntry:
+        # Count the directory inode itself, like du --apparent-size does.
+        files_bytes = dir_stat.st_size
+        subdirs: List[str] = []
+        links: Dict[str, int] = {}
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                            continue
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if st.st_nlink > 1:
+                        links[f"{st.st_dev}:{st.st_ino}"] = st.st_size
+                    else:
+                        files_bytes += st.st_size
+        except OSError:
+            pass
+        self.rescanned += 1
+        self._dirty = True
+        return DirEntry(dir_stat.st_mtime_ns, time.time(), files_bytes, sorted(subdirs), links)
+
+    def _entry_for(self, path: str, now: float) -> Optional[DirEntry]:
+        try:
+            dir_stat = os.stat(path, follow_symlinks=False)
+        except OSError:
+            self.entries.pop(path, None)
+            return None
+        cached = self.entries.get(path)
+        if (
+            cached is not None
+            and cached.mtime_ns == dir_stat.st_mtime_ns
+            and now - cached.scanned_at < self.max_age
+        ):
+            self.reused += 1
+            return cached
+        entry = self._scan(path, dir_stat)
+        self.entries[path] = entry
+        return entry
+
+    def measure(self, path: os.PathLike | str) -> Optional[int]:
+        """Return the apparent size in bytes of ``path``, or None if it is missing."""
+        root = os.path.abspath(os.fspath(path))
+        if not os.path.lexists(root):
+            return None
+        if not os.path.isdir(root) or os.path.islink(root):
+            return os.lstat(root).st_size
+        self.roots.append(root)
+
+        now = time.time()
+        total = 0
+        seen_links: Dict[str, int] = {}
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            self.visited.add(current)
+            entry = self._entry_for(current, now)
+            if entry is None:
+                continue
+            total += entry.files_bytes
+            seen_links.update(entry.links)
+            stack.extend(os.path.join(current, name) for name in entry.subdirs)
+        return total + sum(seen_links.values())
+
+    def _prune(self) -> None:
+        # Forget directories under a measured root that no longer exist.
+        prefixes = tuple(root.rstrip(os.sep) + os.sep for root in self.roots)
+        stale = [
+            path
+            for path in self.entries
+            if path not in self.visited and (path in self.roots or path.startswith(prefixes))
+        ]
+        for path in stale:
+            del self.entries[path]
+        if stale:
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self.cache_path:
+            return
+        self._prune()
+        if not self._dirty:
+            return
+        payload = {
+            "version": CACHE_VERSION,
+            "dirs": {path: entry.to_json() for path, entry in self.entries.items()},
+        }
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.cache_path.with_name(f".{self.cache_path.name}.{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+            os.replace(tmp_path, self.cache_path)
+        except OSError as exc:
+            print(f"Warning: unable to write size cache {self.cache_path}: {exc}", file=sys.stderr)
+
+
+def measure_paths(
+    paths: Iterable[str], cache_path: Optional[Path], max_age: float = DEFAULT_MAX_AGE
+) -> List[Tuple[str, Optional[int]]]:
+    accountant = SizeAccountant(cache_path, max_age=max_age)
+    results = [(path, accountant.measure(path)) for path in paths]
+    accountant.save()
+    return results
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Cached directory size accounting")
+    parser.add_argument("paths", nargs="+", help="Directories to measure")
+    parser.add_argument("--cache", help="Cache file path (default: no persistent cache)")
+    parser.add_argument(
+        "--max-age",
+        type=float,
+        default=DEFAULT_MAX_AGE,
+        help=f"Rescan cached directories older than this many seconds (default: {DEFAULT_MAX_AGE:g})",
+    )
+    parser.add_argument(
+        "--format",
+        choices=["json", "bytes", "human"],
+        default="json",
+        help="Output format: json, bytes (one per line), or human (du -h style)",
+    )
+    args = parser.parse_args(argv)
+
+    cache_path = Path(args.cache).expanduser() if args.cache else None
+    results = measure_paths(args.paths, cache_path, args.max_age)
+
+    if args.format == "json":
+        payload = [
+            {
+                "path": path,
+                "exists": size is not None,
+                "bytes": size or 0,
+                "size": format_size(size) if size is not None else "--",
+            }
+            for path, size in results
+        ]
+        json.dump(payload, sys.stdout)
+        sys.stdout.write("\n")
+    elif args.format == "bytes":
+        for _, size in results:
+            print(size or 0)
+    else:
+        for path, size in results:
+            print(f"{format_size(size) if size is not None else '--'}\t{path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
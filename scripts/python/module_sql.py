@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Apply module SQL from the staged ``.sql-manifest.json`` in batched sessions.
+
+``modules.py`` writes ``.sql-manifest.json`` next to the staged modules,
+listing every enabled module's SQL files by database. This tool renders all of
+them in one process and applies them one database at a time. Rendering
+replaces ``{{PLAYERBOTS_DB}}`` and qualifies bare ``playerbots`` references.
+The rendered text is memoized by content hash, so a file shipped by several
+modules is only rendered once.
+
+Each database gets one client session for its whole batch. After each file a
+marker ``SELECT`` is sent, so the files that completed can be read back from
+the output. If a file fails, the client stops. That file is recorded as failed
+and a new session resumes with the next file, so one bad file still does not
+block the others. Each file is followed by ``DELIMITER ;`` and ``USE`` so that
+a file cannot change the delimiter or default schema of the next one. Files
+that mention ``playerbots`` are skipped while that table does not exist.
+With ``--skip-applied``, files the DB updater has already applied unchanged
+(same staged name and SHA1 in the ``updates`` table) are skipped. Module files
+that apply cleanly are recorded in that table under the same name and SHA1
+(state ``MODULE``), so the updater does not run them a second time when they
+are also staged.
+
+This is a standalone tool. The normal startup path does not call it: module
+SQL is staged by ``stage-modules.sh`` and applied by the worldserver's DB
+updater.
+
+With ``--jobs`` above one, ``sql_deps.py`` works out the tables each file
+reads and writes. Files are then split into independent groups: a module's
+files stay together in order, and so do files that write a table another file
+reads or writes. Each group is applied in the usual serial order, one session
+per database run, and the groups run on parallel connections. ``--plan`` prints
+the groups and the tables or barriers that tie them together, without
+executing anything. Parallel groups only help when this tool is run; the
+first-boot path applies module SQL serially through the DB updater.
+
+Results go to stdout in the same form as ``manage-modules-sql.sh``. With
+``--report`` they are also written as ``status<TAB>database<TAB>file`` lines,
+where status is success, failure or skipped.
+
+Usage:
+    module_sql.py --manifest /modules/.sql-manifest.json --report /tmp/sql-report.tsv
+    module_sql.py --manifest local-storage/modules/.sql-manifest.json --custom-root scripts/sql/custom --dry-run
+    module_sql.py --manifest local-storage/modules/.sql-manifest.json --jobs 8 --plan
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from sql_deps import Access, analyze, group, makespan
+from sql_update_plan import PlanError, load_applied, sha1_file
+
+DB_TYPES = ("db_world", "db_auth", "db_characters", "db_playerbots")
+# Playerbots SQL goes first so the other databases can see its tables.
+APPLY_ORDER = ("db_playerbots", "db_world", "db_auth", "db_characters")
+CUSTOM_GROUPS = (("world", "db_world"), ("auth", "db_auth"), ("characters", "db_characters"))
+LABELS = {"db_world": "world SQL", "db_auth": "auth SQL", "db_characters": "characters SQL",
+          "db_playerbots": "playerbots SQL"}
+SKIPPED_MODULES = {"mod-pocket-portal": "module disabled until C++20 patch is applied"}
+PLAYERBOTS_REF = re.compile(r"(?<![.`])\bplayerbots\b")
+PLAYERBOTS_WORD = re.compile(r"\bplayerbots\b")
+DELIMITER_CMD = re.compile(r"^\s*delimiter\s", re.IGNORECASE | re.MULTILINE)
+TRAILING_COMMENTS = re.compile(r"(?:\s|--[^\n]*(?:\n|$)|#[^\n]*(?:\n|$)|/\*.*?\*/)*\Z", re.DOTALL)
+
+
+class ModuleSqlError(Exception):
+    """Raised when the manifest cannot be read or the client cannot run."""
+
+
+@dataclass
+class SqlFile:
+    path: Path
+    db_type: str
+    module: str
+    label: str
+    status: str = "pending"
+    message: str = ""
+
+
+class Renderer:
+    """Render module SQL once per distinct file content."""
+
+    def __init__(self, playerbots_db: str):
+        self.playerbots_db = playerbots_db
+        self.cache: Dict[str, str] = {}
+        self.hits = 0
+
+    def render(self, path: Path) -> str:
+        data = path.read_bytes()
+        digest = hashlib.sha256(data).hexdigest()
+        cached = self.cache.get(digest)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        text = data.decode("utf-8", errors="surrogateescape")
+        text = text.replace("{{PLAYERBOTS_DB}}", self.playerbots_db)
+        text = PLAYERBOTS_REF.sub(f"`{self.playerbots_db}`.playerbots", text)
+        self.cache[digest] = text
+        return text
+
+
+class Client:
+    """mariadb/mysql client invocation matching ``mysql_exec`` in the shell helper."""
+
+    def __init__(self, host: str, port: str, password: str):
+        if shutil.which("mariadb"):
+            self.base = ["mariadb", "--ssl=false"]
+        elif shutil.which("mysql"):
+            self.base = ["mysql", "--ssl-mode=DISABLED"]
+        else:
+            raise ModuleSqlError("Neither mariadb nor mysql client is available for SQL execution")
+        self.base += ["-h", host, "-P", port, "-u", "root", f"-p{password}"]
+
+    def run(self, args: List[str], script: str) -> Tuple[int, str, str]:
+        result = subprocess.run(self.base + args, input=script, capture_output=True, text=True,
+                                errors="surrogateescape")
+        stderr = "\n".join(line for line in result.stderr.splitlines() if "Using a password" not in line)
+        return result.returncode, result.stdout, stderr
+
+    def query(self, sql: str) -> str:
+        code, out, err = self.run(["-N", "-B", "-e", sql], "")
+        if code != 0:
+            raise ModuleSqlError(err or "query failed")
+        return out.strip()
+
+
+def sorted_files(paths: List[str]) -> List[str]:
+    """Order files by directory (in manifest order), then by name within each directory."""
+    dirs: Dict[str, int] = {}
+    for rel in paths:
+        dirs.setdefault(str(Path(rel).parent), len(dirs))
+    return sorted(paths, key=lambda rel: (dirs[str(Path(rel).parent)], Path(rel).name))
+
+
+def load_manifest(manifest: Path, modules_root: Path) -> Tuple[List[SqlFile], List[str]]:
+    try:
+        data = json.loads(manifest.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        raise ModuleSqlError(f"cannot read {manifest}: {exc}") from exc
+    files: List[SqlFile] = []
+    notes: List[str] = []
+    for module in data.get("modules", []):
+        name = module.get("name", "")
+        if name in SKIPPED_MODULES:
+            notes.append(f"⚠️  Skipping {name} SQL: {SKIPPED_MODULES[name]}.")
+            continue
+        for db_type in DB_TYPES:
+            for rel in sorted_files(module.get("sql_files", {}).get(db_type, [])):
+                files.append(SqlFile(modules_root / name / rel, db_type, name, LABELS[db_type]))
+    return files, notes
+
+
+def custom_files(root: Optional[Path]) -> List[SqlFile]:
+    files: List[SqlFile] = []
+    if root is None:
+        return files
+    for subdir, db_type in CUSTOM_GROUPS:
+        group = root / subdir
+        if group.is_dir():
+            for path in sorted(group.rglob("*.sql"), key=str):
+                files.append(SqlFile(path, db_type, "custom", f"custom {subdir} SQL"))
+    return files
+
+
+def terminated(text: str) -> str:
+    """Make sure the last statement of a file cannot run into the next file."""
+    body = TRAILING_COMMENTS.sub("", text)
+    if body and not body.endswith(";") and not DELIMITER_CMD.search(text):
+        return text.rstrip("\n") + "\n;\n"
+    return text if text.endswith("\n") else text + "\n"
+
+
+def apply_batch(client: Client, database: str, batch: List[Tuple[SqlFile, str]]) -> None:
+    """Apply files over as few sessions as possible; each failure starts a new one."""
+    marker = f"module-sql-{uuid.uuid4().hex}"
+    start = 0
+    while start < len(batch):
+        parts = []
+        for index in range(start, len(batch)):
+            parts.append(terminated(batch[index][1]))
+            parts.append(f"DELIMITER ;\nUSE `{database}`;\nSELECT '{marker}:{index}';\n")
+        code, out, err = client.run(["-N", "-B", database], "".join(parts))
+        done = {int(line.rsplit(":", 1)[1]) for line in out.splitlines() if line.startswith(marker + ":")}
+        index = start
+        while index in done:
+            batch[index][0].status = "success"
+            index += 1
+        if index >= len(batch):
+            return
+        item = batch[index][0]
+        item.status = "failure"
+        item.message = err or f"client exited with status {code}"
+        start = index + 1
+
+
+def sql_string(value: str) -> str:
+    return "'" + value.replace("\\", "\\\\").replace("'", "''") + "'"
+
+
+def record_updates(client: Client, databases: Dict[str, str], files: List[SqlFile]) -> None:
+    """Write updates rows (staged name, SHA1) for module files applied here."""
+    rows: Dict[str, List[str]] = {}
+    for item in files:
+        if item.status != "success" or item.module == "custom":
+            continue
+        try:
+            digest = sha1_file(item.path)[0]
+        except OSError:
+            continue
+        name = f"MODULE_{item.module}_{item.path.stem}.sql"
+        rows.setdefault(item.db_type, []).append(f"({sql_string(name)}, '{digest}', 'MODULE', 0)")
+    for db_type, values in rows.items():
+        sql = ("INSERT INTO updates (name, hash, state, speed) VALUES " + ", ".join(values)
+               + " ON DUPLICATE KEY UPDATE hash = VALUES(hash), state = VALUES(state);\n")
+        code, _, err = client.run(["-N", "-B", databases[db_type]], sql)
+        if code != 0:
+            print(f"  ⚠️  Could not record {len(values)} file(s) in {databases[db_type]}.updates: "
+                  f"{err or 'client failed'}")
+
+
+def apply_group(client: Client, databases: Dict[str, str], members: List[Tuple[SqlFile, str]]) -> None:
+    """Apply a group in order, one session per run of files for the same database."""
+    start = 0
+    while start < len(members):
+        end = start
+        while end < len(members) and members[end][0].db_type == members[start][0].db_type:
+            end += 1
+        apply_batch(client, databases[members[start][0].db_type], members[start:end])
+        start = end
+
+
+def print_plan(groups: List[List[Tuple[SqlFile, str]]], reasons: List[Set[str]],
+               accesses: Dict[int, Access], databases: Dict[str, str], jobs: int) -> None:
+    def short(keys: Set[str], database: str) -> str:
+        return ", ".join(sorted(key.split(".", 1)[1] if key.startswith(database + ".") else key
+                                for key in keys)) or "-"
+
+    sizes = [sum(len(text) for _, text in members) for members in groups]
+    total = sum(sizes)
+    print(f"Plan: {sum(len(m) for m in groups)} file(s) in {len(groups)} independent group(s) on {jobs} connection(s)")
+    for number, (members, size, why) in enumerate(zip(groups, sizes, reasons), 1):
+        modules = sorted({item.module for item, _ in members})
+        print(f"\nGroup {number}: {len(members)} file(s), {size / 1024:.1f} KiB, modules: {', '.join(modules)}")
+        for reason in sorted(why)[:8]:
+            print(f"  linked by {reason}")
+        if len(why) > 8:
+            print(f"  ... and {len(why) - 8} more shared table(s)")
+        for item, _ in members:
+            access = accesses[id(item)]
+            database = databases[item.db_type]
+            detail = f"barrier: {access.barrier}" if access.barrier else \
+                f"writes {short(access.writes, database)}; reads {short(access.reads, database)}"
+            print(f"    {item.module}/{item.path.name} [{database}] {detail}")
+    if total:
+        span = makespan(sizes, jobs)
+        print(f"\nLargest group holds {max(sizes) * 100 // total}% of the SQL; "
+              f"estimated speed-up {total / span:.1f}x over a serial run")
+
+
+def default_jobs(value: str) -> int:
+    try:
+        return int(value or 4)
+    except ValueError:
+        print(f"⚠️  Ignoring MODULE_SQL_JOBS={value!r} (not a number); using 4", file=sys.stderr)
+        return 4
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    env = os.environ
+    parser = argparse.ArgumentParser(description="Apply module SQL from .sql-manifest.json in batched sessions")
+    parser.add_argument("--manifest", type=Path,
+                        default=Path(env.get("MODULES_ROOT", "/modules")) / ".sql-manifest.json")
+    parser.add_argument("--modules-root", type=Path, help="Directory holding the modules (default: manifest dir)")
+    parser.add_argument("--custom-root", type=Path, help="Custom SQL root with world/auth/characters subdirectories")
+    parser.add_argument("--host", default=env.get("CONTAINER_MYSQL", "ac-mysql"))
+    parser.add_argument("--port", default=env.get("MYSQL_PORT", "3306"))
+    parser.add_argument("--password", default=env.get("MYSQL_ROOT_PASSWORD", ""))
+    parser.add_argument("--world-db", default=env.get("DB_WORLD_NAME", "acore_world"))
+    parser.add_argument("--auth-db", default=env.get("DB_AUTH_NAME", "acore_auth"))
+    parser.add_argument("--characters-db", default=env.get("DB_CHARACTERS_NAME", "acore_characters"))
+    parser.add_argument("--playerbots-db", default=env.get("DB_PLAYERBOTS_NAME", "acore_playerbots"))
+    parser.add_argument("--report", help="Write status<TAB>database<TAB>file per SQL file")
+    parser.add_argument("--dry-run", action="store_true", help="Render and list files without executing")
+    parser.add_argument("--skip-applied", action="store_true",
+                        help="Skip files recorded with the same hash in the updates table")
+    parser.add_argument("-j", "--jobs", type=int, default=default_jobs(env.get("MODULE_SQL_JOBS", "4")),
+                        help="Parallel connections for independent file groups (default: 4; 1 = serial)")
+    parser.add_argument("--plan", action="store_true",
+                        help="Show the dependency groups and why files share one, then exit")
+    args = parser.parse_args(argv)
+    if args.plan:
+        args.dry_run = True
+
+    databases = {"db_world": args.world_db, "db_auth": args.auth_db,
+                 "db_characters": args.characters_db, "db_playerbots": args.playerbots_db}
+    renderer = Renderer(args.playerbots_db)
+    try:
+        files, notes = load_manifest(args.manifest, args.modules_root or args.manifest.parent)
+        files += custom_files(args.custom_root)
+        for note in notes:
+            print(note)
+        client = None if args.dry_run else Client(args.host, args.port, args.password)
+
+        if args.skip_applied and client is not None:
+            def updates_query(database: str, sql: str) -> List[List[str]]:
+                code, out, err = client.run(["-N", "-B", database, "-e", sql], "")
+                if code != 0:
+                    raise PlanError(err)
+                return [line.split("\t") for line in out.splitlines() if line]
+
+            applied = load_applied(updates_query, databases)
+            for item in files:
+                if item.module == "custom":
+                    continue
+                name = f"MODULE_{item.module}_{item.path.stem}.sql"
+                try:
+                    digest = sha1_file(item.path)[0]
+                except OSError:
+                    continue
+                if applied.get(item.db_type, {}).get(name) == digest:
+                    item.status, item.message = "skipped", "already applied"
+
+        rendered: Dict[int, str] = {}
+        for item in files:
+            if item.status != "pending":
+                continue
+            try:
+                rendered[id(item)] = renderer.render(item.path)
+            except OSError as exc:
+                item.status, item.message = "failure", str(exc)
+
+        if client is not None and any(f.db_type == "db_playerbots" for f in files):
+            charset = env.get("MYSQL_CHARACTER_SET", "utf8mb4")
+            collation = env.get("MYSQL_COLLATION", "utf8mb4_unicode_ci")
+            print(f"  Ensuring database {args.playerbots_db} exists...")
+            client.query(f"CREATE DATABASE IF NOT EXISTS `{args.playerbots_db}` "
+                         f"CHARACTER SET {charset} COLLATE {collation};")
+        playerbots_ready: Optional[bool] = None if client is not None else True
+
+        queue: List[Tuple[SqlFile, str]] = []
+        for db_type in APPLY_ORDER:
+            batch: List[Tuple[SqlFile, str]] = []
+            for item in files:
+                if item.db_type != db_type or item.status != "pending":
+                    continue
+                text = rendered[id(item)]
+                if db_type != "db_playerbots" and PLAYERBOTS_WORD.search(text) and playerbots_ready is None:
+                    playerbots_ready = client.query(
+                        "SELECT COUNT(*) FROM information_schema.tables WHERE "
+                        f"table_schema='{args.playerbots_db}' AND table_name='playerbots';") not in ("", "0")
+                if db_type != "db_playerbots" and PLAYERBOTS_WORD.search(text) and not playerbots_ready:
+                    item.status, item.message = "skipped", "playerbots table missing"
+                    continue
+                batch.append((item, text))
+            if not batch:
+                continue
+            # db_playerbots is applied before the others even in parallel mode:
+            # the readiness check above needs the playerbots table it creates.
+            if args.plan or (args.jobs > 1 and db_type != "db_playerbots"):
+                queue.extend(batch)
+                continue
+            print(f"Applying {len(batch)} file(s) to {databases[db_type]} in one session...")
+            if client is not None:
+                apply_batch(client, databases[db_type], batch)
+
+        if queue:
+            accesses = {id(item): analyze(text, databases[item.db_type]) for item, text in queue}
+            index_groups, index_reasons = group([(item.module, databases[item.db_type], accesses[id(item)])
+                                                 for item, _ in queue])
+            groups = [[queue[i] for i in members] for members in index_groups]
+            reasons = [index_reasons[members[0]] for members in index_groups]
+            if args.plan:
+                print_plan(groups, reasons, accesses, databases, args.jobs)
+                return 0
+            print(f"Applying {len(queue)} file(s) in {len(groups)} independent group(s) "
+                  f"on up to {args.jobs} connection(s)...")
+            if client is not None:
+                # Largest groups first so the longest chain starts early.
+                ordered = sorted(groups, key=lambda members: -sum(len(text) for _, text in members))
+                with ThreadPoolExecutor(max_workers=args.jobs) as pool:
+                    list(pool.map(lambda members: apply_group(client, databases, members), ordered))
+        if client is not None:
+            record_updates(client, databases, files)
+    except ModuleSqlError as exc:
+        print(f"    ❌ {exc}", file=sys.stderr)
+        return 1
+
+    for item in files:
+        base = item.path.name
+        if item.status == "success":
+            print(f"    ✅ Successfully executed {item.label}: {base}")
+        elif item.status == "failure":
+            print(f"    ❌ Failed to execute {item.path}")
+            for line in item.message.splitlines():
+                print(f"      {line}")
+        elif item.status == "skipped":
+            print(f"  Skipping {item.label}: {base} ({item.message})")
+        else:
+            print(f"  Would execute {item.label}: {base}")
+    if renderer.cache:
+        print(f"Rendered {len(renderer.cache)} distinct file(s), {renderer.hits} duplicate(s) reused")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as handle:
+            for item in files:
+                if item.status != "pending":
+                    handle.write(f"{item.status}\t{databases[item.db_type]}\t{item.path}\n")
+    return 0 if all(item.status != "failure" for item in files) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
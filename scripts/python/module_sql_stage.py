@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Stage module SQL into the worldserver's updates directory incrementally.
+
+The desired set is every enabled module's SQL file, named
+``<db dir>/MODULE_<module>_<file>.sql``, with its SHA1. The last staging left
+a manifest of the same form next to the staged files, both in the container and
+in the host stage directory. Only the difference is transferred: changed and
+new files travel as one tar stream into a single ``docker exec``, which also
+removes files that are no longer wanted and replaces the manifest. When nothing
+changed, staging costs one round trip to read the container's manifest.
+
+A target without a manifest, for example a freshly created container, gets a
+full restage. Its old ``MODULE_*.sql`` files are removed first.
+
+Usage:
+    module_sql_stage.py --modules-dir storage/modules --host-stage storage/module-sql-updates
+    module_sql_stage.py --modules-dir storage/modules --host-stage storage/module-sql-updates --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import subprocess
+import sys
+import tarfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from sql_update_plan import PlanError, PlannedFile, classify, discover, docker_query, load_applied
+
+MANIFEST = ".module-sql-manifest"
+UPDATES_DIR = "/azerothcore/data/sql/updates"
+DB_DIRS = ("db_world", "db_characters", "db_auth", "db_playerbots")
+
+Manifest = Dict[str, str]
+
+
+class StageError(Exception):
+    """Raised when the container cannot be read or updated."""
+
+
+def parse_manifest(text: str) -> Optional[Manifest]:
+    if not text.strip():
+        return None
+    entries: Manifest = {}
+    for line in text.splitlines():
+        key, _, digest = line.partition("\t")
+        if key and digest:
+            entries[key] = digest
+    return entries
+
+
+def render_manifest(entries: Manifest) -> bytes:
+    return "".join(f"{key}\t{digest}\n" for key, digest in sorted(entries.items())).encode()
+
+
+def diff(desired: Dict[str, PlannedFile], current: Optional[Manifest]) -> Tuple[List[str], List[str]]:
+    current = current or {}
+    copy = [key for key, item in desired.items() if current.get(key) != item.sha1]
+    remove = sorted(key for key in current if key not in desired)
+    return copy, remove
+
+
+def build_tar(desired: Dict[str, PlannedFile], copy: List[str]) -> bytes:
+    buffer = io.BytesIO()
+    now = time.time()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        for key in copy:
+            data = desired[key].source.read_bytes()
+            info = tarfile.TarInfo(key)
+            info.size, info.mode, info.mtime = len(data), 0o644, now
+            tar.addfile(info, io.BytesIO(data))
+        manifest = render_manifest({key: item.sha1 for key, item in desired.items()})
+        info = tarfile.TarInfo(MANIFEST)
+        info.size, info.mode, info.mtime = len(manifest), 0o644, now
+        tar.addfile(info, io.BytesIO(manifest))
+    return buffer.getvalue()
+
+
+class Container:
+    def __init__(self, name: str, updates_dir: str):
+        self.name = name
+        self.updates_dir = updates_dir
+
+    def read_manifest(self) -> Optional[Manifest]:
+        result = subprocess.run(["docker", "exec", self.name, "cat", f"{self.updates_dir}/{MANIFEST}"],
+                                capture_output=True, text=True)
+        return parse_manifest(result.stdout) if result.returncode == 0 else None
+
+    def apply(self, payload: bytes, remove: List[str], full: bool) -> None:
+        # "$1" is the updates dir, "$2" is "full", the rest are files to remove.
+        script = (
+            'set -e; dir="$1"; full="$2"; shift 2; mkdir -p "$dir"; cd "$dir"; '
+            'if [ "$full" = 1 ]; then rm -f */MODULE_*.sql; fi; '
+            'tar -xf -; for f in "$@"; do rm -f -- "$f"; done'
+        )
+        result = subprocess.run(
+            ["docker", "exec", "-i", self.name, "sh", "-c", script, "sh", self.updates_dir, "1" if full else "0",
+             *remove],
+            input=payload, capture_output=True)
+        if result.returncode != 0:
+            raise StageError(result.stderr.decode(errors="replace").strip() or "tar extraction failed")
+
+
+def apply_host(root: Path, desired: Dict[str, PlannedFile], copy: List[str], remove: List[str], full: bool) -> None:
+    if full:
+        for db_dir in DB_DIRS:
+            for stale in (root / db_dir).glob("MODULE_*.sql"):
+                stale.unlink()
+    for key in copy:
+        target = root / key
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.write_bytes(desired[key].source.read_bytes())
+        tmp.replace(target)
+    for key in remove:
+        (root / key).unlink(missing_ok=True)
+    (root / MANIFEST).write_bytes(render_manifest({key: item.sha1 for key, item in desired.items()}))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    env = os.environ
+    parser = argparse.ArgumentParser(description="Stage module SQL into the worldserver incrementally")
+    parser.add_argument("--modules-dir", type=Path, required=True)
+    parser.add_argument("--enabled", type=Path, help="File listing enabled modules, one per line")
+    parser.add_argument("--host-stage", type=Path, help="Host copy of the staged files (STAGE_PATH_MODULE_SQL)")
+    parser.add_argument("--container", default="ac-worldserver")
+    parser.add_argument("--updates-dir", default=UPDATES_DIR)
+    parser.add_argument("--mysql-container", default=env.get("CONTAINER_MYSQL", "ac-mysql"))
+    parser.add_argument("--password", default=env.get("MYSQL_ROOT_PASSWORD", ""))
+    parser.add_argument("--world-db", default=env.get("DB_WORLD_NAME", "acore_world"))
+    parser.add_argument("--auth-db", default=env.get("DB_AUTH_NAME", "acore_auth"))
+    parser.add_argument("--characters-db", default=env.get("DB_CHARACTERS_NAME", "acore_characters"))
+    parser.add_argument("--playerbots-db", default=env.get("DB_PLAYERBOTS_NAME", "acore_playerbots"))
+    parser.add_argument("--dry-run", action="store_true", help="Show the difference without staging")
+    args = parser.parse_args(argv)
+
+    enabled: Optional[Set[str]] = None
+    if args.enabled and args.enabled.is_file():
+        enabled = {line.strip() for line in args.enabled.read_text(encoding="utf-8").splitlines() if line.strip()}
+
+    files = discover(args.modules_dir, enabled)
+    classify(files, {})
+    desired: Dict[str, PlannedFile] = {}
+    for item in files:
+        if item.status == "rejected":
+            print(f"  ❌ Security: Rejected {item.module}/{item.source.name} (contains shell commands)")
+        elif item.status == "skipped":
+            print(f"  ⚠️  Skipped empty or invalid: {item.source.name}")
+        else:
+            desired[f"{item.core_dir}/{item.name}"] = item
+
+    container = Container(args.container, args.updates_dir)
+    current = container.read_manifest()
+    copy, remove = diff(desired, current)
+
+    host_copy: List[str] = []
+    host_remove: List[str] = []
+    host_current: Optional[Manifest] = None
+    if args.host_stage:
+        manifest_path = args.host_stage / MANIFEST
+        host_current = parse_manifest(manifest_path.read_text(encoding="utf-8")) if manifest_path.is_file() else None
+        host_copy, host_remove = diff(desired, host_current)
+
+    if not (copy or remove or host_copy or host_remove) and current is not None:
+        print(f"✅ Module SQL unchanged ({len(desired)} file(s) staged)")
+        return 0
+
+    # Label what the updater will do with the copied files; one query per database.
+    applied: Dict[str, Dict[str, str]] = {}
+    if copy and args.password:
+        databases = {"db_world": args.world_db, "db_characters": args.characters_db,
+                     "db_auth": args.auth_db, "db_playerbots": args.playerbots_db}
+        try:
+            applied = load_applied(docker_query(args.mysql_container, args.password), databases)
+        except PlanError:
+            applied = {}
+    pending = 0
+    for key in copy:
+        item = desired[key]
+        recorded = applied.get(item.core_dir, {}).get(item.name)
+        if recorded is None:
+            note = "new"
+            pending += 1
+        elif recorded != item.sha1:
+            note = "changed since applied"
+            pending += 1
+        else:
+            note = "already applied"
+        print(f"  ✓ Staged {item.module}/{item.core_dir}/{item.source.name} ({note})")
+    for key in remove:
+        print(f"  🗑️  Removed {key}")
+
+    if args.dry_run:
+        print(f"Would stage {len(copy)} file(s) and remove {len(remove)} in {args.container}")
+        return 0
+    try:
+        if copy or remove or current is None:
+            container.apply(build_tar(desired, copy), remove, current is None)
+        if args.host_stage and (host_copy or host_remove or host_current is None):
+            apply_host(args.host_stage, desired, host_copy, host_remove, host_current is None)
+    except (StageError, OSError) as exc:
+        print(f"❌ Module SQL staging failed: {exc}", file=sys.stderr)
+        return 1
+
+    print(f"✅ Staged {len(copy)} module SQL file(s), removed {len(remove)} ({len(desired)} total)")
+    if pending:
+        print("🔄 Restart worldserver to apply: docker restart ac-worldserver")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
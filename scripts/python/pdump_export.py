@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Export many characters to pdump files in one pass.
+
+Characters are selected by guild, account, name or guid with a single query.
+Each table of the character dump is then read with one set-based query per
+chunk of characters, not one round trip per character and table. MySQL quotes
+every value itself (``QUOTE()``), so the rows stream straight into
+``INSERT INTO `table` (columns) VALUES (...);`` lines without re-encoding.
+Chunks are exported concurrently by a worker pool.
+
+The output directory gets one ``<name>_<guid>.pdump`` per character plus a
+``manifest.tsv`` (file, account, name, guid) that ``pdump_import.py --plan``
+reads directly; the name and guid columns are left empty so the importer keeps
+the original name and assigns a new guid.
+
+Usage:
+    pdump_export.py --password PW --guild "Raid Team" --output exports/raid
+    pdump_export.py --password PW --account alice --account bob --jobs 8
+    pdump_import.py --password PW --plan exports/raid/manifest.tsv
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pdump_import import Mysql, PdumpError, errors, quote
+
+BANNER = (
+    "IMPORTANT NOTE: THIS DUMPFILE IS MADE FOR USE WITH THE 'PDUMP' COMMAND ONLY - "
+    "EITHER THROUGH INGAME CHAT OR ON CONSOLE!\n"
+    "IMPORTANT NOTE: DO NOT apply it directly - it will irreversibly DAMAGE and CORRUPT "
+    "your database! You have been warned!\n\n"
+)
+NUMERIC = {"tinyint", "smallint", "mediumint", "int", "bigint", "decimal", "float", "double"}
+BATCH_UNESCAPES = {"n": "\n", "t": "\t", "0": "\0", "\\": "\\"}
+BATCH_ESCAPE = re.compile(r"\\(.)")
+
+# Tables in a character dump and how their rows are tied to a character: the
+# selecting SQL fragment is joined to the table alias ``t`` and yields the
+# owning character guid as ``owner``.
+TABLES: List[Tuple[str, str, str]] = [
+    ("characters", "t.guid", ""),
+    ("character_account_data", "t.guid", ""),
+    ("character_achievement", "t.guid", ""),
+    ("character_achievement_progress", "t.guid", ""),
+    ("character_action", "t.guid", ""),
+    ("character_aura", "t.guid", ""),
+    ("character_declinedname", "t.guid", ""),
+    ("character_entry_point", "t.guid", ""),
+    ("character_equipmentsets", "t.guid", ""),
+    ("character_glyphs", "t.guid", ""),
+    ("character_homebind", "t.guid", ""),
+    ("character_inventory", "t.guid", ""),
+    ("character_queststatus", "t.guid", ""),
+    ("character_queststatus_daily", "t.guid", ""),
+    ("character_queststatus_weekly", "t.guid", ""),
+    ("character_queststatus_monthly", "t.guid", ""),
+    ("character_queststatus_seasonal", "t.guid", ""),
+    ("character_queststatus_rewarded", "t.guid", ""),
+    ("character_reputation", "t.guid", ""),
+    ("character_settings", "t.guid", ""),
+    ("character_skills", "t.guid", ""),
+    ("character_spell", "t.guid", ""),
+    ("character_spell_cooldown", "t.guid", ""),
+    ("character_talent", "t.guid", ""),
+    ("character_gifts", "t.guid", ""),
+    ("item_instance", "t.owner_guid", ""),
+    ("item_loot_storage", "i.owner_guid", "JOIN item_instance i ON i.guid = t.containerGUID"),
+    ("mail", "t.receiver", ""),
+    ("mail_items", "t.receiver", ""),
+    ("character_pet", "t.owner", ""),
+    ("character_pet_declinedname", "t.owner", ""),
+    ("pet_aura", "p.owner", "JOIN character_pet p ON p.id = t.guid"),
+    ("pet_spell", "p.owner", "JOIN character_pet p ON p.id = t.guid"),
+    ("pet_spell_cooldown", "p.owner", "JOIN character_pet p ON p.id = t.guid"),
+]
+
+
+@dataclass
+class Character:
+    guid: int
+    name: str
+    account: str
+
+    @property
+    def filename(self) -> str:
+        return f"{self.name}_{self.guid}.pdump"
+
+
+class Exporter(Mysql):
+    def stream(self, db: str, sql: str) -> Iterator[str]:
+        """Yield result lines as they arrive, undoing mysql's batch escaping."""
+        proc = subprocess.Popen(self.base + ["-N", "-B", db, "-e", sql], stdout=subprocess.PIPE,
+                                stderr=subprocess.PIPE, text=True, errors="surrogateescape")
+        assert proc.stdout is not None
+        for line in proc.stdout:
+            yield BATCH_ESCAPE.sub(lambda m: BATCH_UNESCAPES.get(m.group(1), m.group()), line.rstrip("\n"))
+        stderr = proc.stderr.read() if proc.stderr else ""
+        if proc.wait() != 0:
+            raise PdumpError(errors(stderr) or "mysql query failed")
+
+
+def select_characters(mysql: Mysql, args: argparse.Namespace) -> List[Character]:
+    def split(values: List[str]) -> Tuple[List[str], List[str]]:
+        return [v for v in values if v.isdigit()], [quote(v) for v in values if not v.isdigit()]
+
+    auth = f"`{args.auth_db}`.account"
+    clauses: List[str] = []
+    if args.guid:
+        clauses.append(f"c.guid IN ({', '.join(str(g) for g in args.guid)})")
+    if args.character:
+        clauses.append(f"c.name IN ({', '.join(quote(n) for n in args.character)})")
+    ids, names = split(args.account)
+    if ids:
+        clauses.append(f"c.account IN ({', '.join(ids)})")
+    if names:
+        clauses.append(f"c.account IN (SELECT id FROM {auth} WHERE username IN ({', '.join(names)}))")
+    ids, names = split(args.guild)
+    guild_match = []
+    if ids:
+        guild_match.append(f"g.guildid IN ({', '.join(ids)})")
+    if names:
+        guild_match.append(f"g.name IN ({', '.join(names)})")
+    if guild_match:
+        clauses.append("c.guid IN (SELECT gm.guid FROM guild_member gm JOIN guild g ON g.guildid = gm.guildid "
+                       f"WHERE {' OR '.join(guild_match)})")
+    sql = (f"SELECT c.guid, c.name, COALESCE(a.username, c.account) FROM characters c "
+           f"LEFT JOIN {auth} a ON a.id = c.account WHERE ({' OR '.join(clauses)})")
+    if not args.include_deleted:
+        sql += " AND c.deleteDate IS NULL"
+    return [Character(int(guid), name, account)
+            for guid, name, account in mysql.query(args.characters_db, sql + " ORDER BY c.guid")]
+
+
+def read_schema(mysql: Mysql, db: str) -> Dict[str, List[Tuple[str, str]]]:
+    rows = mysql.query("information_schema", (
+        "SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE FROM COLUMNS WHERE TABLE_SCHEMA = "
+        f"{quote(db)} AND TABLE_NAME IN ({', '.join(quote(t) for t, _, _ in TABLES)}) "
+        "ORDER BY TABLE_NAME, ORDINAL_POSITION"))
+    schema: Dict[str, List[Tuple[str, str]]] = {}
+    for table, column, data_type in rows:
+        schema.setdefault(table, []).append((column, data_type.lower()))
+    return schema
+
+
+def table_query(table: str, owner: str, join: str, columns: List[Tuple[str, str]], guids: str) -> str:
+    """One query returning ``owner<TAB>v1, v2, ...`` with every value as a SQL literal."""
+    values = ", ".join(
+        f"IFNULL(t.`{col}`, 'NULL')" if data_type in NUMERIC else f"QUOTE(t.`{col}`)"
+        for col, data_type in columns
+    )
+    return f"SELECT {owner}, CONCAT_WS(', ', {values}) FROM `{table}` t {join} WHERE {owner} IN ({guids})"
+
+
+def export_chunk(mysql: Exporter, db: str, schema: Dict[str, List[Tuple[str, str]]],
+                 chunk: List[Character], out_dir: Path) -> None:
+    guids = ", ".join(str(c.guid) for c in chunk)
+    lines: Dict[int, List[str]] = {c.guid: [BANNER] for c in chunk}
+    for table, owner, join in TABLES:
+        columns = schema.get(table)
+        if not columns:
+            continue
+        prefix = f"INSERT INTO `{table}` ({', '.join(f'`{col}`' for col, _ in columns)}) VALUES ("
+        for row in mysql.stream(db, table_query(table, owner, join, columns, guids)):
+            key, _, values = row.partition("\t")
+            # Keep each statement on one line; newlines only occur inside quoted values.
+            values = values.replace("\r", "\\r").replace("\n", "\\n")
+            lines[int(key)].append(f"{prefix}{values});\n")
+    for character in chunk:
+        path = out_dir / character.filename
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8", errors="surrogateescape") as handle:
+            handle.writelines(lines.pop(character.guid))
+        tmp.replace(path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Export characters to pdump files in parallel")
+    parser.add_argument("--guild", action="append", default=[], help="Guild name or id (repeatable)")
+    parser.add_argument("--account", action="append", default=[], help="Account name or id (repeatable)")
+    parser.add_argument("--character", action="append", default=[], help="Character name (repeatable)")
+    parser.add_argument("--guid", action="append", type=int, default=[], help="Character guid (repeatable)")
+    parser.add_argument("--include-deleted", action="store_true", help="Also export deleted characters")
+    parser.add_argument("--output", type=Path,
+                        default=Path("exports") / f"pdumps-{time.strftime('%Y%m%d_%H%M%S')}",
+                        help="Output directory (default: exports/pdumps-<timestamp>)")
+    parser.add_argument("--password", default=os.environ.get("MYSQL_ROOT_PASSWORD", ""))
+    parser.add_argument("--container", default="ac-mysql")
+    parser.add_argument("--auth-db", default="acore_auth")
+    parser.add_argument("--characters-db", default="acore_characters")
+    parser.add_argument("-j", "--jobs", type=int, default=min(8, os.cpu_count() or 2),
+                        help="Chunks exported concurrently (default: nproc, at most 8)")
+    parser.add_argument("--chunk", type=int, default=100, help="Characters per set-based query (default: 100)")
+    args = parser.parse_args(argv)
+
+    if not (args.guild or args.account or args.character or args.guid):
+        parser.error("select characters with --guild, --account, --character or --guid")
+    if not args.password:
+        parser.error("--password (or MYSQL_ROOT_PASSWORD) is required")
+    mysql = Exporter(args.container, args.password)
+
+    try:
+        characters = select_characters(mysql, args)
+        if not characters:
+            print("No matching characters", file=sys.stderr)
+            return 1
+        schema = read_schema(mysql, args.characters_db)
+        if "characters" not in schema:
+            raise PdumpError(f"{args.characters_db}.characters not found")
+        args.output.mkdir(parents=True, exist_ok=True)
+        size = max(1, args.chunk)
+        chunks = [characters[i:i + size] for i in range(0, len(characters), size)]
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            list(pool.map(lambda chunk: export_chunk(mysql, args.characters_db, schema, chunk, args.output),
+                          chunks))
+    except (PdumpError, OSError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    manifest = args.output / "manifest.tsv"
+    with open(manifest, "w", encoding="utf-8") as handle:
+        handle.write("# file\taccount\tname\tguid\n")
+        for character in characters:
+            handle.write(f"{args.output / character.filename}\t{character.account}\t\t\n")
+    skipped = [table for table, _, _ in TABLES if table not in schema]
+    if skipped:
+        print(f"Tables not in {args.characters_db}, skipped: {', '.join(skipped)}")
+    print(f"✅ Exported {len(characters)} character(s) to {args.output}")
+    print(f"   Import with: python3 scripts/python/pdump_import.py --plan {manifest}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
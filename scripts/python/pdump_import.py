@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+"""
+Import a batch of character pdumps in parallel.
+
+Every INSERT in each dump is parsed into columns and values. The character,
+item, pet, mail and equipment-set ids are then rewritten through per-file maps.
+All new ids for the whole batch come from one query against the current
+maxima: each file gets a contiguous range, so files can be imported
+concurrently without colliding. The account, name and guid fields are
+rewritten exactly, by column name, instead of by pattern-matching the text.
+
+Each file is applied in its own mysql session inside one transaction. A
+failure rolls back only that character and is listed in the per-file report.
+
+Usage:
+    pdump_import.py --password PW --account alice import/pdumps/*.pdump
+    printf 'a.pdump\\talice\\tNewName\\t\\n' | pdump_import.py --password PW --plan -
+    pdump_import.py --password PW --account 5 --jobs 8 --report /tmp/report.tsv dumps/*.sql
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+NAME_RE = re.compile(r"^[A-Za-z]{2,12}$")
+TOKEN = re.compile(
+    r"""
+      (?P<str>'(?:[^'\\]|\\.|'')*')
+    | (?P<ident>`(?:[^`]|``)*`)
+    | (?P<num>[-+]?(?:0x[0-9A-Fa-f]+|\d+(?:\.\d*)?(?:[eE][-+]?\d+)?))
+    | (?P<word>[A-Za-z_][A-Za-z0-9_]*)
+    | (?P<punct>[(),;])
+    | (?P<space>\s+)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+UNESCAPES = {"0": "\0", "b": "\b", "n": "\n", "r": "\r", "t": "\t", "Z": "\x1a"}
+ESCAPES = {"\\": "\\\\", "'": "\\'", "\0": "\\0", "\n": "\\n", "\r": "\\r", "\x1a": "\\Z"}
+
+# How each id-bearing column is rewritten. Any other table with a "guid"
+# column is keyed on the character guid.
+#   char        character guid            item / item0  item guid (0 kept / unknown -> 0)
+#   self        character guid if it was this character, else unchanged
+#   pet, mail, eqset   pet number, mail id, equipment set guid
+#   account, name      target account / character name
+#   null               cleared
+RULES: Dict[str, Dict[str, str]] = {
+    "characters": {
+        "guid": "char", "account": "account", "name": "name",
+        "deleteInfos_Account": "null", "deleteInfos_Name": "null", "deleteDate": "null",
+    },
+    "character_aura": {"guid": "char", "casterGuid": "self", "itemGuid": "item0"},
+    "character_equipmentsets": dict(
+        {"guid": "char", "setguid": "eqset"}, **{f"item{i}": "item0" for i in range(19)}
+    ),
+    "character_gifts": {"guid": "char", "item_guid": "item"},
+    "character_inventory": {"guid": "char", "bag": "item0", "item": "item"},
+    "character_pet": {"id": "pet", "owner": "char"},
+    "character_pet_declinedname": {"id": "pet", "owner": "char"},
+    "pet_aura": {"guid": "pet", "casterGuid": "self"},
+    "pet_spell": {"guid": "pet"},
+    "pet_spell_cooldown": {"guid": "pet"},
+    "item_instance": {"guid": "item", "owner_guid": "char", "creatorGuid": "self", "giftCreatorGuid": "self"},
+    "item_loot_storage": {"containerGUID": "item"},
+    "mail": {"id": "mail", "receiver": "char"},
+    "mail_items": {"mail_id": "mail", "item_guid": "item", "receiver": "char"},
+}
+# Columns whose values define a file's id maps: (table, column, kind).
+SOURCES = (
+    ("item_instance", "guid", "item"),
+    ("character_pet", "id", "pet"),
+    ("mail", "id", "mail"),
+    ("character_equipmentsets", "setguid", "eqset"),
+)
+RANGES = {
+    "char": ("characters", "guid"),
+    "item": ("item_instance", "guid"),
+    "pet": ("character_pet", "id"),
+    "mail": ("mail", "id"),
+    "eqset": ("character_equipmentsets", "setguid"),
+}
+
+
+class PdumpError(Exception):
+    """Raised for unparseable dumps and failed lookups."""
+
+
+@dataclass
+class Value:
+    raw: str
+    value: object  # int, float, str or None
+
+    def as_int(self) -> Optional[int]:
+        try:
+            return int(self.value) if self.value is not None else None
+        except (TypeError, ValueError):
+            return None
+
+
+@dataclass
+class Insert:
+    table: str
+    columns: Optional[List[str]]
+    rows: List[List[Value]]
+
+
+@dataclass
+class Job:
+    path: Path
+    account: str
+    name: str = ""
+    guid: Optional[int] = None
+    inserts: List[Insert] = field(default_factory=list)
+    old_guid: Optional[int] = None
+    old_name: str = ""
+    account_id: Optional[int] = None
+    new_guid: Optional[int] = None
+    maps: Dict[str, Dict[int, int]] = field(default_factory=dict)
+    sql: str = ""
+    rows: int = 0
+    status: str = "pending"
+    message: str = ""
+
+
+def quote(text: str) -> str:
+    return "'" + "".join(ESCAPES.get(ch, ch) for ch in text) + "'"
+
+
+def unquote(raw: str) -> str:
+    body = raw[1:-1].replace("''", "'")
+    out: List[str] = []
+    i = 0
+    while i < len(body):
+        ch = body[i]
+        if ch == "\\" and i + 1 < len(body):
+            i += 1
+            out.append(UNESCAPES.get(body[i], body[i]))
+        else:
+            out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def number(raw: str) -> object:
+    if "x" in raw:
+        return int(raw.replace("0x", ""), 16)
+    return int(raw) if raw.lstrip("+-").isdigit() else float(raw)
+
+
+def tokens(text: str) -> Iterable[Tuple[str, str]]:
+    pos = 0
+    while pos < len(text):
+        match = TOKEN.match(text, pos)
+        if not match:
+            raise PdumpError(f"unexpected character {text[pos]!r}")
+        pos = match.end()
+        if match.lastgroup != "space":
+            yield match.lastgroup, match.group()
+
+
+def parse_insert(statement: str) -> Insert:
+    toks = list(tokens(statement))
+    pos = 0
+
+    def take(kind: Optional[str] = None, text: Optional[str] = None) -> Tuple[str, str]:
+        nonlocal pos
+        if pos >= len(toks):
+            raise PdumpError("statement ends early")
+        tok = toks[pos]
+        if (kind and tok[0] != kind) or (text and tok[1].upper() != text):
+            raise PdumpError(f"expected {text or kind}, found {tok[1][:20]!r}")
+        pos += 1
+        return tok
+
+    take("word", "INSERT")
+    if toks[pos][1].upper() == "IGNORE":
+        pos += 1
+    take("word", "INTO")
+    kind, table = toks[pos]
+    pos += 1
+    table = table[1:-1].replace("``", "`") if kind == "ident" else table
+    columns: Optional[List[str]] = None
+    if toks[pos][1] == "(":
+        pos += 1
+        columns = []
+        while True:
+            kind, name = toks[pos]
+            columns.append(name[1:-1].replace("``", "`") if kind == "ident" else name)
+            pos += 1
+            if take("punct")[1] == ")":
+                break
+    take("word", "VALUES")
+    rows: List[List[Value]] = []
+    while True:
+        take("punct", "(")
+        row: List[Value] = []
+        while True:
+            kind, raw = take()
+            if kind == "str":
+                row.append(Value(raw, unquote(raw)))
+            elif kind == "num":
+                row.append(Value(raw, number(raw)))
+            elif kind == "word" and raw.upper() == "NULL":
+                row.append(Value("NULL", None))
+            else:
+                raise PdumpError(f"unsupported value {raw[:20]!r} in {table}")
+            if take("punct")[1] == ")":
+                break
+        rows.append(row)
+        if pos >= len(toks) or toks[pos][1] == ";":
+            break
+        take("punct", ",")
+    return Insert(table, columns, rows)
+
+
+def read_pdump(path: Path) -> List[Insert]:
+    """Parse every INSERT in a pdump; the banner lines and comments are skipped."""
+    inserts: List[Insert] = []
+    pending = ""
+    with open(path, encoding="utf-8", errors="surrogateescape") as handle:
+        for number, line in enumerate(handle, 1):
+            if not pending and not line.lstrip()[:6].upper() == "INSERT":
+                continue
+            pending += line
+            if not pending.rstrip().endswith(";"):
+                continue
+            try:
+                inserts.append(parse_insert(pending))
+            except (PdumpError, IndexError) as exc:
+                raise PdumpError(f"{path.name}:{number}: {exc or 'statement ends early'}") from None
+            pending = ""
+    if pending:
+        raise PdumpError(f"{path.name}: unterminated statement at end of file")
+    if not any(ins.table == "characters" for ins in inserts):
+        raise PdumpError(f"{path.name}: no characters row")
+    return inserts
+
+
+class Mysql:
+    def __init__(self, container: str, password: str):
+        self.base = ["docker", "exec", "-i", container, "mysql", "-uroot", f"-p{password}"]
+
+    def query(self, db: str, sql: str) -> List[List[str]]:
+        result = subprocess.run(self.base + ["-N", "-B", db, "-e", sql], capture_output=True, text=True)
+        if result.returncode != 0:
+            raise PdumpError(errors(result.stderr) or "mysql query failed")
+        return [line.split("\t") for line in result.stdout.splitlines() if line]
+
+    def apply(self, db: str, sql: str) -> Tuple[bool, str]:
+        result = subprocess.run(self.base + [db], input=sql, capture_output=True, text=True,
+                                errors="surrogateescape")
+        return result.returncode == 0, errors(result.stderr)
+
+
+def errors(stderr: str) -> str:
+    return " ".join(line for line in stderr.splitlines() if "Using a password" not in line).strip()
+
+
+def columns_of(ins: Insert, schema: Dict[str, List[str]]) -> List[str]:
+    if ins.columns is not None:
+        return ins.columns
+    if ins.table not in schema:
+        return []
+    return schema[ins.table]
+
+
+def prepare(job: Job, schema: Dict[str, List[str]]) -> None:
+    """Find the dump's own character guid/name and the ids that need ranges."""
+    seen: Dict[str, set] = {kind: set() for _, _, kind in SOURCES}
+    for ins in job.inserts:
+        cols = columns_of(ins, schema)
+        for row in ins.rows:
+            if len(cols) != len(row):
+                raise PdumpError(f"{ins.table}: {len(row)} values for {len(cols)} columns")
+            record = dict(zip(cols, row))
+            if ins.table == "characters":
+                job.old_guid = record["guid"].as_int()
+                job.old_name = str(record["name"].value)
+            for table, column, kind in SOURCES:
+                if ins.table == table and column in record and record[column].as_int():
+                    seen[kind].add(record[column].as_int())
+    job.maps = {kind: {old: 0 for old in sorted(ids)} for kind, ids in seen.items()}
+
+
+def allocate(jobs: List[Job], mysql: Mysql, db: str) -> None:
+    """Hand out contiguous id ranges for the whole batch from one query."""
+    sql = "SELECT " + ", ".join(
+        f"(SELECT COALESCE(MAX(`{column}`), 0) FROM `{table}`)" for table, column in RANGES.values()
+    )
+    maxima = dict(zip(RANGES, (int(v) for v in mysql.query(db, sql)[0])))
+    forced = [job.guid for job in jobs if job.guid]
+    next_id = dict(maxima)
+    next_id["char"] = max([maxima["char"]] + forced)
+    for job in jobs:
+        if job.guid:
+            job.new_guid = job.guid
+        else:
+            next_id["char"] += 1
+            job.new_guid = next_id["char"]
+        for kind, mapping in job.maps.items():
+            for old in mapping:
+                next_id[kind] += 1
+                mapping[old] = next_id[kind]
+
+
+def render_value(job: Job, rule: str, value: Value) -> str:
+    number = value.as_int()
+    if rule == "char":
+        return str(job.new_guid)
+    if rule == "self":
+        return str(job.new_guid) if number and number == job.old_guid else value.raw
+    if rule == "account":
+        return str(job.account_id)
+    if rule == "name":
+        return quote(job.name or job.old_name)
+    if rule == "null":
+        return "NULL"
+    if rule in ("item", "item0"):
+        if not number:
+            return value.raw
+        return str(job.maps["item"].get(number, 0))
+    if rule in job.maps:
+        return str(job.maps[rule].get(number, number)) if number else value.raw
+    return value.raw
+
+
+def render(job: Job, schema: Dict[str, List[str]]) -> Tuple[str, List[str]]:
+    """Build the transaction for one file; returns (sql, warnings)."""
+    out = ["START TRANSACTION;"]
+    warnings: List[str] = []
+    for ins in job.inserts:
+        if ins.table not in schema:
+            warnings.append(f"table {ins.table} does not exist; skipped")
+            continue
+        cols = columns_of(ins, schema)
+        target = set(schema[ins.table])
+        keep = [i for i, col in enumerate(cols) if col in target]
+        dropped = [col for col in cols if col not in target]
+        if dropped:
+            warnings.append(f"{ins.table}: dropped column(s) {', '.join(dropped)}")
+        rules = RULES.get(ins.table)
+        if rules is None:
+            rules = {"guid": "char"} if "guid" in cols else {}
+        column_sql = ", ".join(f"`{cols[i]}`" for i in keep)
+        for row in ins.rows:
+            values = ", ".join(
+                render_value(job, rules[cols[i]], row[i]) if cols[i] in rules else row[i].raw for i in keep
+            )
+            out.append(f"INSERT INTO `{ins.table}` ({column_sql}) VALUES ({values});")
+            job.rows += 1
+    out.append("COMMIT;")
+    return "\n".join(out) + "\n", warnings
+
+
+def read_plan(lines: Iterable[str], default_account: str) -> List[Job]:
+    jobs: List[Job] = []
+    for line in lines:
+        if not line.strip() or line.startswith("#"):
+            continue
+        parts = (line.rstrip("\n").split("\t") + ["", "", ""])[:4]
+        path, account, name, guid = (part.strip() for part in parts)
+        jobs.append(Job(Path(path), account or default_account, name, int(guid) if guid else None))
+    return jobs
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import character pdumps in parallel")
+    parser.add_argument("files", nargs="*", type=Path, help="Pdump files (use --plan for per-file options)")
+    parser.add_argument("--plan", help="TSV of file, account, name, guid (name/guid optional); - for stdin")
+    parser.add_argument("--account", default="", help="Account name or id for files without one")
+    parser.add_argument("--name", default="", help="New character name (single file only)")
+    parser.add_argument("--guid", type=int, help="Force the character guid (single file only)")
+    parser.add_argument("--password", default=os.environ.get("MYSQL_ROOT_PASSWORD", ""))
+    parser.add_argument("--container", default="ac-mysql")
+    parser.add_argument("--auth-db", default="acore_auth")
+    parser.add_argument("--characters-db", default="acore_characters")
+    parser.add_argument("-j", "--jobs", type=int, default=min(8, os.cpu_count() or 2),
+                        help="Characters imported concurrently (default: nproc, at most 8)")
+    parser.add_argument("--dry-run", action="store_true", help="Parse, allocate and report without writing")
+    parser.add_argument("--report", help="Write status<TAB>file<TAB>name<TAB>guid<TAB>message per file")
+    args = parser.parse_args(argv)
+
+    jobs = [Job(path, args.account, args.name, args.guid) for path in args.files]
+    if args.plan:
+        with (sys.stdin if args.plan == "-" else open(args.plan, encoding="utf-8")) as handle:
+            jobs += read_plan(handle, args.account)
+    if not jobs:
+        parser.error("no pdump files given")
+    if len(jobs) > 1 and (args.name or args.guid):
+        parser.error("--name and --guid apply to a single file; use --plan for batches")
+    if not args.password:
+        parser.error("--password (or MYSQL_ROOT_PASSWORD) is required")
+    mysql = Mysql(args.container, args.password)
+
+    def fail(job: Job, message: str) -> None:
+        job.status, job.message = "failed", message
+
+    try:
+        for job in jobs:
+            try:
+                job.inserts = read_pdump(job.path)
+            except (PdumpError, OSError) as exc:
+                fail(job, str(exc))
+
+        live = [job for job in jobs if job.status == "pending"]
+        tables = sorted({ins.table for job in live for ins in job.inserts})
+        schema: Dict[str, List[str]] = {}
+        if tables:
+            rows = mysql.query("information_schema", (
+                "SELECT TABLE_NAME, COLUMN_NAME FROM COLUMNS WHERE TABLE_SCHEMA = "
+                f"{quote(args.characters_db)} AND TABLE_NAME IN ({', '.join(quote(t) for t in tables)}) "
+                "ORDER BY TABLE_NAME, ORDINAL_POSITION"))
+            for table, column in rows:
+                schema.setdefault(table, []).append(column)
+
+        # Accounts and names for the whole batch, one query each.
+        wanted = sorted({job.account for job in live if job.account})
+        accounts: Dict[str, int] = {}
+        if wanted:
+            ids = [a for a in wanted if a.isdigit()]
+            names = [a for a in wanted if not a.isdigit()]
+            clauses = []
+            if ids:
+                clauses.append(f"id IN ({', '.join(ids)})")
+            if names:
+                clauses.append(f"username IN ({', '.join(quote(n) for n in names)})")
+            for account_id, username in mysql.query(args.auth_db, "SELECT id, username FROM account WHERE "
+                                                    + " OR ".join(clauses)):
+                accounts[account_id] = int(account_id)
+                accounts[username.upper()] = int(account_id)
+
+        for job in live:
+            try:
+                prepare(job, schema)
+            except (PdumpError, KeyError) as exc:
+                fail(job, f"cannot read characters row: {exc}")
+                continue
+            if not job.account:
+                fail(job, "no target account")
+            elif (job.account if job.account.isdigit() else job.account.upper()) not in accounts:
+                fail(job, f"account {job.account} not found")
+            elif job.name and not NAME_RE.match(job.name):
+                fail(job, f"invalid character name {job.name!r} (2-12 letters)")
+            else:
+                job.account_id = accounts[job.account if job.account.isdigit() else job.account.upper()]
+        live = [job for job in live if job.status == "pending"]
+
+        final_names: Dict[str, Job] = {}
+        for job in live:
+            key = (job.name or job.old_name).lower()
+            if key in final_names:
+                fail(job, f"name {job.name or job.old_name} also used by {final_names[key].path.name}")
+            else:
+                final_names[key] = job
+        if final_names:
+            taken = mysql.query(args.characters_db, "SELECT name FROM characters WHERE name IN ("
+                                + ", ".join(quote(j.name or j.old_name) for j in final_names.values()) + ")")
+            for (name,) in taken:
+                job = final_names.get(name.lower())
+                if job:
+                    fail(job, f"character name {name} already exists (set name= to rename)")
+        forced = {job.guid: job for job in live if job.guid}
+        if forced:
+            for (guid,) in mysql.query(args.characters_db, "SELECT guid FROM characters WHERE guid IN ("
+                                       + ", ".join(str(g) for g in forced) + ")"):
+                fail(forced[int(guid)], f"guid {guid} is already in use")
+        live = [job for job in live if job.status == "pending"]
+
+        if live:
+            allocate(live, mysql, args.characters_db)
+        for job in live:
+            job.sql, warnings = render(job, schema)
+            if warnings:
+                job.message = "; ".join(warnings)
+    except PdumpError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+
+    def run(job: Job) -> None:
+        ok, message = mysql.apply(args.characters_db, job.sql)
+        if ok:
+            job.status = "imported"
+        else:
+            fail(job, message or "import failed")
+
+    if args.dry_run:
+        for job in live:
+            job.status = "planned"
+    elif live:
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            list(pool.map(run, live))
+
+    for job in jobs:
+        name = job.name or job.old_name
+        if job.status in ("imported", "planned"):
+            items = len(job.maps.get("item", {}))
+            verb = "would import" if job.status == "planned" else "imported"
+            print(f"✅ {job.path.name}: {verb} {name} (guid {job.new_guid}, account {job.account_id}, "
+                  f"{items} items, {job.rows} rows)" + (f" - {job.message}" if job.message else ""))
+        else:
+            print(f"❌ {job.path.name}: {job.message}")
+    done = sum(job.status in ("imported", "planned") for job in jobs)
+    print(f"{done}/{len(jobs)} pdump(s) {'planned' if args.dry_run else 'imported'}")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as handle:
+            for job in jobs:
+                handle.write("\t".join([job.status, str(job.path), job.name or job.old_name,
+                                        str(job.new_guid or ""), job.message.replace("\t", " ")]) + "\n")
+    return 0 if done == len(jobs) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Static table-access analysis and conflict grouping for module SQL.
+
+``analyze`` strips comments and string literals from a SQL file, splits it into
+statements and records which tables each one reads and writes, as
+``database.table`` keys. Statements whose effect cannot be bounded are recorded
+as a barrier on the file's database. These are stored routines, ``DELIMITER``
+blocks, dynamic SQL and unknown verbs.
+
+``group`` joins files that must keep their relative order: files of the same
+module, a table's writers with every file that reads or writes it, and a
+barrier with every file touching its database. The groups are independent of
+each other. Each one keeps the original serial order, so they can run on
+separate connections.
+
+Usage:
+    sql_deps.py --database acore_world path/to/file.sql ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+IDENT = r"(?:`[^`]+`|[A-Za-z0-9_$]+)(?:\s*\.\s*(?:`[^`]+`|[A-Za-z0-9_$]+))?"
+TABLE_LIST = rf"{IDENT}(?:\s*,\s*{IDENT})*"
+COMMENTS = re.compile(r"/\*!\d*|/\*.*?\*/|(?:--(?=\s)|#)[^\n]*|'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.|\"\")*\"|`[^`]*`",
+                      re.DOTALL)
+# A name followed by "(" after FROM/LIKE is a function call (EXTRACT(x FROM NOW()), LIKE CONCAT(...)).
+READS = re.compile(rf"\bREFERENCES\s+({IDENT})|\b(?:FROM|JOIN|USING|LIKE)\s+({IDENT})(?![\w`.$])(?!\s*\()",
+                   re.IGNORECASE)
+WRITES: List[Tuple[re.Pattern, bool]] = [
+    # (pattern, every table in group 1 is written)
+    (re.compile(rf"^(?:INSERT|REPLACE)\s+(?:(?:LOW_PRIORITY|DELAYED|HIGH_PRIORITY|IGNORE)\s+)*(?:INTO\s+)?({IDENT})",
+                re.IGNORECASE), False),
+    (re.compile(r"^UPDATE\s+(?:(?:LOW_PRIORITY|IGNORE)\s+)*(.*?)\s+SET\s", re.IGNORECASE | re.DOTALL), True),
+    (re.compile(r"^DELETE\s+(?:(?:LOW_PRIORITY|QUICK|IGNORE)\s+)*(.*?)(?:\s+WHERE\s|\s+ORDER\s|\s+LIMIT\s|$)",
+                re.IGNORECASE | re.DOTALL), True),
+    (re.compile(rf"^CREATE\s+(?:TEMPORARY\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?({IDENT})", re.IGNORECASE), False),
+    (re.compile(rf"^ALTER\s+(?:ONLINE\s+|IGNORE\s+)*TABLE\s+({IDENT})", re.IGNORECASE), False),
+    (re.compile(rf"^DROP\s+(?:TEMPORARY\s+)?TABLES?\s+(?:IF\s+EXISTS\s+)?({TABLE_LIST})", re.IGNORECASE), True),
+    (re.compile(rf"^TRUNCATE\s+(?:TABLE\s+)?({IDENT})", re.IGNORECASE), False),
+    (re.compile(r"^RENAME\s+TABLES?\s+(.*)$", re.IGNORECASE | re.DOTALL), True),
+    (re.compile(rf"^CREATE\s+(?:UNIQUE\s+|FULLTEXT\s+|SPATIAL\s+)?INDEX\s+.*?\bON\s+({IDENT})",
+                re.IGNORECASE | re.DOTALL), False),
+    (re.compile(rf"^DROP\s+INDEX\s+.*?\bON\s+({IDENT})", re.IGNORECASE | re.DOTALL), False),
+    (re.compile(rf"^(?:CREATE|ALTER)\s+(?:OR\s+REPLACE\s+)?(?:ALGORITHM\s*=\s*\w+\s+)?(?:SQL\s+SECURITY\s+\w+\s+)?"
+                rf"VIEW\s+(?:IF\s+NOT\s+EXISTS\s+)?({IDENT})", re.IGNORECASE), False),
+    (re.compile(rf"^DROP\s+VIEWS?\s+(?:IF\s+EXISTS\s+)?({TABLE_LIST})", re.IGNORECASE), True),
+    (re.compile(r"^LOCK\s+TABLES?\s+(.*)$", re.IGNORECASE | re.DOTALL), True),
+]
+# Statements that touch no table.
+NEUTRAL = {"SET", "START", "BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "DO", "UNLOCK", "SHOW",
+           "SELECT", "WITH", "ANALYZE", "OPTIMIZE", "CHECKSUM", "FLUSH"}
+NOT_TABLES = {"dual", "select", "set", "values"}
+
+
+@dataclass
+class Access:
+    reads: Set[str] = field(default_factory=set)
+    writes: Set[str] = field(default_factory=set)
+    barrier: str = ""
+
+
+def strip(text: str) -> str:
+    """Blank out comments and string literals; keep identifiers and MySQL versioned comment bodies."""
+    def repl(match: re.Match) -> str:
+        token = match.group()
+        if token.startswith("`"):
+            return token
+        if token.startswith("/*!"):
+            return " "
+        if token[0] in "'\"":
+            return "''"
+        return " "
+    text = COMMENTS.sub(repl, text)
+    return text.replace("*/", " ")
+
+
+def table_key(ident: str, database: str) -> str:
+    parts = [part.strip().strip("`") for part in ident.split(".")]
+    if len(parts) == 1:
+        parts.insert(0, database)
+    return ".".join(parts).lower()
+
+
+def idents(segment: str) -> List[str]:
+    """Table names in a table-reference list, skipping aliases, join conditions and keywords."""
+    names: List[str] = []
+    state = "table"  # table: next name is a table; alias: after a table; condition: inside ON/WHERE
+    for match in re.finditer(rf"{IDENT}|,", segment):
+        token = match.group().lower()
+        if token in (",", "join", "straight_join", "from", "using", "to"):
+            state = "table"
+        elif token in ("on", "where", "set"):
+            state = "condition"
+        elif token in ("as", "read", "write", "local", "low_priority", "inner", "left", "right", "cross",
+                       "natural", "outer", "if", "exists") or token.isdigit():
+            continue
+        elif state == "table":
+            names.append(match.group())
+            state = "alias"
+    return names
+
+
+def analyze(text: str, database: str) -> Access:
+    access = Access()
+    if re.search(r"^\s*DELIMITER\s", text, re.IGNORECASE | re.MULTILINE):
+        access.barrier = "uses DELIMITER (stored routine)"
+        return access
+    current = database
+    for statement in strip(text).split(";"):
+        statement = statement.strip()
+        if not statement:
+            continue
+        verb = statement.split(None, 1)[0].upper()
+        if verb == "USE":
+            current = statement.split(None, 1)[1].strip().strip("`") if " " in statement else current
+            continue
+        if verb in ("CALL", "PREPARE", "EXECUTE", "DEALLOCATE", "HANDLER", "LOAD", "SOURCE", "GRANT", "REVOKE"):
+            access.barrier = f"{verb} statement"
+            return access
+        routine = re.match(r"^(CREATE|DROP|ALTER)\s+(?:DEFINER\s*=\s*\S+\s+)?(PROCEDURE|FUNCTION|TRIGGER|EVENT|"
+                           r"DATABASE|SCHEMA|USER)\b", statement, re.IGNORECASE)
+        if routine:
+            access.barrier = f"{routine.group(1).upper()} {routine.group(2).upper()} statement"
+            return access
+        matched = False
+        for pattern, listed in WRITES:
+            found = pattern.match(statement)
+            if found:
+                segment = found.group(1)
+                if verb == "DELETE":
+                    # Multi-table DELETE names its targets by alias; the tables follow FROM.
+                    segment = re.split(r"\bFROM\b", segment, maxsplit=1, flags=re.IGNORECASE)[-1]
+                names = idents(segment) if listed else [segment]
+                access.writes.update(table_key(name, current) for name in names)
+                matched = True
+                break
+        if not matched and verb not in NEUTRAL:
+            access.barrier = f"unrecognised {verb} statement"
+            return access
+        for referenced, name in READS.findall(statement):
+            name = referenced or name
+            if name.lower() not in NOT_TABLES:
+                access.reads.add(table_key(name, current))
+    access.reads -= access.writes
+    return access
+
+
+def group(items: List[Tuple[str, str, Access]]) -> Tuple[List[List[int]], Dict[int, Set[str]]]:
+    """Group item indexes (module, database, access) into independent, order-preserving groups.
+
+    Returns the groups in first-appearance order and, per group root, the reasons
+    (shared tables, barriers) that linked its files.
+    """
+    parent = list(range(len(items)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def union(a: int, b: int) -> None:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+
+    reasons: Dict[int, Set[str]] = {}
+    last_of_module: Dict[str, int] = {}
+    writers: Dict[str, List[int]] = {}
+    readers: Dict[str, List[int]] = {}
+    by_database: Dict[str, List[int]] = {}
+    barriers: List[int] = []
+    for index, (module, database, access) in enumerate(items):
+        if module in last_of_module:
+            union(last_of_module[module], index)
+        last_of_module[module] = index
+        for table in access.writes:
+            writers.setdefault(table, []).append(index)
+        for table in access.reads:
+            readers.setdefault(table, []).append(index)
+        touched = {database} | {key.split(".", 1)[0] for key in access.reads | access.writes}
+        for name in touched:
+            by_database.setdefault(name, []).append(index)
+        if access.barrier:
+            barriers.append(index)
+
+    linked: List[Tuple[List[int], str]] = []
+    for table, indexes in writers.items():
+        members = indexes + readers.get(table, [])
+        if len({items[i][0] for i in members}) > 1:
+            linked.append((members, table))
+        for other in members[1:]:
+            union(members[0], other)
+    for index in barriers:
+        database = items[index][1]
+        members = by_database.get(database, [])
+        for other in members:
+            union(index, other)
+        linked.append((members, f"{items[index][0]}: {items[index][2].barrier} in {database}"))
+
+    groups: Dict[int, List[int]] = {}
+    for index in range(len(items)):
+        groups.setdefault(find(index), []).append(index)
+    for members, reason in linked:
+        if members:
+            reasons.setdefault(find(members[0]), set()).add(reason)
+    return list(groups.values()), {root: reasons.get(root, set()) for root in groups}
+
+
+def makespan(costs: List[int], workers: int) -> int:
+    """Longest-processing-time-first estimate of the parallel run time."""
+    loads = [0] * max(1, workers)
+    for cost in sorted(costs, reverse=True):
+        loads[loads.index(min(loads))] += cost
+    return max(loads) if costs else 0
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Show the tables module SQL files read and write")
+    parser.add_argument("--database", default="acore_world", help="Default database for unqualified tables")
+    parser.add_argument("files", nargs="+", type=Path)
+    args = parser.parse_args(argv)
+    for path in args.files:
+        access = analyze(path.read_text(encoding="utf-8", errors="replace"), args.database)
+        print(f"{path}: writes {', '.join(sorted(access.writes)) or '-'}; reads {', '.join(sorted(access.reads)) or '-'}"
+              + (f"; barrier: {access.barrier}" if access.barrier else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
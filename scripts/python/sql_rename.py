@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Stream a SQL dump while renaming the schemas it refers to.
+
+Loading a ``mysqldump --databases`` dump under another schema name (a merge
+staging database, or ``backup-import.sh --auth-db``) means rewriting the
+``CREATE DATABASE``, ``DROP DATABASE`` and ``USE`` statements and any
+``schema.table`` references in views, triggers and routines. A blanket ``sed``
+also rewrites matching text inside row data and needs the dump decompressed to
+disk first. This tool tokenizes the stream instead: string literals and
+comments pass through untouched, and only identifiers in schema position are
+renamed. Input is decompressed on the fly and output goes to stdout, so memory
+use is bounded by the longest single token.
+
+Extended ``INSERT INTO `t` VALUES ...;`` lines from mysqldump are
+self-contained; those that do not mention a renamed schema are copied without
+tokenizing, which keeps throughput close to ``zcat``.
+
+``--schemas`` lists the schemas a dump selects or creates (``USE`` and
+``CREATE DATABASE``), which are the names worth mapping.
+
+Usage:
+    sql_rename.py --map acore_auth=merge_stage_auth_42 backup/acore_auth.sql.gz | mysql
+    zcat dump.sql.gz | sql_rename.py --map acore_characters=fix_stage - | mysql
+    sql_rename.py --schemas backup/acore_auth.sql.gz
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence
+
+READ_SIZE = 16 * 1024 * 1024
+
+# One token per match. The trailing "unterminated" alternatives only match at
+# the end of the buffer and tell the caller to read more before deciding.
+TOKEN = re.compile(
+    rb"""
+      (?P<str>'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*")
+    | (?P<ident>`(?:[^`]|``)*`)
+    | (?P<cond>/\*!\d*)
+    | (?P<comment>/\*.*?\*/|(?:--[ \t\r]|--\n|\#)[^\n]*)
+    | (?P<word>[A-Za-z0-9_$]+)
+    | (?P<space>\s+)
+    | (?P<open>'(?:[^'\\]|\\.|'')*\\?\Z|"(?:[^"\\]|\\.|"")*\\?\Z|`(?:[^`]|``)*\Z|/\*.*\Z|--\Z|-\Z|/\Z)
+    | (?P<other>.)
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+FOLLOWED_BY_DOT = re.compile(rb"\s*\.")
+INSERT_LINE = re.compile(rb"INSERT INTO `(?:[^`]|``)+` VALUES ")
+SCHEMA_STATEMENT = re.compile(
+    rb"^\s*(?:USE|CREATE\s+(?:DATABASE|SCHEMA)(?:\s*/\*!\d*\s*IF\s+NOT\s+EXISTS\s*\*/|\s+IF\s+NOT\s+EXISTS)?)"
+    rb"\s+(`(?:[^`]|``)+`|[A-Za-z0-9_$]+)",
+    re.IGNORECASE,
+)
+SCHEMA_KEYWORDS = {b"USE", b"DATABASE", b"SCHEMA"}
+DEFERRABLE = {"str", "ident", "word", "other"}
+
+
+class RenameError(Exception):
+    """Raised when the input cannot be read or decompressed."""
+
+
+def parse_map(pairs: Sequence[str]) -> Dict[bytes, bytes]:
+    mapping: Dict[bytes, bytes] = {}
+    for pair in pairs:
+        old, sep, new = pair.partition("=")
+        if not sep or not old or not new:
+            raise RenameError(f"invalid --map {pair!r}; expected OLD=NEW")
+        mapping[old.encode()] = new.encode()
+    return mapping
+
+
+class Renamer:
+    """Incremental tokenizer that rewrites schema identifiers."""
+
+    def __init__(self, mapping: Dict[bytes, bytes]):
+        self.mapping = mapping
+        self.pending = b""
+        self.recent: List[bytes] = []
+        self.in_conditional = False
+
+    def _schema_position(self) -> bool:
+        recent = self.recent
+        if recent and recent[-1] in SCHEMA_KEYWORDS:
+            return True
+        # DROP DATABASE IF EXISTS x / CREATE DATABASE /*!32312 IF NOT EXISTS*/ x
+        if recent[-2:] == [b"IF", b"EXISTS"] and len(recent) >= 3 and recent[-3] in SCHEMA_KEYWORDS:
+            return True
+        return recent[-3:] == [b"IF", b"NOT", b"EXISTS"] and len(recent) >= 4 and recent[-4] in SCHEMA_KEYWORDS
+
+    def _remember(self, token: bytes) -> None:
+        self.recent.append(token)
+        if len(self.recent) > 4:
+            del self.recent[0]
+
+    def _rename(self, name: bytes, buf: bytes, end: int) -> Optional[bytes]:
+        new = self.mapping.get(name)
+        if new is None:
+            return None
+        if self._schema_position() or FOLLOWED_BY_DOT.match(buf, end):
+            return new
+        return None
+
+    def feed(self, data: bytes, final: bool = False) -> bytes:
+        buf = self.pending + data
+        out: List[bytes] = []
+        pos = 0
+        size = len(buf)
+        while pos < size:
+            match = TOKEN.match(buf, pos)
+            kind = match.lastgroup
+            end = match.end()
+            # A token touching the end of the buffer may continue in the next read.
+            if not final and (kind == "open" or (end == size and kind in DEFERRABLE)):
+                break
+            text = match.group()
+            if kind == "ident":
+                new = self._rename(text[1:-1].replace(b"``", b"`"), buf, end)
+                if new is not None:
+                    text = b"`" + new.replace(b"`", b"``") + b"`"
+                self._remember(b"`")
+            elif kind == "word":
+                new = self._rename(text, buf, end)
+                if new is not None:
+                    text = new
+                self._remember(text.upper())
+            elif kind == "cond":
+                self.in_conditional = True
+            elif kind == "other":
+                if text == b"*" and self.in_conditional and buf.startswith(b"*/", pos):
+                    # Closing "*/" of a /*!...*/ block is not part of the SQL.
+                    self.in_conditional = False
+                    text = b"*/"
+                    end = pos + 2
+                else:
+                    self._remember(text)
+            out.append(text)
+            pos = end
+        self.pending = buf[pos:]
+        return b"".join(out)
+
+    def mentions(self, line: bytes) -> bool:
+        return any(name in line for name in self.mapping)
+
+
+def open_dump(path: str) -> subprocess.Popen | None:
+    """Start a decompressor for ``path``; None means read the file directly."""
+    if path.endswith(".gz"):
+        tool = "pigz" if shutil.which("pigz") else "gzip"
+        cmd = [tool, "-dc", path]
+    elif path.endswith(".zst"):
+        cmd = ["zstd", "-q", "-dc", path]
+    elif path.endswith(".idx"):
+        cmd = [sys.executable, str(Path(__file__).with_name("backup_repo.py")), "cat", path]
+    else:
+        return None
+    try:
+        return subprocess.Popen(cmd, stdout=subprocess.PIPE)
+    except OSError as exc:
+        raise RenameError(f"cannot start {cmd[0]}: {exc}") from exc
+
+
+def iter_lines(stream: BinaryIO) -> Iterator[bytes]:
+    while True:
+        line = stream.readline(READ_SIZE)
+        if not line:
+            return
+        yield line
+
+
+def schemas(stream: BinaryIO) -> List[str]:
+    """Schema names from USE / CREATE DATABASE statements, in order of appearance."""
+    names: List[str] = []
+    for line in iter_lines(stream):
+        if line.startswith(b"INSERT"):
+            continue
+        match = SCHEMA_STATEMENT.match(line)
+        if match:
+            name = match.group(1)
+            if name.startswith(b"`"):
+                name = name[1:-1].replace(b"``", b"`")
+            decoded = name.decode("utf-8", errors="replace")
+            if decoded not in names:
+                names.append(decoded)
+    return names
+
+
+def rewrite(stream: BinaryIO, out: BinaryIO, mapping: Dict[bytes, bytes]) -> None:
+    renamer = Renamer(mapping)
+    write = out.write
+    for line in iter_lines(stream):
+        if (
+            not renamer.pending
+            and line.endswith(b");\n")
+            and INSERT_LINE.match(line)
+            and not renamer.mentions(line)
+        ):
+            write(line)
+            continue
+        write(renamer.feed(line))
+    write(renamer.feed(b"", final=True))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Rename schemas in a SQL dump stream")
+    parser.add_argument("--map", action="append", default=[], metavar="OLD=NEW",
+                        help="Schema to rename (repeatable; none passes the dump through)")
+    parser.add_argument("--schemas", action="store_true",
+                        help="List the schemas the dump's USE / CREATE DATABASE statements name, one per line")
+    parser.add_argument("dump", nargs="?", default="-",
+                        help="Dump file (.sql, .sql.gz, .sql.zst, .sql.idx) or - for stdin (default)")
+    args = parser.parse_args(argv)
+
+    try:
+        mapping = parse_map(args.map)
+        proc = None if args.dump == "-" else open_dump(args.dump)
+        if proc is not None:
+            source = proc.stdout
+        elif args.dump == "-":
+            source = sys.stdin.buffer
+        else:
+            source = open(args.dump, "rb")
+        with source:
+            if args.schemas:
+                for name in schemas(source):
+                    print(name)
+            else:
+                rewrite(source, sys.stdout.buffer, mapping)
+        sys.stdout.buffer.flush()
+        if proc is not None and proc.wait() != 0:
+            raise RenameError(f"decompressing {args.dump} failed (exit {proc.returncode})")
+    except (RenameError, OSError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Plan module SQL staging against the databases' ``updates`` tables.
+
+AzerothCore's DB updater records every applied file in each database's
+``updates`` table: the file name and the SHA1 of its contents. Module SQL is
+staged as ``MODULE_<module>_<file>.sql``. This planner loads each database's
+table in one query, hashes the enabled modules' SQL files locally, and sorts
+every file into one of three sets:
+
+    new       no row with this name; the updater will apply it
+    changed   a row exists with a different hash; the updater re-applies it
+    applied   a row exists with the same hash; nothing to execute
+
+Files that are empty or contain shell escapes are reported as ``skipped`` or
+``rejected``. With ``--present`` the planner also reads a ``sha1sum`` listing
+of what is already in the updates directory. Applied files whose staged copy
+is identical are then marked ``current``, so they are not copied again. They
+still have to stay in the updates directory: the updater deletes the ``updates``
+rows of files that have gone missing.
+
+Output is one tab-separated line per file:
+status, core directory, source path, staged name and hash.
+
+Usage:
+    sql_update_plan.py --modules-dir local-storage/modules --enabled local-storage/modules/.modules-meta/modules-enabled.txt
+    sql_update_plan.py --modules-dir /modules --present /tmp/staged.sha1 --summary
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# Staging directory, then the module directory names it is read from (in order).
+DB_DIRS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("db_world", ("db-world", "db-world/base", "db-world/updates", "world", "world/base")),
+    ("db_characters", ("db-characters", "db-characters/base", "db-characters/updates",
+                       "characters", "characters/base")),
+    ("db_auth", ("db-auth", "db-auth/base", "db-auth/updates", "auth", "auth/base")),
+    ("db_playerbots", ("db-playerbots", "db-playerbots/base", "db-playerbots/updates",
+                       "playerbots", "playerbots/base")),
+)
+SHELL_ESCAPE = re.compile(rb"^[ \t]*(system|exec|shell|!)", re.MULTILINE)
+PENDING = ("new", "changed")
+
+Query = Callable[[str, str], List[List[str]]]
+
+
+class PlanError(Exception):
+    """Raised when the updates tables cannot be read."""
+
+
+@dataclass
+class PlannedFile:
+    module: str
+    core_dir: str
+    source: Path
+    status: str = ""
+    sha1: str = ""
+
+    @property
+    def name(self) -> str:
+        return f"MODULE_{self.module}_{self.source.stem}.sql"
+
+
+def sha1_file(path: Path) -> Tuple[str, bytes]:
+    data = path.read_bytes()
+    return hashlib.sha1(data).hexdigest().upper(), data
+
+
+def discover(modules_dir: Path, enabled: Optional[Set[str]]) -> List[PlannedFile]:
+    files: List[PlannedFile] = []
+    modules = sorted(p for p in modules_dir.iterdir() if p.is_dir()) if modules_dir.is_dir() else []
+    for core_dir, subdirs in DB_DIRS:
+        for subdir in subdirs:
+            for module in modules:
+                if enabled and module.name not in enabled:
+                    continue
+                directory = module / "data" / "sql" / subdir
+                if directory.is_dir():
+                    for path in sorted(directory.glob("*.sql")):
+                        files.append(PlannedFile(module.name, core_dir, path))
+    return files
+
+
+def load_applied(query: Query, databases: Dict[str, str]) -> Dict[str, Dict[str, str]]:
+    """One query per database: {core_dir: {name: hash}}; missing tables read as empty."""
+    applied: Dict[str, Dict[str, str]] = {}
+    for core_dir, database in databases.items():
+        try:
+            rows = query(database, "SELECT name, hash FROM updates")
+        except PlanError:
+            rows = []
+        applied[core_dir] = {row[0]: row[1].upper() for row in rows if len(row) >= 2}
+    return applied
+
+
+def read_present(lines: Iterable[str]) -> Dict[Tuple[str, str], str]:
+    """Parse ``sha1sum`` output of staged files into {(core_dir, name): hash}."""
+    present: Dict[Tuple[str, str], str] = {}
+    for line in lines:
+        digest, _, path = line.strip().partition("  ")
+        if path:
+            parts = Path(path.lstrip("*")).parts
+            if len(parts) >= 2:
+                present[(parts[-2], parts[-1])] = digest.upper()
+    return present
+
+
+def classify(files: List[PlannedFile], applied: Dict[str, Dict[str, str]],
+             present: Optional[Dict[Tuple[str, str], str]] = None) -> None:
+    for item in files:
+        try:
+            item.sha1, data = sha1_file(item.source)
+        except OSError:
+            item.status = "skipped"
+            continue
+        if not data:
+            item.status = "skipped"
+        elif SHELL_ESCAPE.search(data):
+            item.status = "rejected"
+        else:
+            recorded = applied.get(item.core_dir, {}).get(item.name)
+            if recorded is None:
+                item.status = "new"
+            elif recorded != item.sha1:
+                item.status = "changed"
+            elif present is not None and present.get((item.core_dir, item.name)) == item.sha1:
+                item.status = "current"
+            else:
+                item.status = "applied"
+
+
+def docker_query(container: str, password: str) -> Query:
+    def query(database: str, sql: str) -> List[List[str]]:
+        result = subprocess.run(
+            ["docker", "exec", container, "mysql", "-uroot", f"-p{password}", "-N", "-B", database, "-e", sql],
+            capture_output=True, text=True)
+        if result.returncode != 0:
+            raise PlanError(result.stderr.strip())
+        return [line.split("\t") for line in result.stdout.splitlines() if line]
+    return query
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    env = os.environ
+    parser = argparse.ArgumentParser(description="Plan module SQL staging against the updates tables")
+    parser.add_argument("--modules-dir", type=Path, default=Path(env.get("MODULES_ROOT", "/modules")))
+    parser.add_argument("--enabled", type=Path, help="File listing enabled modules, one per line")
+    parser.add_argument("--present", help="sha1sum listing of files already staged (- for stdin)")
+    parser.add_argument("--container", default=env.get("CONTAINER_MYSQL", "ac-mysql"))
+    parser.add_argument("--password", default=env.get("MYSQL_ROOT_PASSWORD", ""))
+    parser.add_argument("--world-db", default=env.get("DB_WORLD_NAME", "acore_world"))
+    parser.add_argument("--auth-db", default=env.get("DB_AUTH_NAME", "acore_auth"))
+    parser.add_argument("--characters-db", default=env.get("DB_CHARACTERS_NAME", "acore_characters"))
+    parser.add_argument("--playerbots-db", default=env.get("DB_PLAYERBOTS_NAME", "acore_playerbots"))
+    parser.add_argument("--summary", action="store_true", help="Print per-module counts instead of the plan")
+    args = parser.parse_args(argv)
+
+    enabled: Optional[Set[str]] = None
+    if args.enabled and args.enabled.is_file():
+        enabled = {line.strip() for line in args.enabled.read_text(encoding="utf-8").splitlines() if line.strip()}
+    present = None
+    if args.present:
+        with (sys.stdin if args.present == "-" else open(args.present, encoding="utf-8")) as handle:
+            present = read_present(handle)
+
+    databases = {"db_world": args.world_db, "db_characters": args.characters_db,
+                 "db_auth": args.auth_db, "db_playerbots": args.playerbots_db}
+    files = discover(args.modules_dir, enabled)
+    applied = load_applied(docker_query(args.container, args.password), databases) if files else {}
+    classify(files, applied, present)
+
+    if args.summary:
+        counts: Dict[str, Dict[str, int]] = {}
+        for item in files:
+            module = counts.setdefault(item.module, {})
+            module[item.status] = module.get(item.status, 0) + 1
+        for module, by_status in sorted(counts.items()):
+            print(module + "\t" + ", ".join(f"{n} {status}" for status, n in sorted(by_status.items())))
+        pending = sum(item.status in PENDING for item in files)
+        print(f"{pending} of {len(files)} module SQL file(s) pending")
+        return 0
+
+    for item in files:
+        print("\t".join([item.status, item.core_dir, str(item.source), item.name, item.sha1]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+OpenMetrics exporter for the AzerothCore stack.
+
+Runs the same collectors as ``statusjson.sh`` on a fixed interval in a
+background thread and serves the most recent snapshot as labelled metrics on
+``/metrics``. Scrapes only render the cached snapshot, so they never trigger
+docker or mysql calls themselves no matter how often Prometheus polls.
+
+Usage:
+    status_exporter.py --port 9105 --interval 15
+    status_exporter.py --once            # print metrics once and exit
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PROJECT_DIR = Path(__file__).resolve().parents[2]
+STATUSJSON = PROJECT_DIR / "scripts" / "bash" / "statusjson.sh"
+
+OPENMETRICS_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+MEMORY_UNITS = {
+    "b": 1,
+    "kb": 1000,
+    "mb": 1000 ** 2,
+    "gb": 1000 ** 3,
+    "tb": 1000 ** 4,
+    "kib": 1024,
+    "mib": 1024 ** 2,
+    "gib": 1024 ** 3,
+    "tib": 1024 ** 4,
+}
+
+
+def parse_memory_usage(value: str) -> Optional[float]:
+    """Parse the used half of docker stats' ``"123.4MiB / 7.6GiB"``."""
+    used = (value or "").split("/", 1)[0].strip()
+    match = re.fullmatch(r"([0-9.]+)\s*([A-Za-z]+)", used)
+    if not match:
+        return None
+    scale = MEMORY_UNITS.get(match.group(2).lower())
+    if scale is None:
+        return None
+    return float(match.group(1)) * scale
+
+
+def escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_value(value: float) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricFamily:
+    def __init__(self, name: str, metric_type: str, help_text: str):
+        self.name = name
+        self.type = metric_type
+        self.help = help_text
+        self.samples: List[Tuple[str, Dict[str, str], float]] = []
+
+    def add(self, value: float, suffix: str = "", **labels) -> None:
+        self.samples.append((suffix, labels, value))
+
+    def render(self, openmetrics: bool = True) -> List[str]:
+        name, metric_type = self.name, self.type
+        if not openmetrics:
+            # The Prometheus text format names families after their samples and
+            # has no info type, so fold the suffix in and report a gauge.
+            if metric_type == "info":
+                name, metric_type = f"{name}_info", "gauge"
+            elif metric_type == "counter":
+                name = f"{name}_total"
+        lines = [f"# TYPE {name} {metric_type}", f"# HELP {name} {self.help}"]
+        for suffix, labels, value in self.samples:
+            label_str = ""
+            if labels:
+                label_str = "{" + ",".join(f'{k}="{escape_label(v)}"' for k, v in labels.items()) + "}"
+            lines.append(f"{self.name}{suffix}{label_str} {format_value(value)}")
+        return lines
+
+
+def snapshot_families(snapshot: Optional[dict], state: dict, now: float) -> List[MetricFamily]:
+    families: List[MetricFamily] = []
+
+    def family(name: str, metric_type: str, help_text: str) -> MetricFamily:
+        fam = MetricFamily(name, metric_type, help_text)
+        families.append(fam)
+        return fam
+
+    refreshes = family("acore_exporter_refreshes", "counter", "Snapshot refresh attempts by result.")
+    refreshes.add(state.get("ok", 0), "_total", result="success")
+    refreshes.add(state.get("errors", 0), "_total", result="error")
+    family("acore_exporter_refresh_duration_seconds", "gauge", "Time taken by the last snapshot refresh.").add(
+        round(state.get("duration", 0.0), 3)
+    )
+    if snapshot is None:
+        family("acore_snapshot_available", "gauge", "Whether a status snapshot has been collected.").add(0)
+        return families
+    family("acore_snapshot_available", "gauge", "Whether a status snapshot has been collected.").add(1)
+    family("acore_snapshot_age_seconds", "gauge", "Seconds since the cached snapshot was collected.").add(
+        round(max(now - state.get("collected_at", now), 0.0), 3)
+    )
+
+    info = family("acore_container", "info", "Container state, health and image.")
+    up = family("acore_container_running", "gauge", "Whether the container is running.")
+    healthy = family("acore_container_healthy", "gauge", "Whether the container health check passes (containers with health checks only).")
+    restarts = family("acore_container_restart_count", "gauge", "Docker restart count for the container.")
+    exit_code = family("acore_container_exit_code", "gauge", "Last exit code reported by docker.")
+    for svc in snapshot.get("services") or []:
+        labels = {"container": svc.get("name", ""), "service": svc.get("label", "")}
+        info.add(
+            1,
+            "_info",
+            **labels,
+            status=svc.get("status", ""),
+            health=svc.get("health", ""),
+            image=svc.get("image", ""),
+        )
+        up.add(1 if svc.get("status") == "running" else 0, **labels)
+        if svc.get("health") not in ("", "none", None):
+            healthy.add(1 if svc.get("health") == "healthy" else 0, **labels)
+        if svc.get("status") != "missing":
+            restarts.add(int(svc.get("restart_count", 0) or 0), **labels)
+            code = str(svc.get("exit_code", "0") or "0")
+            exit_code.add(int(code) if code.lstrip("-").isdigit() else 0, **labels)
+
+    cpu = family("acore_container_cpu_percent", "gauge", "Container CPU usage percentage from docker stats.")
+    mem_pct = family("acore_container_memory_percent", "gauge", "Container memory usage percentage from docker stats.")
+    mem_bytes = family("acore_container_memory_usage_bytes", "gauge", "Container memory usage from docker stats.")
+    for name, stats in sorted((snapshot.get("stats") or {}).items()):
+        cpu.add(float(stats.get("cpu", 0) or 0), container=name)
+        mem_pct.add(float(stats.get("memory_percent", 0) or 0), container=name)
+        used = parse_memory_usage(stats.get("memory", ""))
+        if used is not None:
+            mem_bytes.add(used, container=name)
+
+    ports = family("acore_port_reachable", "gauge", "Whether the published port accepts TCP connections on localhost.")
+    for entry in snapshot.get("ports") or []:
+        ports.add(1 if entry.get("reachable") else 0, name=entry.get("name", ""), port=entry.get("port", "") or "")
+
+    users = snapshot.get("users") or {}
+    family("acore_accounts", "gauge", "Player accounts, excluding bot account prefixes.").add(int(users.get("accounts", 0) or 0))
+    family("acore_characters", "gauge", "Characters on player accounts.").add(int(users.get("characters", 0) or 0))
+    family("acore_players_online", "gauge", "Player accounts with a character online.").add(int(users.get("online", 0) or 0))
+    family("acore_players_active_7d", "gauge", "Accounts that logged in during the last 7 days.").add(int(users.get("active7d", 0) or 0))
+
+    storage = family("acore_storage_bytes", "gauge", "Apparent size of stack storage directories.")
+    storage_exists = family("acore_storage_present", "gauge", "Whether the storage directory exists.")
+    for name, entry in sorted((snapshot.get("storage") or {}).items()):
+        storage_exists.add(1 if entry.get("exists") else 0, name=name, path=entry.get("path", ""))
+        if entry.get("exists"):
+            storage.add(int(entry.get("bytes", 0) or 0), name=name, path=entry.get("path", ""))
+
+    latency = snapshot.get("world_latency") or {}
+    if latency.get("available") and not latency.get("stale"):
+        diff = family("acore_world_update_diff_milliseconds", "gauge", "World update diff from worldserver 'server info'.")
+        if latency.get("last_diff_ms") is not None:
+            diff.add(float(latency["last_diff_ms"]), kind="last")
+        for key, value in sorted((latency.get("server") or {}).items()):
+            if value is not None:
+                diff.add(float(value), kind=f"server_{key[:-3]}")
+        for key, value in sorted((latency.get("rolling") or {}).items()):
+            if key.endswith("_ms") and value is not None:
+                diff.add(float(value), kind=f"rolling_{key[:-3]}")
+        family("acore_world_lagging", "gauge", "Whether the world update diff has stayed above the lag threshold.").add(
+            1 if latency.get("lagging") else 0
+        )
+        if latency.get("uptime_seconds") is not None:
+            family("acore_world_uptime_seconds", "gauge", "Worldserver uptime reported over SOAP or logs.").add(
+                int(latency["uptime_seconds"])
+            )
+
+    stream = snapshot.get("binlog_stream") or {}
+    if stream.get("available") and not stream.get("stale"):
+        family("acore_binlog_stream_streaming", "gauge", "Whether binary logs are being streamed to durable storage.").add(
+            1 if stream.get("state") == "streaming" else 0, state=stream.get("state", "")
+        )
+        family("acore_binlog_stream_lag_bytes", "gauge", "Binary log bytes written by MySQL but not yet on durable storage.").add(
+            int(stream.get("lag_bytes", 0) or 0)
+        )
+        family("acore_binlog_stream_lag_seconds", "gauge", "Seconds since the binlog stream was last fully caught up.").add(
+            int(stream.get("lag_seconds", 0) or 0)
+        )
+
+    build = snapshot.get("build") or {}
+    family("acore_build", "info", "Source variant and commit of the running build.").add(
+        1,
+        "_info",
+        variant=build.get("variant", ""),
+        branch=build.get("branch", ""),
+        commit=build.get("commit", ""),
+        image=build.get("image", ""),
+    )
+    return families
+
+
+def render(snapshot: Optional[dict], state: dict, openmetrics: bool = True, now: Optional[float] = None) -> str:
+    lines: List[str] = []
+    for fam in snapshot_families(snapshot, state, time.time() if now is None else now):
+        lines.extend(fam.render(openmetrics))
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class SnapshotCache:
+    """Refresh statusjson output in the background and hold the latest copy."""
+
+    def __init__(self, command: List[str], interval: float, timeout: float):
+        self.command = command
+        self.interval = interval
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.snapshot: Optional[dict] = None
+        self.state = {"ok": 0, "errors": 0, "duration": 0.0, "collected_at": 0.0}
+        self._stop = threading.Event()
+
+    def refresh(self) -> bool:
+        started = time.time()
+        try:
+            result = subprocess.run(
+                self.command, capture_output=True, text=True, check=True, timeout=self.timeout
+            )
+            snapshot = json.loads(result.stdout)
+        except (OSError, subprocess.SubprocessError, ValueError) as exc:
+            with self.lock:
+                self.state["errors"] += 1
+                self.state["duration"] = time.time() - started
+            print(f"Warning: status refresh failed: {exc}", file=sys.stderr)
+            return False
+        with self.lock:
+            self.snapshot = snapshot
+            self.state["ok"] += 1
+            self.state["duration"] = time.time() - started
+            self.state["collected_at"] = time.time()
+        return True
+
+    def current(self) -> Tuple[Optional[dict], dict]:
+        with self.lock:
+            return self.snapshot, dict(self.state)
+
+    def run(self) -> None:
+        while not self._stop.is_set():
+            self.refresh()
+            self._stop.wait(self.interval)
+
+    def start(self) -> threading.Thread:
+        thread = threading.Thread(target=self.run, name="status-refresh", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def make_handler(cache: SnapshotCache):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802 (http.server naming)
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            openmetrics = "application/openmetrics-text" in self.headers.get("Accept", "")
+            snapshot, state = cache.current()
+            body = render(snapshot, state, openmetrics=openmetrics).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", OPENMETRICS_TYPE if openmetrics else PROMETHEUS_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            return
+
+    return MetricsHandler
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="OpenMetrics exporter for stack health")
+    parser.add_argument("--listen", default=os.environ.get("STATUS_EXPORTER_LISTEN", "0.0.0.0"),
+                        help="Address to bind (default: 0.0.0.0)")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("STATUS_EXPORTER_PORT", "9105")),
+                        help="Port to serve /metrics on (default: 9105)")
+    parser.add_argument("--interval", type=float, default=float(os.environ.get("STATUS_EXPORTER_INTERVAL", "15")),
+                        help="Seconds between snapshot refreshes (default: 15)")
+    parser.add_argument("--timeout", type=float, default=60.0,
+                        help="Maximum seconds a single refresh may take (default: 60)")
+    parser.add_argument("--statusjson", default=str(STATUSJSON),
+                        help="Collector command (default: scripts/bash/statusjson.sh)")
+    parser.add_argument("--once", action="store_true", help="Collect once, print metrics and exit")
+    args = parser.parse_args(argv)
+
+    cache = SnapshotCache([sys.executable, args.statusjson], args.interval, args.timeout)
+
+    if args.once:
+        ok = cache.refresh()
+        snapshot, state = cache.current()
+        sys.stdout.write(render(snapshot, state))
+        return 0 if ok else 1
+
+    cache.start()
+    server = ThreadingHTTPServer((args.listen, args.port), make_handler(cache))
+    print(f"📈 Serving metrics on http://{args.listen}:{args.port}/metrics (refresh every {args.interval:g}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cache.stop()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Time-series history for status snapshots.
+
+Stores CPU, memory, player counts and port reachability from each
+``statusjson.sh`` run in a fixed-size on-disk ring buffer. Every sample is
+folded into three downsampling tiers at once (5 second, 1 minute and 1 hour
+buckets), each an array of fixed-size records addressed by
+``(bucket // step) % capacity``. Old buckets are overwritten in place, so the
+file never grows and no external TSDB is needed.
+
+Usage:
+    statusjson.sh | status_history.py append
+    status_history.py query --metric online --since 6h
+    status_history.py query --metric worldserver_cpu --since 7d --agg max
+"""
+
+from __future__ import annotations
+
+import argparse
+import fcntl
+import json
+import math
+import os
+import re
+import struct
+import sys
+import time
+from calendar import timegm
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+MAGIC = b"ACSH"
+HEADER_SIZE = 4096
+
+PORT_METRICS = {
+    "Auth": "port_auth",
+    "World": "port_world",
+    "SOAP": "port_soap",
+    "MySQL": "port_mysql",
+    "phpMyAdmin": "port_phpmyadmin",
+    "Keira3": "port_keira3",
+}
+
+METRICS: Tuple[str, ...] = (
+    "cpu_total",
+    "memory_percent_total",
+    "worldserver_cpu",
+    "worldserver_memory_percent",
+    "mysql_cpu",
+    "mysql_memory_percent",
+    "online",
+    "accounts",
+    "characters",
+    "active7d",
+    "services_running",
+    "ports_reachable",
+) + tuple(PORT_METRICS.values())
+
+# (step seconds, capacity): 6 hours of 5s, 7 days of 1m, 1 year of 1h buckets
+TIERS: Tuple[Tuple[int, int], ...] = ((5, 4320), (60, 10080), (3600, 8760))
+TIER_NAMES = {5: "5s", 60: "1m", 3600: "1h"}
+
+# bucket start, sample count, then (mean, min, max) per metric
+RECORD = struct.Struct("<qI" + "fff" * len(METRICS))
+
+AGGREGATES = ("avg", "min", "max")
+
+
+def parse_duration(value: str) -> int:
+    match = re.fullmatch(r"\s*(\d+)\s*([smhdw]?)\s*", value or "")
+    if not match:
+        raise ValueError(f"Invalid duration: {value!r} (expected e.g. 90s, 15m, 6h, 7d)")
+    scale = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}[match.group(2)]
+    return int(match.group(1)) * scale
+
+
+def snapshot_metrics(snapshot: dict) -> Dict[str, float]:
+    """Flatten a statusjson snapshot into the fixed metric set."""
+    stats = snapshot.get("stats") or {}
+    users = snapshot.get("users") or {}
+    values: Dict[str, float] = {
+        "cpu_total": sum(float(s.get("cpu", 0) or 0) for s in stats.values()),
+        "memory_percent_total": sum(float(s.get("memory_percent", 0) or 0) for s in stats.values()),
+        "worldserver_cpu": float((stats.get("ac-worldserver") or {}).get("cpu", 0) or 0),
+        "worldserver_memory_percent": float((stats.get("ac-worldserver") or {}).get("memory_percent", 0) or 0),
+        "mysql_cpu": float((stats.get("ac-mysql") or {}).get("cpu", 0) or 0),
+        "mysql_memory_percent": float((stats.get("ac-mysql") or {}).get("memory_percent", 0) or 0),
+        "online": float(users.get("online", 0) or 0),
+        "accounts": float(users.get("accounts", 0) or 0),
+        "characters": float(users.get("characters", 0) or 0),
+        "active7d": float(users.get("active7d", 0) or 0),
+        "services_running": float(
+            sum(1 for svc in snapshot.get("services") or [] if svc.get("status") == "running")
+        ),
+    }
+    reachable = 0
+    for metric in PORT_METRICS.values():
+        values[metric] = 0.0
+    for entry in snapshot.get("ports") or []:
+        metric = PORT_METRICS.get(entry.get("name", ""))
+        up = 1.0 if entry.get("reachable") else 0.0
+        reachable += int(up)
+        if metric:
+            values[metric] = up
+    values["ports_reachable"] = float(reachable)
+    return values
+
+
+class HistoryStore:
+    """Fixed-size multi-tier ring buffer backed by a single file."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.layout = {"metrics": list(METRICS), "tiers": [list(t) for t in TIERS]}
+        self.tier_offsets: Dict[int, int] = {}
+        offset = HEADER_SIZE
+        for step, capacity in TIERS:
+            self.tier_offsets[step] = offset
+            offset += capacity * RECORD.size
+        self.file_size = offset
+
+    # -- file management -------------------------------------------------
+
+    def _header(self) -> bytes:
+        body = MAGIC + json.dumps(self.layout).encode("utf-8")
+        return body.ljust(HEADER_SIZE, b"\0")
+
+    def _open(self, writable: bool):
+        if not writable:
+            fh = self.path.open("rb")
+            fcntl.flock(fh, fcntl.LOCK_SH)
+            return fh
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        fh = os.fdopen(fd, "r+b")
+        fcntl.flock(fh, fcntl.LOCK_EX)
+        header = fh.read(HEADER_SIZE)
+        if header != self._header():
+            # New file or a layout change: start over with an empty buffer.
+            fh.seek(0)
+            fh.truncate(0)
+            fh.write(self._header())
+            fh.truncate(self.file_size)
+        return fh
+
+    def _valid(self, fh) -> bool:
+        fh.seek(0)
+        return fh.read(HEADER_SIZE) == self._header()
+
+    # -- writes ----------------------------------------------------------
+
+    def append(self, values: Dict[str, float], timestamp: Optional[float] = None) -> None:
+        ts = int(timestamp if timestamp is not None else time.time())
+        sample = [float(values.get(metric, 0.0) or 0.0) for metric in METRICS]
+        with self._open(writable=True) as fh:
+            for step, capacity in TIERS:
+                bucket = ts - ts % step
+                pos = self.tier_offsets[step] + ((bucket // step) % capacity) * RECORD.size
+                fh.seek(pos)
+                raw = fh.read(RECORD.size)
+                record = RECORD.unpack(raw) if len(raw) == RECORD.size else None
+                if record and record[0] == bucket and record[1] > 0:
+                    count = record[1]
+                    fields = list(record[2:])
+                    for i, value in enumerate(sample):
+                        mean, low, high = fields[i * 3: i * 3 + 3]
+                        fields[i * 3] = mean + (value - mean) / (count + 1)
+                        fields[i * 3 + 1] = min(low, value)
+                        fields[i * 3 + 2] = max(high, value)
+                    packed = RECORD.pack(bucket, count + 1, *fields)
+                else:
+                    fields = []
+                    for value in sample:
+                        fields.extend((value, value, value))
+                    packed = RECORD.pack(bucket, 1, *fields)
+                fh.seek(pos)
+                fh.write(packed)
+
+    # -- reads -----------------------------------------------------------
+
+    def read_tier(self, step: int, since: int, until: int) -> List[Tuple]:
+        if not self.path.exists():
+            return []
+        capacity = dict(TIERS)[step]
+        with self._open(writable=False) as fh:
+            if not self._valid(fh):
+                return []
+            fh.seek(self.tier_offsets[step])
+            data = fh.read(capacity * RECORD.size)
+        records = []
+        for record in RECORD.iter_unpack(data[: len(data) - len(data) % RECORD.size]):
+            if record[1] and since <= record[0] <= until:
+                records.append(record)
+        records.sort(key=lambda r: r[0])
+        return records
+
+    def query(
+        self,
+        metric: str,
+        since: int,
+        until: Optional[int] = None,
+        tier: str = "auto",
+        agg: str = "avg",
+    ) -> dict:
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric} (choose from {', '.join(METRICS)})")
+        if agg not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate: {agg}")
+        now = int(time.time())
+        until = now if until is None else until
+        step = select_tier(tier, until - since, now - since)
+        index = METRICS.index(metric) * 3
+        points = []
+        total_samples = 0
+        weighted = 0.0
+        low = math.inf
+        high = -math.inf
+        for record in self.read_tier(step, since - since % step, until):
+            count = record[1]
+            mean, rmin, rmax = record[2 + index: 5 + index]
+            value = {"avg": mean, "min": rmin, "max": rmax}[agg]
+            points.append([record[0], round(value, 4)])
+            total_samples += count
+            weighted += mean * count
+            low = min(low, rmin)
+            high = max(high, rmax)
+        aggregate = {
+            "samples": total_samples,
+            "avg": round(weighted / total_samples, 4) if total_samples else None,
+            "min": round(low, 4) if total_samples else None,
+            "max": round(high, 4) if total_samples else None,
+            "last": points[-1][1] if points else None,
+        }
+        return {
+            "metric": metric,
+            "tier": TIER_NAMES[step],
+            "step": step,
+            "since": since,
+            "until": until,
+            "agg": agg,
+            "points": points,
+            "aggregate": aggregate,
+        }
+
+
+def snapshot_timestamp(snapshot: dict) -> Optional[float]:
+    try:
+        return float(timegm(time.strptime(snapshot.get("timestamp", ""), "%Y-%m-%dT%H:%M:%SZ")))
+    except (TypeError, ValueError):
+        return None
+
+
+def select_tier(name: str, span: int, age: int) -> int:
+    """Pick the finest tier that still retains data ``age`` seconds old."""
+    by_name = {v: k for k, v in TIER_NAMES.items()}
+    if name != "auto":
+        if name not in by_name:
+            raise ValueError(f"Unknown tier: {name} (choose from auto, {', '.join(by_name)})")
+        return by_name[name]
+    for step, capacity in TIERS:
+        if age <= step * capacity and span / step <= 2000:
+            return step
+    return TIERS[-1][0]
+
+
+def default_store_path() -> Path:
+    root = Path(__file__).resolve().parents[2]
+    cache = os.environ.get("STATUS_CACHE_PATH", "")
+    if not cache:
+        local = os.environ.get("STORAGE_PATH_LOCAL", "./local-storage")
+        cache = f"{local}/status-cache"
+    path = Path(cache).expanduser()
+    if not path.is_absolute():
+        path = root / path
+    return path / "status-history.bin"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Status snapshot history (ring buffer)")
+    parser.add_argument("--store", help="History file (default: $STATUS_CACHE_PATH/status-history.bin)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    append_parser = sub.add_parser("append", help="Append a statusjson snapshot read from stdin or a file")
+    append_parser.add_argument("snapshot", nargs="?", help="Snapshot JSON file (default: stdin)")
+
+    query_parser = sub.add_parser("query", help="Return a metric range and aggregates as JSON")
+    query_parser.add_argument("--metric", required=True, help="Metric name (see 'metrics')")
+    query_parser.add_argument("--since", default="1h", help="Look-back window, e.g. 15m, 6h, 7d (default: 1h)")
+    query_parser.add_argument("--until", type=int, help="End of range as epoch seconds (default: now)")
+    query_parser.add_argument("--tier", default="auto", choices=["auto", *TIER_NAMES.values()])
+    query_parser.add_argument("--agg", default="avg", choices=AGGREGATES, help="Per-bucket value to report")
+
+    sub.add_parser("metrics", help="List recorded metrics")
+
+    args = parser.parse_args(argv)
+    store = HistoryStore(Path(args.store) if args.store else default_store_path())
+
+    if args.command == "append":
+        raw = Path(args.snapshot).read_text(encoding="utf-8") if args.snapshot else sys.stdin.read()
+        snapshot = json.loads(raw)
+        store.append(snapshot_metrics(snapshot), snapshot_timestamp(snapshot))
+        return 0
+    if args.command == "metrics":
+        for metric in METRICS:
+            print(metric)
+        return 0
+
+    until = args.until if args.until is not None else int(time.time())
+    try:
+        result = store.query(args.metric, until - parse_duration(args.since), until, args.tier, args.agg)
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 2
+    json.dump(result, sys.stdout)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
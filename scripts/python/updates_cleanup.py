@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Remove ``updates`` rows whose SQL file no longer exists.
+
+One ``find`` in the worldserver container lists every SQL file under the
+updates, custom and archive directories, and one query per database reads the
+``updates`` names. Orphans are the set difference. They are deleted in chunks of
+``DELETE ... WHERE name IN (...)`` statements, inside a single transaction per
+database, so tables with tens of thousands of rows are cleaned in a few
+statements instead of one client call per row.
+
+A database with no SQL files on disk is left untouched, so a missing mount
+cannot wipe its update history.
+
+Usage:
+    updates_cleanup.py --password PW --dry-run
+    updates_cleanup.py --password PW --database acore_world=db_world --report /tmp/orphans.tsv
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import PurePosixPath
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+SQL_ROOT = "/azerothcore/data/sql"
+SOURCE_DIRS = ("updates", "custom", "archive")
+DEFAULT_DATABASES = ("acore_world=db_world", "acore_characters=db_characters", "acore_auth=db_auth")
+PREVIEW = 20
+
+
+class CleanupError(Exception):
+    """Raised when the containers cannot be queried."""
+
+
+def run(cmd: List[str], stdin: str = "") -> str:
+    result = subprocess.run(cmd, input=stdin, capture_output=True, text=True, errors="surrogateescape")
+    if result.returncode != 0:
+        stderr = " ".join(line for line in result.stderr.splitlines() if "Using a password" not in line)
+        raise CleanupError(stderr.strip() or f"{cmd[0]} exited with status {result.returncode}")
+    return result.stdout
+
+
+def files_on_disk(worldserver: str, db_types: Set[str]) -> Dict[str, Set[str]]:
+    """Map each db type directory (db_world, ...) to the SQL file names below it."""
+    roots = [f"{SQL_ROOT}/{source}" for source in SOURCE_DIRS]
+    script = 'for d in "$@"; do [ -d "$d" ] && find "$d" -type f -name "*.sql"; done; true'
+    out = run(["docker", "exec", worldserver, "sh", "-c", script, "sh", *roots])
+    found: Dict[str, Set[str]] = {db_type: set() for db_type in db_types}
+    for line in out.splitlines():
+        path = PurePosixPath(line)
+        for part in path.parts[:-1]:
+            if part in found:
+                found[part].add(path.name)
+                break
+    return found
+
+
+def quote(text: str) -> str:
+    return "'" + text.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def delete_script(orphans: List[str], chunk: int) -> str:
+    statements = ["START TRANSACTION;"]
+    for start in range(0, len(orphans), chunk):
+        names = ", ".join(quote(name) for name in orphans[start:start + chunk])
+        statements.append(f"DELETE FROM updates WHERE name IN ({names});")
+    statements.append("COMMIT;")
+    return "\n".join(statements) + "\n"
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Remove updates rows whose SQL file no longer exists")
+    parser.add_argument("--password", default=os.environ.get("MYSQL_ROOT_PASSWORD", ""))
+    parser.add_argument("--user", default=os.environ.get("MYSQL_USER", "root"))
+    parser.add_argument("--container", default=os.environ.get("MYSQL_CONTAINER", "ac-mysql"))
+    parser.add_argument("--worldserver", default=os.environ.get("WORLDSERVER_CONTAINER", "ac-worldserver"))
+    parser.add_argument("--database", action="append", metavar="SCHEMA=DIR",
+                        help="Database and its updates directory (repeatable; default: world, characters, auth)")
+    parser.add_argument("--chunk", type=int, default=1000, help="Names per DELETE statement (default: 1000)")
+    parser.add_argument("-n", "--dry-run", action="store_true", help="Report orphans without deleting them")
+    parser.add_argument("-v", "--verbose", action="store_true", help="List every orphan, not just the first 20")
+    parser.add_argument("--report", help="Write database<TAB>name for every orphan")
+    args = parser.parse_args(argv)
+
+    if not args.password:
+        parser.error("--password (or MYSQL_ROOT_PASSWORD) is required")
+    pairs: List[Tuple[str, str]] = []
+    for spec in args.database or DEFAULT_DATABASES:
+        schema, sep, db_type = spec.partition("=")
+        if not sep or not schema or not db_type:
+            parser.error(f"invalid --database {spec!r}; expected SCHEMA=DIR")
+        pairs.append((schema, db_type))
+    mysql = ["docker", "exec", "-i", args.container, "mysql", f"-u{args.user}", f"-p{args.password}"]
+
+    report: List[Tuple[str, str]] = []
+    failed = False
+    try:
+        disk = files_on_disk(args.worldserver, {db_type for _, db_type in pairs})
+    except CleanupError as exc:
+        print(f"❌ Cannot list SQL files in {args.worldserver}: {exc}", file=sys.stderr)
+        return 1
+
+    for schema, db_type in pairs:
+        print(f"Processing: {schema}")
+        on_disk = disk.get(db_type, set())
+        if not on_disk:
+            print(f"⚠ No SQL files found for {db_type} under {SQL_ROOT}; skipping")
+            continue
+        try:
+            names = run(mysql + ["-N", "-B", schema, "-e", "SELECT name FROM updates"]).splitlines()
+        except CleanupError as exc:
+            print(f"❌ Cannot read {schema}.updates: {exc}")
+            failed = True
+            continue
+        orphans = sorted(set(names) - on_disk)
+        print(f"📁 {len(on_disk)} SQL files on disk, 📊 {len(names)} updates rows")
+        if not orphans:
+            print("✅ No orphaned entries found")
+            continue
+        print(f"🗑️  Orphaned entries: {len(orphans)}")
+        shown = orphans if args.verbose else orphans[:PREVIEW]
+        for name in shown:
+            print(f"   {name}")
+        if len(shown) < len(orphans):
+            print(f"   ... and {len(orphans) - len(shown)} more")
+        report.extend((schema, name) for name in orphans)
+        if args.dry_run:
+            print(f"Would clean {len(orphans)} orphaned entries")
+            continue
+        try:
+            run(mysql + [schema], delete_script(orphans, max(1, args.chunk)))
+        except CleanupError as exc:
+            print(f"❌ Cleanup of {schema} rolled back: {exc}")
+            failed = True
+            continue
+        print(f"✅ Cleaned {len(orphans)} orphaned entries")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as handle:
+            handle.writelines(f"{schema}\t{name}\n" for schema, name in report)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
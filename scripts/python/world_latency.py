@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""
+World update latency monitor.
+
+Collects world update diff and uptime figures from the worldserver, either by
+sending ``server info`` over SOAP or by tailing worldserver output (a log file
+or captured console output containing the same lines). Samples are kept in a
+rolling window on disk so one-shot runs, the ``watch`` loop and
+``statusjson.sh`` all share the same view. Sustained lag is flagged when the
+last N samples all exceed a threshold.
+
+Usage:
+    world_latency.py sample --soap-user admin --soap-pass secret
+    world_latency.py sample --log-file storage/logs/Server.log
+    world_latency.py watch --interval 30
+    world_latency.py show
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import html
+import json
+import os
+import re
+import sys
+import time
+import urllib.error
+import urllib.request
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+DEFAULT_WINDOW_SECONDS = 900
+DEFAULT_MAX_SAMPLES = 500
+DEFAULT_THRESHOLD_MS = 150.0
+DEFAULT_SUSTAIN = 5
+
+SOAP_ENVELOPE = """<?xml version="1.0" encoding="UTF-8"?>
+<SOAP-ENV:Envelope
+  xmlns:SOAP-ENV="http://schemas.xmlsoap.org/soap/envelope/"
+  xmlns:SOAP-ENC="http://schemas.xmlsoap.org/soap/encoding/"
+  xmlns:xsi="http://www.w3.org/1999/XMLSchema-instance"
+  xmlns:xsd="http://www.w3.org/1999/XMLSchema"
+  xmlns:ns1="urn:AC">
+  <SOAP-ENV:Body>
+    <ns1:executeCommand>
+      <command>{command}</command>
+    </ns1:executeCommand>
+  </SOAP-ENV:Body>
+</SOAP-ENV:Envelope>"""
+
+UPDATE_DIFF_RE = re.compile(r"Update time diff:\s*(\d+)\s*ms", re.IGNORECASE)
+AVERAGE_RE = re.compile(r"average:\s*(\d+)\s*ms", re.IGNORECASE)
+MEAN_RE = re.compile(r"Mean:\s*(\d+)\s*ms", re.IGNORECASE)
+MEDIAN_RE = re.compile(r"Median:\s*(\d+)\s*ms", re.IGNORECASE)
+PERCENTILES_RE = re.compile(
+    r"Percentiles\s*\(95,\s*99,\s*max\):\s*(\d+)\s*ms,\s*(\d+)\s*ms,\s*(\d+)\s*ms", re.IGNORECASE
+)
+UPTIME_RE = re.compile(r"(?:Server )?uptime:\s*(.+)", re.IGNORECASE)
+UPTIME_PART_RE = re.compile(r"(\d+)\s*(day|hour|minute|second|d|h|m|s)", re.IGNORECASE)
+PLAYERS_RE = re.compile(r"Connected players:\s*(\d+)", re.IGNORECASE)
+UNIT_SECONDS = {"d": 86400, "h": 3600, "m": 60, "s": 1}
+
+
+class SoapError(Exception):
+    """Raised when the SOAP endpoint is unreachable or returns a fault."""
+
+
+@dataclass
+class Sample:
+    timestamp: float
+    diff_ms: float
+    mean_ms: Optional[float] = None
+    median_ms: Optional[float] = None
+    p95_ms: Optional[float] = None
+    p99_ms: Optional[float] = None
+    max_ms: Optional[float] = None
+    uptime_seconds: Optional[int] = None
+    players_online: Optional[int] = None
+
+    @property
+    def lag_value(self) -> float:
+        """Value compared against the lag threshold (server mean when reported)."""
+        return self.mean_ms if self.mean_ms is not None else self.diff_ms
+
+
+def parse_uptime(text: str) -> Optional[int]:
+    parts = UPTIME_PART_RE.findall(text)
+    if not parts:
+        return None
+    return sum(int(value) * UNIT_SECONDS[unit[0].lower()] for value, unit in parts)
+
+
+def parse_server_info(text: str, timestamp: Optional[float] = None) -> Optional[Sample]:
+    """Parse one ``server info`` response; returns None when no diff is present."""
+    diff = UPDATE_DIFF_RE.search(text)
+    if not diff:
+        return None
+    sample = Sample(timestamp=timestamp if timestamp is not None else time.time(), diff_ms=float(diff.group(1)))
+    mean = MEAN_RE.search(text) or AVERAGE_RE.search(text)
+    if mean:
+        sample.mean_ms = float(mean.group(1))
+    median = MEDIAN_RE.search(text)
+    if median:
+        sample.median_ms = float(median.group(1))
+    percentiles = PERCENTILES_RE.search(text)
+    if percentiles:
+        sample.p95_ms, sample.p99_ms, sample.max_ms = (float(v) for v in percentiles.groups())
+    uptime = UPTIME_RE.search(text)
+    if uptime:
+        sample.uptime_seconds = parse_uptime(uptime.group(1))
+    players = PLAYERS_RE.search(text)
+    if players:
+        sample.players_online = int(players.group(1))
+    return sample
+
+
+def parse_log_lines(lines: Iterable[str], timestamp: Optional[float] = None) -> List[Sample]:
+    """Group worldserver output into ``server info`` blocks and parse each one.
+
+    A block starts at an ``Update time diff`` line; the lines that follow
+    (mean/median/percentiles) belong to it. Uptime and player lines printed
+    just before the diff line are carried into the next block.
+    """
+    samples: List[Sample] = []
+    block: List[str] = []
+    preamble: List[str] = []
+    for line in lines:
+        if UPDATE_DIFF_RE.search(line):
+            if block:
+                parsed = parse_server_info("\n".join(block), timestamp)
+                if parsed:
+                    samples.append(parsed)
+            block = preamble + [line]
+            preamble = []
+        elif block and re.search(r"Mean:|Median:|Percentiles", line, re.IGNORECASE):
+            block.append(line)
+        elif UPTIME_RE.search(line) or PLAYERS_RE.search(line):
+            preamble.append(line)
+    if block:
+        parsed = parse_server_info("\n".join(block), timestamp)
+        if parsed:
+            samples.append(parsed)
+    return samples
+
+
+def soap_execute(url: str, user: str, password: str, command: str, timeout: float = 5.0) -> str:
+    body = SOAP_ENVELOPE.format(command=html.escape(command)).encode("utf-8")
+    request = urllib.request.Request(url, data=body, method="POST")
+    request.add_header("Content-Type", "text/xml")
+    token = base64.b64encode(f"{user}:{password}".encode("utf-8")).decode("ascii")
+    request.add_header("Authorization", f"Basic {token}")
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            payload = response.read().decode("utf-8", errors="replace")
+    except urllib.error.HTTPError as exc:
+        payload = exc.read().decode("utf-8", errors="replace")
+        if "faultstring" not in payload:
+            raise SoapError(f"SOAP request failed: HTTP {exc.code}") from exc
+    except (urllib.error.URLError, OSError) as exc:
+        raise SoapError(f"SOAP endpoint unreachable: {exc}") from exc
+    fault = re.search(r"<faultstring>(.*?)</faultstring>", payload, re.DOTALL)
+    if fault:
+        raise SoapError(html.unescape(fault.group(1)).strip())
+    result = re.search(r"<result>(.*?)</result>", payload, re.DOTALL)
+    if not result:
+        raise SoapError("SOAP response did not contain a result")
+    return html.unescape(result.group(1)).replace("\r", "")
+
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[rank]
+
+
+class LatencyMonitor:
+    """Rolling window of samples persisted between runs."""
+
+    def __init__(
+        self,
+        state_path: Path,
+        window_seconds: int = DEFAULT_WINDOW_SECONDS,
+        max_samples: int = DEFAULT_MAX_SAMPLES,
+        threshold_ms: float = DEFAULT_THRESHOLD_MS,
+        sustain: int = DEFAULT_SUSTAIN,
+    ):
+        self.state_path = Path(state_path)
+        self.window_seconds = window_seconds
+        self.max_samples = max_samples
+        self.threshold_ms = threshold_ms
+        self.sustain = sustain
+        self.samples: List[Sample] = []
+        self.source = ""
+        self.log_position: Dict[str, int] = {}
+        self.restarts = 0
+        self.lag_since: Optional[float] = None
+        self._load()
+
+    def _load(self) -> None:
+        if not self.state_path.exists():
+            return
+        try:
+            data = json.loads(self.state_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        self.samples = [Sample(**raw) for raw in data.get("samples", [])]
+        self.source = data.get("source", "")
+        self.log_position = data.get("log_position") or {}
+        self.restarts = int(data.get("restarts", 0))
+        self.lag_since = data.get("lag_since")
+        self._update_lag()
+
+    def save(self) -> None:
+        payload = {
+            "summary": self.summary(),
+            "source": self.source,
+            "log_position": self.log_position,
+            "restarts": self.restarts,
+            "lag_since": self.lag_since,
+            "samples": [asdict(sample) for sample in self.samples],
+        }
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_name(f".{self.state_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.state_path)
+
+    def add(self, sample: Sample) -> None:
+        last = self.samples[-1] if self.samples else None
+        if (
+            last
+            and last.uptime_seconds is not None
+            and sample.uptime_seconds is not None
+            and sample.uptime_seconds < last.uptime_seconds
+        ):
+            # Worldserver restarted: earlier ticks no longer describe this process.
+            self.samples.clear()
+            self.restarts += 1
+            self.lag_since = None
+        self.samples.append(sample)
+        cutoff = sample.timestamp - self.window_seconds
+        self.samples = [s for s in self.samples if s.timestamp >= cutoff][-self.max_samples:]
+        self._update_lag()
+
+    def _update_lag(self) -> None:
+        """Derive lag_since from the window: start of the trailing lagging run, if it spans --sustain samples.
+
+        When the run fills the whole window its real start may already be
+        pruned, so an earlier persisted onset is kept.
+        """
+        run = 0
+        for sample in reversed(self.samples):
+            if sample.lag_value < self.threshold_ms:
+                break
+            run += 1
+        if run < max(1, self.sustain):
+            self.lag_since = None
+            return
+        start = self.samples[-run].timestamp
+        if not (run == len(self.samples) and self.lag_since is not None and self.lag_since < start):
+            self.lag_since = start
+
+    def collect_soap(self, url: str, user: str, password: str, timeout: float) -> Sample:
+        text = soap_execute(url, user, password, "server info", timeout)
+        sample = parse_server_info(text)
+        if sample is None:
+            raise SoapError("server info response did not include an update diff")
+        self.source = "soap"
+        self.add(sample)
+        return sample
+
+    def collect_log(self, log_path: Path, from_start: bool = False) -> List[Sample]:
+        stat = log_path.stat()
+        key = str(log_path)
+        position = self.log_position.get(key, {})
+        offset = 0
+        if not from_start and position.get("inode") == stat.st_ino and position.get("offset", 0) <= stat.st_size:
+            offset = position.get("offset", 0)
+        with log_path.open("r", encoding="utf-8", errors="replace") as fh:
+            fh.seek(offset)
+            lines = fh.readlines()
+            end = fh.tell()
+        self.log_position[key] = {"inode": stat.st_ino, "offset": end}
+        samples = parse_log_lines(lines)
+        now = time.time()
+        # Lines carry no reliable timestamps; spread the batch just before now.
+        for idx, sample in enumerate(samples):
+            sample.timestamp = now - (len(samples) - 1 - idx) * 1e-3
+            self.add(sample)
+        self.source = "log"
+        return samples
+
+    def summary(self) -> dict:
+        diffs = [s.diff_ms for s in self.samples]
+        last = self.samples[-1] if self.samples else None
+        return {
+            "source": self.source,
+            "updated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(last.timestamp)) if last else "",
+            "uptime_seconds": last.uptime_seconds if last else None,
+            "players_online": last.players_online if last else None,
+            "last_diff_ms": last.diff_ms if last else None,
+            "server": {
+                "mean_ms": last.mean_ms if last else None,
+                "median_ms": last.median_ms if last else None,
+                "p95_ms": last.p95_ms if last else None,
+                "p99_ms": last.p99_ms if last else None,
+                "max_ms": last.max_ms if last else None,
+            },
+            "rolling": {
+                "samples": len(diffs),
+                "window_seconds": self.window_seconds,
+                "p50_ms": percentile(diffs, 50),
+                "p95_ms": percentile(diffs, 95),
+                "p99_ms": percentile(diffs, 99),
+                "max_ms": max(diffs) if diffs else None,
+            },
+            "threshold_ms": self.threshold_ms,
+            "sustain_samples": self.sustain,
+            "lagging": self.lag_since is not None,
+            "lag_since": (
+                time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.lag_since)) if self.lag_since else None
+            ),
+            "restarts": self.restarts,
+        }
+
+
+def default_state_path() -> Path:
+    root = Path(__file__).resolve().parents[2]
+    cache = os.environ.get("STATUS_CACHE_PATH", "")
+    if not cache:
+        local = os.environ.get("STORAGE_PATH_LOCAL", "./local-storage")
+        cache = f"{local}/status-cache"
+    path = Path(cache).expanduser()
+    if not path.is_absolute():
+        path = root / path
+    return path / "world-latency.json"
+
+
+def collect_once(monitor: LatencyMonitor, args: argparse.Namespace) -> bool:
+    try:
+        if args.log_file:
+            monitor.collect_log(Path(args.log_file), from_start=args.from_start)
+        else:
+            if not args.soap_user or not args.soap_pass:
+                print("Error: SOAP credentials required (--soap-user/--soap-pass or SOAP_USERNAME/SOAP_PASSWORD)", file=sys.stderr)
+                return False
+            monitor.collect_soap(args.soap_url, args.soap_user, args.soap_pass, args.timeout)
+    except (SoapError, OSError) as exc:
+        print(f"Warning: latency sample failed: {exc}", file=sys.stderr)
+        return False
+    monitor.save()
+    return True
+
+
+def main(argv: Optional[Iterable[str]] = None) -> int:
+    soap_port = os.environ.get("SOAP_EXTERNAL_PORT", "7778")
+    parser = argparse.ArgumentParser(description="World update latency monitor")
+    parser.add_argument("--state", help="State file (default: $STATUS_CACHE_PATH/world-latency.json)")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW_SECONDS,
+                        help=f"Rolling window in seconds (default: {DEFAULT_WINDOW_SECONDS})")
+    parser.add_argument("--threshold-ms", type=float, default=DEFAULT_THRESHOLD_MS,
+                        help=f"Update diff considered lag (default: {DEFAULT_THRESHOLD_MS:g}ms)")
+    parser.add_argument("--sustain", type=int, default=DEFAULT_SUSTAIN,
+                        help=f"Consecutive lagging samples before flagging (default: {DEFAULT_SUSTAIN})")
+
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("sample", "Collect one sample"), ("watch", "Collect samples periodically")):
+        cmd = sub.add_parser(name, help=help_text)
+        cmd.add_argument("--soap-url", default=os.environ.get("SOAP_URL", f"http://127.0.0.1:{soap_port}/"),
+                         help="SOAP endpoint (default: http://127.0.0.1:$SOAP_EXTERNAL_PORT/)")
+        cmd.add_argument("--soap-user", default=os.environ.get("SOAP_USERNAME", ""))
+        cmd.add_argument("--soap-pass", default=os.environ.get("SOAP_PASSWORD", ""))
+        cmd.add_argument("--timeout", type=float, default=5.0, help="SOAP timeout in seconds (default: 5)")
+        cmd.add_argument("--log-file", help="Tail worldserver output instead of querying SOAP")
+        cmd.add_argument("--from-start", action="store_true", help="Read the log file from the beginning")
+        if name == "watch":
+            cmd.add_argument("--interval", type=float, default=30.0, help="Seconds between samples (default: 30)")
+    sub.add_parser("show", help="Print the current summary")
+
+    args = parser.parse_args(argv)
+    monitor = LatencyMonitor(
+        Path(args.state) if args.state else default_state_path(),
+        window_seconds=args.window,
+        threshold_ms=args.threshold_ms,
+        sustain=args.sustain,
+    )
+
+    if args.command == "show":
+        json.dump(monitor.summary(), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0 if monitor.samples else 1
+
+    if args.command == "sample":
+        ok = collect_once(monitor, args)
+        json.dump(monitor.summary(), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0 if ok else 1
+
+    print(f"⏱️  Sampling world update diff every {args.interval:g}s (lag threshold {args.threshold_ms:g}ms)")
+    try:
+        while True:
+            was_lagging = monitor.lag_since is not None
+            if collect_once(monitor, args):
+                summary = monitor.summary()
+                if summary["lagging"] and not was_lagging:
+                    print(f"⚠️  Sustained world lag since {summary['lag_since']} "
+                          f"(last diff {summary['last_diff_ms']:g}ms)", file=sys.stderr)
+                elif was_lagging and not summary["lagging"]:
+                    print("✅ World update diff back under threshold", file=sys.stderr)
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
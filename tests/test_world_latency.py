@@ -0,0 +1,168 @@
+import base64
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "scripts" / "python"))
+
+from world_latency import LatencyMonitor, Sample, SoapError  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+SERVER_INFO = """AzerothCore rev. 8a4f6b2b2e5b 2025-01-05 10:11:12 +0000 (master branch) (Unix, RelWithDebInfo, Static)\r
+Connected players: 3. Characters in world: 3.\r
+Connection peak: 5.\r
+Server uptime: 2 Day(s) 4 Hour(s) 10 Minute(s) 5 Second(s)\r
+Update time diff: 61ms. Last 500 diffs summary:\r
+|- Mean: 55ms\r
+|- Median: 52ms\r
+|- Percentiles (95, 99, max): 90ms, 140ms, 300ms\r
+"""
+
+
+def monitor(tmp_path, **kwargs):
+    options = {"window_seconds": 900, "max_samples": 500, "threshold_ms": 100.0, "sustain": 3}
+    options.update(kwargs)
+    return LatencyMonitor(tmp_path / "world-latency.json", **options)
+
+
+def feed(mon, values, start=0.0, step=10.0, uptime=None):
+    for offset, value in enumerate(values):
+        mon.add(Sample(timestamp=start + offset * step, diff_ms=value,
+                       uptime_seconds=None if uptime is None else uptime + offset * int(step)))
+
+
+def test_lag_starts_after_sustained_samples(tmp_path):
+    mon = monitor(tmp_path)
+    feed(mon, [50, 200, 200])
+    assert mon.lag_since is None
+    feed(mon, [200], start=30)
+    assert mon.lag_since == 10
+
+
+def test_single_fast_sample_recovers(tmp_path):
+    mon = monitor(tmp_path)
+    feed(mon, [200, 200, 200, 200])
+    assert mon.lag_since == 0
+    feed(mon, [50], start=40)
+    assert mon.lag_since is None
+
+
+def test_restart_clears_lag(tmp_path):
+    mon = monitor(tmp_path)
+    feed(mon, [200, 200, 200], uptime=1000)
+    assert mon.lag_since is not None
+    feed(mon, [200], start=30, uptime=5)
+    assert mon.restarts == 1
+    assert mon.lag_since is None
+
+
+def test_pruning_below_sustain_clears_lag(tmp_path):
+    mon = monitor(tmp_path, window_seconds=25)
+    feed(mon, [200, 200, 200])
+    assert mon.lag_since == 0
+    # A long gap prunes the earlier lagging samples; one lagging sample is not sustained.
+    feed(mon, [200], start=500)
+    assert mon.samples and len(mon.samples) == 1
+    assert mon.lag_since is None
+
+
+def test_max_samples_pruning_keeps_onset(tmp_path):
+    mon = monitor(tmp_path, max_samples=4)
+    feed(mon, [200, 200, 200, 200, 200, 200])
+    assert mon.samples[0].timestamp == 20
+    assert mon.lag_since == 0
+
+
+def test_window_pruning_keeps_onset_across_reload(tmp_path):
+    mon = monitor(tmp_path, window_seconds=25)
+    feed(mon, [200] * 10)
+    mon.save()
+    reloaded = monitor(tmp_path, window_seconds=25)
+    feed(reloaded, [200], start=100)
+    assert reloaded.lag_since == 0
+
+
+def test_stale_state_is_recomputed_on_load(tmp_path):
+    mon = monitor(tmp_path)
+    feed(mon, [200, 200, 200])
+    mon.lag_since = 0
+    mon.samples = mon.samples[-1:]
+    mon.save()
+    assert monitor(tmp_path).lag_since is None
+
+
+class SoapHandler(BaseHTTPRequestHandler):
+    """Stand-in worldserver SOAP endpoint answering ``server info``."""
+
+    requests = []
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8")
+        SoapHandler.requests.append((self.headers.get("Authorization"), body))
+        if "<command>server info</command>" in body:
+            payload = ("<?xml version=\"1.0\" encoding=\"UTF-8\"?><SOAP-ENV:Envelope><SOAP-ENV:Body>"
+                       "<ns1:executeCommandResponse><result>" + SERVER_INFO + "</result>"
+                       "</ns1:executeCommandResponse></SOAP-ENV:Body></SOAP-ENV:Envelope>")
+            self.send_response(200)
+        else:
+            payload = "<SOAP-ENV:Fault><faultstring>There is no such command.</faultstring></SOAP-ENV:Fault>"
+            self.send_response(500)
+        data = payload.encode("utf-8")
+        self.send_header("Content-Type", "text/xml")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def soap_url():
+    server = HTTPServer(("127.0.0.1", 0), SoapHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    SoapHandler.requests = []
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_soap_server_info_sample(tmp_path, soap_url):
+    mon = monitor(tmp_path)
+    sample = mon.collect_soap(soap_url, "admin", "secret", timeout=5)
+    auth, body = SoapHandler.requests[0]
+    assert auth == "Basic " + base64.b64encode(b"admin:secret").decode("ascii")
+    assert "<command>server info</command>" in body
+    assert (sample.diff_ms, sample.mean_ms, sample.median_ms) == (61, 55, 52)
+    assert (sample.p95_ms, sample.p99_ms, sample.max_ms) == (90, 140, 300)
+    assert sample.uptime_seconds == 2 * 86400 + 4 * 3600 + 10 * 60 + 5
+    assert sample.players_online == 3
+    mon.save()
+    assert monitor(tmp_path).summary()["source"] == "soap"
+
+
+def test_soap_unreachable(tmp_path):
+    mon = monitor(tmp_path)
+    with pytest.raises(SoapError):
+        mon.collect_soap("http://127.0.0.1:9/", "admin", "secret", timeout=1)
+    assert not mon.samples
+
+
+def test_log_fixture_samples(tmp_path):
+    log = tmp_path / "Server.log"
+    log.write_text((FIXTURES / "worldserver-server-info.log").read_text(encoding="utf-8"), encoding="utf-8")
+    mon = monitor(tmp_path)
+    samples = mon.collect_log(log)
+    assert [s.diff_ms for s in samples] == [48, 212]
+    assert [s.mean_ms for s in samples] == [51, 180]
+    assert [s.players_online for s in samples] == [12, 14]
+    assert samples[1].uptime_seconds == 3600 + 7 * 60 + 30
+    assert samples[1].p99_ms == 310
+    # A second read only sees lines appended since the first.
+    with log.open("a", encoding="utf-8") as handle:
+        handle.write("Update time diff: 30ms. Last 500 diffs summary:\n|- Mean: 29ms\n")
+    assert [s.diff_ms for s in mon.collect_log(log)] == [30]